@@ -123,6 +123,17 @@ class ChatCompletionResponse(BaseModel):
     created: int = Field(default_factory=lambda: int(time.time()))
 
 
+class EmbeddingRequest(BaseModel):
+    """Request for text embeddings."""
+
+    model: str = Field(
+        ..., description="Embedding model (e.g., text-embedding-3-small)"
+    )
+    input: list[str] = Field(..., min_length=1, max_length=2048)
+    dimensions: int | None = Field(default=None, gt=0)
+    tenant_id: str = Field(..., description="Tenant identifier")
+
+
 class ErrorResponse(BaseModel):
     """Error response structure."""
 
@@ -275,6 +286,52 @@ async def route_to_provider(request: ChatCompletionRequest) -> dict[str, Any]:
             )
 
 
+async def embed_with_provider(request: EmbeddingRequest) -> dict[str, Any]:
+    """
+    Send an embedding request to the provider.
+
+    Args:
+        request: Embedding request
+
+    Returns:
+        OpenAI-compatible embedding response
+
+    Raises:
+        HTTPException: If provider call fails
+    """
+    if not request.model.lower().startswith("text-embedding"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported embedding model: {request.model}",
+        )
+
+    if not settings.openai_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Provider openai not configured",
+        )
+
+    payload: dict[str, Any] = {"model": request.model, "input": request.input}
+    if request.dimensions:
+        payload["dimensions"] = request.dimensions
+
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        try:
+            response = await client.post(
+                "https://api.openai.com/v1/embeddings",
+                json=payload,
+                headers={"Authorization": f"Bearer {settings.openai_api_key}"},
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            logger.error(f"Embedding request failed: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Provider request failed: {str(e)}",
+            )
+
+
 # Record usage metrics
 async def record_usage(
     tenant_id: str, model: str, tokens: int, redis_client: redis.Redis
@@ -397,6 +454,34 @@ async def chat_completions(
         )
 
 
+@app.post("/v1/embeddings")
+async def embeddings(request: EmbeddingRequest, r: redis.Redis = Depends(get_redis)):
+    """
+    Embed a batch of texts.
+
+    Args:
+        request: Embedding request
+        r: Redis client dependency
+
+    Returns:
+        OpenAI-compatible embedding response
+    """
+    if not await check_rate_limit(request.tenant_id, r):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Rate limit exceeded"
+        )
+
+    response = await embed_with_provider(request)
+
+    usage = response.get("usage", {})
+    total_tokens = usage.get(
+        "total_tokens", sum(count_tokens(text) for text in request.input)
+    )
+    await record_usage(request.tenant_id, request.model, total_tokens, r)
+
+    return response
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -406,6 +491,7 @@ async def root():
         "endpoints": {
             "health": "/health",
             "chat": "/v1/chat/completions",
+            "embeddings": "/v1/embeddings",
             "metrics": "/metrics/{tenant_id}",
         },
     }
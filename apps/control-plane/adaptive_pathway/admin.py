@@ -5,6 +5,7 @@ from .models import (
     StudentProgress,
     PathwayRecommendation,
     ContentEmbedding,
+    PathwayRecommenderModel,
 )
 
 
@@ -280,3 +281,30 @@ class ContentEmbeddingAdmin(admin.ModelAdmin):
         ("Similarity Cache", {"fields": ("similar_content",)}),
         ("Timestamps", {"fields": ("created_at", "updated_at")}),
     )
+
+
+@admin.register(PathwayRecommenderModel)
+class PathwayRecommenderModelAdmin(admin.ModelAdmin):
+    list_display = [
+        "tenant",
+        "version",
+        "algorithm",
+        "item_count",
+        "student_count",
+        "interaction_count",
+        "build_seconds",
+        "built_at",
+    ]
+    list_filter = ["algorithm", "built_at"]
+    search_fields = ["tenant"]
+    exclude = ["data"]
+    readonly_fields = [
+        "tenant",
+        "version",
+        "algorithm",
+        "item_count",
+        "student_count",
+        "interaction_count",
+        "build_seconds",
+        "built_at",
+    ]
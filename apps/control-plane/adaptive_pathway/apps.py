@@ -5,3 +5,6 @@ class AdaptivePathwayConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "adaptive_pathway"
     verbose_name = "Adaptive Learning Pathway"
+
+    def ready(self):
+        from . import signals  # noqa: F401
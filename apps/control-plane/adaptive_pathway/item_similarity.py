@@ -0,0 +1,299 @@
+"""
+Offline item-item recommender for learning pathways.
+
+A nightly task trains, per tenant, a cosine item-item similarity model over
+student x pathway completions (a student "completed" a pathway if they
+finished it or completed any of its steps) and stores it as a versioned
+PathwayRecommenderModel. Workers load the latest version lazily and check
+for a newer one at most every CHECK_INTERVAL seconds, so a recommendation
+is a lookup of the student's history plus a merge of precomputed
+neighbour lists.
+"""
+
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Neighbours stored per pathway
+TOP_K = 50
+
+# Most popular pathways stored as a fallback for students with no history
+MAX_POPULAR = 200
+
+# Pathways per student used for co-completion counts (bounds training cost)
+MAX_ITEMS_PER_STUDENT = 200
+
+# Model versions kept per tenant
+KEEP_VERSIONS = 3
+
+# Seconds between checks for a newer model version
+CHECK_INTERVAL = getattr(settings, "ADAPTIVE_PATHWAY_MODEL_CHECK_INTERVAL", 60)
+
+
+def train_item_model(
+    interactions: Iterable[Tuple[str, int]],
+    items: Dict[int, Dict[str, Any]],
+    top_k: int = TOP_K,
+) -> Dict[str, Any]:
+    """
+    Train an item-item cosine similarity model.
+
+    interactions are (student_id, pathway_id) pairs; items maps pathway id
+    to the metadata needed at recommendation time. Returns a
+    JSON-serialisable dict.
+    """
+    items_by_student: Dict[str, Set[int]] = defaultdict(set)
+    for student_id, pathway_id in interactions:
+        items_by_student[student_id].add(pathway_id)
+
+    counts: Counter = Counter()
+    co_counts: Dict[int, Counter] = defaultdict(Counter)
+    interaction_count = 0
+
+    for student_items in items_by_student.values():
+        student_items = sorted(student_items)[:MAX_ITEMS_PER_STUDENT]
+        interaction_count += len(student_items)
+        counts.update(student_items)
+        for a, b in combinations(student_items, 2):
+            co_counts[a][b] += 1
+            co_counts[b][a] += 1
+
+    neighbours = {}
+    for item, row in co_counts.items():
+        scored = (
+            (other, shared / math.sqrt(counts[item] * counts[other]))
+            for other, shared in row.items()
+        )
+        neighbours[str(item)] = [
+            [other, round(similarity, 4)]
+            for other, similarity in heapq.nlargest(
+                top_k, scored, key=lambda pair: pair[1]
+            )
+        ]
+
+    return {
+        "items": {
+            str(item): {**items.get(item, {}), "completions": count}
+            for item, count in counts.items()
+        },
+        "neighbours": neighbours,
+        "popular": [
+            item for item, _ in sorted(counts.items(), key=lambda p: (-p[1], p[0]))
+        ][:MAX_POPULAR],
+        "student_count": len(items_by_student),
+        "interaction_count": interaction_count,
+    }
+
+
+class ItemSimilarityModel:
+    """
+    In-memory form of a PathwayRecommenderModel.
+    """
+
+    def __init__(self, version: int, data: Dict[str, Any]):
+        self.version = version
+        self.items: Dict[int, Dict[str, Any]] = {
+            int(item): meta for item, meta in data.get("items", {}).items()
+        }
+        self.neighbours: Dict[int, List[Tuple[int, float]]] = {
+            int(item): [(other, similarity) for other, similarity in row]
+            for item, row in data.get("neighbours", {}).items()
+        }
+        self.popular: List[int] = data.get("popular", [])
+
+    def scores(self, history: Iterable[int]) -> Dict[int, float]:
+        """Mean similarity of each unseen pathway to the student's history"""
+        history = set(history)
+        if not history:
+            return {}
+
+        totals: Dict[int, float] = defaultdict(float)
+        for item in history:
+            for other, similarity in self.neighbours.get(item, ()):
+                if other not in history:
+                    totals[other] += similarity
+
+        return {item: total / len(history) for item, total in totals.items()}
+
+    def recommend(
+        self,
+        history: Iterable[int],
+        difficulty_level: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank completed pathways at the given difficulty for a student.
+
+        Students without a usable history get the most popular pathways
+        with a score of 0.
+        """
+        history = set(history)
+
+        def eligible(item: int) -> bool:
+            meta = self.items.get(item, {})
+            return meta.get("status") == "completed" and (
+                difficulty_level is None
+                or meta.get("difficulty_level") == difficulty_level
+            )
+
+        ranked = sorted(
+            (
+                (item, score)
+                for item, score in self.scores(history).items()
+                if eligible(item)
+            ),
+            key=lambda pair: (-pair[1], pair[0]),
+        )[:limit]
+
+        if not ranked:
+            ranked = [
+                (item, 0.0)
+                for item in self.popular
+                if item not in history and eligible(item)
+            ][:limit]
+
+        return ranked
+
+
+def student_history(tenant: str, student_id: str) -> Set[int]:
+    """Pathways a student has completed or completed steps of"""
+    from .models import LearningPathway, StudentProgress
+
+    owned = LearningPathway.objects.filter(
+        tenant=tenant, student_id=student_id, status="completed"
+    ).values_list("id", flat=True)
+    progressed = StudentProgress.objects.filter(
+        tenant=tenant, student_id=student_id, is_completed=True
+    ).values_list("pathway_id", flat=True)
+
+    return set(owned) | set(progressed)
+
+
+def build_item_model(tenant: str, top_k: int = TOP_K):
+    """Train and store a new model version for a tenant"""
+    from .models import LearningPathway, PathwayRecommenderModel, StudentProgress
+
+    start = time.perf_counter()
+
+    pathways = LearningPathway.objects.filter(tenant=tenant).values_list(
+        "id", "student_id", "status", "difficulty_level", "completion_percentage"
+    )
+    items = {}
+    interactions: List[Tuple[str, int]] = []
+    for pathway_id, owner, status, difficulty, completion in pathways.iterator(
+        chunk_size=5000
+    ):
+        items[pathway_id] = {
+            "status": status,
+            "difficulty_level": difficulty,
+            "completion_percentage": float(completion or 0),
+        }
+        if status == "completed":
+            interactions.append((owner, pathway_id))
+
+    interactions.extend(
+        StudentProgress.objects.filter(tenant=tenant, is_completed=True)
+        .values_list("student_id", "pathway_id")
+        .distinct()
+        .iterator(chunk_size=5000)
+    )
+
+    data = train_item_model(interactions, items, top_k)
+
+    with transaction.atomic():
+        latest = (
+            PathwayRecommenderModel.objects.select_for_update()
+            .filter(tenant=tenant)
+            .order_by("-version")
+            .first()
+        )
+        model = PathwayRecommenderModel.objects.create(
+            tenant=tenant,
+            version=(latest.version if latest else 0) + 1,
+            student_count=data.pop("student_count"),
+            item_count=len(data["items"]),
+            interaction_count=data.pop("interaction_count"),
+            data=data,
+            build_seconds=round(time.perf_counter() - start, 3),
+        )
+
+        stale = PathwayRecommenderModel.objects.filter(tenant=tenant).order_by(
+            "-version"
+        )[KEEP_VERSIONS:]
+        PathwayRecommenderModel.objects.filter(
+            id__in=list(stale.values_list("id", flat=True))
+        ).delete()
+
+    logger.info(
+        f"Built pathway recommender for {tenant} v{model.version}: "
+        f"{model.item_count} pathways, {model.student_count} students "
+        f"in {model.build_seconds}s"
+    )
+    return model
+
+
+class ItemModelStore:
+    """
+    Per-process holder of each tenant's latest ItemSimilarityModel.
+    """
+
+    def __init__(self, check_interval: float = CHECK_INTERVAL):
+        self.check_interval = check_interval
+        # tenant -> (model or None, checked_at)
+        self._entries: Dict[str, Tuple[Optional[ItemSimilarityModel], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tenant: str) -> Optional[ItemSimilarityModel]:
+        """Return the tenant's model, or None if none has been built"""
+        entry = self._entries.get(tenant)
+        if entry is not None and time.monotonic() - entry[1] < self.check_interval:
+            return entry[0]
+
+        from .models import PathwayRecommenderModel
+
+        with self._lock:
+            current = self._entries.get(tenant, (None, 0.0))[0]
+            latest = (
+                PathwayRecommenderModel.objects.filter(tenant=tenant)
+                .order_by("-version")
+                .values_list("version", flat=True)
+                .first()
+            )
+
+            if latest is None:
+                current = None
+            elif current is None or current.version != latest:
+                data = (
+                    PathwayRecommenderModel.objects.filter(
+                        tenant=tenant, version=latest
+                    )
+                    .values_list("data", flat=True)
+                    .first()
+                )
+                if data is not None:
+                    current = ItemSimilarityModel(latest, data)
+                    logger.info(f"Loaded pathway recommender for {tenant} v{latest}")
+
+            self._entries[tenant] = (current, time.monotonic())
+            return current
+
+    def invalidate(self, tenant: Optional[str] = None) -> None:
+        with self._lock:
+            if tenant is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(tenant, None)
+
+
+# Shared by all recommendation requests in this process
+item_models = ItemModelStore()
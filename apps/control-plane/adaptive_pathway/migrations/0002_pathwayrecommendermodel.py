@@ -0,0 +1,49 @@
+# Generated by Django 5.1.13 on 2026-10-18 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("adaptive_pathway", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PathwayRecommenderModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tenant", models.CharField(db_index=True, max_length=100)),
+                ("version", models.PositiveIntegerField()),
+                (
+                    "algorithm",
+                    models.CharField(default="item_item_cosine", max_length=50),
+                ),
+                ("student_count", models.PositiveIntegerField(default=0)),
+                ("item_count", models.PositiveIntegerField(default=0)),
+                ("interaction_count", models.PositiveIntegerField(default=0)),
+                ("data", models.JSONField(default=dict)),
+                ("build_seconds", models.FloatField(default=0.0)),
+                ("built_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Pathway Recommender Model",
+                "verbose_name_plural": "Pathway Recommender Models",
+                "ordering": ["-built_at"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("tenant", "version"), name="unique_recommender_version"
+                    )
+                ],
+            },
+        ),
+    ]
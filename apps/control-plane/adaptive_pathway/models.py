@@ -451,3 +451,38 @@ class ContentEmbedding(models.Model):
 
     def __str__(self):
         return f"{self.embedding_number} - {self.step.title}"
+
+
+class PathwayRecommenderModel(models.Model):
+    """
+    Item-item similarity model over a tenant's pathways, built offline.
+    Workers load the latest version lazily to answer recommendations.
+    """
+
+    tenant = models.CharField(max_length=100, db_index=True)
+    version = models.PositiveIntegerField()
+    algorithm = models.CharField(max_length=50, default="item_item_cosine")
+
+    # Training set size
+    student_count = models.PositiveIntegerField(default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    interaction_count = models.PositiveIntegerField(default=0)
+
+    # Serialised model: item metadata, top-K neighbours per item, popularity
+    data = models.JSONField(default=dict)
+
+    build_seconds = models.FloatField(default=0.0)
+    built_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-built_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant", "version"], name="unique_recommender_version"
+            )
+        ]
+        verbose_name = "Pathway Recommender Model"
+        verbose_name_plural = "Pathway Recommender Models"
+
+    def __str__(self):
+        return f"{self.tenant} v{self.version} ({self.item_count} pathways)"
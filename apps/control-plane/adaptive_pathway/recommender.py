@@ -0,0 +1,180 @@
+"""
+Collaborative filtering over a tenant's step-completion matrix.
+
+Each tenant's completed StudentProgress rows are loaded once into a sparse
+matrix held as two posting maps (student -> steps, step -> students).
+Jaccard similarity between one student and every other student is then
+computed in a single pass over the student's steps' posting lists, instead
+of one query per student.
+
+Neighbourhoods are cached per student. When progress changes, the matrix is
+updated in place and only the neighbourhoods the change can affect are
+dropped. Other processes notice via a per-tenant generation counter in the
+shared cache and reload that tenant.
+"""
+
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from django.conf import settings
+
+from control_plane.tenant_store import TenantStore
+
+logger = logging.getLogger(__name__)
+
+# Minimum Jaccard similarity for a student to count as a neighbour
+SIMILARITY_THRESHOLD = 0.3
+
+# Neighbours kept per student
+MAX_NEIGHBOURS = 20
+
+# Seconds between checks of a tenant's shared generation counter
+CHECK_INTERVAL = getattr(settings, "ADAPTIVE_PATHWAY_CHECK_INTERVAL", 30)
+
+# Reload a tenant at least this often, to pick up bulk writes that bypass
+# model signals
+MAX_AGE = getattr(settings, "ADAPTIVE_PATHWAY_MATRIX_MAX_AGE", 900)
+
+GENERATION_KEY = "adaptive_pathway:completions:{tenant}"
+
+
+class CompletionMatrix:
+    """
+    Sparse student x step completion matrix with cached neighbourhoods.
+    """
+
+    def __init__(
+        self,
+        completions: Iterable[Tuple[str, int]] = (),
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_neighbours: int = MAX_NEIGHBOURS,
+    ):
+        self.threshold = threshold
+        self.max_neighbours = max_neighbours
+        self._steps_by_student: Dict[str, Set[int]] = defaultdict(set)
+        self._students_by_step: Dict[int, Set[str]] = defaultdict(set)
+        self._neighbourhoods: Dict[str, List[Tuple[str, float]]] = {}
+        self._lock = threading.Lock()
+
+        for student_id, step_id in completions:
+            self._steps_by_student[student_id].add(step_id)
+            self._students_by_step[step_id].add(student_id)
+
+    @classmethod
+    def load(cls, tenant: str) -> "CompletionMatrix":
+        """Build the matrix from a tenant's completed progress records"""
+        from .models import StudentProgress
+
+        completions = (
+            StudentProgress.objects.filter(tenant=tenant, is_completed=True)
+            .values_list("student_id", "step_id")
+            .iterator(chunk_size=5000)
+        )
+        return cls(completions)
+
+    @property
+    def student_count(self) -> int:
+        return len(self._steps_by_student)
+
+    def steps(self, student_id: str) -> Set[int]:
+        return set(self._steps_by_student.get(student_id, ()))
+
+    def similarities(self, student_id: str) -> Dict[str, float]:
+        """Jaccard similarity to every student sharing at least one step"""
+        with self._lock:
+            return self._similarities(student_id)
+
+    def neighbours(self, student_id: str) -> List[Tuple[str, float]]:
+        """Most similar students above the threshold, best first"""
+        with self._lock:
+            cached = self._neighbourhoods.get(student_id)
+            if cached is not None:
+                return cached
+
+            ranked = sorted(
+                (
+                    (other, similarity)
+                    for other, similarity in self._similarities(student_id).items()
+                    if similarity > self.threshold
+                ),
+                key=lambda pair: (-pair[1], pair[0]),
+            )[: self.max_neighbours]
+
+            self._neighbourhoods[student_id] = ranked
+            return ranked
+
+    def set_completed(self, student_id: str, step_id: int, completed: bool) -> None:
+        """Apply one completion change, dropping affected neighbourhoods"""
+        with self._lock:
+            steps = self._steps_by_student.get(student_id, set())
+            if (step_id in steps) == completed:
+                return
+
+            # Similarity to this student changes for everyone sharing a
+            # step with them, before or after the change
+            affected = {student_id}
+            for step in steps | {step_id}:
+                affected |= self._students_by_step.get(step, set())
+
+            if completed:
+                self._steps_by_student[student_id].add(step_id)
+                self._students_by_step[step_id].add(student_id)
+            else:
+                steps.discard(step_id)
+                self._students_by_step[step_id].discard(student_id)
+                if not steps:
+                    self._steps_by_student.pop(student_id, None)
+                if not self._students_by_step[step_id]:
+                    del self._students_by_step[step_id]
+
+            for other in affected:
+                self._neighbourhoods.pop(other, None)
+
+    def _similarities(self, student_id: str) -> Dict[str, float]:
+        steps = self._steps_by_student.get(student_id)
+        if not steps:
+            return {}
+
+        overlap: Counter = Counter()
+        for step in steps:
+            overlap.update(self._students_by_step[step])
+        overlap.pop(student_id, None)
+
+        size = len(steps)
+        return {
+            other: shared / (size + len(self._steps_by_student[other]) - shared)
+            for other, shared in overlap.items()
+        }
+
+
+class CompletionMatrixStore(TenantStore):
+    """
+    Per-process holder of each tenant's CompletionMatrix.
+    """
+
+    generation_key = GENERATION_KEY
+    name = "Completion matrix"
+    check_interval = CHECK_INTERVAL
+    max_age = MAX_AGE
+
+    def load(self, tenant: str) -> CompletionMatrix:
+        matrix = CompletionMatrix.load(tenant)
+        logger.info(
+            f"Loaded completion matrix for {tenant}: "
+            f"{matrix.student_count} students"
+        )
+        return matrix
+
+    def record_progress(
+        self, tenant: str, student_id: str, step_id: int, completed: bool
+    ) -> None:
+        """Apply a progress change locally and tell other processes"""
+        self.apply(
+            tenant, lambda matrix: matrix.set_completed(student_id, step_id, completed)
+        )
+
+
+# Shared by all recommendation requests in this process
+completion_matrices = CompletionMatrixStore()
@@ -0,0 +1,45 @@
+"""
+Signal handlers for adaptive pathway models.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import StudentProgress
+from .recommender import completion_matrices
+
+
+@receiver(post_init, sender=StudentProgress)
+def remember_completion(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred field is not fetched
+    instance._was_completed = instance.__dict__.get("is_completed")
+
+
+@receiver(post_save, sender=StudentProgress)
+def student_progress_saved(sender, instance, created, **kwargs):
+    """Only completion changes affect the recommender"""
+    was_completed = False if created else getattr(instance, "_was_completed", None)
+    instance._was_completed = instance.is_completed
+    if instance.is_completed != was_completed:
+        _on_commit_update(instance)
+
+
+@receiver(post_delete, sender=StudentProgress)
+def student_progress_deleted(sender, instance, **kwargs):
+    if instance.is_completed:
+        _on_commit_update(instance)
+
+
+def _on_commit_update(instance):
+    """Update the tenant's completion matrix once the change is committed"""
+    tenant, student_id, step_id = instance.tenant, instance.student_id, instance.step_id
+
+    def apply():
+        # Another record may still mark the same step completed
+        completed = StudentProgress.objects.filter(
+            tenant=tenant, student_id=student_id, step_id=step_id, is_completed=True
+        ).exists()
+        completion_matrices.record_progress(tenant, student_id, step_id, completed)
+
+    transaction.on_commit(apply)
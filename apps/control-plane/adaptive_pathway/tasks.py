@@ -0,0 +1,37 @@
+from celery import shared_task
+import logging
+
+from .item_similarity import build_item_model
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def build_pathway_recommenders():
+    """
+    Queue a recommender rebuild for every tenant with pathways.
+
+    Scheduled nightly via Celery Beat.
+    """
+    from .models import LearningPathway
+
+    tenants = list(
+        LearningPathway.objects.order_by().values_list("tenant", flat=True).distinct()
+    )
+    for tenant in tenants:
+        build_pathway_recommender.delay(tenant)
+
+    logger.info(f"Queued pathway recommender builds for {len(tenants)} tenants")
+    return len(tenants)
+
+
+@shared_task(bind=True, max_retries=2)
+def build_pathway_recommender(self, tenant):
+    """Train and store a new item-item model for one tenant"""
+    try:
+        model = build_item_model(tenant)
+    except Exception as e:
+        logger.error(f"Pathway recommender build failed for {tenant}: {e}")
+        raise self.retry(exc=e, countdown=300)
+
+    return {"tenant": tenant, "version": model.version, "items": model.item_count}
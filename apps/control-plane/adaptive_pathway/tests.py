@@ -1,4 +1,102 @@
 # Adaptive Learning Pathway Tests
-from django.test import TestCase
+import json
+import math
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .item_similarity import ItemSimilarityModel, train_item_model
+from .recommender import CompletionMatrix
+
+
+class CompletionMatrixTests(SimpleTestCase):
+    """Test set-based collaborative filtering"""
+
+    def setUp(self):
+        self.matrix = CompletionMatrix(
+            [
+                ("alice", 1),
+                ("alice", 2),
+                ("alice", 3),
+                ("bob", 1),
+                ("bob", 2),
+                ("bob", 3),
+                ("bob", 4),
+                ("carol", 1),
+                ("carol", 9),
+                ("dave", 7),
+            ]
+        )
+
+    def test_jaccard_similarities(self):
+        similarities = self.matrix.similarities("alice")
+
+        self.assertAlmostEqual(similarities["bob"], 3 / 4)
+        self.assertAlmostEqual(similarities["carol"], 1 / 4)
+        self.assertNotIn("dave", similarities)
+        self.assertNotIn("alice", similarities)
+
+    def test_neighbours_apply_threshold(self):
+        self.assertEqual(self.matrix.neighbours("alice"), [("bob", 0.75)])
+        self.assertEqual(self.matrix.neighbours("unknown"), [])
+
+    def test_completion_updates_cached_neighbourhoods(self):
+        self.assertEqual(self.matrix.neighbours("carol"), [])
+
+        self.matrix.set_completed("carol", 2, True)
+        self.matrix.set_completed("carol", 9, False)
+
+        self.assertEqual(
+            [other for other, _ in self.matrix.neighbours("carol")], ["alice", "bob"]
+        )
+        self.assertIn("carol", dict(self.matrix.neighbours("alice")))
+
+    def test_uncompleting_last_step_removes_student(self):
+        self.matrix.set_completed("dave", 7, False)
+
+        self.assertEqual(self.matrix.steps("dave"), set())
+        self.assertEqual(self.matrix.student_count, 3)
+
+
+class ItemSimilarityModelTests(SimpleTestCase):
+    """Test the offline item-item recommender"""
+
+    def setUp(self):
+        items = {
+            1: {"status": "completed", "difficulty_level": "beginner"},
+            2: {"status": "completed", "difficulty_level": "beginner"},
+            3: {"status": "completed", "difficulty_level": "beginner"},
+            4: {"status": "active", "difficulty_level": "beginner"},
+            5: {"status": "completed", "difficulty_level": "advanced"},
+        }
+        interactions = [
+            ("alice", 1),
+            ("alice", 2),
+            ("bob", 1),
+            ("bob", 2),
+            ("carol", 1),
+            ("carol", 3),
+            ("carol", 4),
+            ("carol", 5),
+            ("dave", 2),
+        ]
+        data = train_item_model(interactions, items)
+        # Round-trip through JSON as stored in PathwayRecommenderModel.data
+        self.model = ItemSimilarityModel(1, json.loads(json.dumps(data)))
+
+    def test_cosine_neighbours(self):
+        neighbours = dict(self.model.neighbours[1])
+
+        # 1 and 2 share alice and bob: 2 / sqrt(3 * 3)
+        self.assertAlmostEqual(neighbours[2], round(2 / 3, 4))
+        self.assertAlmostEqual(neighbours[3], round(1 / math.sqrt(3), 4))
+
+    def test_recommend_excludes_history_and_filters_eligibility(self):
+        ranked = self.model.recommend([1], difficulty_level="beginner")
+
+        self.assertEqual([item for item, _ in ranked], [2, 3])
+
+    def test_popular_fallback_without_history(self):
+        ranked = self.model.recommend([], difficulty_level="beginner")
+
+        self.assertEqual(ranked[0], (1, 0.0))
+        self.assertNotIn(4, [item for item, _ in ranked])
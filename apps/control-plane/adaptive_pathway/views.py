@@ -20,6 +20,8 @@ from .serializers import (
     ContentEmbeddingSerializer,
     RecommendationRequestSerializer,
 )
+from .item_similarity import item_models, student_history
+from .recommender import completion_matrices
 
 
 class LearningPathwayViewSet(viewsets.ModelViewSet):
@@ -62,18 +64,30 @@ class LearningPathwayViewSet(viewsets.ModelViewSet):
         learning_style = data.get("learning_style", "visual")
         time_commitment = data.get("time_commitment_hours", 10.0)
 
-        # Step 1: Find similar students using collaborative filtering
-        similar_students = self._find_similar_students(student_id, tenant_slug)
-
-        # Step 2: Get pathways completed by similar students
-        candidate_pathways = self._get_candidate_pathways(
-            similar_students, tenant_slug, skill_level
-        )
+        item_model = item_models.get(tenant_slug)
+        if item_model is not None:
+            # Steps 1-3: Candidates and scores from the precomputed
+            # item-item model, which needs no neighbour search
+            similar_students = []
+            ranked = item_model.recommend(
+                student_history(tenant_slug, student_id),
+                difficulty_level=skill_level,
+            )
+            candidate_pathways = [pathway_id for pathway_id, _ in ranked]
+            cf_scores = dict(ranked)
+        else:
+            # Step 1: Find similar students using collaborative filtering
+            similar_students = self._find_similar_students(student_id, tenant_slug)
+
+            # Step 2: Get pathways completed by similar students
+            candidate_pathways = self._get_candidate_pathways(
+                similar_students, tenant_slug, skill_level
+            )
 
-        # Step 3: Calculate collaborative filtering scores
-        cf_scores = self._calculate_collaborative_scores(
-            student_id, candidate_pathways, similar_students
-        )
+            # Step 3: Calculate collaborative filtering scores
+            cf_scores = self._calculate_collaborative_scores(
+                student_id, candidate_pathways, similar_students
+            )
 
         # Step 4: Calculate content-based scores using embeddings
         embedding_scores = self._calculate_embedding_scores(
@@ -106,9 +120,15 @@ class LearningPathwayViewSet(viewsets.ModelViewSet):
         top_recommendations = final_recommendations[:5]
 
         # Step 6: Create recommendation records
+        pathways = LearningPathway.objects.in_bulk(
+            [rec["pathway_id"] for rec in top_recommendations]
+        )
         recommendations = []
         for rec in top_recommendations:
-            pathway = LearningPathway.objects.get(id=rec["pathway_id"])
+            pathway = pathways.get(rec["pathway_id"])
+            if pathway is None:
+                # Deleted since the model was built
+                continue
 
             # Generate recommendation reasons
             reasons = self._generate_recommendation_reasons(
@@ -140,66 +160,28 @@ class LearningPathwayViewSet(viewsets.ModelViewSet):
                 "algorithm": "Hybrid (Collaborative Filtering + Embeddings)",
                 "similar_students_found": len(similar_students),
                 "total_candidates_evaluated": len(candidate_pathways),
+                "model_version": item_model.version if item_model else None,
             }
         )
 
     def _find_similar_students(self, student_id, tenant_slug):
         """
         Find students with similar learning patterns using collaborative filtering.
-        Similarity based on: completed pathways, progress patterns, engagement.
+        Similarity is the Jaccard index of completed steps, computed against
+        the tenant's cached completion matrix.
         """
-        # Get current student's progress
-        student_progress = StudentProgress.objects.filter(
-            student_id=student_id, tenant=tenant_slug, is_completed=True
-        ).values_list("step_id", flat=True)
-
-        if not student_progress:
-            return []
-
-        student_steps = set(student_progress)
-
-        # Find other students who completed similar steps
-        other_students = (
-            StudentProgress.objects.filter(tenant=tenant_slug, is_completed=True)
-            .exclude(student_id=student_id)
-            .values("student_id")
-            .annotate(completed_count=Count("id"))
-        )
-
-        # Calculate Jaccard similarity for each student
-        similarities = []
-        for other_student in other_students:
-            other_id = other_student["student_id"]
-            other_steps = set(
-                StudentProgress.objects.filter(
-                    student_id=other_id, tenant=tenant_slug, is_completed=True
-                ).values_list("step_id", flat=True)
-            )
-
-            # Jaccard similarity: intersection / union
-            intersection = len(student_steps & other_steps)
-            union = len(student_steps | other_steps)
-
-            if union > 0:
-                similarity = intersection / union
-                if similarity > 0.3:  # Threshold for similarity
-                    similarities.append(
-                        {"student_id": other_id, "similarity": similarity}
-                    )
-
-        # Sort by similarity
-        similarities.sort(key=lambda x: x["similarity"], reverse=True)
-
-        # Return top 20 similar students
-        return [s["student_id"] for s in similarities[:20]]
+        neighbours = completion_matrices.get(tenant_slug).neighbours(student_id)
+        return [other_id for other_id, _ in neighbours]
 
     def _get_candidate_pathways(self, similar_students, tenant_slug, skill_level):
         """Get pathways completed by similar students"""
         if not similar_students:
             # Fallback: popular pathways for skill level
-            return LearningPathway.objects.filter(
-                tenant=tenant_slug, difficulty_level=skill_level, status="completed"
-            ).values_list("id", flat=True)[:20]
+            return list(
+                LearningPathway.objects.filter(
+                    tenant=tenant_slug, difficulty_level=skill_level, status="completed"
+                ).values_list("id", flat=True)[:20]
+            )
 
         # Get pathways from similar students
         pathways = (
@@ -222,31 +204,30 @@ class LearningPathwayViewSet(viewsets.ModelViewSet):
         Calculate collaborative filtering scores.
         Score based on: popularity among similar students, completion rates, ratings.
         """
-        scores = {}
-
-        for pathway_id in candidate_pathways:
-            # Count how many similar students completed this pathway
-            completions = LearningPathway.objects.filter(
-                id=pathway_id, student_id__in=similar_students, status="completed"
-            ).count()
+        if not similar_students:
+            return {pathway_id: 0 for pathway_id in candidate_pathways}
 
-            # Get average completion percentage
-            avg_completion = (
-                LearningPathway.objects.filter(
-                    id=pathway_id, student_id__in=similar_students
-                ).aggregate(avg=Avg("completion_percentage"))["avg"]
-                or 0
+        # One grouped query for every candidate
+        stats = {
+            row["id"]: row
+            for row in LearningPathway.objects.filter(
+                id__in=list(candidate_pathways), student_id__in=similar_students
             )
+            .values("id")
+            .annotate(
+                completions=Count("id", filter=Q(status="completed")),
+                avg_completion=Avg("completion_percentage"),
+            )
+        }
 
-            # Calculate score (normalize by number of similar students)
-            if similar_students:
-                popularity_score = completions / len(similar_students)
-                completion_score = avg_completion / 100
+        scores = {}
+        for pathway_id in candidate_pathways:
+            row = stats.get(pathway_id, {})
+            popularity_score = row.get("completions", 0) / len(similar_students)
+            completion_score = (row.get("avg_completion") or 0) / 100
 
-                # Combined CF score
-                scores[pathway_id] = (0.7 * popularity_score) + (0.3 * completion_score)
-            else:
-                scores[pathway_id] = 0
+            # Combined CF score
+            scores[pathway_id] = (0.7 * popularity_score) + (0.3 * completion_score)
 
         return scores
 
@@ -255,44 +236,38 @@ class LearningPathwayViewSet(viewsets.ModelViewSet):
         Calculate content-based scores using embeddings.
         Cosine similarity between user interests and pathway content.
         """
-        scores = {}
-
         if not interests:
             # No interests provided, return neutral scores
             return {pid: 0.5 for pid in candidate_pathways}
 
-        # For each pathway, calculate similarity with interests
-        for pathway_id in candidate_pathways:
-            pathway = LearningPathway.objects.get(id=pathway_id)
+        # Step tags for every candidate pathway's embedded steps, in one query
+        step_tags_by_pathway = {}
+        for pathway_id, tags in ContentEmbedding.objects.filter(
+            step__pathway_id__in=list(candidate_pathways)
+        ).values_list("step__pathway_id", "step__tags"):
+            step_tags_by_pathway.setdefault(pathway_id, []).append(set(tags or []))
 
-            # Get embeddings for pathway steps
-            step_embeddings = ContentEmbedding.objects.filter(step__pathway=pathway)
+        interest_tags = set(interests)
+        scores = {}
+
+        for pathway_id in candidate_pathways:
+            step_tag_sets = step_tags_by_pathway.get(pathway_id)
 
-            if not step_embeddings:
+            if not step_tag_sets:
                 scores[pathway_id] = 0.5
                 continue
 
-            # Calculate average embedding similarity
+            # Average tag overlap over steps that share an interest
             # In production, you'd use actual sentence embeddings
-            # This is a simplified simulation
-            total_similarity = 0
-            count = 0
-
-            for embedding in step_embeddings:
-                # Check if step tags match interests
-                step_tags = set(embedding.step.tags)
-                interest_tags = set(interests)
-
-                if step_tags & interest_tags:  # Intersection
-                    # Simulate cosine similarity
-                    overlap = len(step_tags & interest_tags)
-                    total = len(step_tags | interest_tags)
-                    similarity = overlap / total if total > 0 else 0
-                    total_similarity += similarity
-                    count += 1
-
-            # Average similarity
-            scores[pathway_id] = total_similarity / count if count > 0 else 0.3
+            similarities = [
+                len(step_tags & interest_tags) / len(step_tags | interest_tags)
+                for step_tags in step_tag_sets
+                if step_tags & interest_tags
+            ]
+
+            scores[pathway_id] = (
+                sum(similarities) / len(similarities) if similarities else 0.3
+            )
 
         return scores
 
@@ -304,9 +279,12 @@ class LearningPathwayViewSet(viewsets.ModelViewSet):
 
         # Collaborative filtering reasons
         if recommendation["collaborative_score"] > 0.5:
-            reasons.append(
-                f"Recommended by {len(similar_students)} students with similar learning patterns"
-            )
+            if similar_students:
+                reasons.append(
+                    f"Recommended by {len(similar_students)} students with similar learning patterns"
+                )
+            else:
+                reasons.append("Often taken by students with your pathway history")
 
         # Content similarity reasons
         if recommendation["embedding_score"] > 0.4:
@@ -5,3 +5,6 @@ class AssessmentBuilderConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "assessment_builder"
     verbose_name = "Assessment Builder"
+
+    def ready(self):
+        from . import rollups  # noqa: F401
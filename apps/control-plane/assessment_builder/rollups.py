@@ -0,0 +1,78 @@
+"""
+Dashboard rollup for the assessment builder.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from dashboards.rollups import register
+
+from .models import Assessment, AssessmentTask
+
+
+@register(
+    "assessment_builder",
+    sources={
+        Assessment: lambda assessment: assessment.tenant_id,
+        AssessmentTask: lambda task: task.assessment.tenant_id,
+    },
+)
+def compute_dashboard(tenant):
+    """Dashboard statistics for a tenant (keyed by Tenant pk)"""
+    thirty_days_ago = timezone.now() - timedelta(days=30)
+
+    assessments = Assessment.objects.filter(tenant_id=tenant)
+    counts = assessments.aggregate(
+        total=Count("id"),
+        ai_generated=Count("id", filter=Q(ai_generated=True)),
+        recent=Count("id", filter=Q(created_at__gte=thirty_days_ago)),
+        avg_compliance=Avg("compliance_score"),
+    )
+
+    # Average Bloom's distribution across assessments that have one
+    all_blooms = {}
+    with_blooms = 0
+    for distribution in assessments.values_list(
+        "blooms_distribution", flat=True
+    ).iterator():
+        if distribution:
+            with_blooms += 1
+            for level, percentage in distribution.items():
+                all_blooms[level] = all_blooms.get(level, 0) + percentage
+
+    blooms_distribution = {
+        level: round(count / with_blooms, 1) for level, count in all_blooms.items()
+    }
+
+    stats = {
+        "total_assessments": counts["total"],
+        "by_status": dict(
+            assessments.values("status")
+            .annotate(count=Count("id"))
+            .values_list("status", "count")
+        ),
+        "by_type": dict(
+            assessments.values("assessment_type")
+            .annotate(count=Count("id"))
+            .values_list("assessment_type", "count")
+        ),
+        "ai_generated_count": counts["ai_generated"],
+        "ai_generation_rate": 0.0,
+        "avg_compliance_score": counts["avg_compliance"] or 0,
+        "avg_tasks_per_assessment": 0.0,
+        "blooms_distribution": blooms_distribution,
+        "recent_assessments": counts["recent"],
+    }
+
+    if counts["total"] > 0:
+        stats["ai_generation_rate"] = round(
+            (counts["ai_generated"] / counts["total"]) * 100, 1
+        )
+        total_tasks = AssessmentTask.objects.filter(
+            assessment__tenant_id=tenant
+        ).count()
+        stats["avg_tasks_per_assessment"] = round(total_tasks / counts["total"], 1)
+
+    return stats
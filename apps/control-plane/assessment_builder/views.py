@@ -1,12 +1,14 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Count, Avg, Q
+from django.db.models import Q
 from django.utils import timezone
-from datetime import timedelta
 import re
 import time
 
+from dashboards.rollups import dashboard_response, get_rollup
+from tenants.resolver import request_tenant
+
 from .models import (
     Assessment,
     AssessmentTask,
@@ -378,67 +380,10 @@ and practical tasks that align with workplace requirements.
         """
         Get dashboard statistics
         """
-        tenant = request.tenant
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-
-        assessments = Assessment.objects.filter(tenant=tenant)
-        recent = assessments.filter(created_at__gte=thirty_days_ago)
-
-        # Calculate Bloom's distribution across all assessments
-        all_blooms = {}
-        for assessment in assessments:
-            if assessment.blooms_distribution:
-                for level, percentage in assessment.blooms_distribution.items():
-                    all_blooms[level] = all_blooms.get(level, 0) + percentage
-
-        # Average out the distribution
-        total_assessments_with_blooms = sum(
-            1 for a in assessments if a.blooms_distribution
-        )
-        if total_assessments_with_blooms > 0:
-            blooms_distribution = {
-                level: round(count / total_assessments_with_blooms, 1)
-                for level, count in all_blooms.items()
-            }
-        else:
-            blooms_distribution = {}
-
-        stats = {
-            "total_assessments": assessments.count(),
-            "by_status": dict(
-                assessments.values("status")
-                .annotate(count=Count("id"))
-                .values_list("status", "count")
-            ),
-            "by_type": dict(
-                assessments.values("assessment_type")
-                .annotate(count=Count("id"))
-                .values_list("assessment_type", "count")
-            ),
-            "ai_generated_count": assessments.filter(ai_generated=True).count(),
-            "ai_generation_rate": 0.0,
-            "avg_compliance_score": assessments.aggregate(avg=Avg("compliance_score"))[
-                "avg"
-            ]
-            or 0,
-            "avg_tasks_per_assessment": 0.0,
-            "blooms_distribution": blooms_distribution,
-            "recent_assessments": recent.count(),
-        }
+        rollup = get_rollup("assessment_builder", request_tenant(request))
 
-        if stats["total_assessments"] > 0:
-            stats["ai_generation_rate"] = round(
-                (stats["ai_generated_count"] / stats["total_assessments"]) * 100, 1
-            )
-
-            # Calculate average tasks
-            total_tasks = sum(a.get_task_count() for a in assessments)
-            stats["avg_tasks_per_assessment"] = round(
-                total_tasks / stats["total_assessments"], 1
-            )
-
-        serializer = DashboardStatsSerializer(stats)
-        return Response(serializer.data)
+        serializer = DashboardStatsSerializer(rollup.data)
+        return dashboard_response(serializer.data, rollup)
 
 
 class AssessmentTaskViewSet(viewsets.ModelViewSet):
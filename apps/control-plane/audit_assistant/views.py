@@ -21,6 +21,7 @@ from .serializers import (
 )
 from policy_comparator.models import ASQAClause, ASQAStandard
 from tenants.models import Tenant
+from tenants.resolver import request_tenant
 
 from .services import auto_tag_clauses, detect_ner_entities, extract_text_from_file
 from .tasks import process_evidence_document
@@ -41,7 +42,7 @@ class TenantScopedViewSetMixin:
         )
 
         if tenant_slug:
-            tenant = get_object_or_404(Tenant, slug=tenant_slug)
+            tenant = request_tenant(self.request, tenant_slug)
         elif tenant_id:
             tenant = get_object_or_404(Tenant, id=tenant_id)
         else:
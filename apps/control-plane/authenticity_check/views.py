@@ -7,6 +7,8 @@ import random
 import hashlib
 from datetime import datetime, timedelta
 
+from embeddings.service import cosine_similarity, get_embedding_service
+
 from .models import (
     AuthenticityCheck,
     SubmissionAnalysis,
@@ -55,8 +57,8 @@ class AuthenticityCheckViewSet(viewsets.ModelViewSet):
         # Generate content hash
         content_hash = hashlib.sha256(submission_content.encode("utf-8")).hexdigest()
 
-        # Generate embedding (mock 384-dimensional vector)
-        content_embedding = [random.uniform(-1, 1) for _ in range(384)]
+        # Generate embedding via the shared embedding service
+        content_embedding = get_embedding_service().embed(submission_content)
 
         # Create submission analysis
         analysis = SubmissionAnalysis.objects.create(
@@ -126,9 +128,16 @@ class AuthenticityCheckViewSet(viewsets.ModelViewSet):
         highest_score = 0.0
 
         for other_analysis in other_analyses:
-            # Calculate similarity (mock implementation using random score)
-            # In real implementation, use cosine similarity on embeddings
-            similarity_score = random.uniform(0.1, 0.95)
+            similarity_score = round(
+                max(
+                    0.0,
+                    cosine_similarity(
+                        current_analysis.content_embedding,
+                        other_analysis.content_embedding,
+                    ),
+                ),
+                4,
+            )
 
             if similarity_score >= authenticity_check.plagiarism_threshold:
                 # Create plagiarism match
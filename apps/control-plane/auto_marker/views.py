@@ -6,6 +6,8 @@ from django.db.models import Q, Avg, Count
 import time
 import re
 
+from embeddings.service import cosine_similarity, get_embedding_service
+
 from .models import (
     AutoMarker,
     MarkedResponse,
@@ -87,6 +89,13 @@ class AutoMarkerViewSet(viewsets.ModelViewSet):
         start_time = time.time()
         marked_responses = []
 
+        if auto_mark:
+            # Embed the whole batch in one pass; marking then hits the cache
+            get_embedding_service().embed_many(
+                [auto_marker.model_answer]
+                + [r["response_text"] for r in responses_data]
+            )
+
         for response_data in responses_data:
             # Create response object
             response = MarkedResponse.objects.create(
@@ -204,8 +213,7 @@ class AutoMarkerViewSet(viewsets.ModelViewSet):
         """
         start_time = time.time()
 
-        # Mock semantic similarity calculation
-        # In production: Use sentence transformers, BERT, etc.
+        # Semantic similarity against the model answer
         similarity_score = self._calculate_semantic_similarity(
             response.response_text, auto_marker.model_answer
         )
@@ -273,36 +281,13 @@ class AutoMarkerViewSet(viewsets.ModelViewSet):
 
     def _calculate_semantic_similarity(self, text1, text2):
         """
-        Mock semantic similarity calculation
-        In production: Use sentence-transformers, OpenAI embeddings, etc.
+        Cosine similarity of the two texts' embeddings, clamped to [0, 1]
         """
-        # Simple mock: based on word overlap and length ratio
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-
-        if not words1 or not words2:
+        if not text1.strip() or not text2.strip():
             return 0.0
 
-        # Jaccard similarity
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        jaccard = len(intersection) / len(union) if union else 0
-
-        # Length ratio
-        len_ratio = (
-            min(len(text1), len(text2)) / max(len(text1), len(text2))
-            if max(len(text1), len(text2)) > 0
-            else 0
-        )
-
-        # Combined score (weighted)
-        similarity = (jaccard * 0.7) + (len_ratio * 0.3)
-
-        # Add some variance
-        import random
-
-        variance = random.uniform(-0.05, 0.15)
-        similarity = max(0.0, min(1.0, similarity + variance))
+        embedding1, embedding2 = get_embedding_service().embed_many([text1, text2])
+        similarity = max(0.0, min(1.0, cosine_similarity(embedding1, embedding2)))
 
         return round(similarity, 3)
 
@@ -5,3 +5,6 @@ class CompetencyGapConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "competency_gap"
     verbose_name = "Competency Gap Finder"
+
+    def ready(self):
+        from . import rollups, signals  # noqa: F401
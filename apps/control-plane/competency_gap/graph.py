@@ -0,0 +1,495 @@
+"""
+In-memory trainer / qualification / unit graph for a tenant.
+
+The graph is built from four bulk queries (qualifications held, units,
+assignments and qualification mappings) and stored as directed adjacency
+arrays in CSR form: the out-edges of node i are
+indices[indptr[i]:indptr[i + 1]], with parallel arrays for edge kind,
+weight and whether the edge is active. A second CSR holds the reversed
+edges so "who can deliver this unit" queries do not scan the whole graph.
+
+Edges point the way delivery capability flows:
+
+* trainer -> qualification  (holds; inactive if unverified or expired)
+* qualification -> qualification  (equivalent, both ways, from mappings)
+* qualification -> unit  (qualifies via required_qualifications, covers via
+  units_covered on qualifications and mappings)
+* unit -> unit  (prerequisite, related)
+* trainer -> unit  (assigned)
+
+Graphs are cached per tenant and rebuilt when a qualification, unit,
+assignment or mapping changes. Other processes notice via a per-tenant
+generation counter in the shared cache.
+"""
+
+import logging
+import time
+from array import array
+from collections import defaultdict, deque
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+from control_plane.tenant_store import TenantStore
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of a tenant's shared generation counter
+CHECK_INTERVAL = getattr(settings, "COMPETENCY_GRAPH_CHECK_INTERVAL", 30)
+
+# Rebuild a tenant at least this often, to pick up bulk writes that bypass
+# model signals (and qualifications expiring)
+MAX_AGE = getattr(settings, "COMPETENCY_GRAPH_MAX_AGE", 900)
+
+GENERATION_KEY = "competency_gap:graph:{tenant}"
+
+# Node kinds
+TRAINER = 0
+QUALIFICATION = 1
+UNIT = 2
+
+NODE_TYPES = {TRAINER: "trainer", QUALIFICATION: "qualification", UNIT: "unit"}
+NODE_PREFIXES = {TRAINER: "trainer", QUALIFICATION: "qual", UNIT: "unit"}
+
+# Edge kinds
+HOLDS = 0
+EQUIVALENT = 1
+QUALIFIES = 2
+COVERS = 3
+PREREQUISITE = 4
+RELATED = 5
+ASSIGNED = 6
+
+EDGE_TYPES = {
+    HOLDS: "holds",
+    EQUIVALENT: "equivalent",
+    QUALIFIES: "qualifies",
+    COVERS: "covers",
+    PREREQUISITE: "prerequisite",
+    RELATED: "related",
+    ASSIGNED: "can_deliver",
+}
+
+# Edges followed when asking whether a trainer is qualified for a unit
+QUALIFYING_KINDS = frozenset({HOLDS, EQUIVALENT, QUALIFIES, COVERS})
+
+ALL_KINDS = frozenset(EDGE_TYPES)
+
+
+class CompetencyGraph:
+    """
+    Directed trainer / qualification / unit graph in CSR form.
+    """
+
+    def __init__(
+        self,
+        qualifications: Iterable[Dict[str, Any]] = (),
+        units: Iterable[Dict[str, Any]] = (),
+        assignments: Iterable[Dict[str, Any]] = (),
+        mappings: Iterable[Dict[str, Any]] = (),
+        today: Optional[date] = None,
+    ):
+        """
+        Build the graph from plain rows, as returned by values():
+
+        * qualifications: trainer_id, trainer_name, qualification_code,
+          qualification_name, verification_status, expiry_date, units_covered
+        * units: id, unit_code, unit_name, unit_type, required_qualifications,
+          prerequisite_units, related_units
+        * assignments: trainer_id, trainer_name, unit_id, compliance_score,
+          meets_requirements
+        * mappings: source_qualification_code, source_qualification_name,
+          equivalent_qualifications, units_covered, match_strength
+        """
+        today = today or date.today()
+        self.built_at = time.time()
+
+        self.kinds = array("b")
+        self.keys: List[str] = []
+        self.names: List[str] = []
+        self.unit_ids: Dict[int, Any] = {}
+        self._index: Dict[Tuple[int, str], int] = {}
+
+        edges: Dict[Tuple[int, int, int], Tuple[float, bool]] = {}
+
+        def add_edge(source, target, kind, weight=1.0, active=True):
+            key = (source, target, kind)
+            previous = edges.get(key)
+            # Keep the strongest active edge when several rows imply the same one
+            if previous is None or (active, weight) > (previous[1], previous[0]):
+                edges[key] = (weight, active)
+
+        # Units first so unit codes referenced by other rows resolve to them
+        for unit in units:
+            index = self._node(UNIT, unit["unit_code"], unit.get("unit_name", ""))
+            self.unit_ids[index] = unit.get("id")
+            for code in unit.get("required_qualifications") or []:
+                add_edge(self._node(QUALIFICATION, code), index, QUALIFIES)
+            for code in unit.get("prerequisite_units") or []:
+                add_edge(index, self._node(UNIT, code), PREREQUISITE, 0.5)
+            for code in unit.get("related_units") or []:
+                add_edge(index, self._node(UNIT, code), RELATED, 0.5)
+                add_edge(self._node(UNIT, code), index, RELATED, 0.5)
+
+        for qual in qualifications:
+            trainer = self._node(
+                TRAINER, qual["trainer_id"], qual.get("trainer_name", "")
+            )
+            node = self._node(
+                QUALIFICATION,
+                qual["qualification_code"],
+                qual.get("qualification_name", ""),
+            )
+            expiry = qual.get("expiry_date")
+            active = qual.get("verification_status") == "verified" and (
+                expiry is None or expiry >= today
+            )
+            add_edge(trainer, node, HOLDS, 1.0 if active else 0.0, active)
+            for code in qual.get("units_covered") or []:
+                add_edge(node, self._node(UNIT, code), COVERS)
+
+        for mapping in mappings:
+            node = self._node(
+                QUALIFICATION,
+                mapping["source_qualification_code"],
+                mapping.get("source_qualification_name", ""),
+            )
+            strength = float(mapping.get("match_strength") or 0.0)
+            for code in mapping.get("equivalent_qualifications") or []:
+                other = self._node(QUALIFICATION, code)
+                if other != node:
+                    add_edge(node, other, EQUIVALENT, strength)
+                    add_edge(other, node, EQUIVALENT, strength)
+            for code in mapping.get("units_covered") or []:
+                add_edge(node, self._node(UNIT, code), COVERS, strength)
+
+        self.assignment_count = 0
+        self.compliant_assignments: Dict[int, Set[int]] = defaultdict(set)
+        compliance_total = 0.0
+        unit_nodes = {unit_id: index for index, unit_id in self.unit_ids.items()}
+
+        for assignment in assignments:
+            unit = unit_nodes.get(assignment["unit_id"])
+            if unit is None:
+                continue
+            trainer = self._node(
+                TRAINER, assignment["trainer_id"], assignment.get("trainer_name", "")
+            )
+            score = float(assignment.get("compliance_score") or 0.0)
+            compliant = bool(assignment.get("meets_requirements"))
+            add_edge(trainer, unit, ASSIGNED, score / 100, compliant)
+            self.assignment_count += 1
+            compliance_total += score
+            if compliant:
+                self.compliant_assignments[unit].add(trainer)
+
+        self.average_compliance = (
+            compliance_total / self.assignment_count if self.assignment_count else 0.0
+        )
+
+        self.indptr, self.indices, self.edge_kinds, self.weights, self.active = _to_csr(
+            len(self.kinds), edges
+        )
+        reversed_edges = {
+            (target, source, kind): value
+            for (source, target, kind), value in edges.items()
+        }
+        self.rev_indptr, self.rev_indices, self.rev_kinds, _, self.rev_active = _to_csr(
+            len(self.kinds), reversed_edges
+        )
+
+    @classmethod
+    def load(cls, tenant: str) -> "CompetencyGraph":
+        """Build a tenant's graph with one query per table"""
+        from .models import (
+            QualificationMapping,
+            TrainerAssignment,
+            TrainerQualification,
+            UnitOfCompetency,
+        )
+
+        qualifications = TrainerQualification.objects.filter(tenant=tenant).values(
+            "trainer_id",
+            "trainer_name",
+            "qualification_code",
+            "qualification_name",
+            "verification_status",
+            "expiry_date",
+            "units_covered",
+        )
+        units = UnitOfCompetency.objects.filter(tenant=tenant).values(
+            "id",
+            "unit_code",
+            "unit_name",
+            "required_qualifications",
+            "prerequisite_units",
+            "related_units",
+        )
+        assignments = TrainerAssignment.objects.filter(tenant=tenant).values(
+            "trainer_id",
+            "trainer_name",
+            "unit_id",
+            "compliance_score",
+            "meets_requirements",
+        )
+        mappings = QualificationMapping.objects.filter(tenant=tenant).values(
+            "source_qualification_code",
+            "source_qualification_name",
+            "equivalent_qualifications",
+            "units_covered",
+            "match_strength",
+        )
+
+        return cls(
+            qualifications.iterator(chunk_size=5000),
+            units.iterator(chunk_size=5000),
+            assignments.iterator(chunk_size=5000),
+            mappings.iterator(chunk_size=5000),
+        )
+
+    @property
+    def node_count(self) -> int:
+        return len(self.kinds)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def find(self, kind: int, key: str) -> Optional[int]:
+        return self._index.get((kind, key))
+
+    def nodes_of(self, kind: int) -> List[int]:
+        return [index for index, k in enumerate(self.kinds) if k == kind]
+
+    def out_edges(self, node: int):
+        """(target, kind, weight, active) for each edge leaving node"""
+        for e in range(self.indptr[node], self.indptr[node + 1]):
+            yield self.indices[e], self.edge_kinds[e], self.weights[e], self.active[e]
+
+    def shortest_paths(
+        self,
+        source: int,
+        kinds: Iterable[int] = ALL_KINDS,
+        max_depth: Optional[int] = None,
+        active_only: bool = True,
+    ) -> Dict[int, Tuple[int, float]]:
+        """
+        Breadth-first search from source along edges of the given kinds.
+
+        Returns {node: (parent, edge weight)} for every node reached; the
+        source maps to (-1, 1.0). Use path_to() to read paths out.
+        """
+        allowed = set(kinds)
+        parents: Dict[int, Tuple[int, float]] = {source: (-1, 1.0)}
+        frontier = [source]
+        depth = 0
+
+        while frontier and (max_depth is None or depth < max_depth):
+            next_frontier = []
+            for node in frontier:
+                for e in range(self.indptr[node], self.indptr[node + 1]):
+                    target = self.indices[e]
+                    if target in parents or self.edge_kinds[e] not in allowed:
+                        continue
+                    if active_only and not self.active[e]:
+                        continue
+                    parents[target] = (node, self.weights[e])
+                    next_frontier.append(target)
+            frontier = next_frontier
+            depth += 1
+
+        return parents
+
+    @staticmethod
+    def path_to(
+        parents: Dict[int, Tuple[int, float]], target: int
+    ) -> Optional[Tuple[List[int], float]]:
+        """Node path and strength (product of edge weights) to target"""
+        if target not in parents:
+            return None
+        path, strength = [], 1.0
+        node = target
+        while node != -1:
+            path.append(node)
+            node, weight = parents[node]
+            strength *= weight
+        path.reverse()
+        return path, strength
+
+    def shortest_path(
+        self,
+        source: int,
+        target: int,
+        kinds: Iterable[int] = ALL_KINDS,
+        max_depth: Optional[int] = None,
+    ) -> Optional[Tuple[List[int], float]]:
+        """Shortest active path from source to target, or None"""
+        return self.path_to(self.shortest_paths(source, kinds, max_depth), target)
+
+    def neighbourhood(self, source: int, max_depth: int) -> Set[int]:
+        """Nodes within max_depth hops of source, following edges either way"""
+        seen = {source}
+        frontier = deque([(source, 0)])
+        while frontier:
+            node, depth = frontier.popleft()
+            if depth >= max_depth:
+                continue
+            for indptr, indices in (
+                (self.indptr, self.indices),
+                (self.rev_indptr, self.rev_indices),
+            ):
+                for e in range(indptr[node], indptr[node + 1]):
+                    target = indices[e]
+                    if target not in seen:
+                        seen.add(target)
+                        frontier.append((target, depth + 1))
+        return seen
+
+    def qualified_trainers(self) -> Dict[int, Set[int]]:
+        """
+        Trainers holding an active qualification (or an equivalent of one)
+        that qualifies or covers each unit.
+        """
+        # Group qualifications into equivalence classes
+        component = {}
+        for start in self.nodes_of(QUALIFICATION):
+            if start in component:
+                continue
+            component[start] = start
+            stack = [start]
+            while stack:
+                node = stack.pop()
+                for target, kind, _, _ in self.out_edges(node):
+                    if kind == EQUIVALENT and target not in component:
+                        component[target] = start
+                        stack.append(target)
+
+        holders: Dict[int, Set[int]] = defaultdict(set)
+        for trainer in self.nodes_of(TRAINER):
+            for target, kind, _, active in self.out_edges(trainer):
+                if kind == HOLDS and active:
+                    holders[component[target]].add(trainer)
+
+        qualified: Dict[int, Set[int]] = {}
+        for unit in self.unit_ids:
+            trainers: Set[int] = set()
+            for e in range(self.rev_indptr[unit], self.rev_indptr[unit + 1]):
+                if self.rev_kinds[e] in (QUALIFIES, COVERS) and self.rev_active[e]:
+                    trainers |= holders.get(component[self.rev_indices[e]], set())
+            qualified[unit] = trainers
+        return qualified
+
+    def coverage(self) -> Dict[str, Any]:
+        """
+        Coverage of every unit in the tenant.
+
+        A unit is assigned-covered if a compliant trainer is assigned to it,
+        and qualified-covered if some trainer's verified, current
+        qualifications reach it through the graph.
+        """
+        qualified = self.qualified_trainers()
+        units = sorted(self.unit_ids, key=lambda index: self.keys[index])
+        assigned_covered = [u for u in units if self.compliant_assignments.get(u)]
+        qualified_covered = [u for u in units if qualified[u]]
+        total = len(units)
+
+        def percentage(count):
+            return count / total * 100 if total else 0.0
+
+        return {
+            "total_units": total,
+            "assigned_units": len(assigned_covered),
+            "qualified_units": len(qualified_covered),
+            "coverage_percentage": percentage(len(assigned_covered)),
+            "qualified_coverage_percentage": percentage(len(qualified_covered)),
+            "uncovered_units": [
+                self.keys[u]
+                for u in units
+                if not qualified[u] and not self.compliant_assignments.get(u)
+            ],
+            "qualified_trainer_counts": {
+                self.keys[u]: len(qualified[u]) for u in units
+            },
+        }
+
+    def node_data(self, index: int) -> Dict[str, Any]:
+        kind = self.kinds[index]
+        data = {
+            "id": self.node_id(index),
+            "type": NODE_TYPES[kind],
+            "label": self.keys[index],
+            "name": self.names[index],
+        }
+        if kind == UNIT:
+            data["unit_id"] = self.unit_ids.get(index)
+        return data
+
+    def edge_data(self, source: int, target: int, kind: int, weight, active):
+        data = {
+            "source": self.node_id(source),
+            "target": self.node_id(target),
+            "type": EDGE_TYPES[kind],
+            "weight": round(weight, 4),
+            "active": bool(active),
+        }
+        if kind == ASSIGNED:
+            data["compliant"] = bool(active)
+        return data
+
+    def node_id(self, index: int) -> str:
+        return f"{NODE_PREFIXES[self.kinds[index]]}-{self.keys[index]}"
+
+    def _node(self, kind: int, key: str, name: str = "") -> int:
+        index = self._index.get((kind, key))
+        if index is None:
+            index = len(self.kinds)
+            self._index[(kind, key)] = index
+            self.kinds.append(kind)
+            self.keys.append(key)
+            self.names.append(name)
+        elif name and not self.names[index]:
+            self.names[index] = name
+        return index
+
+
+def _to_csr(node_count: int, edges: Dict[Tuple[int, int, int], Tuple[float, bool]]):
+    """Pack {(source, target, kind): (weight, active)} into CSR arrays"""
+    ordered = sorted(edges.items())
+
+    indptr = array("l", [0] * (node_count + 1))
+    for (source, _, _), _ in ordered:
+        indptr[source + 1] += 1
+    for i in range(node_count):
+        indptr[i + 1] += indptr[i]
+
+    indices = array("l", (target for (_, target, _), _ in ordered))
+    kinds = array("b", (kind for (_, _, kind), _ in ordered))
+    weights = array("d", (weight for _, (weight, _) in ordered))
+    active = array("b", (active for _, (_, active) in ordered))
+    return indptr, indices, kinds, weights, active
+
+
+class CompetencyGraphStore(TenantStore):
+    """
+    Per-process holder of each tenant's CompetencyGraph.
+    """
+
+    generation_key = GENERATION_KEY
+    name = "Competency graph"
+    check_interval = CHECK_INTERVAL
+    max_age = MAX_AGE
+
+    def load(self, tenant: str) -> CompetencyGraph:
+        start = time.perf_counter()
+        graph = CompetencyGraph.load(tenant)
+        logger.info(
+            f"Built competency graph for {tenant}: {graph.node_count} "
+            f"nodes, {graph.edge_count} edges in "
+            f"{time.perf_counter() - start:.3f}s"
+        )
+        return graph
+
+
+# Shared by all graph requests in this process
+competency_graphs = CompetencyGraphStore()
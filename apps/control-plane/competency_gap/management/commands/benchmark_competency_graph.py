@@ -0,0 +1,124 @@
+"""
+Management command to measure competency graph build and query times
+Usage: python manage.py benchmark_competency_graph [--tenant acme]
+       [--trainers 500] [--units 2000] [--qualifications 150]
+"""
+
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from competency_gap.graph import QUALIFYING_KINDS, TRAINER, CompetencyGraph
+
+
+def synthetic_rows(trainers: int, units: int, qualifications: int, seed: int = 0):
+    """Random qualifications, units, assignments and mappings"""
+    rng = random.Random(seed)
+    qual_codes = [f"QUAL{i:05d}" for i in range(qualifications)]
+    unit_codes = [f"UNIT{i:05d}" for i in range(units)]
+
+    unit_rows = [
+        {
+            "id": i,
+            "unit_code": code,
+            "unit_name": f"Unit {i}",
+            "required_qualifications": rng.sample(qual_codes, k=2),
+            "prerequisite_units": rng.sample(unit_codes, k=1) if i % 3 == 0 else [],
+            "related_units": rng.sample(unit_codes, k=2),
+        }
+        for i, code in enumerate(unit_codes)
+    ]
+    qual_rows = [
+        {
+            "trainer_id": f"trainer-{t}",
+            "trainer_name": f"Trainer {t}",
+            "qualification_code": code,
+            "qualification_name": code,
+            "verification_status": "verified" if rng.random() < 0.9 else "pending",
+            "expiry_date": None,
+            "units_covered": rng.sample(unit_codes, k=3),
+        }
+        for t in range(trainers)
+        for code in rng.sample(qual_codes, k=4)
+    ]
+    assignment_rows = [
+        {
+            "trainer_id": f"trainer-{rng.randrange(trainers)}",
+            "trainer_name": "",
+            "unit_id": unit,
+            "compliance_score": rng.uniform(40, 100),
+            "meets_requirements": rng.random() < 0.8,
+        }
+        for unit in range(units)
+    ]
+    mapping_rows = [
+        {
+            "source_qualification_code": code,
+            "source_qualification_name": code,
+            "equivalent_qualifications": rng.sample(qual_codes, k=1),
+            "units_covered": [],
+            "match_strength": rng.uniform(0.5, 1.0),
+        }
+        for code in qual_codes[::5]
+    ]
+    return qual_rows, unit_rows, assignment_rows, mapping_rows
+
+
+class Command(BaseCommand):
+    help = "Benchmark building and querying the competency graph"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            type=str,
+            default=None,
+            help="Load this tenant from the database instead of synthetic data",
+        )
+        parser.add_argument("--trainers", type=int, default=500)
+        parser.add_argument("--units", type=int, default=2000)
+        parser.add_argument("--qualifications", type=int, default=150)
+        parser.add_argument("--max-depth", type=int, default=3)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options["tenant"]:
+            graph = CompetencyGraph.load(options["tenant"])
+        else:
+            rows = synthetic_rows(
+                options["trainers"], options["units"], options["qualifications"]
+            )
+            start = time.perf_counter()
+            graph = CompetencyGraph(*rows)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        coverage = graph.coverage()
+        coverage_seconds = time.perf_counter() - start
+
+        trainers = graph.nodes_of(TRAINER)
+        start = time.perf_counter()
+        reached = 0
+        for trainer in trainers:
+            parents = graph.shortest_paths(
+                trainer, QUALIFYING_KINDS, options["max_depth"]
+            )
+            reached += sum(1 for unit in graph.unit_ids if unit in parents)
+        paths_seconds = time.perf_counter() - start
+
+        results = {
+            "nodes": graph.node_count,
+            "edges": graph.edge_count,
+            "units": coverage["total_units"],
+            "trainers": len(trainers),
+            "build_seconds": round(build_seconds, 4),
+            "coverage_seconds": round(coverage_seconds, 4),
+            "qualified_coverage_percentage": round(
+                coverage["qualified_coverage_percentage"], 2
+            ),
+            "path_searches": len(trainers),
+            "path_search_seconds": round(paths_seconds, 4),
+            "trainer_unit_paths": reached,
+        }
+        self.stdout.write(json.dumps(results, indent=2))
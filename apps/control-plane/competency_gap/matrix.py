@@ -0,0 +1,573 @@
+"""
+Trainer x unit compliance matrix for a tenant.
+
+Every trainer's verified qualifications and every unit's requirements are
+loaded once, and each check from check_gaps (TAE, required qualification,
+industry experience, industry currency, competency areas) becomes a set
+operation over trainer indexes: e.g. the trainers missing a unit's
+required qualification are all trainers minus the union of the holders of
+any of its codes. A cell is stored as a byte of gap flags, so a column is
+a bytearray with one byte per trainer and scores, gaps and
+recommendations are derived from the flags when asked for.
+
+When a trainer's qualifications change only their row is recomputed, and
+when a unit changes only its column. Other processes notice via a
+per-tenant generation counter in the shared cache and reload that tenant.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+
+from control_plane.tenant_store import TenantStore
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of a tenant's shared generation counter; kept short
+# because check_gaps answers single pairs from the matrix
+CHECK_INTERVAL = getattr(settings, "COMPETENCY_MATRIX_CHECK_INTERVAL", 5)
+
+# Reload a tenant at least this often, to pick up bulk writes that bypass
+# model signals
+MAX_AGE = getattr(settings, "COMPETENCY_MATRIX_MAX_AGE", 900)
+
+GENERATION_KEY = "competency_gap:matrix:{tenant}"
+
+TAE_CODES = ("TAE40116", "TAE40122")
+
+# Cell flags
+MISSING_TAE = 1
+MISSING_QUALIFICATION = 2
+INSUFFICIENT_EXPERIENCE = 4
+MISSING_CURRENCY = 8
+COMPETENCY_MISMATCH = 16
+MATCHED_QUALIFICATION = 32
+
+CRITICAL = MISSING_TAE | MISSING_QUALIFICATION
+
+QUALIFICATION_FIELDS = (
+    "trainer_id",
+    "trainer_name",
+    "qualification_id",
+    "qualification_code",
+    "qualification_name",
+    "verification_status",
+    "competency_areas",
+    "industry_experience_years",
+    "recent_industry_work",
+)
+
+UNIT_FIELDS = (
+    "id",
+    "unit_code",
+    "unit_name",
+    "required_qualifications",
+    "required_competency_areas",
+    "required_industry_experience",
+    "requires_tae",
+    "requires_industry_currency",
+)
+
+
+class TrainerProfile:
+    """What a trainer's verified qualifications provide"""
+
+    def __init__(self, trainer_id: str, rows: Iterable[Dict[str, Any]] = ()):
+        self.trainer_id = trainer_id
+        self.trainer_name = ""
+        self.qualifications: Dict[str, Dict[str, Any]] = {}
+        self.competencies: Set[str] = set()
+        self.recent_work = False
+        experience = []
+
+        for row in rows:
+            if row.get("verification_status") != "verified":
+                continue
+            if not self.trainer_name:
+                self.trainer_name = row.get("trainer_name", "")
+            self.qualifications.setdefault(row["qualification_code"], row)
+            self.competencies.update(row.get("competency_areas") or [])
+            self.recent_work = self.recent_work or bool(row.get("recent_industry_work"))
+            experience.append(row.get("industry_experience_years") or 0)
+
+        self.experience = sum(experience) / len(experience) if experience else 0
+        self.has_tae = any(
+            code.upper().startswith(TAE_CODES) for code in self.qualifications
+        )
+
+
+class UnitRequirements:
+    """What a unit of competency asks of its trainers"""
+
+    def __init__(self, row: Dict[str, Any]):
+        self.id = row["id"]
+        self.unit_code = row["unit_code"]
+        self.unit_name = row.get("unit_name", "")
+        self.required_qualifications: List[str] = list(
+            row.get("required_qualifications") or []
+        )
+        self.required_competencies: Set[str] = set(
+            row.get("required_competency_areas") or []
+        )
+        self.required_experience = row.get("required_industry_experience") or 0
+        self.requires_tae = row.get("requires_tae", True)
+        self.requires_currency = row.get("requires_industry_currency", True)
+
+    def empty_flags(self) -> int:
+        """Flags for a trainer with no verified qualifications"""
+        flags = 0
+        if self.requires_tae:
+            flags |= MISSING_TAE
+        if self.required_qualifications:
+            flags |= MISSING_QUALIFICATION
+        if self.required_experience > 0:
+            flags |= INSUFFICIENT_EXPERIENCE
+        if self.requires_currency:
+            flags |= MISSING_CURRENCY
+        if self.required_competencies:
+            flags |= COMPETENCY_MISMATCH
+        return flags
+
+
+def compliance_score(flags: int) -> float:
+    """Weighted score for a cell, as in check_gaps"""
+    score = 0.0
+    if not flags & MISSING_TAE:
+        score += 30
+    if flags & MATCHED_QUALIFICATION:
+        score += 30
+    if not flags & INSUFFICIENT_EXPERIENCE:
+        score += 20
+    if not flags & MISSING_CURRENCY:
+        score += 20
+    return score
+
+
+def meets_requirements(flags: int) -> bool:
+    return not flags & CRITICAL
+
+
+class GapMatrix:
+    """
+    Trainer x unit compliance flags, stored column by column.
+    """
+
+    def __init__(
+        self,
+        qualifications: Iterable[Dict[str, Any]] = (),
+        units: Iterable[Dict[str, Any]] = (),
+    ):
+        self._lock = threading.RLock()
+        self.trainer_ids: List[str] = []
+        self.profiles: List[Optional[TrainerProfile]] = []
+        self._trainer_index: Dict[str, int] = {}
+        self.units: Dict[int, UnitRequirements] = {}
+        self.columns: Dict[int, bytearray] = {}
+
+        rows_by_trainer: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in qualifications:
+            rows_by_trainer[row["trainer_id"]].append(row)
+        for trainer_id, rows in rows_by_trainer.items():
+            self._add_trainer(trainer_id, TrainerProfile(trainer_id, rows))
+        self._reindex()
+
+        for row in units:
+            unit = UnitRequirements(row)
+            self.units[unit.id] = unit
+            column = bytearray(len(self.profiles))
+            self._fill(unit, column, self._active)
+            self.columns[unit.id] = column
+
+    @classmethod
+    def load(cls, tenant: str) -> "GapMatrix":
+        """Build the matrix with one query for qualifications and one for units"""
+        from .models import TrainerQualification, UnitOfCompetency
+
+        qualifications = (
+            TrainerQualification.objects.filter(tenant=tenant)
+            .order_by("id")
+            .values(*QUALIFICATION_FIELDS)
+        )
+        units = UnitOfCompetency.objects.filter(tenant=tenant).values(*UNIT_FIELDS)
+        return cls(
+            qualifications.iterator(chunk_size=5000), units.iterator(chunk_size=5000)
+        )
+
+    @property
+    def trainer_count(self) -> int:
+        return len(self._active)
+
+    def profile(self, trainer_id: str) -> Optional[TrainerProfile]:
+        index = self._trainer_index.get(trainer_id)
+        return self.profiles[index] if index is not None else None
+
+    def flags(self, trainer_id: str, unit_id: int) -> int:
+        """Gap flags for a pair; unknown trainers have every applicable gap"""
+        unit = self.units[unit_id]
+        index = self._trainer_index.get(trainer_id)
+        if index is None or self.profiles[index] is None:
+            return unit.empty_flags()
+        return self.columns[unit_id][index]
+
+    def result(
+        self,
+        trainer_id: str,
+        unit_id: int,
+        trainer_name: Optional[str] = None,
+        include_recommendations: bool = True,
+    ) -> Dict[str, Any]:
+        """check_gaps response for one trainer-unit pair"""
+        unit = self.units[unit_id]
+        profile = self.profile(trainer_id) or TrainerProfile(trainer_id)
+        flags = self.flags(trainer_id, unit_id)
+        score = compliance_score(flags)
+
+        gaps = gap_details(flags, profile, unit)
+        matching = []
+        if flags & MATCHED_QUALIFICATION:
+            code = next(
+                c for c in unit.required_qualifications if c in profile.qualifications
+            )
+            qual = profile.qualifications[code]
+            matching.append(
+                {
+                    "qualification_id": qual.get("qualification_id"),
+                    "qualification_code": code,
+                    "qualification_name": qual.get("qualification_name"),
+                    "match_strength": 1.0,
+                }
+            )
+
+        meets = meets_requirements(flags)
+        return {
+            "trainer_id": trainer_id,
+            "trainer_name": profile.trainer_name or trainer_name or trainer_id,
+            "unit_code": unit.unit_code,
+            "unit_name": unit.unit_name,
+            "meets_requirements": meets,
+            "compliance_score": score,
+            "gaps_found": gaps,
+            "matching_qualifications": matching,
+            "recommendations": (
+                [gap["recommendation"] for gap in gaps]
+                if include_recommendations
+                else []
+            ),
+            "can_deliver": meets and score >= 60,
+            "message": f"Found {len(gaps)} gaps. Compliance score: {score:.1f}%",
+        }
+
+    def set_trainer(self, trainer_id: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Replace a trainer's qualifications and recompute their row"""
+        with self._lock:
+            rows = list(rows)
+            profile = TrainerProfile(trainer_id, rows) if rows else None
+            index = self._trainer_index.get(trainer_id)
+
+            if index is None:
+                if profile is None:
+                    return
+                index = self._add_trainer(trainer_id, profile)
+                for column in self.columns.values():
+                    column.append(0)
+            else:
+                self.profiles[index] = profile
+
+            self._reindex()
+            if profile is not None:
+                for unit_id, column in self.columns.items():
+                    self._fill(self.units[unit_id], column, {index})
+
+    def set_unit(self, unit_id: int, row: Optional[Dict[str, Any]]) -> None:
+        """Replace (or remove, if row is None) a unit and recompute its column"""
+        with self._lock:
+            if row is None:
+                self.units.pop(unit_id, None)
+                self.columns.pop(unit_id, None)
+                return
+
+            unit = UnitRequirements(row)
+            column = bytearray(len(self.profiles))
+            self._fill(unit, column, self._active)
+            self.units[unit_id] = unit
+            self.columns[unit_id] = column
+
+    def to_dict(
+        self,
+        trainer_ids: Optional[Iterable[str]] = None,
+        unit_codes: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """Scores and deliverability for every (selected) trainer and unit"""
+        with self._lock:
+            indexes = sorted(self._active)
+            if trainer_ids is not None:
+                wanted = set(trainer_ids)
+                indexes = [i for i in indexes if self.trainer_ids[i] in wanted]
+
+            units = sorted(self.units.values(), key=lambda u: u.unit_code)
+            if unit_codes is not None:
+                wanted = set(unit_codes)
+                units = [u for u in units if u.unit_code in wanted]
+
+            columns = [self.columns[unit.id] for unit in units]
+            scores, deliverable = [], []
+            for i in indexes:
+                row_scores, row_deliverable = [], []
+                for column in columns:
+                    flags = column[i]
+                    score = compliance_score(flags)
+                    row_scores.append(score)
+                    row_deliverable.append(meets_requirements(flags) and score >= 60)
+                scores.append(row_scores)
+                deliverable.append(row_deliverable)
+
+            return {
+                "trainers": [
+                    {
+                        "trainer_id": self.trainer_ids[i],
+                        "trainer_name": self.profiles[i].trainer_name
+                        or self.trainer_ids[i],
+                    }
+                    for i in indexes
+                ],
+                "units": [
+                    {
+                        "unit_id": u.id,
+                        "unit_code": u.unit_code,
+                        "unit_name": u.unit_name,
+                    }
+                    for u in units
+                ],
+                "scores": scores,
+                "can_deliver": deliverable,
+            }
+
+    def _add_trainer(self, trainer_id: str, profile: TrainerProfile) -> int:
+        index = len(self.trainer_ids)
+        self.trainer_ids.append(trainer_id)
+        self.profiles.append(profile)
+        self._trainer_index[trainer_id] = index
+        return index
+
+    def _reindex(self) -> None:
+        """Rebuild the per-requirement trainer sets used by _fill"""
+        self._active: Set[int] = set()
+        self._tae: Set[int] = set()
+        self._recent: Set[int] = set()
+        self._holders: Dict[str, Set[int]] = defaultdict(set)
+        self._area_holders: Dict[str, Set[int]] = defaultdict(set)
+        self._experience: Dict[int, float] = {}
+
+        for index, profile in enumerate(self.profiles):
+            if profile is None:
+                continue
+            self._active.add(index)
+            if profile.has_tae:
+                self._tae.add(index)
+            if profile.recent_work:
+                self._recent.add(index)
+            for code in profile.qualifications:
+                self._holders[code].add(index)
+            for area in profile.competencies:
+                self._area_holders[area].add(index)
+            self._experience[index] = profile.experience
+
+    def _fill(self, unit: UnitRequirements, column: bytearray, trainers: Set[int]):
+        """Write the flags for the given trainer indexes into a unit's column"""
+        for i in trainers:
+            column[i] = 0
+
+        def mark(indexes, flag):
+            for i in indexes:
+                column[i] |= flag
+
+        if unit.requires_tae:
+            mark(trainers - self._tae, MISSING_TAE)
+
+        if unit.required_qualifications:
+            holders = set().union(
+                *(self._holders.get(c, ()) for c in unit.required_qualifications)
+            )
+            matched = trainers & holders
+            mark(matched, MATCHED_QUALIFICATION)
+            mark(trainers - matched, MISSING_QUALIFICATION)
+
+        if unit.required_experience > 0:
+            mark(
+                (i for i in trainers if self._experience[i] < unit.required_experience),
+                INSUFFICIENT_EXPERIENCE,
+            )
+
+        if unit.requires_currency:
+            mark(trainers - self._recent, MISSING_CURRENCY)
+
+        if unit.required_competencies:
+            capable = set.intersection(
+                *(
+                    self._area_holders.get(area, set())
+                    for area in unit.required_competencies
+                )
+            )
+            mark(trainers - capable, COMPETENCY_MISMATCH)
+
+
+def gap_details(
+    flags: int, profile: TrainerProfile, unit: UnitRequirements
+) -> List[Dict[str, Any]]:
+    """Gap descriptions for a cell, worded as check_gaps reports them"""
+    gaps = []
+
+    if flags & MISSING_TAE:
+        gaps.append(
+            {
+                "gap_type": "missing_tae",
+                "severity": "critical",
+                "description": "Missing TAE40116/TAE40122 qualification",
+                "required": "TAE40116 or TAE40122",
+                "recommendation": "Complete Certificate IV in Training and Assessment",
+            }
+        )
+
+    if flags & MISSING_QUALIFICATION:
+        required = unit.required_qualifications
+        gaps.append(
+            {
+                "gap_type": "missing_qualification",
+                "severity": "critical",
+                "description": f'Missing required qualification: {", ".join(required)}',
+                "required": required[0],
+                "recommendation": f"Obtain {required[0]} or equivalent qualification",
+            }
+        )
+
+    if flags & INSUFFICIENT_EXPERIENCE:
+        required = unit.required_experience
+        gaps.append(
+            {
+                "gap_type": "insufficient_experience",
+                "severity": "high",
+                "description": f"Requires {required} years experience, has {profile.experience:.0f}",
+                "required": f"{required} years",
+                "recommendation": f"Gain additional {required - profile.experience:.0f} years of industry experience",
+            }
+        )
+
+    if flags & MISSING_CURRENCY:
+        gaps.append(
+            {
+                "gap_type": "missing_currency",
+                "severity": "high",
+                "description": "No recent industry work documented",
+                "required": "Recent industry experience",
+                "recommendation": "Complete industry placement or update LinkedIn/GitHub profiles",
+            }
+        )
+
+    if flags & COMPETENCY_MISMATCH:
+        missing = sorted(unit.required_competencies - profile.competencies)
+        gaps.append(
+            {
+                "gap_type": "competency_mismatch",
+                "severity": "medium",
+                "description": f'Missing competency areas: {", ".join(missing)}',
+                "required": missing,
+                "recommendation": f'Complete training in: {", ".join(missing[:3])}',
+            }
+        )
+
+    return gaps
+
+
+def gap_records(tenant, trainer_id, trainer_name, unit_id, assignment, gaps):
+    """Unsaved CompetencyGap rows for bulk_create"""
+    from .models import CompetencyGap, generate_id
+
+    return [
+        CompetencyGap(
+            gap_id=generate_id("GAP"),
+            tenant=tenant,
+            trainer_id=trainer_id,
+            trainer_name=trainer_name,
+            unit_id=unit_id,
+            assignment=assignment,
+            gap_type=gap["gap_type"],
+            gap_severity=gap["severity"],
+            gap_description=gap["description"],
+            required_qualification=(
+                gap["required"] if isinstance(gap["required"], str) else ""
+            ),
+            required_competency=(
+                ", ".join(gap["required"]) if isinstance(gap["required"], list) else ""
+            ),
+            recommended_action=gap["recommendation"],
+        )
+        for gap in gaps
+    ]
+
+
+class GapMatrixStore(TenantStore):
+    """
+    Per-process holder of each tenant's GapMatrix.
+    """
+
+    generation_key = GENERATION_KEY
+    name = "Gap matrix"
+    check_interval = CHECK_INTERVAL
+    max_age = MAX_AGE
+
+    def get(self, tenant: str, unit_ids: Iterable[int] = ()) -> GapMatrix:
+        """
+        Return the tenant's matrix, reloading it if another process changed
+        it or it is missing any of unit_ids (created since the last check).
+        """
+        matrix = super().get(tenant)
+        if any(unit_id not in matrix.units for unit_id in unit_ids):
+            self.invalidate(tenant)
+            matrix = super().get(tenant)
+        return matrix
+
+    def load(self, tenant: str) -> GapMatrix:
+        start = time.perf_counter()
+        matrix = GapMatrix.load(tenant)
+        logger.info(
+            f"Built gap matrix for {tenant}: {matrix.trainer_count} "
+            f"trainers x {len(matrix.units)} units in "
+            f"{time.perf_counter() - start:.3f}s"
+        )
+        return matrix
+
+    def trainer_changed(self, tenant: str, trainer_id: str) -> None:
+        """Recompute a trainer's row locally and tell other processes"""
+        from .models import TrainerQualification
+
+        def update(matrix):
+            rows = (
+                TrainerQualification.objects.filter(
+                    tenant=tenant, trainer_id=trainer_id
+                )
+                .order_by("id")
+                .values(*QUALIFICATION_FIELDS)
+            )
+            matrix.set_trainer(trainer_id, rows)
+
+        self.apply(tenant, update)
+
+    def unit_changed(self, tenant: str, unit_id: int) -> None:
+        """Recompute a unit's column locally and tell other processes"""
+        from .models import UnitOfCompetency
+
+        def update(matrix):
+            row = UnitOfCompetency.objects.filter(id=unit_id, tenant=tenant).values(
+                *UNIT_FIELDS
+            )
+            matrix.set_unit(unit_id, row.first())
+
+        self.apply(tenant, update)
+
+
+# Shared by all gap checks in this process
+gap_matrices = GapMatrixStore()
@@ -3,6 +3,13 @@ from django.utils import timezone
 import uuid
 
 
+def generate_id(prefix):
+    """Human-readable record ID, e.g. GAP-20250101-1A2B3C4D"""
+    date_str = timezone.now().strftime("%Y%m%d")
+    random_str = str(uuid.uuid4())[:8].upper()
+    return f"{prefix}-{date_str}-{random_str}"
+
+
 class TrainerQualification(models.Model):
     """Store trainer qualifications and certifications"""
 
@@ -67,9 +74,7 @@ class TrainerQualification(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.qualification_id:
-            date_str = timezone.now().strftime("%Y%m%d")
-            random_str = str(uuid.uuid4())[:8].upper()
-            self.qualification_id = f"QUAL-{date_str}-{random_str}"
+            self.qualification_id = generate_id("QUAL")
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -128,9 +133,7 @@ class UnitOfCompetency(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.unit_id:
-            date_str = timezone.now().strftime("%Y%m%d")
-            random_str = str(uuid.uuid4())[:8].upper()
-            self.unit_id = f"UNIT-{date_str}-{random_str}"
+            self.unit_id = generate_id("UNIT")
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -191,9 +194,7 @@ class TrainerAssignment(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.assignment_id:
-            date_str = timezone.now().strftime("%Y%m%d")
-            random_str = str(uuid.uuid4())[:8].upper()
-            self.assignment_id = f"ASSIGN-{date_str}-{random_str}"
+            self.assignment_id = generate_id("ASSIGN")
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -274,9 +275,7 @@ class CompetencyGap(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.gap_id:
-            date_str = timezone.now().strftime("%Y%m%d")
-            random_str = str(uuid.uuid4())[:8].upper()
-            self.gap_id = f"GAP-{date_str}-{random_str}"
+            self.gap_id = generate_id("GAP")
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -331,9 +330,7 @@ class QualificationMapping(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.mapping_id:
-            date_str = timezone.now().strftime("%Y%m%d")
-            random_str = str(uuid.uuid4())[:8].upper()
-            self.mapping_id = f"MAP-{date_str}-{random_str}"
+            self.mapping_id = generate_id("MAP")
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -0,0 +1,134 @@
+"""
+Dashboard rollup for the competency gap finder.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from dashboards.rollups import register
+
+from .models import (
+    CompetencyGap,
+    ComplianceCheck,
+    TrainerAssignment,
+    TrainerQualification,
+    UnitOfCompetency,
+)
+
+
+def _tenant(instance):
+    return instance.tenant
+
+
+@register(
+    "competency_gap",
+    sources={
+        TrainerQualification: _tenant,
+        UnitOfCompetency: _tenant,
+        TrainerAssignment: _tenant,
+        CompetencyGap: _tenant,
+        ComplianceCheck: _tenant,
+    },
+)
+def compute_dashboard(tenant):
+    """Dashboard statistics with one aggregate per table"""
+    thirty_days_ago = timezone.now() - timedelta(days=30)
+
+    qualifications = TrainerQualification.objects.filter(tenant=tenant).aggregate(
+        total=Count("id"),
+        trainers=Count("trainer_id", distinct=True),
+        verified=Count("id", filter=Q(verification_status="verified")),
+        expired=Count("id", filter=Q(verification_status="expired")),
+    )
+
+    units = UnitOfCompetency.objects.filter(tenant=tenant).aggregate(
+        total=Count("id"),
+        core=Count("id", filter=Q(unit_type="core")),
+        elective=Count("id", filter=Q(unit_type="elective")),
+    )
+
+    assignments = TrainerAssignment.objects.filter(tenant=tenant).aggregate(
+        total=Count("id"),
+        approved=Count("id", filter=Q(assignment_status="approved")),
+        pending=Count("id", filter=Q(assignment_status="pending")),
+        rejected=Count("id", filter=Q(assignment_status="rejected")),
+        compliant=Count("id", filter=Q(meets_requirements=True)),
+    )
+
+    gaps = CompetencyGap.objects.filter(tenant=tenant)
+    gap_counts = gaps.aggregate(
+        total=Count("id"),
+        critical=Count("id", filter=Q(gap_severity="critical")),
+        high=Count("id", filter=Q(gap_severity="high")),
+        unresolved=Count("id", filter=Q(is_resolved=False)),
+    )
+
+    checks = ComplianceCheck.objects.filter(tenant=tenant)
+    checks_this_month = checks.filter(created_at__gte=thirty_days_ago).count()
+
+    overall_compliance = (
+        (assignments["compliant"] / assignments["total"] * 100)
+        if assignments["total"] > 0
+        else 0
+    )
+
+    recent_checks = [
+        {
+            "check_id": check["check_id"],
+            "check_status": check["check_status"],
+            "compliance_score": check["overall_compliance_score"],
+            "gaps_found": check["gaps_found"],
+            "created_at": check["created_at"].isoformat(),
+        }
+        for check in checks.order_by("-created_at").values(
+            "check_id",
+            "check_status",
+            "overall_compliance_score",
+            "gaps_found",
+            "created_at",
+        )[:5]
+    ]
+
+    top_gap_types = [
+        {"gap_type": gt["gap_type"], "count": gt["count"]}
+        for gt in gaps.values("gap_type")
+        .annotate(count=Count("id"))
+        .order_by("-count")[:5]
+    ]
+
+    trainers_needing_attention = [
+        {
+            "trainer_id": t["trainer_id"],
+            "trainer_name": t["trainer_name"],
+            "unresolved_gaps": t["gap_count"],
+        }
+        for t in gaps.filter(is_resolved=False)
+        .values("trainer_id", "trainer_name")
+        .annotate(gap_count=Count("id"))
+        .order_by("-gap_count")[:5]
+    ]
+
+    return {
+        "total_trainers": qualifications["trainers"],
+        "total_qualifications": qualifications["total"],
+        "verified_qualifications": qualifications["verified"],
+        "expired_qualifications": qualifications["expired"],
+        "total_units": units["total"],
+        "core_units": units["core"],
+        "elective_units": units["elective"],
+        "total_assignments": assignments["total"],
+        "approved_assignments": assignments["approved"],
+        "pending_assignments": assignments["pending"],
+        "rejected_assignments": assignments["rejected"],
+        "total_gaps": gap_counts["total"],
+        "critical_gaps": gap_counts["critical"],
+        "high_gaps": gap_counts["high"],
+        "unresolved_gaps": gap_counts["unresolved"],
+        "overall_compliance_score": overall_compliance,
+        "compliance_checks_this_month": checks_this_month,
+        "recent_checks": recent_checks,
+        "top_gap_types": top_gap_types,
+        "trainers_needing_attention": trainers_needing_attention,
+    }
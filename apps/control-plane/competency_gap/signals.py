@@ -0,0 +1,46 @@
+"""
+Signal handlers for competency gap models.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .graph import competency_graphs
+from .matrix import gap_matrices
+from .models import (
+    QualificationMapping,
+    TrainerAssignment,
+    TrainerQualification,
+    UnitOfCompetency,
+)
+
+
+@receiver(post_save, sender=TrainerQualification)
+@receiver(post_delete, sender=TrainerQualification)
+@receiver(post_save, sender=UnitOfCompetency)
+@receiver(post_delete, sender=UnitOfCompetency)
+@receiver(post_save, sender=TrainerAssignment)
+@receiver(post_delete, sender=TrainerAssignment)
+@receiver(post_save, sender=QualificationMapping)
+@receiver(post_delete, sender=QualificationMapping)
+def graph_source_changed(sender, instance, **kwargs):
+    """Rebuild the tenant's graph once the change is committed"""
+    tenant = instance.tenant
+    transaction.on_commit(lambda: competency_graphs.mark_changed(tenant))
+
+
+@receiver(post_save, sender=TrainerQualification)
+@receiver(post_delete, sender=TrainerQualification)
+def qualification_changed(sender, instance, **kwargs):
+    """Recompute the trainer's row of the gap matrix"""
+    tenant, trainer_id = instance.tenant, instance.trainer_id
+    transaction.on_commit(lambda: gap_matrices.trainer_changed(tenant, trainer_id))
+
+
+@receiver(post_save, sender=UnitOfCompetency)
+@receiver(post_delete, sender=UnitOfCompetency)
+def unit_changed(sender, instance, **kwargs):
+    """Recompute the unit's column of the gap matrix"""
+    tenant, unit_id = instance.tenant, instance.id
+    transaction.on_commit(lambda: gap_matrices.unit_changed(tenant, unit_id))
@@ -1,6 +1,20 @@
-from django.test import TestCase
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, timedelta
+from .graph import QUALIFYING_KINDS, QUALIFICATION, TRAINER, UNIT, CompetencyGraph
+from .matrix import (
+    COMPETENCY_MISMATCH,
+    INSUFFICIENT_EXPERIENCE,
+    MATCHED_QUALIFICATION,
+    MISSING_CURRENCY,
+    MISSING_QUALIFICATION,
+    MISSING_TAE,
+    GapMatrix,
+    GapMatrixStore,
+)
 from .models import (
     TrainerQualification,
     UnitOfCompetency,
@@ -166,3 +180,264 @@ class ComplianceCheckModelTest(TestCase):
     def test_compliance_calculation(self):
         self.assertEqual(self.check.compliant_assignments, 8)
         self.assertEqual(self.check.overall_compliance_score, 80.0)
+
+
+class CompetencyGraphTest(SimpleTestCase):
+    """Test the in-memory trainer / qualification / unit graph"""
+
+    def setUp(self):
+        self.graph = CompetencyGraph(
+            qualifications=[
+                {
+                    "trainer_id": "t1",
+                    "qualification_code": "ICT40120",
+                    "verification_status": "verified",
+                    "expiry_date": None,
+                },
+                {
+                    "trainer_id": "t2",
+                    "qualification_code": "BSB50120",
+                    "verification_status": "pending",
+                    "expiry_date": None,
+                },
+                {
+                    "trainer_id": "t3",
+                    "qualification_code": "ICT30120",
+                    "verification_status": "verified",
+                    "expiry_date": date(2000, 1, 1),
+                },
+            ],
+            units=[
+                {
+                    "id": 1,
+                    "unit_code": "ICTPRG302",
+                    "required_qualifications": ["ICT50220"],
+                },
+                {
+                    "id": 2,
+                    "unit_code": "BSBOPS404",
+                    "required_qualifications": ["BSB50120"],
+                },
+                {
+                    "id": 3,
+                    "unit_code": "ICTNWK305",
+                    "required_qualifications": ["ICT30120"],
+                },
+            ],
+            assignments=[
+                {
+                    "trainer_id": "t2",
+                    "unit_id": 2,
+                    "compliance_score": 80.0,
+                    "meets_requirements": True,
+                },
+            ],
+            mappings=[
+                {
+                    "source_qualification_code": "ICT40120",
+                    "equivalent_qualifications": ["ICT50220"],
+                    "match_strength": 0.8,
+                },
+            ],
+            today=date(2026, 1, 1),
+        )
+
+    def test_shortest_path_through_equivalent_qualification(self):
+        trainer = self.graph.find(TRAINER, "t1")
+        unit = self.graph.find(UNIT, "ICTPRG302")
+
+        path, strength = self.graph.shortest_path(trainer, unit, QUALIFYING_KINDS)
+
+        self.assertEqual(
+            [self.graph.keys[node] for node in path],
+            ["t1", "ICT40120", "ICT50220", "ICTPRG302"],
+        )
+        self.assertAlmostEqual(strength, 0.8)
+        self.assertIsNone(
+            self.graph.shortest_path(trainer, unit, QUALIFYING_KINDS, max_depth=2)
+        )
+
+    def test_unverified_and_expired_holdings_are_not_traversed(self):
+        for trainer_id, unit_code in [("t2", "BSBOPS404"), ("t3", "ICTNWK305")]:
+            self.assertIsNone(
+                self.graph.shortest_path(
+                    self.graph.find(TRAINER, trainer_id),
+                    self.graph.find(UNIT, unit_code),
+                    QUALIFYING_KINDS,
+                )
+            )
+
+    def test_coverage_spans_every_unit(self):
+        coverage = self.graph.coverage()
+
+        self.assertEqual(coverage["total_units"], 3)
+        self.assertEqual(coverage["assigned_units"], 1)
+        self.assertEqual(coverage["qualified_units"], 1)
+        self.assertEqual(coverage["uncovered_units"], ["ICTNWK305"])
+        self.assertEqual(coverage["qualified_trainer_counts"]["ICTPRG302"], 1)
+
+    def test_neighbourhood_follows_edges_both_ways(self):
+        qual = self.graph.find(QUALIFICATION, "ICT50220")
+        nearby = {self.graph.keys[node] for node in self.graph.neighbourhood(qual, 1)}
+
+        self.assertEqual(nearby, {"ICT50220", "ICT40120", "ICTPRG302"})
+
+
+def qualification_row(trainer_id, code, **extra):
+    return {
+        "trainer_id": trainer_id,
+        "trainer_name": trainer_id.title(),
+        "qualification_id": f"QUAL-{trainer_id}-{code}",
+        "qualification_code": code,
+        "qualification_name": code,
+        "verification_status": "verified",
+        "competency_areas": [],
+        "industry_experience_years": 0,
+        "recent_industry_work": False,
+        **extra,
+    }
+
+
+class GapMatrixTest(SimpleTestCase):
+    """Test the trainer x unit compliance matrix"""
+
+    def setUp(self):
+        self.unit = {
+            "id": 1,
+            "unit_code": "ICTPRG302",
+            "unit_name": "Apply introductory programming techniques",
+            "required_qualifications": ["ICT50220", "ICT40120"],
+            "required_competency_areas": ["programming"],
+            "required_industry_experience": 3,
+            "requires_tae": True,
+            "requires_industry_currency": True,
+        }
+        self.matrix = GapMatrix(
+            qualifications=[
+                qualification_row("alice", "TAE40116"),
+                qualification_row(
+                    "alice",
+                    "ICT40120",
+                    competency_areas=["programming"],
+                    industry_experience_years=8,
+                    recent_industry_work=True,
+                ),
+                qualification_row("bob", "ICT50220", industry_experience_years=2),
+                qualification_row("carol", "TAE40122", verification_status="pending"),
+            ],
+            units=[self.unit],
+        )
+
+    def test_cells_match_check_gaps_rules(self):
+        alice = self.matrix.result("alice", 1)
+        self.assertTrue(alice["can_deliver"])
+        self.assertEqual(alice["compliance_score"], 100.0)
+        self.assertEqual(alice["gaps_found"], [])
+        self.assertEqual(
+            alice["matching_qualifications"][0]["qualification_code"], "ICT40120"
+        )
+
+        self.assertEqual(
+            self.matrix.flags("bob", 1),
+            MISSING_TAE
+            | INSUFFICIENT_EXPERIENCE
+            | MISSING_CURRENCY
+            | COMPETENCY_MISMATCH
+            | MATCHED_QUALIFICATION,
+        )
+        bob = self.matrix.result("bob", 1)
+        self.assertFalse(bob["meets_requirements"])
+        self.assertEqual(bob["compliance_score"], 30.0)
+        self.assertEqual(
+            bob["gaps_found"][1]["description"], "Requires 3 years experience, has 2"
+        )
+
+    def test_unverified_and_unknown_trainers_have_every_gap(self):
+        expected = (
+            MISSING_TAE
+            | MISSING_QUALIFICATION
+            | INSUFFICIENT_EXPERIENCE
+            | MISSING_CURRENCY
+            | COMPETENCY_MISMATCH
+        )
+        self.assertEqual(self.matrix.flags("carol", 1), expected)
+        self.assertEqual(self.matrix.flags("nobody", 1), expected)
+        self.assertEqual(
+            self.matrix.result("nobody", 1, trainer_name="N. Body")["trainer_name"],
+            "N. Body",
+        )
+
+    def test_trainer_change_recomputes_row(self):
+        self.matrix.set_trainer(
+            "carol",
+            [
+                qualification_row("carol", "TAE40122"),
+                qualification_row(
+                    "carol",
+                    "ICT50220",
+                    competency_areas=["programming"],
+                    industry_experience_years=5,
+                    recent_industry_work=True,
+                ),
+            ],
+        )
+        self.matrix.set_trainer("dave", [qualification_row("dave", "ICT50220")])
+
+        self.assertTrue(self.matrix.result("carol", 1)["can_deliver"])
+        self.assertEqual(self.matrix.flags("dave", 1) & MISSING_QUALIFICATION, 0)
+        self.assertEqual(self.matrix.trainer_count, 4)
+
+        self.matrix.set_trainer("alice", [])
+        self.assertEqual(self.matrix.trainer_count, 3)
+
+    def test_unit_change_recomputes_column(self):
+        self.matrix.set_unit(
+            1,
+            {
+                **self.unit,
+                "required_qualifications": [],
+                "required_competency_areas": [],
+                "required_industry_experience": 0,
+            },
+        )
+        self.matrix.set_unit(2, {**self.unit, "id": 2, "unit_code": "BSBOPS404"})
+
+        self.assertEqual(self.matrix.result("bob", 1)["compliance_score"], 20.0)
+
+        table = self.matrix.to_dict()
+        self.assertEqual(
+            [u["unit_code"] for u in table["units"]], ["BSBOPS404", "ICTPRG302"]
+        )
+        self.assertEqual(len(table["scores"]), 3)
+
+        self.matrix.set_unit(2, None)
+        self.assertNotIn(2, self.matrix.units)
+
+
+class GapMatrixStoreTest(SimpleTestCase):
+    """Test that per-process gap matrices follow changes in other processes"""
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(
+            GapMatrix, "load", side_effect=lambda tenant: GapMatrix()
+        )
+        self.load = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_local_changes_are_kept_and_others_reload(self):
+        here = GapMatrixStore(check_interval=0)
+        there = GapMatrixStore(check_interval=0)
+        matrix = here.get("acme")
+        there.get("acme")
+        self.assertEqual(self.load.call_count, 2)
+
+        # The process that made the change keeps (and patches) its matrix
+        patched = []
+        here.apply("acme", patched.append)
+        self.assertEqual(patched, [matrix])
+        self.assertIs(here.get("acme"), matrix)
+
+        # The other process notices the new generation and reloads
+        there.get("acme")
+        self.assertEqual(self.load.call_count, 3)
@@ -2,10 +2,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db.models import Count, Q, Avg
-from datetime import timedelta
+from django.db import transaction
+from django.db.models import Count, Q
+from collections import defaultdict
 import json
 
+from dashboards.rollups import dashboard_response, get_rollup
+
 from .models import (
     TrainerQualification,
     UnitOfCompetency,
@@ -13,7 +16,16 @@ from .models import (
     CompetencyGap,
     QualificationMapping,
     ComplianceCheck,
+    generate_id,
+)
+from .graph import (
+    ASSIGNED,
+    QUALIFICATION,
+    QUALIFYING_KINDS,
+    TRAINER,
+    competency_graphs,
 )
+from .matrix import gap_matrices, gap_records
 from .serializers import (
     TrainerQualificationSerializer,
     TrainerQualificationListSerializer,
@@ -73,161 +85,23 @@ class TrainerQualificationViewSet(viewsets.ModelViewSet):
         trainer_id = data["trainer_id"]
         unit_id = data["unit_id"]
 
-        # Get unit and trainer qualifications
         try:
-            unit = UnitOfCompetency.objects.get(id=unit_id)
+            unit = UnitOfCompetency.objects.only("id", "tenant").get(id=unit_id)
         except UnitOfCompetency.DoesNotExist:
             return Response(
                 {"error": "Unit not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        qualifications = TrainerQualification.objects.filter(
-            trainer_id=trainer_id, verification_status="verified"
+        # Checked against the unit's tenant matrix, so only that tenant's
+        # qualifications count
+        matrix = gap_matrices.get(unit.tenant, unit_ids=[unit.id])
+        response_data = matrix.result(
+            trainer_id,
+            unit.id,
+            trainer_name=request.data.get("trainer_name", trainer_id),
+            include_recommendations=data.get("include_recommendations", True),
         )
 
-        if not qualifications.exists():
-            trainer_name = request.data.get("trainer_name", trainer_id)
-        else:
-            trainer_name = qualifications.first().trainer_name
-
-        # Initialize gap analysis
-        gaps_found = []
-        matching_qualifications = []
-        compliance_score = 0.0
-
-        # Check TAE requirement
-        has_tae = qualifications.filter(
-            Q(qualification_code__istartswith="TAE40116")
-            | Q(qualification_code__istartswith="TAE40122")
-        ).exists()
-
-        if unit.requires_tae and not has_tae:
-            gaps_found.append(
-                {
-                    "gap_type": "missing_tae",
-                    "severity": "critical",
-                    "description": "Missing TAE40116/TAE40122 qualification",
-                    "required": "TAE40116 or TAE40122",
-                    "recommendation": "Complete Certificate IV in Training and Assessment",
-                }
-            )
-        else:
-            compliance_score += 30  # TAE worth 30%
-
-        # Check qualification requirements
-        required_quals = unit.required_qualifications or []
-        trainer_qual_codes = list(
-            qualifications.values_list("qualification_code", flat=True)
-        )
-
-        has_required_qual = False
-        for req_qual in required_quals:
-            if req_qual in trainer_qual_codes:
-                has_required_qual = True
-                qual = qualifications.get(qualification_code=req_qual)
-                matching_qualifications.append(
-                    {
-                        "qualification_id": qual.qualification_id,
-                        "qualification_code": qual.qualification_code,
-                        "qualification_name": qual.qualification_name,
-                        "match_strength": 1.0,
-                    }
-                )
-                compliance_score += 30  # Required qual worth 30%
-                break
-
-        if not has_required_qual and required_quals:
-            gaps_found.append(
-                {
-                    "gap_type": "missing_qualification",
-                    "severity": "critical",
-                    "description": f'Missing required qualification: {", ".join(required_quals)}',
-                    "required": required_quals[0] if required_quals else "Unknown",
-                    "recommendation": f"Obtain {required_quals[0]} or equivalent qualification",
-                }
-            )
-
-        # Check industry experience
-        max_experience = (
-            qualifications.aggregate(Avg("industry_experience_years"))[
-                "industry_experience_years__avg"
-            ]
-            or 0
-        )
-        required_experience = unit.required_industry_experience
-
-        if required_experience > max_experience:
-            gaps_found.append(
-                {
-                    "gap_type": "insufficient_experience",
-                    "severity": "high",
-                    "description": f"Requires {required_experience} years experience, has {max_experience:.0f}",
-                    "required": f"{required_experience} years",
-                    "recommendation": f"Gain additional {required_experience - max_experience:.0f} years of industry experience",
-                }
-            )
-        else:
-            compliance_score += 20  # Experience worth 20%
-
-        # Check industry currency
-        has_recent_work = qualifications.filter(recent_industry_work=True).exists()
-        if unit.requires_industry_currency and not has_recent_work:
-            gaps_found.append(
-                {
-                    "gap_type": "missing_currency",
-                    "severity": "high",
-                    "description": "No recent industry work documented",
-                    "required": "Recent industry experience",
-                    "recommendation": "Complete industry placement or update LinkedIn/GitHub profiles",
-                }
-            )
-        else:
-            compliance_score += 20  # Currency worth 20%
-
-        # Check competency areas
-        required_competencies = set(unit.required_competency_areas or [])
-        trainer_competencies = set()
-        for qual in qualifications:
-            trainer_competencies.update(qual.competency_areas or [])
-
-        missing_competencies = required_competencies - trainer_competencies
-        if missing_competencies:
-            gaps_found.append(
-                {
-                    "gap_type": "competency_mismatch",
-                    "severity": "medium",
-                    "description": f'Missing competency areas: {", ".join(missing_competencies)}',
-                    "required": list(missing_competencies),
-                    "recommendation": f'Complete training in: {", ".join(list(missing_competencies)[:3])}',
-                }
-            )
-
-        # Calculate final compliance
-        meets_requirements = len(gaps_found) == 0 or all(
-            g["severity"] not in ["critical"] for g in gaps_found
-        )
-        can_deliver = meets_requirements and compliance_score >= 60
-
-        recommendations = [
-            g["recommendation"]
-            for g in gaps_found
-            if data.get("include_recommendations", True)
-        ]
-
-        response_data = {
-            "trainer_id": trainer_id,
-            "trainer_name": trainer_name,
-            "unit_code": unit.unit_code,
-            "unit_name": unit.unit_name,
-            "meets_requirements": meets_requirements,
-            "compliance_score": compliance_score,
-            "gaps_found": gaps_found,
-            "matching_qualifications": matching_qualifications,
-            "recommendations": recommendations,
-            "can_deliver": can_deliver,
-            "message": f"Found {len(gaps_found)} gaps. Compliance score: {compliance_score:.1f}%",
-        }
-
         resp_serializer = CheckGapsResponseSerializer(data=response_data)
         resp_serializer.is_valid(raise_exception=True)
         return Response(resp_serializer.data)
@@ -301,19 +175,16 @@ class TrainerQualificationViewSet(viewsets.ModelViewSet):
         )
 
         # Create gap records
-        for gap_data in gaps:
-            CompetencyGap.objects.create(
-                tenant=request.data.get("tenant", "default"),
-                trainer_id=trainer_id,
-                trainer_name=trainer_name,
-                unit=unit,
-                assignment=assignment,
-                gap_type=gap_data["gap_type"],
-                gap_severity=gap_data["severity"],
-                gap_description=gap_data["description"],
-                required_qualification=gap_data.get("required", ""),
-                recommended_action=gap_data.get("recommendation", ""),
+        CompetencyGap.objects.bulk_create(
+            gap_records(
+                request.data.get("tenant", "default"),
+                trainer_id,
+                trainer_name,
+                unit.id,
+                assignment,
+                gaps,
             )
+        )
 
         response_data = {
             "assignment_id": str(assignment.id),
@@ -338,46 +209,94 @@ class TrainerQualificationViewSet(viewsets.ModelViewSet):
         data = req_serializer.validated_data
         trainer_id = data["trainer_id"]
         unit_ids = data["unit_ids"]
+        tenant = request.data.get("tenant", "default")
 
-        assignments = []
-        successful = 0
-        failed = 0
+        units = UnitOfCompetency.objects.only("id", "tenant").in_bulk(unit_ids)
+        taken = set(
+            TrainerAssignment.objects.filter(
+                tenant=tenant, trainer_id=trainer_id, unit_id__in=list(units)
+            ).values_list("unit_id", flat=True)
+        )
+
+        qual = TrainerQualification.objects.filter(trainer_id=trainer_id).first()
+        trainer_name = qual.trainer_name if qual else trainer_id
 
+        # Score every unit from the compliance matrix, then create all
+        # assignments and gaps in two bulk inserts
+        outcomes = []
+        created = []
         for unit_id in unit_ids:
-            assign_data = {
-                "trainer_id": trainer_id,
-                "unit_id": unit_id,
-                "check_compliance": data.get("check_compliance", True),
-                "tenant": request.data.get("tenant", "default"),
-            }
-
-            response = self.assign_trainer(
-                type(
-                    "Request",
-                    (),
-                    {"data": assign_data, "query_params": request.query_params},
-                )()
+            unit = units.get(unit_id)
+            if unit is None:
+                outcomes.append((unit_id, None, "Unit not found"))
+                continue
+            if unit_id in taken:
+                outcomes.append((unit_id, None, "Assignment already exists"))
+                continue
+            taken.add(unit_id)
+
+            result = None
+            if data.get("check_compliance", True):
+                matrix = gap_matrices.get(unit.tenant, unit_ids=[unit.id])
+                result = matrix.result(trainer_id, unit.id)
+            meets_requirements = result["meets_requirements"] if result else False
+            gaps = result["gaps_found"] if result else []
+
+            assignment = TrainerAssignment(
+                assignment_id=generate_id("ASSIGN"),
+                tenant=tenant,
+                trainer_id=trainer_id,
+                trainer_name=trainer_name,
+                unit=unit,
+                meets_requirements=meets_requirements,
+                compliance_score=result["compliance_score"] if result else 0.0,
+                gaps_identified=[g["description"] for g in gaps],
+                matching_qualifications=[],
+                assignment_status=(
+                    "approved" if meets_requirements else "under_review"
+                ),
             )
+            created.append((assignment, gaps))
+            outcomes.append((unit_id, assignment, None))
+
+        if created:
+            with transaction.atomic():
+                TrainerAssignment.objects.bulk_create([a for a, _ in created])
+                CompetencyGap.objects.bulk_create(
+                    [
+                        record
+                        for assignment, gaps in created
+                        for record in gap_records(
+                            tenant,
+                            trainer_id,
+                            trainer_name,
+                            assignment.unit_id,
+                            assignment,
+                            gaps,
+                        )
+                    ]
+                )
+            # bulk_create skips the signals that keep the graph current
+            competency_graphs.mark_changed(tenant)
 
-            if response.status_code == 201:
-                successful += 1
+        assignments = []
+        for unit_id, assignment, error in outcomes:
+            if assignment is not None:
                 assignments.append(
                     {
                         "unit_id": unit_id,
                         "status": "success",
-                        "assignment_id": response.data["assignment_id"],
+                        "assignment_id": str(assignment.id),
                     }
                 )
             else:
-                failed += 1
                 assignments.append(
-                    {
-                        "unit_id": unit_id,
-                        "status": "failed",
-                        "error": response.data.get("error", "Unknown error"),
-                    }
+                    {"unit_id": unit_id, "status": "failed", "error": error}
                 )
 
+        successful = len(created)
+        failed = len(outcomes) - successful
+
         response_data = {
             "total_assignments": len(unit_ids),
             "successful_assignments": successful,
@@ -418,9 +337,98 @@ class TrainerQualificationViewSet(viewsets.ModelViewSet):
         if data.get("unit_codes"):
             assignments = assignments.filter(unit__unit_code__in=data["unit_codes"])
 
+        assignments = list(
+            assignments.only(
+                "id",
+                "tenant",
+                "trainer_id",
+                "trainer_name",
+                "unit_id",
+                "meets_requirements",
+                "compliance_score",
+                "gaps_identified",
+            )
+        )
+
+        # Re-score every assignment from its unit's tenant matrix
+        unit_tenants = dict(
+            UnitOfCompetency.objects.filter(
+                id__in={a.unit_id for a in assignments}
+            ).values_list("id", "tenant")
+        )
+        units_by_tenant = defaultdict(set)
+        for unit_id, unit_tenant in unit_tenants.items():
+            units_by_tenant[unit_tenant].add(unit_id)
+        matrices = {
+            unit_tenant: gap_matrices.get(unit_tenant, unit_ids=unit_ids)
+            for unit_tenant, unit_ids in units_by_tenant.items()
+        }
+
+        open_gaps = defaultdict(dict)
+        for gap_id, assignment_id, gap_type in CompetencyGap.objects.filter(
+            assignment__in=assignments, is_resolved=False
+        ).values_list("id", "assignment_id", "gap_type"):
+            open_gaps[assignment_id][gap_type] = gap_id
+
+        changed = []
+        new_gaps = []
+        resolved_gap_ids = []
+        compliant = 0
+
+        for assignment in assignments:
+            matrix = matrices[unit_tenants[assignment.unit_id]]
+            result = matrix.result(assignment.trainer_id, assignment.unit_id)
+            gaps = result["gaps_found"]
+            compliant += result["meets_requirements"]
+
+            # Record new gaps and resolve ones that no longer apply
+            existing = open_gaps.get(assignment.id, {})
+            current = {gap["gap_type"] for gap in gaps}
+            new_gaps.extend(
+                gap_records(
+                    assignment.tenant,
+                    assignment.trainer_id,
+                    assignment.trainer_name,
+                    assignment.unit_id,
+                    assignment,
+                    [gap for gap in gaps if gap["gap_type"] not in existing],
+                )
+            )
+            resolved_gap_ids.extend(
+                gap_id
+                for gap_type, gap_id in existing.items()
+                if gap_type not in current
+            )
+
+            descriptions = [gap["description"] for gap in gaps]
+            if (
+                assignment.meets_requirements != result["meets_requirements"]
+                or assignment.compliance_score != result["compliance_score"]
+                or assignment.gaps_identified != descriptions
+            ):
+                assignment.meets_requirements = result["meets_requirements"]
+                assignment.compliance_score = result["compliance_score"]
+                assignment.gaps_identified = descriptions
+                changed.append(assignment)
+
+        with transaction.atomic():
+            TrainerAssignment.objects.bulk_update(
+                changed,
+                ["meets_requirements", "compliance_score", "gaps_identified"],
+                batch_size=500,
+            )
+            CompetencyGap.objects.bulk_create(new_gaps, batch_size=500)
+            CompetencyGap.objects.filter(id__in=resolved_gap_ids).update(
+                is_resolved=True,
+                resolution_date=timezone.now().date(),
+                resolution_notes="Resolved by matrix validation",
+            )
+        if changed:
+            # bulk_update skips the signals that keep the graph current
+            competency_graphs.mark_changed(tenant)
+
         # Count results
-        total = assignments.count()
-        compliant = assignments.filter(meets_requirements=True).count()
+        total = len(assignments)
         non_compliant = total - compliant
 
         # Get gaps
@@ -432,18 +440,25 @@ class TrainerQualificationViewSet(viewsets.ModelViewSet):
         if data.get("unit_codes"):
             gaps = gaps.filter(unit__unit_code__in=data["unit_codes"])
 
-        gaps_count = gaps.count()
-        critical_gaps = gaps.filter(gap_severity="critical").count()
-        high_gaps = gaps.filter(gap_severity="high").count()
-        medium_gaps = gaps.filter(gap_severity="medium").count()
-        low_gaps = gaps.filter(gap_severity="low").count()
+        gap_counts = gaps.aggregate(
+            total=Count("id"),
+            critical=Count("id", filter=Q(gap_severity="critical")),
+            high=Count("id", filter=Q(gap_severity="high")),
+            medium=Count("id", filter=Q(gap_severity="medium")),
+            low=Count("id", filter=Q(gap_severity="low")),
+        )
+        gaps_count = gap_counts["total"]
+        critical_gaps = gap_counts["critical"]
+        high_gaps = gap_counts["high"]
+        medium_gaps = gap_counts["medium"]
+        low_gaps = gap_counts["low"]
 
         # Calculate compliance percentage
         compliance_pct = (compliant / total * 100) if total > 0 else 0
 
         # Count unique trainers and units
-        trainers_checked = assignments.values("trainer_id").distinct().count()
-        units_checked = assignments.values("unit").distinct().count()
+        trainers_checked = len({a.trainer_id for a in assignments})
+        units_checked = len({a.unit_id for a in assignments})
 
         # Update check record
         check.check_status = "completed"
@@ -480,6 +495,21 @@ class TrainerQualificationViewSet(viewsets.ModelViewSet):
         resp_serializer.is_valid(raise_exception=True)
         return Response(resp_serializer.data)
 
+    @action(detail=False, methods=["get"])
+    def gap_matrix(self, request):
+        """
+        Compliance scores for every trainer x unit pair in the tenant.
+
+        Rows follow trainers and columns follow units; filter with repeated
+        trainer_id and unit_code query parameters.
+        """
+        tenant = request.query_params.get("tenant", "default")
+        trainer_ids = request.query_params.getlist("trainer_id") or None
+        unit_codes = request.query_params.getlist("unit_code") or None
+
+        matrix = gap_matrices.get(tenant)
+        return Response(matrix.to_dict(trainer_ids, unit_codes))
+
     @action(detail=False, methods=["post"])
     def graph_analysis(self, request):
         """Perform graph-based analysis of qualifications and competencies"""
@@ -488,109 +518,79 @@ class TrainerQualificationViewSet(viewsets.ModelViewSet):
 
         data = req_serializer.validated_data
         tenant = request.query_params.get("tenant", "default")
+        max_depth = data.get("max_depth", 3)
 
-        # Build graph nodes and edges
-        nodes = []
-        edges = []
+        graph = competency_graphs.get(tenant)
 
-        # Get trainer qualifications as nodes
+        # Focus on one trainer or qualification's neighbourhood if asked,
+        # otherwise return the whole tenant
+        focus = None
         if data.get("trainer_id"):
-            qualifications = TrainerQualification.objects.filter(
-                tenant=tenant, trainer_id=data["trainer_id"]
-            )
+            focus = graph.find(TRAINER, data["trainer_id"])
+        elif data.get("qualification_code"):
+            focus = graph.find(QUALIFICATION, data["qualification_code"])
+
+        if focus is not None:
+            selected = graph.neighbourhood(focus, max_depth)
+        elif data.get("trainer_id") or data.get("qualification_code"):
+            selected = set()
         else:
-            qualifications = TrainerQualification.objects.filter(tenant=tenant)[:10]
-
-        for qual in qualifications:
-            nodes.append(
-                {
-                    "id": f"qual-{qual.id}",
-                    "type": "qualification",
-                    "label": qual.qualification_code,
-                    "name": qual.qualification_name,
-                    "trainer_id": qual.trainer_id,
-                }
-            )
-
-        # Get units as nodes
-        units = UnitOfCompetency.objects.filter(tenant=tenant)[:20]
-        for unit in units:
-            nodes.append(
-                {
-                    "id": f"unit-{unit.id}",
-                    "type": "unit",
-                    "label": unit.unit_code,
-                    "name": unit.unit_name,
-                }
-            )
-
-        # Get mappings as nodes
-        mappings = QualificationMapping.objects.filter(tenant=tenant)[:10]
-        for mapping in mappings:
-            nodes.append(
-                {
-                    "id": f"map-{mapping.id}",
-                    "type": "mapping",
-                    "label": mapping.source_qualification_code,
-                    "match_strength": mapping.match_strength,
-                }
-            )
-
-        # Create edges from assignments
-        assignments = TrainerAssignment.objects.filter(tenant=tenant)[:30]
-        for assignment in assignments:
-            # Find trainer's qualifications
-            trainer_quals = qualifications.filter(trainer_id=assignment.trainer_id)
-            for qual in trainer_quals:
-                edges.append(
-                    {
-                        "source": f"qual-{qual.id}",
-                        "target": f"unit-{assignment.unit.id}",
-                        "type": "can_deliver",
-                        "weight": assignment.compliance_score / 100,
-                        "compliant": assignment.meets_requirements,
-                    }
-                )
+            selected = range(graph.node_count)
+
+        nodes = [graph.node_data(index) for index in sorted(selected)]
+        edges = [
+            graph.edge_data(source, target, kind, weight, active)
+            for source in selected
+            for target, kind, weight, active in graph.out_edges(source)
+            if target in selected
+        ]
 
-        # Find paths (simulated for demo)
+        # Qualification paths: from the focus to every unit it reaches, or
+        # from each assigned trainer to the units they are assigned to
         paths = []
         if data.get("find_paths", True):
-            for assignment in assignments[:5]:
-                trainer_quals = qualifications.filter(trainer_id=assignment.trainer_id)
-                if trainer_quals.exists():
-                    qual = trainer_quals.first()
+            if focus is not None:
+                targets = {focus: list(graph.unit_ids)}
+            else:
+                targets = {}
+                for trainer in graph.nodes_of(TRAINER):
+                    assigned = [
+                        target
+                        for target, kind, _, _ in graph.out_edges(trainer)
+                        if kind == ASSIGNED
+                    ]
+                    if assigned:
+                        targets[trainer] = assigned
+
+            for source, units in targets.items():
+                parents = graph.shortest_paths(source, QUALIFYING_KINDS, max_depth)
+                for unit in units:
+                    found = graph.path_to(parents, unit)
+                    if found is None:
+                        continue
+                    path, strength = found
                     paths.append(
                         {
-                            "source": qual.qualification_code,
-                            "target": assignment.unit.unit_code,
-                            "path": [
-                                qual.qualification_code,
-                                assignment.unit.unit_code,
-                            ],
-                            "length": 1,
-                            "strength": assignment.compliance_score / 100,
+                            "source": graph.keys[source],
+                            "target": graph.keys[unit],
+                            "path": [graph.keys[node] for node in path],
+                            "length": len(path) - 1,
+                            "strength": round(strength, 4),
                         }
                     )
 
-        # Calculate coverage score
-        total_units = units.count()
-        covered_units = (
-            assignments.filter(meets_requirements=True)
-            .values("unit")
-            .distinct()
-            .count()
-        )
-        coverage_score = (covered_units / total_units * 100) if total_units > 0 else 0
+        coverage = graph.coverage()
+        coverage_score = coverage["coverage_percentage"]
 
         analysis = {
             "total_nodes": len(nodes),
             "total_edges": len(edges),
             "total_paths": len(paths),
             "coverage_percentage": coverage_score,
-            "avg_compliance": assignments.aggregate(Avg("compliance_score"))[
-                "compliance_score__avg"
-            ]
-            or 0,
+            "qualified_coverage_percentage": coverage["qualified_coverage_percentage"],
+            "total_units": coverage["total_units"],
+            "uncovered_units": coverage["uncovered_units"],
+            "avg_compliance": graph.average_compliance,
         }
 
         response_data = {
@@ -764,115 +764,12 @@ class TrainerQualificationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Qualifications stats
-        qualifications = TrainerQualification.objects.filter(tenant=tenant)
-        total_trainers = qualifications.values("trainer_id").distinct().count()
-        total_qualifications = qualifications.count()
-        verified_qualifications = qualifications.filter(
-            verification_status="verified"
-        ).count()
-        expired_qualifications = qualifications.filter(
-            verification_status="expired"
-        ).count()
-
-        # Units stats
-        units = UnitOfCompetency.objects.filter(tenant=tenant)
-        total_units = units.count()
-        core_units = units.filter(unit_type="core").count()
-        elective_units = units.filter(unit_type="elective").count()
-
-        # Assignments stats
-        assignments = TrainerAssignment.objects.filter(tenant=tenant)
-        total_assignments = assignments.count()
-        approved_assignments = assignments.filter(assignment_status="approved").count()
-        pending_assignments = assignments.filter(assignment_status="pending").count()
-        rejected_assignments = assignments.filter(assignment_status="rejected").count()
-
-        # Gaps stats
-        gaps = CompetencyGap.objects.filter(tenant=tenant)
-        total_gaps = gaps.count()
-        critical_gaps = gaps.filter(gap_severity="critical").count()
-        high_gaps = gaps.filter(gap_severity="high").count()
-        unresolved_gaps = gaps.filter(is_resolved=False).count()
-
-        # Compliance stats
-        compliant_assignments = assignments.filter(meets_requirements=True).count()
-        overall_compliance = (
-            (compliant_assignments / total_assignments * 100)
-            if total_assignments > 0
-            else 0
-        )
-
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        compliance_checks_this_month = ComplianceCheck.objects.filter(
-            tenant=tenant, created_at__gte=thirty_days_ago
-        ).count()
-
-        # Recent checks
-        recent_checks_qs = ComplianceCheck.objects.filter(tenant=tenant).order_by(
-            "-created_at"
-        )[:5]
-        recent_checks = [
-            {
-                "check_id": check.check_id,
-                "check_status": check.check_status,
-                "compliance_score": check.overall_compliance_score,
-                "gaps_found": check.gaps_found,
-                "created_at": check.created_at.isoformat(),
-            }
-            for check in recent_checks_qs
-        ]
-
-        # Top gap types
-        gap_types = (
-            gaps.values("gap_type").annotate(count=Count("id")).order_by("-count")[:5]
-        )
-        top_gap_types = [
-            {"gap_type": gt["gap_type"], "count": gt["count"]} for gt in gap_types
-        ]
-
-        # Trainers needing attention
-        trainers_with_gaps = (
-            gaps.filter(is_resolved=False)
-            .values("trainer_id", "trainer_name")
-            .annotate(gap_count=Count("id"))
-            .order_by("-gap_count")[:5]
-        )
-        trainers_needing_attention = [
-            {
-                "trainer_id": t["trainer_id"],
-                "trainer_name": t["trainer_name"],
-                "unresolved_gaps": t["gap_count"],
-            }
-            for t in trainers_with_gaps
-        ]
-
-        stats = {
-            "total_trainers": total_trainers,
-            "total_qualifications": total_qualifications,
-            "verified_qualifications": verified_qualifications,
-            "expired_qualifications": expired_qualifications,
-            "total_units": total_units,
-            "core_units": core_units,
-            "elective_units": elective_units,
-            "total_assignments": total_assignments,
-            "approved_assignments": approved_assignments,
-            "pending_assignments": pending_assignments,
-            "rejected_assignments": rejected_assignments,
-            "total_gaps": total_gaps,
-            "critical_gaps": critical_gaps,
-            "high_gaps": high_gaps,
-            "unresolved_gaps": unresolved_gaps,
-            "overall_compliance_score": overall_compliance,
-            "compliance_checks_this_month": compliance_checks_this_month,
-            "recent_checks": recent_checks,
-            "top_gap_types": top_gap_types,
-            "trainers_needing_attention": trainers_needing_attention,
-        }
+        rollup = get_rollup("competency_gap", tenant)
+        stats = rollup.data
 
         serializer = DashboardStatsSerializer(data=stats)
         serializer.is_valid(raise_exception=True)
-        return Response(serializer.data)
+        return dashboard_response(serializer.data, rollup)
 
 
 class UnitOfCompetencyViewSet(viewsets.ModelViewSet):
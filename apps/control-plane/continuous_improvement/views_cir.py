@@ -13,6 +13,7 @@ from django.db import transaction
 from django.db.models import Count, Avg, Q, F, Prefetch
 
 from tenants.models import Tenant
+from tenants.resolver import request_tenant
 from .models import ImprovementAction
 from .models_cir import (
     ActionStep,
@@ -59,7 +60,7 @@ class TenantScopedMixin:
         tenant_slug = self.kwargs.get("tenant_slug")
 
         if tenant_slug:
-            return get_object_or_404(Tenant, slug=tenant_slug)
+            return request_tenant(self.request, tenant_slug)
         elif tenant_id:
             return get_object_or_404(Tenant, id=tenant_id)
         else:
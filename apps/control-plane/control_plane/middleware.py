@@ -3,43 +3,45 @@ Custom middleware for tenant context and request processing.
 """
 
 import logging
-import threading
 from typing import Callable
 
 from django.http import HttpRequest, HttpResponse
 from django.utils.deprecation import MiddlewareMixin
 
-logger = logging.getLogger(__name__)
-
-# Thread-local storage for tenant context
-_thread_locals = threading.local()
-
+from tenants.context import (  # noqa: F401
+    get_current_tenant_id,
+    parse_tenant_id,
+    set_current_tenant_id,
+)
+from tenants.resolver import resolve_tenant
 
-def get_current_tenant_id() -> str | None:
-    """Get the current tenant ID from thread-local storage."""
-    return getattr(_thread_locals, "tenant_id", None)
-
-
-def set_current_tenant_id(tenant_id: str | None) -> None:
-    """Set the current tenant ID in thread-local storage."""
-    _thread_locals.tenant_id = tenant_id
+logger = logging.getLogger(__name__)
 
 
 class TenantContextMiddleware(MiddlewareMixin):
     """
     Middleware to extract and set tenant context from request headers.
 
-    Expects X-Tenant-ID header in requests.
+    Expects X-Tenant-ID header in requests, holding a tenant ID (or slug).
+    The tenant ID is kept in a context variable (see tenants.context), so
+    async views and work they hand to tasks or threads see it too.
     """
 
     def process_request(self, request: HttpRequest) -> None:
-        """Extract tenant ID from request header and set in thread-local storage."""
+        """Extract tenant ID from request header and set it as the current tenant."""
         tenant_id = request.headers.get("X-Tenant-ID")
 
         if tenant_id:
-            set_current_tenant_id(tenant_id)
+            current = parse_tenant_id(tenant_id)
+            if current is None:
+                tenant = resolve_tenant(tenant_id)
+                current = str(tenant.pk) if tenant is not None else None
+            set_current_tenant_id(current)
             request.tenant_id = tenant_id
-            logger.debug(f"Tenant context set: {tenant_id}")
+            if current is None:
+                logger.debug(f"Unknown tenant in X-Tenant-ID: {tenant_id}")
+            else:
+                logger.debug(f"Tenant context set: {current}")
         else:
             set_current_tenant_id(None)
             request.tenant_id = None
@@ -53,6 +55,25 @@ class TenantContextMiddleware(MiddlewareMixin):
         return response
 
 
+class TenantResolverMiddleware(MiddlewareMixin):
+    """
+    Middleware to attach the tenant of slug-scoped routes to the request.
+
+    Resolves the tenant_slug URL kwarg once per request (through the tenant
+    cache) and sets request.tenant, or None when no tenant has that slug.
+    The resolved tenant becomes the current tenant.
+    """
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs):
+        """Resolve the tenant named by the URL."""
+        tenant_slug = view_kwargs.get("tenant_slug")
+        if tenant_slug:
+            request.tenant = resolve_tenant(tenant_slug)
+            if request.tenant is not None:
+                set_current_tenant_id(request.tenant.pk)
+        return None
+
+
 class RequestLoggingMiddleware(MiddlewareMixin):
     """
     Middleware to log all incoming requests and responses.
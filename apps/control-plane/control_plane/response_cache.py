@@ -0,0 +1,206 @@
+"""
+Per-tenant response cache for read-heavy reference endpoints.
+
+Decorate a viewset action (or list) with cached_response() to store its
+response data in the shared cache. Entries are keyed by namespace, tenant,
+query parameters and the namespace's data version. Saving or deleting any
+of the listed models bumps the version, so stale entries are never read
+again and simply expire.
+
+Pagination links (``next``/``previous`` of a paginated response) are
+absolute URLs of the request's route and host, so only their query string
+is cached and the links are rebuilt for each request; entries shared
+between tenants never point one tenant at another's route.
+
+Every cached response carries a content ETag; a request whose
+If-None-Match matches gets an empty 304 instead of the payload.
+Permission checks run before the handler, so they still apply to hits.
+"""
+
+import hashlib
+import json
+import logging
+from functools import wraps
+from typing import Dict, Iterable, Optional, Set
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import patch_cache_control
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached response is kept (versions make most entries obsolete sooner)
+RESPONSE_CACHE_TIMEOUT = getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+
+VERSION_KEY = "response_cache:version:{namespace}"
+ENTRY_KEY = "response_cache:{namespace}:{version}:{tenant}:{params}"
+
+# Keys of paginated response data holding links built from the request
+PAGE_LINKS = ("next", "previous")
+
+# Model -> namespaces to invalidate when one of its rows changes
+_dependents: Dict[type, Set[str]] = {}
+
+
+def cached_response(
+    namespace: str,
+    models: Iterable[type] = (),
+    per_tenant: bool = True,
+    timeout: Optional[int] = None,
+):
+    """
+    Cache a viewset handler's 200 responses.
+
+    namespace names the cached data; models are the models it is built
+    from. per_tenant=False shares one entry between tenants (for global
+    reference data).
+    """
+    for model in models:
+        _watch(model, namespace)
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            tenant = _tenant_key(request, kwargs) if per_tenant else ""
+            key = ENTRY_KEY.format(
+                namespace=namespace,
+                version=data_version(namespace),
+                tenant=tenant,
+                params=_params_key(request),
+            )
+
+            entry = _cache_get(key)
+            if entry is None:
+                response = handler(self, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+
+                body = json.dumps(
+                    _relative_links(response.data),
+                    cls=DjangoJSONEncoder,
+                    sort_keys=True,
+                )
+                entry = {
+                    "etag": f'"{hashlib.md5(body.encode()).hexdigest()}"',
+                    "data": json.loads(body),
+                }
+                _cache_set(
+                    key,
+                    entry,
+                    RESPONSE_CACHE_TIMEOUT if timeout is None else timeout,
+                )
+            else:
+                response = Response(_absolute_links(entry["data"], request))
+
+            if entry["etag"] in _if_none_match(request):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+
+            response["ETag"] = entry["etag"]
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def data_version(namespace: str) -> int:
+    """Current data version of a namespace (0 if never invalidated)"""
+    try:
+        return cache.get(VERSION_KEY.format(namespace=namespace), 0)
+    except Exception as e:
+        logger.warning(f"Response cache version unavailable: {e}")
+        return 0
+
+
+def invalidate(namespace: str):
+    """Make every cached response in a namespace obsolete"""
+    key = VERSION_KEY.format(namespace=namespace)
+    try:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Could not invalidate {namespace} responses: {e}")
+
+
+def _watch(model, namespace: str):
+    if model not in _dependents:
+        _dependents[model] = set()
+        uid = f"response_cache:{model._meta.label}"
+        post_save.connect(_model_changed, sender=model, dispatch_uid=uid)
+        post_delete.connect(_model_changed, sender=model, dispatch_uid=uid)
+    _dependents[model].add(namespace)
+
+
+def _model_changed(sender, **kwargs):
+    for namespace in _dependents.get(sender, ()):
+        transaction.on_commit(lambda namespace=namespace: invalidate(namespace))
+
+
+def _tenant_key(request, kwargs) -> str:
+    if kwargs.get("tenant_slug"):
+        return kwargs["tenant_slug"]
+    tenant = getattr(request, "tenant", None)
+    if tenant is not None:
+        return str(getattr(tenant, "pk", tenant))
+    return getattr(request, "tenant_id", None) or ""
+
+
+def _is_page(data) -> bool:
+    return isinstance(data, dict) and "results" in data
+
+
+def _relative_links(data):
+    """Replace page links with their query strings"""
+    if not _is_page(data):
+        return data
+    data = dict(data)
+    for name in PAGE_LINKS:
+        if data.get(name):
+            data[name] = urlsplit(data[name]).query
+    return data
+
+
+def _absolute_links(data, request):
+    """Rebuild page links for this request's route and host"""
+    if not _is_page(data):
+        return data
+    data = dict(data)
+    base = request.build_absolute_uri(request.path)
+    for name in PAGE_LINKS:
+        if data.get(name) is not None:
+            data[name] = f"{base}?{data[name]}" if data[name] else base
+    return data
+
+
+def _params_key(request) -> str:
+    params = sorted(
+        (name, sorted(values)) for name, values in request.query_params.lists()
+    )
+    return hashlib.md5(json.dumps(params).encode()).hexdigest()
+
+
+def _if_none_match(request) -> Set[str]:
+    header = request.META.get("HTTP_IF_NONE_MATCH", "")
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag}
+
+
+def _cache_get(key: str):
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"Response cache read failed: {e}")
+        return None
+
+
+def _cache_set(key: str, entry, timeout: int):
+    try:
+        cache.set(key, entry, timeout)
+    except Exception as e:
+        logger.warning(f"Response cache write failed: {e}")
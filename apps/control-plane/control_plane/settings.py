@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+from celery.schedules import crontab
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # SECURITY WARNING: keep the secret key used in production secret!
@@ -52,6 +54,8 @@ INSTALLED_APPS = [
     "competency_gap",
     "email_assistant",
     "micro_credential",
+    "embeddings",
+    "dashboards",
 ]
 
 MIDDLEWARE = [
@@ -64,6 +68,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "control_plane.middleware.TenantContextMiddleware",
+    "control_plane.middleware.TenantResolverMiddleware",
 ]
 
 ROOT_URLCONF = "control_plane.urls"
@@ -125,6 +130,10 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# Uploaded and generated files (rendered TAS exports)
+MEDIA_URL = "media/"
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", BASE_DIR / "media")
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Frontend URL for email links
@@ -170,6 +179,7 @@ CORS_ALLOW_CREDENTIALS = True
 # REST Framework Configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "tenants.authentication.TenantAPIKeyAuthentication",
         "rest_framework.authentication.TokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
@@ -186,6 +196,7 @@ REST_FRAMEWORK = {
     "DEFAULT_THROTTLE_CLASSES": [
         "rest_framework.throttling.AnonRateThrottle",
         "rest_framework.throttling.UserRateThrottle",
+        "control_plane.throttling.TenantQuotaThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/hour",
@@ -212,6 +223,18 @@ CELERY_BEAT_SCHEDULE = {
         "task": "audit.tasks.process_outbox",
         "schedule": 60.0,
     },
+    "build-pathway-recommenders-nightly": {
+        "task": "adaptive_pathway.tasks.build_pathway_recommenders",
+        "schedule": crontab(hour=2, minute=0),
+    },
+    "refresh-dashboard-rollups-every-60-seconds": {
+        "task": "dashboards.tasks.refresh_dashboard_rollups",
+        "schedule": 60.0,
+    },
+    "flush-quota-counters-every-60-seconds": {
+        "task": "tenants.tasks.flush_quota_counters",
+        "schedule": 60.0,
+    },
 }
 
 # Logging Configuration
@@ -290,3 +313,13 @@ CACHES = {
 # Session Configuration
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
+
+# Embeddings Configuration
+# Backend: "hashing" (CPU, no model), "sentence_transformers" or "gateway"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "hashing")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+# The gateway only serves OpenAI text-embedding-* models
+EMBEDDING_GATEWAY_MODEL = os.getenv("EMBEDDING_GATEWAY_MODEL", "text-embedding-3-small")
+EMBEDDING_DIMENSION = 384
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+AI_GATEWAY_URL = os.getenv("AI_GATEWAY_URL", "http://localhost:8080")
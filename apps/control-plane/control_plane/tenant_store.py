@@ -0,0 +1,124 @@
+"""
+Per-process, per-tenant caches of objects that are expensive to build.
+
+A TenantStore keeps one object per tenant (a graph, a matrix, ...) in
+process memory. Processes share a generation counter per tenant in the
+cache: a process that changes a tenant's data bumps it, and every other
+process reloads its copy when it next notices the new generation (it
+looks at most every check_interval seconds). Objects are also reloaded
+after max_age seconds in case a bump was lost.
+
+A process can patch its own copy in place and bump the generation with
+apply(); if no other process bumped in between, it keeps its copy
+instead of reloading it.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class TenantStore:
+    """
+    Base class of per-process tenant object caches.
+
+    Subclasses set generation_key (formatted with ``tenant``), name (for
+    log messages), check_interval and max_age, and implement load().
+    """
+
+    generation_key: str
+    name: str = "Tenant store"
+    check_interval: float = 30
+    max_age: float = 900
+
+    def __init__(
+        self, check_interval: Optional[float] = None, max_age: Optional[float] = None
+    ):
+        if check_interval is not None:
+            self.check_interval = check_interval
+        if max_age is not None:
+            self.max_age = max_age
+        # tenant -> [object, generation, loaded_at, checked_at]
+        self._entries: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def load(self, tenant: str) -> Any:
+        """Build the tenant's object from the database"""
+        raise NotImplementedError
+
+    def get(self, tenant: str) -> Any:
+        """Return the tenant's object, reloading it if another process changed it"""
+        now = time.monotonic()
+        entry = self._entries.get(tenant)
+        if entry is not None and now - entry[3] < self.check_interval:
+            return entry[0]
+
+        with self._lock:
+            entry = self._entries.get(tenant)
+            generation = self._generation(tenant)
+
+            if (
+                entry is None
+                or generation != entry[1]
+                or now - entry[2] >= self.max_age
+            ):
+                entry = [self.load(tenant), generation, time.monotonic(), 0.0]
+                self._entries[tenant] = entry
+
+            entry[3] = time.monotonic()
+            return entry[0]
+
+    def apply(self, tenant: str, update: Callable[[Any], None]) -> None:
+        """Apply a change to the local object and tell other processes"""
+        with self._lock:
+            entry = self._entries.get(tenant)
+            if entry is not None:
+                update(entry[0])
+
+            generation = self._bump(tenant)
+
+            # Only adopt the new generation if no other process bumped in
+            # between; otherwise the next get() reloads
+            if entry is not None and is_next(entry[1], generation):
+                entry[1] = generation
+
+    def mark_changed(self, tenant: str) -> None:
+        """Drop the local object and tell other processes to drop theirs"""
+        with self._lock:
+            self._entries.pop(tenant, None)
+            self._bump(tenant)
+
+    def invalidate(self, tenant: Optional[str] = None) -> None:
+        with self._lock:
+            if tenant is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(tenant, None)
+
+    def _generation(self, tenant: str):
+        try:
+            return cache.get(self.generation_key.format(tenant=tenant))
+        except Exception as e:
+            logger.warning(f"{self.name} generation unavailable: {e}")
+            return None
+
+    def _bump(self, tenant: str):
+        key = self.generation_key.format(tenant=tenant)
+        try:
+            if cache.add(key, 1, timeout=None):
+                return 1
+            return cache.incr(key)
+        except Exception as e:
+            logger.warning(f"Could not bump {self.name.lower()} generation: {e}")
+            return None
+
+
+def is_next(previous, current) -> bool:
+    if current is None:
+        return False
+    return (previous or 0) + 1 == current
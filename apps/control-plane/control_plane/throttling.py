@@ -0,0 +1,39 @@
+"""
+DRF throttles for tenant routes.
+"""
+
+import logging
+
+from rest_framework.throttling import BaseThrottle
+
+from tenants.quotas import charge
+
+logger = logging.getLogger(__name__)
+
+
+class TenantQuotaThrottle(BaseThrottle):
+    """
+    Charges slug-scoped API requests to the tenant's monthly quota.
+
+    DRF checks throttles after authentication and permissions, so only
+    requests that pass them are charged: anonymous callers and bad API
+    keys cannot use up a tenant's quota. Requests over the tenant's API
+    call limit get a 429 response.
+    """
+
+    def allow_request(self, request, view):
+        tenant = getattr(request._request, "tenant", None)
+        if tenant is None or not (request.user and request.user.is_authenticated):
+            return True
+
+        allowed, used, limit = charge(tenant)
+        if not allowed:
+            # Imported here: .exceptions imports rest_framework.views, which
+            # imports the throttle classes
+            from .exceptions import QuotaExceededError
+
+            logger.info(f"API quota exceeded for tenant {tenant.pk}")
+            raise QuotaExceededError(
+                f"API quota exceeded ({used} of {limit} calls this month)."
+            )
+        return True
@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import DashboardRollup
+
+
+@admin.register(DashboardRollup)
+class DashboardRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "dashboard",
+        "tenant",
+        "computed_at",
+        "compute_seconds",
+        "stale_since",
+    )
+    list_filter = ("dashboard",)
+    search_fields = ("tenant",)
+    readonly_fields = ("computed_at", "compute_seconds", "stale_since")
@@ -0,0 +1,69 @@
+# Generated by Django 5.1.13 on 2026-10-18 23:25
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dashboard", models.CharField(max_length=100)),
+                (
+                    "tenant",
+                    models.CharField(
+                        blank=True,
+                        help_text="Tenant key; blank for all tenants",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "data",
+                    models.JSONField(
+                        default=dict,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                    ),
+                ),
+                ("computed_at", models.DateTimeField()),
+                ("compute_seconds", models.FloatField(default=0.0)),
+                (
+                    "stale_since",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="First source change not yet reflected",
+                        null=True,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["stale_since"], name="dashboards__stale_s_bab899_idx"
+                    ),
+                    models.Index(
+                        fields=["computed_at"], name="dashboards__compute_173db8_idx"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("dashboard", "tenant"), name="unique_rollup_per_tenant"
+                    )
+                ],
+            },
+        ),
+    ]
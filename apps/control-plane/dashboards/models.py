@@ -0,0 +1,37 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class DashboardRollup(models.Model):
+    """
+    Precomputed dashboard payload for one tenant.
+
+    Rows are marked stale when a source model changes and recomputed by the
+    refresh task, or on read once they are too stale to serve.
+    """
+
+    dashboard = models.CharField(max_length=100)
+    tenant = models.CharField(
+        max_length=100, blank=True, help_text="Tenant key; blank for all tenants"
+    )
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+
+    computed_at = models.DateTimeField()
+    compute_seconds = models.FloatField(default=0.0)
+    stale_since = models.DateTimeField(
+        null=True, blank=True, help_text="First source change not yet reflected"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dashboard", "tenant"], name="unique_rollup_per_tenant"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["stale_since"]),
+            models.Index(fields=["computed_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.dashboard} ({self.tenant or 'all tenants'})"
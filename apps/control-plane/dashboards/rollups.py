@@ -0,0 +1,220 @@
+"""
+Materialised dashboard rollups.
+
+Each dashboard registers a compute function (usually a handful of
+conditional aggregates) and the models it reads. The computed payload is
+stored per tenant in DashboardRollup, so serving a dashboard is one
+indexed read instead of a COUNT per metric.
+
+When a source model is saved or deleted, the affected tenant's rollup
+(and the all-tenants rollup) is marked stale. The refresh task recomputes
+stale rollups in the background; a read only recomputes synchronously if
+the rollup has been stale for longer than MAX_STALENESS, or is older than
+MAX_AGE (time-windowed metrics such as "last 30 days" drift otherwise).
+
+Dashboard views return rollup data with dashboard_response(), which adds
+Last-Modified and Cache-Control headers.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+# Seconds a rollup may lag behind its sources before a read recomputes it
+MAX_STALENESS = getattr(settings, "DASHBOARD_ROLLUP_MAX_STALENESS", 60)
+
+# Seconds after which even an unchanged rollup is recomputed
+MAX_AGE = getattr(settings, "DASHBOARD_ROLLUP_MAX_AGE", 900)
+
+# Tenant key of rollups covering every tenant
+ALL_TENANTS = ""
+
+ComputeFunction = Callable[[str], Dict[str, Any]]
+
+_dashboards: Dict[str, ComputeFunction] = {}
+
+# Dashboards that may be computed for ALL_TENANTS
+_all_tenant_dashboards = set()
+
+
+@dataclass
+class Rollup:
+    dashboard: str
+    tenant: str
+    data: Dict[str, Any]
+    computed_at: datetime
+
+
+def tenant_key(tenant) -> str:
+    """Rollup key for a tenant slug, Tenant instance or None (all tenants)"""
+    if tenant is None:
+        return ALL_TENANTS
+    if hasattr(tenant, "pk"):
+        return str(tenant.pk)
+    return str(tenant)
+
+
+def register(
+    name: str, sources: Dict[Any, Callable[[Any], Any]], all_tenants: bool = False
+):
+    """
+    Register a dashboard compute function.
+
+    sources maps each model the dashboard reads to a function returning the
+    tenant of a changed instance (or None if a change affects every tenant).
+    The compute function receives the tenant key. Only dashboards
+    registered with all_tenants=True may be asked for ALL_TENANTS (no
+    tenant filter); the others need a tenant.
+    """
+
+    def decorator(compute: ComputeFunction) -> ComputeFunction:
+        _dashboards[name] = compute
+        if all_tenants:
+            _all_tenant_dashboards.add(name)
+        else:
+            _all_tenant_dashboards.discard(name)
+        for model, tenant_of in sources.items():
+            handler = _source_handler(name, tenant_of)
+            uid = f"dashboards:{name}:{model._meta.label}"
+            post_save.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+            post_delete.connect(handler, sender=model, weak=False, dispatch_uid=uid)
+        return compute
+
+    return decorator
+
+
+def _source_handler(name: str, tenant_of: Callable[[Any], Any]):
+    def handler(sender, instance, **kwargs):
+        try:
+            tenant = tenant_of(instance)
+        except Exception:
+            # e.g. the parent row is already gone; refresh every tenant
+            tenant = None
+        transaction.on_commit(lambda: mark_stale(name, tenant))
+
+    return handler
+
+
+def mark_stale(name: str, tenant=None) -> int:
+    """Mark a tenant's rollup (and the all-tenants one) stale; None marks all"""
+    from .models import DashboardRollup
+
+    rollups = DashboardRollup.objects.filter(dashboard=name, stale_since__isnull=True)
+    if tenant is not None:
+        rollups = rollups.filter(tenant__in=[tenant_key(tenant), ALL_TENANTS])
+    return rollups.update(stale_since=timezone.now())
+
+
+def get_rollup(name: str, tenant=None) -> Rollup:
+    """Return a dashboard's rollup, recomputing it if it is too stale to serve"""
+    from .models import DashboardRollup
+
+    key = _checked_key(name, tenant)
+    row = (
+        DashboardRollup.objects.filter(dashboard=name, tenant=key)
+        .values("data", "computed_at", "stale_since")
+        .first()
+    )
+
+    if row is not None:
+        now = timezone.now()
+        fresh = now - row["computed_at"] < timedelta(seconds=MAX_AGE)
+        if row["stale_since"] is not None:
+            fresh = fresh and now - row["stale_since"] < timedelta(
+                seconds=MAX_STALENESS
+            )
+        if fresh:
+            return Rollup(name, key, row["data"], row["computed_at"])
+
+    return refresh(name, key)
+
+
+def refresh(name: str, tenant=None) -> Rollup:
+    """Recompute and store a dashboard rollup"""
+    from .models import DashboardRollup
+
+    compute = _dashboards[name]
+    key = _checked_key(name, tenant)
+
+    started_at = timezone.now()
+    start = time.perf_counter()
+    data = compute(key)
+    elapsed = time.perf_counter() - start
+
+    DashboardRollup.objects.update_or_create(
+        dashboard=name,
+        tenant=key,
+        defaults={
+            "data": data,
+            "computed_at": started_at,
+            "compute_seconds": round(elapsed, 4),
+        },
+    )
+    # Changes made while computing keep the rollup stale
+    DashboardRollup.objects.filter(
+        dashboard=name, tenant=key, stale_since__lt=started_at
+    ).update(stale_since=None)
+
+    logger.debug(f"Refreshed {name} dashboard for {key or 'all tenants'}")
+
+    # Convert to JSON types so fresh and stored rollups look alike
+    data = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+    return Rollup(name, key, data, started_at)
+
+
+def refresh_due(limit: Optional[int] = None) -> int:
+    """
+    Recompute stale rollups, longest stale first.
+
+    Expired but unchanged rollups are left to be recomputed on their next
+    read, so dashboards nobody opens cost nothing.
+    """
+    from .models import DashboardRollup
+
+    due = (
+        DashboardRollup.objects.filter(stale_since__isnull=False)
+        .order_by("stale_since")
+        .values_list("dashboard", "tenant")
+    )
+    if limit:
+        due = due[:limit]
+
+    refreshed = 0
+    for name, key in due:
+        if name not in _dashboards:
+            continue
+        try:
+            refresh(name, key)
+            refreshed += 1
+        except Exception as e:
+            logger.error(f"Failed to refresh {name} dashboard for {key!r}: {e}")
+    return refreshed
+
+
+def _checked_key(name: str, tenant) -> str:
+    key = tenant_key(tenant)
+    if key == ALL_TENANTS and name not in _all_tenant_dashboards:
+        raise ValueError(f"The {name} dashboard needs a tenant")
+    return key
+
+
+def dashboard_response(data: Dict[str, Any], rollup: Rollup) -> Response:
+    """Response for rollup data with caching headers"""
+    response = Response(data)
+    response["Last-Modified"] = http_date(rollup.computed_at.timestamp())
+    patch_cache_control(response, private=True, max_age=MAX_STALENESS)
+    return response
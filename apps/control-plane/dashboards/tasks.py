@@ -0,0 +1,22 @@
+from celery import shared_task
+import logging
+
+from .rollups import refresh_due
+
+logger = logging.getLogger(__name__)
+
+# Rollups recomputed per run, oldest first
+REFRESH_BATCH = 500
+
+
+@shared_task
+def refresh_dashboard_rollups():
+    """
+    Recompute stale dashboard rollups.
+
+    Scheduled every minute via Celery Beat.
+    """
+    refreshed = refresh_due(limit=REFRESH_BATCH)
+    if refreshed:
+        logger.info(f"Refreshed {refreshed} dashboard rollups")
+    return refreshed
@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from . import rollups
+from .models import DashboardRollup
+from .rollups import ALL_TENANTS, get_rollup, mark_stale, refresh_due, register
+
+computed = []
+
+
+@register("test_dashboard", sources={}, all_tenants=True)
+def compute_test_dashboard(tenant):
+    computed.append(tenant)
+    return {"tenant": tenant, "computations": len(computed)}
+
+
+@register("test_tenant_dashboard", sources={})
+def compute_test_tenant_dashboard(tenant):
+    return {"tenant": tenant}
+
+
+class DashboardRollupTests(TestCase):
+    """Test materialised rollups and stale refresh"""
+
+    def setUp(self):
+        computed.clear()
+
+    def test_first_read_computes_and_stores(self):
+        rollup = get_rollup("test_dashboard", "acme")
+
+        self.assertEqual(rollup.data, {"tenant": "acme", "computations": 1})
+        row = DashboardRollup.objects.get(dashboard="test_dashboard", tenant="acme")
+        self.assertIsNone(row.stale_since)
+        self.assertEqual(row.data["computations"], 1)
+
+    def test_fresh_rollup_is_served_without_recomputing(self):
+        get_rollup("test_dashboard", "acme")
+        rollup = get_rollup("test_dashboard", "acme")
+
+        self.assertEqual(computed, ["acme"])
+        self.assertEqual(rollup.data["computations"], 1)
+
+    def test_recently_stale_rollup_is_served_until_refreshed(self):
+        get_rollup("test_dashboard", "acme")
+        mark_stale("test_dashboard", "acme")
+
+        self.assertEqual(get_rollup("test_dashboard", "acme").data["computations"], 1)
+
+        self.assertEqual(refresh_due(), 1)
+        self.assertEqual(get_rollup("test_dashboard", "acme").data["computations"], 2)
+        self.assertEqual(refresh_due(), 0)
+
+    def test_long_stale_rollup_is_recomputed_on_read(self):
+        get_rollup("test_dashboard", "acme")
+        DashboardRollup.objects.update(
+            stale_since=timezone.now() - timedelta(seconds=rollups.MAX_STALENESS + 1)
+        )
+
+        self.assertEqual(get_rollup("test_dashboard", "acme").data["computations"], 2)
+
+    def test_expired_rollup_is_recomputed_on_read(self):
+        get_rollup("test_dashboard", "acme")
+        DashboardRollup.objects.update(
+            computed_at=timezone.now() - timedelta(seconds=rollups.MAX_AGE + 1)
+        )
+
+        self.assertEqual(get_rollup("test_dashboard", "acme").data["computations"], 2)
+
+    def test_tenant_dashboard_needs_a_tenant(self):
+        self.assertEqual(
+            get_rollup("test_tenant_dashboard", "acme").data, {"tenant": "acme"}
+        )
+        with self.assertRaises(ValueError):
+            get_rollup("test_tenant_dashboard", None)
+        self.assertFalse(
+            DashboardRollup.objects.filter(
+                dashboard="test_tenant_dashboard", tenant=ALL_TENANTS
+            ).exists()
+        )
+
+    def test_mark_stale_touches_tenant_and_all_tenants_rollups(self):
+        for tenant in ("acme", "globex", None):
+            get_rollup("test_dashboard", tenant)
+
+        self.assertEqual(mark_stale("test_dashboard", "acme"), 2)
+        stale = set(
+            DashboardRollup.objects.filter(stale_since__isnull=False).values_list(
+                "tenant", flat=True
+            )
+        )
+        self.assertEqual(stale, {"acme", ALL_TENANTS})
+
+        self.assertEqual(mark_stale("test_dashboard"), 1)
@@ -5,3 +5,6 @@ class EmailAssistantConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "email_assistant"
     verbose_name = "Email/Message Assistant"
+
+    def ready(self):
+        from . import rollups  # noqa: F401
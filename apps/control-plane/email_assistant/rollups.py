@@ -0,0 +1,100 @@
+"""
+Dashboard rollup for the email/message assistant.
+"""
+
+from django.db.models import Avg, Count, Q, Sum
+
+from dashboards.rollups import register
+
+from .models import DraftReply, MessageTemplate, ReplyHistory, StudentMessage
+from .serializers import (
+    DraftReplyListSerializer,
+    MessageTemplateListSerializer,
+    StudentMessageListSerializer,
+)
+
+PRIORITIES = ["urgent", "high", "medium", "low"]
+SENTIMENTS = ["positive", "neutral", "negative"]
+
+
+@register(
+    "email_assistant",
+    sources={
+        StudentMessage: lambda message: message.tenant,
+        DraftReply: lambda draft: draft.student_message.tenant,
+        MessageTemplate: lambda template: template.tenant,
+        ReplyHistory: lambda history: history.student_message.tenant,
+    },
+)
+def compute_dashboard(tenant):
+    """Dashboard statistics with one aggregate per table"""
+    messages = StudentMessage.objects.filter(tenant=tenant)
+    message_counts = messages.aggregate(
+        total=Count("id"),
+        new=Count("id", filter=Q(status="new")),
+        draft_generated=Count("id", filter=Q(status="draft_generated")),
+        replied=Count("id", filter=Q(status="replied")),
+        **{
+            f"priority_{priority}": Count("id", filter=Q(priority=priority))
+            for priority in PRIORITIES
+        },
+        **{
+            f"sentiment_{sentiment}": Count(
+                "id", filter=Q(detected_sentiment=sentiment)
+            )
+            for sentiment in SENTIMENTS
+        },
+    )
+
+    drafts = DraftReply.objects.filter(student_message__tenant=tenant)
+    draft_counts = drafts.aggregate(
+        total=Count("id"),
+        sent=Count("id", filter=Q(was_sent=True)),
+        rejected=Count("id", filter=Q(was_rejected=True)),
+        avg_confidence=Avg("confidence_score"),
+    )
+
+    templates = MessageTemplate.objects.filter(tenant=tenant)
+    template_counts = templates.aggregate(
+        total=Count("id"), active=Count("id", filter=Q(is_active=True))
+    )
+
+    history = ReplyHistory.objects.filter(student_message__tenant=tenant).aggregate(
+        total=Count("id"),
+        time_saved=Sum("time_saved_seconds"),
+        avg_time_saved=Avg("time_saved_seconds"),
+        avg_time_saved_pct=Avg("time_saved_percentage"),
+    )
+
+    recent_messages = messages.order_by("-received_date")[:10]
+    recent_drafts = drafts.order_by("-generated_at")[:10]
+    top_templates = templates.filter(is_active=True).order_by("-usage_count")[:5]
+
+    return {
+        "total_messages": message_counts["total"],
+        "new_messages": message_counts["new"],
+        "draft_generated": message_counts["draft_generated"],
+        "replied_messages": message_counts["replied"],
+        "total_drafts": draft_counts["total"],
+        "drafts_sent": draft_counts["sent"],
+        "drafts_rejected": draft_counts["rejected"],
+        "avg_confidence_score": round(draft_counts["avg_confidence"] or 0.0, 2),
+        "total_templates": template_counts["total"],
+        "active_templates": template_counts["active"],
+        "total_time_saved_hours": round((history["time_saved"] or 0) / 3600, 2),
+        "avg_time_saved_per_reply_seconds": int(history["avg_time_saved"] or 0),
+        "time_saved_percentage": round(history["avg_time_saved_pct"] or 0, 1),
+        "total_replies_sent": history["total"],
+        "messages_by_priority": {
+            priority: message_counts[f"priority_{priority}"] for priority in PRIORITIES
+        },
+        "messages_by_sentiment": {
+            sentiment: message_counts[f"sentiment_{sentiment}"]
+            for sentiment in SENTIMENTS
+        },
+        "recent_messages": StudentMessageListSerializer(
+            recent_messages, many=True
+        ).data,
+        "recent_drafts": DraftReplyListSerializer(recent_drafts, many=True).data,
+        "top_templates": MessageTemplateListSerializer(top_templates, many=True).data,
+    }
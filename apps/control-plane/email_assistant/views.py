@@ -2,11 +2,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db.models import Avg, Count, Sum, Q
+from django.db.models import Count, Q
 import random
 import time
 from datetime import timedelta
 
+from dashboards.rollups import dashboard_response, get_rollup
+
 from .models import (
     StudentMessage,
     DraftReply,
@@ -475,87 +477,13 @@ class StudentMessageViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Message statistics
-        messages = StudentMessage.objects.filter(tenant=tenant)
-        total_messages = messages.count()
-        new_messages = messages.filter(status="new").count()
-        draft_generated = messages.filter(status="draft_generated").count()
-        replied_messages = messages.filter(status="replied").count()
-
-        # Draft statistics
-        drafts = DraftReply.objects.filter(student_message__tenant=tenant)
-        total_drafts = drafts.count()
-        drafts_sent = drafts.filter(was_sent=True).count()
-        drafts_rejected = drafts.filter(was_rejected=True).count()
-        avg_confidence = drafts.aggregate(avg=Avg("confidence_score"))["avg"] or 0.0
-
-        # Template statistics
-        templates = MessageTemplate.objects.filter(tenant=tenant)
-        total_templates = templates.count()
-        active_templates = templates.filter(is_active=True).count()
-
-        # Time saved statistics
-        history = ReplyHistory.objects.filter(student_message__tenant=tenant)
-        total_time_saved = (
-            history.aggregate(total=Sum("time_saved_seconds"))["total"] or 0
-        )
-        total_time_saved_hours = total_time_saved / 3600
-        avg_time_saved = history.aggregate(avg=Avg("time_saved_seconds"))["avg"] or 0
-        avg_time_saved_pct = (
-            history.aggregate(avg=Avg("time_saved_percentage"))["avg"] or 0
-        )
-        total_replies_sent = history.count()
-
-        # Messages by priority
-        messages_by_priority = {
-            "urgent": messages.filter(priority="urgent").count(),
-            "high": messages.filter(priority="high").count(),
-            "medium": messages.filter(priority="medium").count(),
-            "low": messages.filter(priority="low").count(),
-        }
-
-        # Messages by sentiment
-        messages_by_sentiment = {
-            "positive": messages.filter(detected_sentiment="positive").count(),
-            "neutral": messages.filter(detected_sentiment="neutral").count(),
-            "negative": messages.filter(detected_sentiment="negative").count(),
-        }
-
-        # Recent data
-        recent_messages = messages.order_by("-received_date")[:10]
-        recent_drafts = drafts.order_by("-generated_at")[:10]
-        top_templates = templates.filter(is_active=True).order_by("-usage_count")[:5]
-
-        dashboard_data = {
-            "total_messages": total_messages,
-            "new_messages": new_messages,
-            "draft_generated": draft_generated,
-            "replied_messages": replied_messages,
-            "total_drafts": total_drafts,
-            "drafts_sent": drafts_sent,
-            "drafts_rejected": drafts_rejected,
-            "avg_confidence_score": round(avg_confidence, 2),
-            "total_templates": total_templates,
-            "active_templates": active_templates,
-            "total_time_saved_hours": round(total_time_saved_hours, 2),
-            "avg_time_saved_per_reply_seconds": int(avg_time_saved),
-            "time_saved_percentage": round(avg_time_saved_pct, 1),
-            "total_replies_sent": total_replies_sent,
-            "messages_by_priority": messages_by_priority,
-            "messages_by_sentiment": messages_by_sentiment,
-            "recent_messages": StudentMessageListSerializer(
-                recent_messages, many=True
-            ).data,
-            "recent_drafts": DraftReplyListSerializer(recent_drafts, many=True).data,
-            "top_templates": MessageTemplateListSerializer(
-                top_templates, many=True
-            ).data,
-        }
+        rollup = get_rollup("email_assistant", tenant)
+        dashboard_data = rollup.data
 
         serializer = DashboardStatsSerializer(data=dashboard_data)
         serializer.is_valid(raise_exception=True)
 
-        return Response(serializer.data)
+        return dashboard_response(serializer.data, rollup)
 
 
 class DraftReplyViewSet(viewsets.ModelViewSet):
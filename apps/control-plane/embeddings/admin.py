@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import StoredEmbedding
+
+
+@admin.register(StoredEmbedding)
+class StoredEmbeddingAdmin(admin.ModelAdmin):
+    list_display = ("content_hash", "model", "dimension", "created_at")
+    list_filter = ("model",)
+    search_fields = ("content_hash",)
+    readonly_fields = ("content_hash", "model", "dimension", "created_at")
+    exclude = ("vector",)
@@ -0,0 +1,185 @@
+"""
+Embedding backends.
+
+A backend turns a batch of texts into fixed-dimension vectors. The service
+in embeddings.service handles batching, deduplication and caching, so
+backends only ever see texts that actually need computing.
+
+* ``hashing`` - deterministic feature-hashing vectors computed on the CPU
+  with no model download; the default for development and tests
+* ``sentence_transformers`` - a local sentence-transformers model
+  (optional dependency)
+* ``gateway`` - the AI gateway's /v1/embeddings endpoint, with its own
+  model setting (EMBEDDING_GATEWAY_MODEL) since the gateway only serves
+  text-embedding-* models
+"""
+
+import hashlib
+import logging
+import math
+import re
+import threading
+from typing import Dict, List, Sequence
+
+import requests
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BACKEND = getattr(settings, "EMBEDDING_BACKEND", "hashing")
+EMBEDDING_MODEL = getattr(settings, "EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_DIMENSION = getattr(settings, "EMBEDDING_DIMENSION", 384)
+
+AI_GATEWAY_URL = getattr(settings, "AI_GATEWAY_URL", "http://localhost:8080")
+GATEWAY_MODEL = getattr(settings, "EMBEDDING_GATEWAY_MODEL", "text-embedding-3-small")
+GATEWAY_TIMEOUT = getattr(settings, "EMBEDDING_GATEWAY_TIMEOUT", 30)
+GATEWAY_TENANT_ID = getattr(settings, "EMBEDDING_GATEWAY_TENANT_ID", "control-plane")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class EmbeddingError(Exception):
+    """Raised when a backend cannot produce embeddings"""
+
+
+class EmbeddingBackend:
+    """Base class for embedding backends"""
+
+    name = "base"
+
+    def __init__(
+        self, model: str = EMBEDDING_MODEL, dimension: int = EMBEDDING_DIMENSION
+    ):
+        self.model = model
+        self.dimension = dimension
+
+    @property
+    def model_name(self) -> str:
+        """Identifier stored with each vector; changes invalidate the cache"""
+        return f"{self.name}:{self.model}:{self.dimension}"
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed a batch of texts, returning one vector per text"""
+        raise NotImplementedError
+
+
+class HashingBackend(EmbeddingBackend):
+    """
+    Feature-hashed bag of words and bigrams, L2-normalised.
+
+    Texts sharing vocabulary get a high cosine similarity, which is enough
+    for development, tests and as a fallback when no model is available.
+    """
+
+    name = "hashing"
+
+    def __init__(self, model: str = "hashing-v1", dimension: int = EMBEDDING_DIMENSION):
+        super().__init__(model, dimension)
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        tokens = _TOKEN_RE.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+        for feature in features:
+            digest = int.from_bytes(
+                hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+            )
+            sign = 1.0 if digest >> 63 else -1.0
+            vector[digest % self.dimension] += sign
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm:
+            vector = [v / norm for v in vector]
+        return vector
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """Local sentence-transformers model, loaded once per process"""
+
+    name = "sentence_transformers"
+
+    _models: Dict[str, object] = {}
+    _lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self.model not in self._models:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError:
+                    raise ImproperlyConfigured(
+                        "EMBEDDING_BACKEND is 'sentence_transformers' but the "
+                        "sentence-transformers package is not installed"
+                    )
+                logger.info(f"Loading embedding model {self.model}")
+                self._models[self.model] = SentenceTransformer(self.model, device="cpu")
+            return self._models[self.model]
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        vectors = self._load().encode(
+            list(texts), batch_size=len(texts), normalize_embeddings=True
+        )
+        return [list(map(float, vector)) for vector in vectors]
+
+
+class GatewayBackend(EmbeddingBackend):
+    """Embeddings from the AI gateway (OpenAI-compatible /v1/embeddings)"""
+
+    name = "gateway"
+
+    def __init__(
+        self,
+        model: str = GATEWAY_MODEL,
+        dimension: int = EMBEDDING_DIMENSION,
+        url: str = AI_GATEWAY_URL,
+        timeout: float = GATEWAY_TIMEOUT,
+        tenant_id: str = GATEWAY_TENANT_ID,
+    ):
+        super().__init__(model, dimension)
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.tenant_id = tenant_id
+        self._session = requests.Session()
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        try:
+            response = self._session.post(
+                f"{self.url}/v1/embeddings",
+                json={
+                    "model": self.model,
+                    "input": list(texts),
+                    "dimensions": self.dimension,
+                    "tenant_id": self.tenant_id,
+                },
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()["data"]
+        except (requests.RequestException, KeyError, ValueError) as e:
+            raise EmbeddingError(f"Gateway embedding request failed: {e}")
+
+        data = sorted(data, key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+
+BACKENDS = {
+    HashingBackend.name: HashingBackend,
+    SentenceTransformerBackend.name: SentenceTransformerBackend,
+    GatewayBackend.name: GatewayBackend,
+}
+
+
+def get_backend(name: str = EMBEDDING_BACKEND) -> EmbeddingBackend:
+    """Instantiate the configured backend"""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Unknown EMBEDDING_BACKEND {name!r}; expected one of {sorted(BACKENDS)}"
+        )
+    return backend_class()
@@ -0,0 +1,54 @@
+"""
+Management command to measure embedding throughput
+Usage: python manage.py benchmark_embeddings [--texts 500] [--batch-sizes 1,8,32,64]
+"""
+
+import json
+import random
+
+from django.core.management.base import BaseCommand
+
+from embeddings.backends import get_backend
+from embeddings.service import EmbeddingService
+
+SAMPLE_SENTENCES = [
+    "The learner demonstrated safe work practices when operating equipment.",
+    "Evidence shows the candidate can interpret workplace documentation.",
+    "The assessment task requires a written report on risk controls.",
+    "Students must complete the practical observation in a simulated workplace.",
+    "The trainer holds current industry experience relevant to the unit.",
+    "Feedback was provided on the structure and referencing of the essay.",
+]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the configured embedding backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--texts", type=int, default=500, help="Number of texts to embed"
+        )
+        parser.add_argument(
+            "--batch-sizes",
+            type=str,
+            default="1,8,32,64",
+            help="Comma-separated batch sizes to time",
+        )
+        parser.add_argument(
+            "--backend", type=str, default=None, help="Override EMBEDDING_BACKEND"
+        )
+
+    def handle(self, *args, **options):
+        backend = get_backend(options["backend"]) if options["backend"] else None
+        service = EmbeddingService(backend=backend, persist=False)
+        batch_sizes = [int(size) for size in options["batch_sizes"].split(",")]
+
+        rng = random.Random(0)
+        texts = [
+            " ".join(rng.sample(SAMPLE_SENTENCES, k=3)) + f" Submission {i}."
+            for i in range(options["texts"])
+        ]
+
+        self.stdout.write(f"Benchmarking {service.model_name} on {len(texts)} texts...")
+        results = service.benchmark(texts, batch_sizes)
+        self.stdout.write(json.dumps(results, indent=2))
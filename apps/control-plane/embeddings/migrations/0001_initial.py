@@ -0,0 +1,54 @@
+# Generated by Django 5.1.13 on 2026-10-18 23:04
+
+import pgvector.django
+import pgvector.django.vector
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        pgvector.django.VectorExtension(),
+        migrations.CreateModel(
+            name="StoredEmbedding",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(
+                        help_text="SHA-256 of the normalised text", max_length=64
+                    ),
+                ),
+                (
+                    "model",
+                    models.CharField(
+                        help_text="Backend, model and dimension the vector came from",
+                        max_length=200,
+                    ),
+                ),
+                ("dimension", models.IntegerField()),
+                ("vector", pgvector.django.vector.VectorField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("model", "content_hash"),
+                        name="unique_embedding_per_model",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import models
+from pgvector.django import VectorField
+
+
+class StoredEmbedding(models.Model):
+    """
+    Persistent embedding cache keyed by content hash.
+
+    The same text embedded with the same backend/model is computed once and
+    shared by every feature that needs it.
+    """
+
+    content_hash = models.CharField(
+        max_length=64, help_text="SHA-256 of the normalised text"
+    )
+    model = models.CharField(
+        max_length=200, help_text="Backend, model and dimension the vector came from"
+    )
+    dimension = models.IntegerField()
+    vector = VectorField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["model", "content_hash"], name="unique_embedding_per_model"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.content_hash[:12]}"
@@ -0,0 +1,244 @@
+"""
+Shared embedding service.
+
+Every feature that needs text embeddings goes through one EmbeddingService:
+
+* texts are normalised and hashed, so identical content is embedded once
+  no matter how many submissions, documents or answers contain it
+* vectors are looked up in a per-process LRU, then in the StoredEmbedding
+  table, and only the remainder is sent to the backend
+* the backend is called in batches of EMBEDDING_BATCH_SIZE texts
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+
+from .backends import EmbeddingBackend, EmbeddingError, get_backend
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = getattr(settings, "EMBEDDING_BATCH_SIZE", 64)
+
+# Maximum vectors held in the in-process tier
+LOCAL_MAX_ENTRIES = getattr(settings, "EMBEDDING_LOCAL_MAX_ENTRIES", 5000)
+
+
+def normalise_text(text: Optional[str]) -> str:
+    """Collapse whitespace so trivially different copies share a hash"""
+    return " ".join((text or "").split())
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors (0.0 if either is empty or zero)"""
+    if a is None or b is None or len(a) == 0 or len(a) != len(b):
+        return 0.0
+
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class EmbeddingService:
+    """
+    Batched, deduplicated and cached access to an embedding backend.
+
+    Pass persist=False to skip the StoredEmbedding table (e.g. outside a
+    database context).
+    """
+
+    def __init__(
+        self,
+        backend: Optional[EmbeddingBackend] = None,
+        batch_size: int = BATCH_SIZE,
+        persist: bool = True,
+        local_max_entries: int = LOCAL_MAX_ENTRIES,
+    ):
+        self.backend = backend or get_backend()
+        self.batch_size = batch_size
+        self.persist = persist
+        self.local_max_entries = local_max_entries
+        self._local: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics: Counter = Counter()
+
+    @property
+    def model_name(self) -> str:
+        return self.backend.model_name
+
+    @property
+    def dimension(self) -> int:
+        return self.backend.dimension
+
+    def embed(self, text: str) -> List[float]:
+        """Embed a single text"""
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Iterable[str]) -> List[List[float]]:
+        """Embed many texts, returning vectors in input order"""
+        texts = [normalise_text(text) for text in texts]
+        hashes = [content_hash(text) for text in texts]
+        vectors: Dict[str, List[float]] = {}
+
+        with self._lock:
+            for key in set(hashes):
+                if key in self._local:
+                    self._local.move_to_end(key)
+                    vectors[key] = self._local[key]
+        self.metrics["local_hits"] += len(vectors)
+
+        missing = {key: text for key, text in zip(hashes, texts) if key not in vectors}
+
+        if missing and self.persist:
+            stored = self._load_stored(list(missing))
+            self.metrics["store_hits"] += len(stored)
+            vectors.update(stored)
+            self._store_local(stored)
+            for key in stored:
+                del missing[key]
+
+        if missing:
+            computed = self._compute(missing)
+            vectors.update(computed)
+            self._store_local(computed)
+            if self.persist:
+                self._save_stored(computed)
+
+        return [vectors[key] for key in hashes]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/compute counters for this process"""
+        counts = dict(self.metrics)
+        hits = counts.get("local_hits", 0) + counts.get("store_hits", 0)
+        total = hits + counts.get("computed", 0)
+        return {
+            **counts,
+            "model": self.model_name,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "local_entries": len(self._local),
+        }
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def benchmark(
+        self, texts: Sequence[str], batch_sizes: Optional[Sequence[int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Measure backend throughput (texts/second) at several batch sizes.
+
+        Calls the backend directly, bypassing both cache tiers, then times a
+        cached pass through the service for comparison.
+        """
+        texts = [normalise_text(text) for text in texts]
+        results = []
+
+        for batch_size in batch_sizes or [1, 8, 32, self.batch_size]:
+            start = time.perf_counter()
+            for i in range(0, len(texts), batch_size):
+                self.backend.embed_batch(texts[i : i + batch_size])
+            elapsed = time.perf_counter() - start
+            results.append(
+                {
+                    "batch_size": batch_size,
+                    "seconds": round(elapsed, 4),
+                    "texts_per_second": (
+                        round(len(texts) / elapsed, 1) if elapsed else None
+                    ),
+                }
+            )
+
+        self.embed_many(texts)
+        start = time.perf_counter()
+        self.embed_many(texts)
+        cached_elapsed = time.perf_counter() - start
+
+        return {
+            "model": self.model_name,
+            "texts": len(texts),
+            "unique_texts": len(set(texts)),
+            "backend": results,
+            "cached_texts_per_second": (
+                round(len(texts) / cached_elapsed, 1) if cached_elapsed else None
+            ),
+        }
+
+    def _compute(self, missing: Dict[str, str]) -> Dict[str, List[float]]:
+        keys = list(missing)
+        computed: Dict[str, List[float]] = {}
+
+        for i in range(0, len(keys), self.batch_size):
+            batch = keys[i : i + self.batch_size]
+            vectors = self.backend.embed_batch([missing[key] for key in batch])
+            if len(vectors) != len(batch):
+                raise EmbeddingError(
+                    f"Backend returned {len(vectors)} vectors for {len(batch)} texts"
+                )
+            for key, vector in zip(batch, vectors):
+                if len(vector) != self.dimension:
+                    raise EmbeddingError(
+                        f"Backend returned a {len(vector)}-dimension vector; "
+                        f"expected {self.dimension}"
+                    )
+                computed[key] = list(vector)
+
+        self.metrics["computed"] += len(computed)
+        return computed
+
+    def _load_stored(self, keys: List[str]) -> Dict[str, List[float]]:
+        from .models import StoredEmbedding
+
+        rows = StoredEmbedding.objects.filter(
+            model=self.model_name, content_hash__in=keys
+        ).values_list("content_hash", "vector")
+        return {key: [float(v) for v in vector] for key, vector in rows}
+
+    def _save_stored(self, vectors: Dict[str, List[float]]) -> None:
+        from .models import StoredEmbedding
+
+        StoredEmbedding.objects.bulk_create(
+            [
+                StoredEmbedding(
+                    content_hash=key,
+                    model=self.model_name,
+                    dimension=len(vector),
+                    vector=vector,
+                )
+                for key, vector in vectors.items()
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+
+    def _store_local(self, vectors: Dict[str, List[float]]) -> None:
+        with self._lock:
+            for key, vector in vectors.items():
+                self._local[key] = vector
+                self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+
+_service: Optional[EmbeddingService] = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Process-wide service for the configured backend"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = EmbeddingService()
+    return _service
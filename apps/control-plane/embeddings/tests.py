@@ -0,0 +1,130 @@
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase
+
+from .backends import EmbeddingBackend, GatewayBackend, HashingBackend, get_backend
+from .models import StoredEmbedding
+from .service import EmbeddingService, cosine_similarity
+
+
+class CountingBackend(EmbeddingBackend):
+    """Records every batch it is asked to embed"""
+
+    name = "counting"
+
+    def __init__(self, dimension=4):
+        super().__init__(model="test", dimension=dimension)
+        self.batches = []
+
+    def embed_batch(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text)), 1.0, 0.0, 0.0] for text in texts]
+
+
+class HashingBackendTests(SimpleTestCase):
+    """Test the CPU feature-hashing backend"""
+
+    def test_vectors_are_deterministic_and_normalised(self):
+        backend = HashingBackend()
+        first, second = backend.embed_batch(
+            ["Safe work practices", "Safe work practices"]
+        )
+
+        self.assertEqual(len(first), backend.dimension)
+        self.assertEqual(first, second)
+        self.assertAlmostEqual(sum(v * v for v in first), 1.0)
+
+    def test_shared_vocabulary_scores_higher(self):
+        backend = HashingBackend()
+        query, related, unrelated = backend.embed_batch(
+            [
+                "workplace health and safety procedures",
+                "follow workplace health and safety procedures on site",
+                "marketing budget forecast spreadsheet",
+            ]
+        )
+
+        self.assertGreater(
+            cosine_similarity(query, related), cosine_similarity(query, unrelated)
+        )
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_backend("nope")
+
+
+class GatewayBackendTests(SimpleTestCase):
+    """Test the AI gateway backend"""
+
+    def test_request_uses_a_gateway_model(self):
+        backend = GatewayBackend(url="http://gateway/", dimension=2)
+        response = mock.Mock()
+        response.json.return_value = {
+            "data": [
+                {"index": 1, "embedding": [0.0, 1.0]},
+                {"index": 0, "embedding": [1.0, 0.0]},
+            ]
+        }
+
+        with mock.patch.object(backend._session, "post", return_value=response) as post:
+            vectors = backend.embed_batch(["a", "b"])
+
+        self.assertEqual(vectors, [[1.0, 0.0], [0.0, 1.0]])
+        url, kwargs = post.call_args[0][0], post.call_args[1]
+        self.assertEqual(url, "http://gateway/v1/embeddings")
+        self.assertTrue(kwargs["json"]["model"].startswith("text-embedding"))
+        self.assertEqual(kwargs["json"]["input"], ["a", "b"])
+        self.assertEqual(kwargs["json"]["dimensions"], 2)
+
+
+class EmbeddingServiceTests(SimpleTestCase):
+    """Test batching and deduplication (without the persistent store)"""
+
+    def setUp(self):
+        self.backend = CountingBackend()
+        self.service = EmbeddingService(
+            backend=self.backend, batch_size=2, persist=False
+        )
+
+    def test_dedupes_and_batches(self):
+        vectors = self.service.embed_many(["a", "bb", "a", "ccc", "  bb "])
+
+        self.assertEqual([v[0] for v in vectors], [1.0, 2.0, 1.0, 3.0, 2.0])
+        self.assertEqual(sum(len(batch) for batch in self.backend.batches), 3)
+        self.assertTrue(all(len(batch) <= 2 for batch in self.backend.batches))
+
+    def test_repeat_calls_hit_local_cache(self):
+        self.service.embed("some text")
+        self.service.embed("some text")
+
+        self.assertEqual(len(self.backend.batches), 1)
+        self.assertEqual(self.service.stats()["local_hits"], 1)
+
+    def test_wrong_dimension_rejected(self):
+        service = EmbeddingService(backend=CountingBackend(dimension=8), persist=False)
+
+        with self.assertRaises(Exception):
+            service.embed("text")
+
+    def test_benchmark_reports_throughput(self):
+        results = self.service.benchmark(["a", "b", "c"], batch_sizes=[1, 3])
+
+        self.assertEqual([r["batch_size"] for r in results["backend"]], [1, 3])
+        self.assertEqual(results["texts"], 3)
+
+
+class StoredEmbeddingTests(TestCase):
+    """Test the persistent content-hash store"""
+
+    def test_vectors_shared_across_service_instances(self):
+        first_backend = CountingBackend()
+        EmbeddingService(backend=first_backend).embed_many(["alpha", "beta"])
+
+        self.assertEqual(StoredEmbedding.objects.count(), 2)
+
+        second_backend = CountingBackend()
+        vectors = EmbeddingService(backend=second_backend).embed_many(["alpha", "beta"])
+
+        self.assertEqual(second_backend.batches, [])
+        self.assertEqual([v[0] for v in vectors], [5.0, 4.0])
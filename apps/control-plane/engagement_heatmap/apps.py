@@ -5,3 +5,6 @@ class EngagementHeatmapConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "engagement_heatmap"
     verbose_name = "Engagement Heatmap"
+
+    def ready(self):
+        from . import rollups  # noqa: F401
@@ -0,0 +1,50 @@
+"""
+Dashboard rollup for engagement risk.
+"""
+
+from django.db.models import Avg, Count, Q
+
+from dashboards.rollups import register
+
+from .models import EngagementAlert, EngagementHeatmap
+
+
+@register(
+    "engagement_heatmap",
+    sources={
+        EngagementHeatmap: lambda heatmap: heatmap.tenant,
+        EngagementAlert: lambda alert: alert.tenant,
+    },
+)
+def compute_dashboard(tenant):
+    """Risk dashboard metrics for a tenant"""
+    heatmaps = EngagementHeatmap.objects.filter(tenant=tenant)
+
+    totals = heatmaps.aggregate(
+        avg_attendance=Avg("attendance_score"),
+        avg_lms=Avg("lms_activity_score"),
+        avg_sentiment=Avg("sentiment_score"),
+        avg_overall=Avg("overall_engagement_score"),
+        total_students=Count("student_id", distinct=True),
+        at_risk=Count("id", filter=Q(risk_level__in=["high", "critical"])),
+    )
+
+    active_alerts = (
+        EngagementAlert.objects.filter(tenant=tenant, status="active")
+        .values("severity")
+        .annotate(count=Count("id"))
+    )
+
+    return {
+        "risk_breakdown": list(
+            heatmaps.values("risk_level").annotate(count=Count("id"))
+        ),
+        "active_alerts": list(active_alerts),
+        "average_scores": {
+            key: totals[key]
+            for key in ("avg_attendance", "avg_lms", "avg_sentiment", "avg_overall")
+        },
+        "trends": list(heatmaps.values("engagement_trend").annotate(count=Count("id"))),
+        "total_students": totals["total_students"],
+        "at_risk_count": totals["at_risk"],
+    }
@@ -6,6 +6,8 @@ from django.utils import timezone
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from dashboards.rollups import dashboard_response, get_rollup
+
 from .models import (
     EngagementHeatmap,
     AttendanceRecord,
@@ -515,41 +517,8 @@ class EngagementHeatmapViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def risk_dashboard(self, request, tenant_slug=None):
         """Visual risk dashboard with aggregated metrics"""
-        heatmaps = EngagementHeatmap.objects.filter(tenant=tenant_slug)
-
-        # Risk level breakdown
-        risk_breakdown = heatmaps.values("risk_level").annotate(count=Count("id"))
-
-        # Active alerts
-        active_alerts = (
-            EngagementAlert.objects.filter(tenant=tenant_slug, status="active")
-            .values("severity")
-            .annotate(count=Count("id"))
-        )
-
-        # Average scores
-        avg_scores = heatmaps.aggregate(
-            avg_attendance=Avg("attendance_score"),
-            avg_lms=Avg("lms_activity_score"),
-            avg_sentiment=Avg("sentiment_score"),
-            avg_overall=Avg("overall_engagement_score"),
-        )
-
-        # Trend analysis
-        trends = heatmaps.values("engagement_trend").annotate(count=Count("id"))
-
-        return Response(
-            {
-                "risk_breakdown": list(risk_breakdown),
-                "active_alerts": list(active_alerts),
-                "average_scores": avg_scores,
-                "trends": list(trends),
-                "total_students": heatmaps.values("student_id").distinct().count(),
-                "at_risk_count": heatmaps.filter(
-                    risk_level__in=["high", "critical"]
-                ).count(),
-            }
-        )
+        rollup = get_rollup("engagement_heatmap", tenant_slug)
+        return dashboard_response(rollup.data, rollup)
 
 
 class AttendanceRecordViewSet(viewsets.ModelViewSet):
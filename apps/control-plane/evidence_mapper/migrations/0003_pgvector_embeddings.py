@@ -0,0 +1,104 @@
+from django.db import migrations
+
+import pgvector.django
+
+EMBEDDING_DIMENSION = 384
+
+
+def copy_json_embeddings(apps, schema_editor):
+    """Copy JSON embedding lists into the new vector columns"""
+    for model_name, source, target in (
+        ("SubmissionEvidence", "text_embedding", "text_embedding_vector"),
+        ("EmbeddingSearch", "query_embedding", "query_embedding_vector"),
+    ):
+        model = apps.get_model("evidence_mapper", model_name)
+        batch = []
+
+        for obj in model.objects.only("pk", source).iterator(chunk_size=1000):
+            values = getattr(obj, source)
+            # Vectors of another dimension cannot be stored in the column;
+            # they are dropped and regenerated on the next extraction
+            if isinstance(values, list) and len(values) == EMBEDDING_DIMENSION:
+                setattr(obj, target, [float(v) for v in values])
+                batch.append(obj)
+
+            if len(batch) >= 1000:
+                model.objects.bulk_update(batch, [target])
+                batch = []
+
+        if batch:
+            model.objects.bulk_update(batch, [target])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evidence_mapper", "0002_alter_embeddingsearch_search_time_ms_and_more"),
+    ]
+
+    operations = [
+        pgvector.django.VectorExtension(),
+        migrations.AddField(
+            model_name="submissionevidence",
+            name="text_embedding_vector",
+            field=pgvector.django.VectorField(
+                blank=True, dimensions=EMBEDDING_DIMENSION, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="embeddingsearch",
+            name="query_embedding_vector",
+            field=pgvector.django.VectorField(
+                blank=True, dimensions=EMBEDDING_DIMENSION, null=True
+            ),
+        ),
+        migrations.RunPython(copy_json_embeddings, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="submissionevidence",
+            name="text_embedding",
+        ),
+        migrations.RemoveField(
+            model_name="embeddingsearch",
+            name="query_embedding",
+        ),
+        migrations.RenameField(
+            model_name="submissionevidence",
+            old_name="text_embedding_vector",
+            new_name="text_embedding",
+        ),
+        migrations.RenameField(
+            model_name="embeddingsearch",
+            old_name="query_embedding_vector",
+            new_name="query_embedding",
+        ),
+        migrations.AlterField(
+            model_name="submissionevidence",
+            name="text_embedding",
+            field=pgvector.django.VectorField(
+                blank=True,
+                dimensions=EMBEDDING_DIMENSION,
+                help_text="Vector embedding for semantic search",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="embeddingsearch",
+            name="query_embedding",
+            field=pgvector.django.VectorField(
+                blank=True,
+                dimensions=EMBEDDING_DIMENSION,
+                help_text="Vector embedding of query",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submissionevidence",
+            index=pgvector.django.HnswIndex(
+                ef_construction=64,
+                fields=["text_embedding"],
+                m=16,
+                name="evidence_embedding_hnsw",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+    ]
@@ -1,9 +1,13 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from pgvector.django import HnswIndex, VectorField
 from datetime import datetime
 import secrets
 import json
 
+# Dimension of the sentence embeddings stored in vector columns
+EMBEDDING_DIMENSION = 384
+
 
 class EvidenceMapping(models.Model):
     """
@@ -147,9 +151,12 @@ class SubmissionEvidence(models.Model):
         max_length=100, blank=True, help_text="e.g., OCR, PDF parser, Speech-to-text"
     )
 
-    # Embeddings (stored as JSON array)
-    text_embedding = models.JSONField(
-        default=list, help_text="Vector embedding for semantic search"
+    # Embeddings (pgvector column, indexed for nearest-neighbour search)
+    text_embedding = VectorField(
+        dimensions=EMBEDDING_DIMENSION,
+        null=True,
+        blank=True,
+        help_text="Vector embedding for semantic search",
     )
     embedding_model = models.CharField(
         max_length=100, blank=True, help_text="e.g., sentence-transformers"
@@ -179,6 +186,13 @@ class SubmissionEvidence(models.Model):
             models.Index(fields=["mapping", "student_id"]),
             models.Index(fields=["extraction_status"]),
             models.Index(fields=["submitted_at"]),
+            HnswIndex(
+                name="evidence_embedding_hnsw",
+                fields=["text_embedding"],
+                m=16,
+                ef_construction=64,
+                opclasses=["vector_cosine_ops"],
+            ),
         ]
 
     def save(self, *args, **kwargs):
@@ -382,8 +396,11 @@ class EmbeddingSearch(models.Model):
     # Search details
     search_type = models.CharField(max_length=20, choices=SEARCH_TYPE_CHOICES)
     query_text = models.TextField()
-    query_embedding = models.JSONField(
-        default=list, help_text="Vector embedding of query"
+    query_embedding = VectorField(
+        dimensions=EMBEDDING_DIMENSION,
+        null=True,
+        blank=True,
+        help_text="Vector embedding of query",
     )
 
     # Filters applied
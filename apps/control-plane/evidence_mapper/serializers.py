@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import (
+    EMBEDDING_DIMENSION,
     EvidenceMapping,
     SubmissionEvidence,
     CriteriaTag,
@@ -8,6 +9,18 @@ from .models import (
 )
 
 
+class EmbeddingField(serializers.ListField):
+    """Vector column exposed as a plain list of floats"""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("child", serializers.FloatField())
+        kwargs.setdefault("min_length", EMBEDDING_DIMENSION)
+        kwargs.setdefault("max_length", EMBEDDING_DIMENSION)
+        kwargs.setdefault("required", False)
+        kwargs.setdefault("allow_null", True)
+        super().__init__(**kwargs)
+
+
 class EvidenceMappingSerializer(serializers.ModelSerializer):
     coverage_percentage_calculated = serializers.SerializerMethodField()
 
@@ -29,6 +42,8 @@ class EvidenceMappingSerializer(serializers.ModelSerializer):
 
 
 class SubmissionEvidenceSerializer(serializers.ModelSerializer):
+    text_embedding = EmbeddingField()
+
     class Meta:
         model = SubmissionEvidence
         fields = "__all__"
@@ -43,6 +58,7 @@ class SubmissionEvidenceSerializer(serializers.ModelSerializer):
 
 class SubmissionEvidenceDetailSerializer(serializers.ModelSerializer):
     tags = serializers.SerializerMethodField()
+    text_embedding = EmbeddingField()
 
     class Meta:
         model = SubmissionEvidence
@@ -80,6 +96,8 @@ class EvidenceAuditSerializer(serializers.ModelSerializer):
 
 
 class EmbeddingSearchSerializer(serializers.ModelSerializer):
+    query_embedding = EmbeddingField()
+
     class Meta:
         model = EmbeddingSearch
         fields = "__all__"
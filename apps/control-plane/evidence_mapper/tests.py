@@ -1,7 +1,9 @@
 from django.test import TestCase
 from django.utils import timezone
 from datetime import datetime
+from pgvector.django import CosineDistance
 from .models import (
+    EMBEDDING_DIMENSION,
     EvidenceMapping,
     SubmissionEvidence,
     CriteriaTag,
@@ -311,3 +313,52 @@ class EmbeddingSearchModelTest(TestCase):
         self.assertNotEqual(search1.search_number, search2.search_number)
         self.assertTrue(search1.search_number.startswith("SRCH-"))
         self.assertTrue(search2.search_number.startswith("SRCH-"))
+
+
+class EmbeddingVectorSearchTest(TestCase):
+    """Test nearest-neighbour search over vector embeddings"""
+
+    def setUp(self):
+        self.mapping = EvidenceMapping.objects.create(
+            name="Test Mapping", created_by="test_user"
+        )
+
+    def _submission(self, student_id, embedding, mapping=None):
+        return SubmissionEvidence.objects.create(
+            mapping=mapping or self.mapping,
+            student_id=student_id,
+            student_name=student_id,
+            submission_id=f"SUB-{student_id}",
+            text_embedding=embedding,
+        )
+
+    def test_orders_by_cosine_distance(self):
+        """Test closest embeddings are returned first"""
+        ones = [1.0] * EMBEDDING_DIMENSION
+        half = [1.0] * (EMBEDDING_DIMENSION // 2) + [0.0] * (EMBEDDING_DIMENSION // 2)
+        axis = [1.0] + [0.0] * (EMBEDDING_DIMENSION - 1)
+
+        far = self._submission("S3", axis)
+        exact = self._submission("S1", ones)
+        near = self._submission("S2", half)
+        self._submission("S4", None)
+
+        results = list(
+            SubmissionEvidence.objects.filter(
+                mapping=self.mapping, text_embedding__isnull=False
+            )
+            .annotate(distance=CosineDistance("text_embedding", ones))
+            .order_by("distance")
+        )
+
+        self.assertEqual([s.id for s in results], [exact.id, near.id, far.id])
+        self.assertAlmostEqual(results[0].distance, 0.0, places=5)
+
+    def test_embedding_round_trip(self):
+        """Test embeddings are stored and read back as vectors"""
+        embedding = [0.5] * EMBEDDING_DIMENSION
+        submission = self._submission("S1", embedding)
+        submission.refresh_from_db()
+
+        self.assertEqual(len(submission.text_embedding), EMBEDDING_DIMENSION)
+        self.assertAlmostEqual(float(submission.text_embedding[0]), 0.5)
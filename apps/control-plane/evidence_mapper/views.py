@@ -4,9 +4,12 @@ from rest_framework.response import Response
 from django.utils import timezone
 from django.db import models
 from datetime import datetime
+from pgvector.django import CosineDistance
 import random
 import math
 
+from embeddings.service import get_embedding_service
+
 from .models import (
     EvidenceMapping,
     SubmissionEvidence,
@@ -134,14 +137,14 @@ class SubmissionEvidenceViewSet(viewsets.ModelViewSet):
                 "keywords": ["analysis", "methodology", "evidence", "research"],
             }
 
-        # Generate mock embedding (in production, use sentence-transformers or similar)
-        if generate_embedding and not submission.text_embedding:
-            embedding_dimension = 384
-            submission.text_embedding = [
-                random.random() for _ in range(embedding_dimension)
-            ]
-            submission.embedding_model = "sentence-transformers/all-MiniLM-L6-v2"
-            submission.embedding_dimension = embedding_dimension
+        # Generate embedding via the shared embedding service
+        if generate_embedding and submission.text_embedding is None:
+            embedding_service = get_embedding_service()
+            submission.text_embedding = embedding_service.embed(
+                submission.extracted_text
+            )
+            submission.embedding_model = embedding_service.model_name
+            submission.embedding_dimension = embedding_service.dimension
 
             # Update mapping statistics
             submission.mapping.embeddings_generated += 1
@@ -175,7 +178,7 @@ class SubmissionEvidenceViewSet(viewsets.ModelViewSet):
             {
                 "status": "success",
                 "extracted_text_length": submission.text_length,
-                "embedding_generated": bool(submission.text_embedding),
+                "embedding_generated": submission.text_embedding is not None,
                 "embedding_dimension": submission.embedding_dimension,
                 "metadata": submission.metadata,
             }
@@ -289,44 +292,41 @@ class SubmissionEvidenceViewSet(viewsets.ModelViewSet):
 
         start_time = datetime.now()
 
-        # Generate query embedding (mock)
-        query_embedding = [random.random() for _ in range(384)]
-
-        # Get all submissions with embeddings
-        submissions = SubmissionEvidence.objects.exclude(text_embedding=[])
-
-        # Calculate cosine similarity (mock implementation)
-        results = []
-        for submission in submissions:
-            if submission.text_embedding:
-                # Mock similarity score
-                similarity = random.uniform(0.3, 0.95)
-
-                if similarity >= min_similarity:
-                    results.append(
-                        {
-                            "submission_id": submission.id,
-                            "evidence_number": submission.evidence_number,
-                            "student_id": submission.student_id,
-                            "student_name": submission.student_name,
-                            "similarity_score": round(similarity, 3),
-                            "text_preview": (
-                                submission.extracted_text[:200] + "..."
-                                if len(submission.extracted_text) > 200
-                                else submission.extracted_text
-                            ),
-                            "total_tags": submission.total_tags,
-                        }
-                    )
-
-        # Sort by similarity and limit
-        results.sort(key=lambda x: x["similarity_score"], reverse=True)
-        results = results[:limit]
+        query_embedding = get_embedding_service().embed(query)
+
+        # Nearest neighbours by cosine distance, served by the HNSW index
+        submissions = SubmissionEvidence.objects.filter(text_embedding__isnull=False)
+        mapping_id = request.query_params.get("mapping_id")
+        if mapping_id:
+            submissions = submissions.filter(mapping_id=mapping_id)
+
+        submissions = (
+            submissions.defer("text_embedding")
+            .annotate(distance=CosineDistance("text_embedding", query_embedding))
+            .filter(distance__lte=1 - min_similarity)
+            .order_by("distance")[:limit]
+        )
+
+        results = [
+            {
+                "submission_id": submission.id,
+                "evidence_number": submission.evidence_number,
+                "student_id": submission.student_id,
+                "student_name": submission.student_name,
+                "similarity_score": round(1 - submission.distance, 3),
+                "text_preview": (
+                    submission.extracted_text[:200] + "..."
+                    if len(submission.extracted_text) > 200
+                    else submission.extracted_text
+                ),
+                "total_tags": submission.total_tags,
+            }
+            for submission in submissions
+        ]
 
         # Log search
         search_time = (datetime.now() - start_time).total_seconds() * 1000
 
-        mapping_id = request.query_params.get("mapping_id")
         if mapping_id:
             try:
                 mapping = EvidenceMapping.objects.get(id=mapping_id)
@@ -5,3 +5,6 @@ class FundingEligibilityConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "funding_eligibility"
     verbose_name = "Funding Eligibility"
+
+    def ready(self):
+        from . import rollups, signals  # noqa: F401
@@ -0,0 +1,107 @@
+# Generated by Django 5.1.13 on 2026-10-18 22:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("funding_eligibility", "0004_alter_jurisdictionrequirement_effective_from"),
+        ("tenants", "0003_tenantapikey_description"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EligibilityBatch",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("jurisdiction_code", models.CharField(max_length=10)),
+                ("source_filename", models.CharField(blank=True, max_length=255)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("total_rows", models.IntegerField(default=0)),
+                ("processed_rows", models.IntegerField(default=0)),
+                ("failed_rows", models.IntegerField(default=0)),
+                ("errors", models.JSONField(blank=True, default=list)),
+                ("summary", models.JSONField(blank=True, default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "requested_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="eligibility_batches",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "ruleset",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Ruleset used for evaluation (defaults to active ruleset)",
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="batches",
+                        to="funding_eligibility.ruleset",
+                    ),
+                ),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="eligibility_batches",
+                        to="tenants.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "funding_eligibility_batches",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddField(
+            model_name="eligibilityrequest",
+            name="batch",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="requests",
+                to="funding_eligibility.eligibilitybatch",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eligibilityrequest",
+            index=models.Index(
+                fields=["batch", "status"], name="funding_eli_batch_i_4c23fe_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eligibilitybatch",
+            index=models.Index(
+                fields=["tenant", "status"], name="funding_eli_tenant__d96bfe_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eligibilitybatch",
+            index=models.Index(
+                fields=["created_at"], name="funding_eli_created_dd9cc2_idx"
+            ),
+        ),
+    ]
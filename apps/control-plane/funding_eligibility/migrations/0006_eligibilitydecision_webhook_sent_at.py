@@ -0,0 +1,18 @@
+# Generated by Django 5.1.13 on 2026-10-19 00:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("funding_eligibility", "0005_eligibilitybatch"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eligibilitydecision",
+            name="webhook_sent_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -237,6 +237,15 @@ class EligibilityRequest(models.Model):
     )
     metadata = models.JSONField(default=dict, help_text="Additional metadata")
 
+    # Bulk intake this request was created from, if any
+    batch = models.ForeignKey(
+        "EligibilityBatch",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="requests",
+    )
+
     class Meta:
         db_table = "funding_eligibility_requests"
         ordering = ["-requested_at"]
@@ -245,12 +254,85 @@ class EligibilityRequest(models.Model):
             models.Index(fields=["person_id"]),
             models.Index(fields=["jurisdiction_code"]),
             models.Index(fields=["requested_at"]),
+            models.Index(fields=["batch", "status"]),
         ]
 
     def __str__(self):
         return f"REQ-{self.id} ({self.jurisdiction_code})"
 
 
+class EligibilityBatch(models.Model):
+    """
+    Bulk eligibility evaluation for a whole intake.
+    Tracks progress and per-row errors while the batch task runs.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("processing", "Processing"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.AutoField(primary_key=True)
+
+    tenant = models.ForeignKey(
+        "tenants.Tenant", on_delete=models.CASCADE, related_name="eligibility_batches"
+    )
+    jurisdiction_code = models.CharField(max_length=10)
+    ruleset = models.ForeignKey(
+        Ruleset,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="batches",
+        help_text="Ruleset used for evaluation (defaults to active ruleset)",
+    )
+
+    # Intake source
+    source_filename = models.CharField(max_length=255, blank=True)
+
+    # Status & progress
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    total_rows = models.IntegerField(default=0)
+    processed_rows = models.IntegerField(default=0)
+    failed_rows = models.IntegerField(default=0)
+
+    # Per-row errors: [{"row": 12, "person_id": "...", "error": "..."}]
+    errors = models.JSONField(default=list, blank=True)
+
+    # Outcome counts and lookup statistics
+    summary = models.JSONField(default=dict, blank=True)
+
+    # Audit
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="eligibility_batches",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "funding_eligibility_batches"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["tenant", "status"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"BATCH-{self.id} ({self.jurisdiction_code}, {self.total_rows} rows)"
+
+    @property
+    def progress_percentage(self) -> float:
+        if not self.total_rows:
+            return 0.0
+        return round(self.processed_rows / self.total_rows * 100, 1)
+
+
 class ExternalLookup(models.Model):
     """
     External API lookups with caching.
@@ -359,6 +441,9 @@ class EligibilityDecision(models.Model):
     # Timestamp
     decided_at = models.DateTimeField(auto_now_add=True)
 
+    # When the decision.finalized webhook was queued (sent once per decision)
+    webhook_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
+
     class Meta:
         db_table = "funding_eligibility_decisions"
         ordering = ["-decided_at"]
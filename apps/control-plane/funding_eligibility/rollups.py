@@ -0,0 +1,73 @@
+"""
+Dashboard rollup for funding eligibility checks.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from dashboards.rollups import register
+
+from .models import EligibilityCheck
+
+
+@register(
+    "funding_eligibility",
+    sources={EligibilityCheck: lambda check: check.tenant_id},
+)
+def compute_dashboard(tenant):
+    """Dashboard statistics for a tenant (keyed by Tenant pk)"""
+    thirty_days_ago = timezone.now() - timedelta(days=30)
+
+    checks = EligibilityCheck.objects.filter(tenant_id=tenant)
+    counts = checks.aggregate(
+        total=Count("id"),
+        eligible=Count("id", filter=Q(is_eligible=True)),
+        ineligible=Count("id", filter=Q(is_eligible=False)),
+        pending=Count("id", filter=Q(status="pending")),
+        override=Count("id", filter=Q(status="override")),
+        recent=Count("id", filter=Q(checked_at__gte=thirty_days_ago)),
+        prevented=Count("id", filter=Q(prevents_enrollment=True)),
+    )
+
+    failure_reasons = {}
+    for failed_rules in (
+        checks.filter(is_eligible=False)
+        .values_list("failed_rules", flat=True)
+        .iterator()
+    ):
+        for failed_rule in failed_rules or []:
+            rule_name = failed_rule.get("rule_name", "Unknown")
+            failure_reasons[rule_name] = failure_reasons.get(rule_name, 0) + 1
+
+    return {
+        "total_checks": counts["total"],
+        "eligible_count": counts["eligible"],
+        "ineligible_count": counts["ineligible"],
+        "pending_count": counts["pending"],
+        "override_count": counts["override"],
+        "eligibility_rate": (
+            round((counts["eligible"] / counts["total"]) * 100, 2)
+            if counts["total"] > 0
+            else 0.0
+        ),
+        "by_jurisdiction": dict(
+            checks.values("jurisdiction")
+            .annotate(count=Count("id"))
+            .values_list("jurisdiction", "count")
+        ),
+        "by_status": dict(
+            checks.values("status")
+            .annotate(count=Count("id"))
+            .values_list("status", "count")
+        ),
+        "recent_checks": counts["recent"],
+        "prevented_enrollments": counts["prevented"],
+        "top_failure_reasons": [
+            {"reason": reason, "count": count}
+            for reason, count in sorted(
+                failure_reasons.items(), key=lambda x: x[1], reverse=True
+            )[:5]
+        ],
+    }
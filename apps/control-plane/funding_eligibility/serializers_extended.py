@@ -3,12 +3,14 @@ Serializers for extended funding eligibility models.
 """
 
 from rest_framework import serializers
+from .services.batch import MAX_INTAKE_ROWS
 from .models_extended import (
     Jurisdiction,
     Ruleset,
     RulesetArtifact,
     ReferenceTable,
     EligibilityRequest,
+    EligibilityBatch,
     ExternalLookup,
     EligibilityDecision,
     DecisionOverride,
@@ -291,6 +293,35 @@ class EligibilityRequestListSerializer(serializers.ModelSerializer):
         return None
 
 
+class EligibilityBatchSerializer(serializers.ModelSerializer):
+    """Bulk intake serializer with progress"""
+
+    ruleset_details = RulesetMinimalSerializer(source="ruleset", read_only=True)
+    progress_percentage = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = EligibilityBatch
+        fields = [
+            "id",
+            "jurisdiction_code",
+            "ruleset",
+            "ruleset_details",
+            "source_filename",
+            "status",
+            "total_rows",
+            "processed_rows",
+            "failed_rows",
+            "progress_percentage",
+            "errors",
+            "summary",
+            "requested_by",
+            "created_at",
+            "started_at",
+            "completed_at",
+        ]
+        read_only_fields = fields
+
+
 class WebhookEndpointSerializer(serializers.ModelSerializer):
     """Webhook endpoint serializer"""
 
@@ -349,6 +380,25 @@ class CreateEligibilityRequestSerializer(serializers.Serializer):
     metadata = serializers.JSONField(required=False, default=dict)
 
 
+class CreateEligibilityBatchSerializer(serializers.Serializer):
+    """Serializer for submitting a bulk intake (CSV/JSON file or inline rows)"""
+
+    jurisdiction_code = serializers.CharField(max_length=10)
+    ruleset_id = serializers.IntegerField(required=False)
+    course_id = serializers.CharField(
+        max_length=100, required=False, default="", allow_blank=True
+    )
+    file = serializers.FileField(required=False)
+    rows = serializers.ListField(
+        child=serializers.JSONField(), required=False, max_length=MAX_INTAKE_ROWS
+    )
+
+    def validate(self, attrs):
+        if not attrs.get("file") and not attrs.get("rows"):
+            raise serializers.ValidationError("Provide an intake file or rows.")
+        return attrs
+
+
 class EvaluateRequestSerializer(serializers.Serializer):
     """Serializer for triggering evaluation"""
 
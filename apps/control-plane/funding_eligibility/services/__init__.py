@@ -2,6 +2,22 @@
 Services for funding eligibility system.
 """
 
-from .rules_engine import RulesEngine, EvaluationContext, EvaluationResult
+from .rules_engine import (
+    RulesEngine,
+    EvaluationContext,
+    EvaluationResult,
+    RuleCompiler,
+    CompiledRuleset,
+    compile_ruleset,
+    ruleset_programs,
+)
 
-__all__ = ["RulesEngine", "EvaluationContext", "EvaluationResult"]
+__all__ = [
+    "RulesEngine",
+    "EvaluationContext",
+    "EvaluationResult",
+    "RuleCompiler",
+    "CompiledRuleset",
+    "compile_ruleset",
+    "ruleset_programs",
+]
@@ -0,0 +1,371 @@
+"""
+Bulk eligibility evaluation for whole intakes.
+
+An intake file is ingested into EligibilityRequest rows linked to an
+EligibilityBatch. The batch task then evaluates every request in chunks:
+external lookups are deduplicated across the whole intake (so one postcode
+is looked up once, however many students share it), all requests are
+evaluated against a single compiled ruleset, and lookups, decisions and
+status changes are written with bulk queries.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from .connectors import LookupResult
+from .lookup_orchestrator import LookupOrchestrator, PlannedLookup, lookup_status
+from .reference_data import reference_store
+from .rules_engine import EvaluationContext, RulesEngine, ruleset_programs
+
+logger = logging.getLogger(__name__)
+
+# Requests evaluated (and written) per transaction
+CHUNK_SIZE = 500
+
+# Upper bound on rows accepted in a single intake
+MAX_INTAKE_ROWS = 20000
+
+# Cap on stored per-row errors so a bad file cannot bloat the batch record
+MAX_STORED_ERRORS = 1000
+
+
+class IntakeError(ValueError):
+    """Raised when an intake file cannot be parsed"""
+
+
+def parse_intake(content: bytes | str, filename: str = "") -> List[Dict[str, Any]]:
+    """
+    Parse an intake file into a list of row dicts.
+
+    CSV files use one column per input field; dotted headers such as
+    ``concession_card.number`` become nested dicts. JSON files may contain
+    a list of rows or an object with a ``rows`` list.
+    """
+    if isinstance(content, bytes):
+        try:
+            content = content.decode("utf-8-sig")
+        except UnicodeDecodeError as e:
+            raise IntakeError(f"Intake file must be UTF-8 encoded: {e}")
+
+    if filename.lower().endswith(".json") or content.lstrip().startswith(("[", "{")):
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise IntakeError(f"Invalid JSON intake: {e}")
+
+        rows = data.get("rows") if isinstance(data, dict) else data
+        if not isinstance(rows, list):
+            raise IntakeError("JSON intake must be a list of rows")
+    else:
+        reader = csv.DictReader(io.StringIO(content))
+        rows = [_expand_dotted(row) for row in reader]
+
+    if len(rows) > MAX_INTAKE_ROWS:
+        raise IntakeError(
+            f"Intake has {len(rows)} rows; the maximum is {MAX_INTAKE_ROWS}"
+        )
+
+    return rows
+
+
+def _expand_dotted(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn flat CSV columns with dotted names into nested dicts"""
+    result: Dict[str, Any] = {}
+
+    for key, value in row.items():
+        if key is None or value in (None, ""):
+            continue
+
+        target = result
+        parts = key.strip().split(".")
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value.strip() if isinstance(value, str) else value
+
+    return result
+
+
+def normalise_row(
+    row: Any, default_course_id: str = ""
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Split an intake row into (person_id, course_id, input_data).
+
+    Rows may either carry an explicit ``input`` object or put the input
+    fields alongside ``person_id`` and ``course_id``.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("Row must be an object")
+
+    row = dict(row)
+    person_id = str(row.pop("person_id", "") or "").strip()
+    course_id = str(row.pop("course_id", "") or default_course_id).strip()
+    input_data = row.pop("input", None)
+    if input_data is None:
+        input_data = row
+
+    if not person_id:
+        raise ValueError("Missing person_id")
+    if not course_id:
+        raise ValueError("Missing course_id")
+    if not isinstance(input_data, dict):
+        raise ValueError("input must be an object")
+
+    return person_id, course_id, input_data
+
+
+def create_batch_requests(
+    batch, rows: Iterable[Any], default_course_id: str = "", requested_by=None
+) -> int:
+    """
+    Create one EligibilityRequest per valid intake row.
+
+    Invalid rows are recorded on the batch as per-row errors instead of
+    aborting the whole intake. Returns the number of requests created.
+    """
+    from ..models_extended import EligibilityRequest
+
+    requests = []
+    errors = []
+    total = 0
+
+    for index, row in enumerate(rows, start=1):
+        total += 1
+        try:
+            person_id, course_id, input_data = normalise_row(row, default_course_id)
+        except ValueError as e:
+            errors.append({"row": index, "error": str(e)})
+            continue
+
+        requests.append(
+            EligibilityRequest(
+                tenant=batch.tenant,
+                person_id=person_id,
+                course_id=course_id,
+                jurisdiction_code=batch.jurisdiction_code,
+                input=input_data,
+                metadata={"batch_row": index},
+                requested_by=requested_by,
+                batch=batch,
+            )
+        )
+
+    EligibilityRequest.objects.bulk_create(requests, batch_size=CHUNK_SIZE)
+
+    batch.total_rows = total
+    batch.processed_rows = len(errors)
+    batch.failed_rows = len(errors)
+    batch.errors = errors[:MAX_STORED_ERRORS]
+    batch.save(update_fields=["total_rows", "processed_rows", "failed_rows", "errors"])
+
+    return len(requests)
+
+
+class BatchEvaluator:
+    """
+    Evaluates every pending request in an EligibilityBatch.
+    """
+
+    def __init__(self, batch, chunk_size: int = CHUNK_SIZE):
+        self.batch = batch
+        self.chunk_size = chunk_size
+        self.engine = RulesEngine()
+        self.orchestrator = LookupOrchestrator(tenant_id=batch.tenant_id)
+
+        # Lookup results shared by every request in the batch, keyed by the
+        # connector cache key
+        self._lookup_results: Dict[str, LookupResult] = {}
+
+        self.outcomes: Counter = Counter()
+        self.lookups_requested = 0
+
+    def run(self):
+        """Evaluate all pending requests and return the updated batch"""
+        from ..models_extended import Ruleset
+
+        batch = self.batch
+        batch.status = "processing"
+        batch.started_at = batch.started_at or timezone.now()
+        batch.save(update_fields=["status", "started_at"])
+
+        ruleset = batch.ruleset or (
+            Ruleset.objects.filter(
+                jurisdiction_code=batch.jurisdiction_code, status="active"
+            ).first()
+        )
+        if ruleset is None:
+            batch.status = "failed"
+            batch.summary = {
+                "error": f"No active ruleset for jurisdiction {batch.jurisdiction_code}"
+            }
+            batch.completed_at = timezone.now()
+            batch.save(update_fields=["status", "summary", "completed_at"])
+            return batch
+
+        if batch.ruleset_id is None:
+            batch.ruleset = ruleset
+            batch.save(update_fields=["ruleset"])
+
+        # Compile once for the whole intake
+        compiled = ruleset_programs.get(ruleset)
+
+        for chunk in self._pending_chunks():
+            self._process_chunk(chunk, ruleset, compiled)
+
+        batch.status = "completed"
+        batch.completed_at = timezone.now()
+        batch.summary = {
+            "ruleset_version": ruleset.version,
+            "outcomes": dict(self.outcomes),
+            "lookups": {
+                "requested": self.lookups_requested,
+                "unique": len(self._lookup_results),
+                "cache_hits": self.orchestrator.stats["cache_hits"],
+                "fetched": self.orchestrator.stats["fetched"],
+            },
+        }
+        batch.save(update_fields=["status", "completed_at", "summary"])
+
+        logger.info(
+            f"Completed eligibility batch {batch.id}: "
+            f"{batch.processed_rows}/{batch.total_rows} rows, "
+            f"{batch.failed_rows} failed"
+        )
+        return batch
+
+    def _pending_chunks(self):
+        """Yield pending requests in id order, one chunk at a time"""
+        last_id = 0
+        while True:
+            chunk = list(
+                self.batch.requests.filter(status="pending", id__gt=last_id).order_by(
+                    "id"
+                )[: self.chunk_size]
+            )
+            if not chunk:
+                return
+            last_id = chunk[-1].id
+            yield chunk
+
+    def _process_chunk(self, chunk, ruleset, compiled) -> None:
+        from ..models_extended import (
+            EligibilityBatch,
+            EligibilityDecision,
+            EligibilityRequest,
+            ExternalLookup,
+        )
+
+        # Plan lookups for the chunk and resolve each distinct one once
+        plans: Dict[int, List[PlannedLookup]] = {}
+        pending: List[PlannedLookup] = []
+        for request_obj in chunk:
+            planned = self.orchestrator.plan(request_obj.input)
+            pending.extend(
+                p for p in planned if p.cache_key not in self._lookup_results
+            )
+            plans[request_obj.id] = planned
+            self.lookups_requested += len(planned)
+
+        if pending:
+            self._lookup_results.update(self.orchestrator.run(pending))
+
+        lookups = []
+        decisions = []
+        errors = []
+        now = timezone.now()
+        reference_data = reference_store.snapshot()
+
+        for request_obj in chunk:
+            context_lookups: Dict[str, Dict[str, Any]] = {}
+
+            for planned in plans[request_obj.id]:
+                result = self._lookup_results[planned.cache_key]
+                lookups.append(
+                    ExternalLookup(
+                        request=request_obj,
+                        provider=planned.provider,
+                        request_data=planned.data,
+                        response_data=result.data,
+                        status=lookup_status(result),
+                        error_message=result.error or "",
+                        latency_ms=result.latency_ms,
+                        cached_until=result.cache_until,
+                    )
+                )
+                if result.success:
+                    context_lookups.setdefault(planned.provider, {}).update(result.data)
+
+            try:
+                context = EvaluationContext(
+                    input_data=request_obj.input,
+                    lookups=context_lookups,
+                    reference_data=reference_data,
+                    jurisdiction_code=request_obj.jurisdiction_code,
+                    evaluation_date=now,
+                )
+                result = self.engine.evaluate_compiled(compiled, context)
+            except Exception as e:
+                logger.error(f"Error evaluating batch request {request_obj.id}: {e}")
+                request_obj.status = "error"
+                errors.append(
+                    {
+                        "row": request_obj.metadata.get("batch_row"),
+                        "person_id": request_obj.person_id,
+                        "error": str(e),
+                    }
+                )
+                continue
+
+            decisions.append(
+                EligibilityDecision(
+                    request=request_obj,
+                    ruleset=ruleset,
+                    outcome=result.outcome,
+                    reasons=result.reasons,
+                    clause_refs=result.clause_refs,
+                    decision_data=result.details,
+                    explanation=result.explanation,
+                    decided_by="system",
+                )
+            )
+            request_obj.status = "evaluated"
+            request_obj.evaluated_at = now
+            self.outcomes[result.outcome] += 1
+
+        batch = self.batch
+        batch.processed_rows += len(chunk)
+        batch.failed_rows += len(errors)
+        batch.errors = (batch.errors + errors)[:MAX_STORED_ERRORS]
+
+        with transaction.atomic():
+            ExternalLookup.objects.bulk_create(lookups, batch_size=self.chunk_size)
+            EligibilityDecision.objects.bulk_create(
+                decisions, batch_size=self.chunk_size
+            )
+            EligibilityRequest.objects.bulk_update(
+                chunk, ["status", "evaluated_at"], batch_size=self.chunk_size
+            )
+            EligibilityBatch.objects.filter(pk=batch.pk).update(
+                processed_rows=batch.processed_rows,
+                failed_rows=batch.failed_rows,
+                errors=batch.errors,
+            )
+
+
+def run_batch(batch_id: int, chunk_size: Optional[int] = None):
+    """Evaluate an EligibilityBatch by id"""
+    from ..models_extended import EligibilityBatch
+
+    batch = EligibilityBatch.objects.select_related("ruleset", "tenant").get(
+        id=batch_id
+    )
+    return BatchEvaluator(batch, chunk_size or CHUNK_SIZE).run()
@@ -5,7 +5,7 @@ Connectors for external jurisdiction APIs.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
@@ -24,11 +24,16 @@ class LookupResult:
     latency_ms: Optional[int] = None
     cached: bool = False
     cache_until: Optional[datetime] = None
+    timed_out: bool = False
 
 
 class BaseConnector(ABC):
     """Base class for external API connectors"""
 
+    # Whether cached results may be reused across tenants. Only providers
+    # returning public reference data (no personal information) opt in.
+    shared_across_tenants = False
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.timeout = config.get("timeout", 30)  # seconds
@@ -126,6 +131,9 @@ class PostcodeConnector(BaseConnector):
     Uses ABS (Australian Bureau of Statistics) data.
     """
 
+    # Public reference data, safe to share between tenants
+    shared_across_tenants = True
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         # Longer cache for postcode data (24 hours)
@@ -389,3 +397,61 @@ class ConnectorFactory:
             raise ValueError(f"Unknown provider: {provider}")
 
         return connector_class(config)
+
+
+def plan_lookups(input_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Determine which external lookups an eligibility input needs.
+
+    Returns a list of {provider, data} dicts, where data is passed as keyword
+    arguments to the provider's connector.
+    """
+    lookups_needed = []
+
+    # USI validation
+    if input_data.get("usi"):
+        lookups_needed.append(
+            {
+                "provider": "usi",
+                "data": {
+                    "usi": input_data["usi"],
+                    "first_name": input_data.get("first_name"),
+                    "family_name": input_data.get("family_name"),
+                    "date_of_birth": input_data.get("date_of_birth"),
+                },
+            }
+        )
+
+    # Postcode lookup
+    if input_data.get("postcode"):
+        lookups_needed.append(
+            {"provider": "postcode", "data": {"postcode": input_data["postcode"]}}
+        )
+
+    # Concession card
+    if input_data.get("concession_card"):
+        lookups_needed.append(
+            {
+                "provider": "concession",
+                "data": {
+                    "card_number": input_data["concession_card"].get("number"),
+                    "card_type": input_data["concession_card"].get("type"),
+                    "holder_name": input_data.get("full_name"),
+                },
+            }
+        )
+
+    # Visa check
+    if input_data.get("passport_number"):
+        lookups_needed.append(
+            {
+                "provider": "visa",
+                "data": {
+                    "passport_number": input_data["passport_number"],
+                    "country_of_passport": input_data.get("country_of_passport"),
+                    "date_of_birth": input_data.get("date_of_birth"),
+                },
+            }
+        )
+
+    return lookups_needed
@@ -0,0 +1,245 @@
+"""
+Shared cache for external lookup results.
+
+Two tiers sit in front of the connectors:
+
+* an in-process LRU, so repeated lookups within a worker cost nothing
+* the Django cache (Redis), shared by every worker and request
+
+Entries are keyed on a SHA-256 of the connector cache key, which holds the
+raw lookup inputs (USI, name, date of birth, ...) that must not appear in
+cache keys. Providers that return public
+reference data (e.g. postcodes) are shared across tenants; lookups involving
+personal data are scoped to the tenant that made them. Failed lookups are
+cached briefly (negative caching) so a failing or rate-limited API is not
+hammered, and entries past their TTL are served stale for a grace period
+while a background refresh is scheduled.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .connectors import BaseConnector, LookupResult
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = getattr(settings, "FUNDING_LOOKUP_CACHE_ALIAS", "default")
+
+# Seconds failed lookups are remembered for
+NEGATIVE_TTL = getattr(settings, "FUNDING_LOOKUP_NEGATIVE_TTL", 60)
+
+# Stale-while-revalidate window, as a fraction of the provider's cache TTL
+STALE_FACTOR = getattr(settings, "FUNDING_LOOKUP_STALE_FACTOR", 0.5)
+
+# Maximum entries held in the in-process tier
+LOCAL_MAX_ENTRIES = getattr(settings, "FUNDING_LOOKUP_LOCAL_MAX_ENTRIES", 10000)
+
+# How long a refresh claim blocks other workers from refreshing the same key
+REFRESH_LOCK_TTL = 60
+
+KEY_PREFIX = "funding:lookup"
+
+
+@dataclass
+class CacheEntry:
+    """A cached lookup result with freshness bounds (epoch seconds)"""
+
+    result: Dict[str, Any]
+    fresh_until: float
+    stale_until: float
+    negative: bool = False
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def is_usable(self, now: float) -> bool:
+        return now < self.stale_until
+
+    def to_result(self, now: float) -> LookupResult:
+        data = dict(self.result)
+        if data.get("cache_until") and self.is_fresh(now):
+            data["cache_until"] = datetime.fromisoformat(data["cache_until"])
+        else:
+            # A stale result is already past its cache_until
+            data["cache_until"] = None
+        data["cached"] = True
+        return LookupResult(**data)
+
+    @classmethod
+    def from_result(cls, result: LookupResult, ttl: float, now: float) -> CacheEntry:
+        negative = not result.success
+        fresh_ttl = NEGATIVE_TTL if negative else ttl
+        stale_ttl = 0 if negative else ttl * STALE_FACTOR
+
+        return cls(
+            result={
+                "provider": result.provider,
+                "success": result.success,
+                "data": result.data,
+                "error": result.error,
+                "latency_ms": result.latency_ms,
+                "cache_until": (
+                    result.cache_until.isoformat() if result.cache_until else None
+                ),
+                "timed_out": result.timed_out,
+            },
+            fresh_until=now + fresh_ttl,
+            stale_until=now + fresh_ttl + stale_ttl,
+            negative=negative,
+        )
+
+
+class LookupCache:
+    """
+    Two-tier (process-local LRU + shared Django cache) lookup result cache.
+    """
+
+    def __init__(
+        self,
+        cache_alias: str = CACHE_ALIAS,
+        local_max_entries: int = LOCAL_MAX_ENTRIES,
+    ):
+        self.cache_alias = cache_alias
+        self.local_max_entries = local_max_entries
+        self._local: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics: Counter = Counter()
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    @staticmethod
+    def make_key(
+        connector: BaseConnector, cache_key: str, tenant_id: Optional[Any] = None
+    ) -> str:
+        """
+        Hash a connector cache key and scope it to a tenant unless the
+        provider is public
+        """
+        digest = hashlib.sha256(cache_key.encode()).hexdigest()
+        if connector.shared_across_tenants:
+            return f"{KEY_PREFIX}:shared:{digest}"
+        return f"{KEY_PREFIX}:tenant:{tenant_id}:{digest}"
+
+    def get_many(
+        self, keys: Iterable[str]
+    ) -> Tuple[Dict[str, LookupResult], List[str], List[str]]:
+        """
+        Look up many keys.
+
+        Returns (results, stale_keys, missing_keys): results holds every
+        usable entry (fresh or stale), stale_keys the subset that should be
+        refreshed and missing_keys those that must be fetched now.
+        """
+        now = time.time()
+        keys = list(dict.fromkeys(keys))
+        results: Dict[str, LookupResult] = {}
+        stale: List[str] = []
+        remote_keys: List[str] = []
+
+        with self._lock:
+            for key in keys:
+                entry = self._local.get(key)
+                if entry is not None and entry.is_usable(now):
+                    self._local.move_to_end(key)
+                    self._record(entry, now, "local", results, stale, key)
+                else:
+                    remote_keys.append(key)
+
+        missing: List[str] = []
+        if remote_keys:
+            try:
+                remote = self.shared.get_many(remote_keys)
+            except Exception as e:
+                logger.warning(f"Lookup cache unavailable: {e}")
+                remote = {}
+
+            for key in remote_keys:
+                raw = remote.get(key)
+                entry = CacheEntry(**raw) if raw else None
+                if entry is not None and entry.is_usable(now):
+                    self._store_local(key, entry)
+                    self._record(entry, now, "shared", results, stale, key)
+                else:
+                    self.metrics["miss"] += 1
+                    missing.append(key)
+
+        return results, stale, missing
+
+    def set(self, key: str, result: LookupResult, ttl: float) -> None:
+        """Store a lookup result in both tiers"""
+        now = time.time()
+        entry = CacheEntry.from_result(result, ttl, now)
+        self._store_local(key, entry)
+
+        try:
+            self.shared.set(
+                key, entry.__dict__, timeout=max(1, int(entry.stale_until - now))
+            )
+        except Exception as e:
+            logger.warning(f"Lookup cache unavailable: {e}")
+
+    def claim_refresh(self, key: str) -> bool:
+        """Claim the right to refresh a stale key (one worker at a time)"""
+        try:
+            return bool(
+                self.shared.add(f"{key}:refreshing", 1, timeout=REFRESH_LOCK_TTL)
+            )
+        except Exception:
+            return True
+
+    def release_refresh(self, key: str) -> None:
+        try:
+            self.shared.delete(f"{key}:refreshing")
+        except Exception:
+            pass
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit ratio for this process"""
+        counts = dict(self.metrics)
+        hits = sum(v for k, v in counts.items() if k.endswith("_hit"))
+        total = hits + counts.get("miss", 0)
+        return {
+            **counts,
+            "hits": hits,
+            "requests": total,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "local_entries": len(self._local),
+        }
+
+    def _record(self, entry, now, tier, results, stale, key) -> None:
+        results[key] = entry.to_result(now)
+        if entry.negative:
+            self.metrics["negative_hit"] += 1
+        elif entry.is_fresh(now):
+            self.metrics[f"{tier}_hit"] += 1
+        else:
+            self.metrics["stale_hit"] += 1
+            stale.append(key)
+
+    def _store_local(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+
+# Shared by all lookups in this process
+lookup_cache = LookupCache()
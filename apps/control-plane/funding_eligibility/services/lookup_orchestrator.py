@@ -0,0 +1,220 @@
+"""
+Orchestrates external lookups for eligibility requests.
+
+All lookups for a request (or a whole batch) run concurrently in a single
+event loop, each bounded by its provider's timeout, instead of one Celery
+task per provider. Results are served from the shared lookup cache where
+possible.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from .connectors import BaseConnector, ConnectorFactory, LookupResult, plan_lookups
+from .lookup_cache import LookupCache, lookup_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECTOR_CONFIG = {
+    "timeout": 30,
+    "cache_ttl": 3600,
+}
+
+# Per-provider connector overrides (timeouts in seconds)
+PROVIDER_CONFIG = {
+    "usi": {"timeout": 10},
+    "postcode": {"timeout": 5},
+    "concession": {"timeout": 10},
+    "visa": {"timeout": 15},
+}
+
+# Maximum lookups in flight at once
+MAX_CONCURRENCY = 20
+
+# Sentinel for "use the process-wide lookup cache"
+_DEFAULT_CACHE = object()
+
+
+@dataclass
+class PlannedLookup:
+    """A lookup to perform, identified by its connector cache key"""
+
+    provider: str
+    data: Dict[str, Any]
+    cache_key: str
+
+
+def lookup_status(result: LookupResult) -> str:
+    """Map a lookup result onto ExternalLookup.status"""
+    if result.success:
+        return "success"
+    return "timeout" if result.timed_out else "error"
+
+
+class LookupOrchestrator:
+    """
+    Plans and runs connector lookups concurrently.
+
+    Pass the tenant the lookups are made for so tenant-scoped providers are
+    cached per tenant, or cache=None to always call the providers.
+    """
+
+    def __init__(
+        self,
+        connector_config: Optional[Dict[str, Any]] = None,
+        provider_config: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        tenant_id: Optional[Any] = None,
+        cache: Any = _DEFAULT_CACHE,
+    ):
+        self.connector_config = connector_config or DEFAULT_CONNECTOR_CONFIG
+        self.provider_config = (
+            PROVIDER_CONFIG if provider_config is None else provider_config
+        )
+        self.max_concurrency = max_concurrency
+        self.tenant_id = tenant_id
+        self.cache: Optional[LookupCache] = (
+            lookup_cache if cache is _DEFAULT_CACHE else cache
+        )
+        self.stats: Counter = Counter()
+        self._connectors: Dict[str, BaseConnector] = {}
+
+    def connector(self, provider: str) -> BaseConnector:
+        """Get (and reuse) the connector for a provider"""
+        if provider not in self._connectors:
+            config = {
+                **self.connector_config,
+                **self.provider_config.get(provider, {}),
+            }
+            self._connectors[provider] = ConnectorFactory.create(provider, config)
+        return self._connectors[provider]
+
+    def plan(self, input_data: Dict[str, Any]) -> List[PlannedLookup]:
+        """Determine the lookups needed for one eligibility input"""
+        return [
+            PlannedLookup(
+                provider=lookup_def["provider"],
+                data=lookup_def["data"],
+                cache_key=self.connector(lookup_def["provider"]).get_cache_key(
+                    **lookup_def["data"]
+                ),
+            )
+            for lookup_def in plan_lookups(input_data)
+        ]
+
+    def run(self, lookups: Iterable[PlannedLookup]) -> Dict[str, LookupResult]:
+        """Run lookups from synchronous code (e.g. a Celery task)"""
+        return asyncio.run(self.gather(lookups))
+
+    async def gather(self, lookups: Iterable[PlannedLookup]) -> Dict[str, LookupResult]:
+        """
+        Run lookups concurrently, deduplicated by cache key.
+
+        Returns results keyed by cache key. Failures and timeouts are
+        returned as unsuccessful results rather than raised.
+        """
+        unique = {lookup.cache_key: lookup for lookup in lookups}
+        results: Dict[str, LookupResult] = {}
+
+        if self.cache is not None and unique:
+            storage_keys = {
+                self._storage_key(lookup): lookup for lookup in unique.values()
+            }
+            cached, stale, missing = self.cache.get_many(storage_keys)
+
+            for storage_key, result in cached.items():
+                results[storage_keys[storage_key].cache_key] = result
+            for storage_key in stale:
+                self._schedule_refresh(storage_key, storage_keys[storage_key])
+
+            self.stats["cache_hits"] += len(cached)
+            to_fetch = [storage_keys[key] for key in missing]
+        else:
+            to_fetch = list(unique.values())
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_one(lookup: PlannedLookup) -> LookupResult:
+            async with semaphore:
+                return await self._lookup(lookup)
+
+        fetched = await asyncio.gather(*(run_one(l) for l in to_fetch))
+        self.stats["fetched"] += len(fetched)
+
+        for lookup, result in zip(to_fetch, fetched):
+            results[lookup.cache_key] = result
+            self._store(lookup, result)
+
+        return results
+
+    def refresh(self, lookup: PlannedLookup) -> LookupResult:
+        """Call the provider and overwrite any cached result"""
+        result = asyncio.run(self._lookup(lookup))
+        self._store(lookup, result)
+        return result
+
+    def _storage_key(self, lookup: PlannedLookup) -> str:
+        return LookupCache.make_key(
+            self.connector(lookup.provider), lookup.cache_key, self.tenant_id
+        )
+
+    def _store(self, lookup: PlannedLookup, result: LookupResult) -> None:
+        if self.cache is not None:
+            self.cache.set(
+                self._storage_key(lookup),
+                result,
+                ttl=self.connector(lookup.provider).cache_ttl,
+            )
+
+    def _schedule_refresh(self, storage_key: str, lookup: PlannedLookup) -> None:
+        """Refresh a stale entry in the background, once across workers"""
+        if not self.cache.claim_refresh(storage_key):
+            return
+
+        from ..tasks import refresh_cached_lookup
+
+        try:
+            refresh_cached_lookup.delay(lookup.provider, lookup.data, self.tenant_id)
+        except Exception as e:
+            logger.warning(f"Could not schedule {lookup.provider} refresh: {e}")
+            self.cache.release_refresh(storage_key)
+
+    async def _lookup(self, lookup: PlannedLookup) -> LookupResult:
+        connector = self.connector(lookup.provider)
+        start_time = datetime.now()
+
+        try:
+            return await asyncio.wait_for(
+                connector.lookup(**lookup.data), timeout=connector.timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"{lookup.provider} lookup timed out after {connector.timeout}s"
+            )
+            return LookupResult(
+                provider=lookup.provider,
+                success=False,
+                data={},
+                error=f"Timed out after {connector.timeout}s",
+                latency_ms=self._elapsed_ms(start_time),
+                timed_out=True,
+            )
+        except Exception as e:
+            logger.error(f"{lookup.provider} lookup error: {e}")
+            return LookupResult(
+                provider=lookup.provider,
+                success=False,
+                data={},
+                error=str(e),
+                latency_ms=self._elapsed_ms(start_time),
+            )
+
+    @staticmethod
+    def _elapsed_ms(start_time: datetime) -> int:
+        return int((datetime.now() - start_time).total_seconds() * 1000)
@@ -0,0 +1,334 @@
+"""
+In-memory reference data for rule evaluation.
+
+Reference tables (postcode RAI bands, concession types, course funding
+categories, ...) are loaded once per version into an immutable snapshot that
+every evaluation in the process shares. Evaluations read from the snapshot
+and never query ReferenceTable rows themselves.
+
+* Tables keyed by fixed-width numeric codes with numeric values (e.g.
+  postcode -> RAI band) are packed into flat arrays instead of dicts.
+* Large packed tables are written to a snapshot file named by checksum and
+  memory-mapped, so worker processes on a host share one copy via the page
+  cache.
+* Saving or deleting a ReferenceTable bumps a generation counter in the
+  shared cache; processes notice it on their next check and reload only the
+  namespaces whose version or checksum changed.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import mmap
+import os
+import tempfile
+import threading
+import time
+from array import array
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the shared generation counter
+CHECK_INTERVAL = getattr(settings, "FUNDING_REFERENCE_CHECK_INTERVAL", 30)
+
+# Re-read the manifest at least this often, so tables whose validity window
+# opens or closes are picked up without an explicit save
+MANIFEST_MAX_AGE = getattr(settings, "FUNDING_REFERENCE_MANIFEST_MAX_AGE", 600)
+
+# Packed tables with at least this many entries are memory-mapped
+MMAP_THRESHOLD = getattr(settings, "FUNDING_REFERENCE_MMAP_THRESHOLD", 50000)
+
+SNAPSHOT_DIR = getattr(
+    settings,
+    "FUNDING_REFERENCE_SNAPSHOT_DIR",
+    os.path.join(tempfile.gettempdir(), "funding-reference"),
+)
+
+GENERATION_KEY = "funding:reference:generation"
+
+# Largest key space (and minimum fill ratio) worth packing into an array
+MAX_PACKED_KEYSPACE = 1_000_000
+MIN_PACKED_DENSITY = 0.05
+
+_INT32_MIN, _INT32_MAX = -(2**31), 2**31 - 1
+
+
+class PackedTable(Mapping):
+    """
+    Read-only mapping of fixed-width numeric string keys to numbers,
+    stored as a flat array indexed by int(key).
+    """
+
+    def __init__(self, values, typecode: str, width: int, size: int):
+        self._values = values
+        self.typecode = typecode
+        self.width = width
+        self._size = size
+
+    @classmethod
+    def build(cls, data: Dict[str, Any]) -> Optional["PackedTable"]:
+        """Pack a dict if its keys and values allow it, else return None"""
+        if not data:
+            return None
+
+        widths = {len(k) if isinstance(k, str) else -1 for k in data}
+        if len(widths) != 1 or -1 in widths:
+            return None
+        if not all(k.isdigit() for k in data):
+            return None
+
+        values = list(data.values())
+        if not all(
+            isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+        ):
+            return None
+
+        if all(isinstance(v, int) and _INT32_MIN < v <= _INT32_MAX for v in values):
+            typecode, missing = "i", _INT32_MIN
+        else:
+            typecode, missing = "d", math.nan
+
+        keyspace = max(int(k) for k in data) + 1
+        if keyspace > MAX_PACKED_KEYSPACE or len(data) / keyspace < MIN_PACKED_DENSITY:
+            return None
+
+        packed = array(typecode, [missing]) * keyspace
+        for key, value in data.items():
+            packed[int(key)] = value
+
+        return cls(packed, typecode, widths.pop(), len(data))
+
+    def _index(self, key: Any) -> Optional[int]:
+        if isinstance(key, str) and len(key) == self.width and key.isdigit():
+            index = int(key)
+            if index < len(self._values):
+                return index
+        return None
+
+    def _is_missing(self, value) -> bool:
+        if self.typecode == "i":
+            return value == _INT32_MIN
+        return math.isnan(value)
+
+    def __getitem__(self, key):
+        index = self._index(key)
+        if index is not None:
+            value = self._values[index]
+            if not self._is_missing(value):
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for index, value in enumerate(self._values):
+            if not self._is_missing(value):
+                yield str(index).zfill(self.width)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def to_file(self, path: str) -> None:
+        """Write the packed values to a snapshot file atomically"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            self._values.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def from_file(
+        cls, path: str, typecode: str, width: int, size: int
+    ) -> "PackedTable":
+        """Memory-map a snapshot file written by to_file"""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(memoryview(mapped).cast(typecode), typecode, width, size)
+
+
+class ReferenceSnapshot:
+    """
+    Immutable view of every currently valid reference table.
+
+    Passed as EvaluationContext.reference_data; namespaces map to read-only
+    mappings of key -> value.
+    """
+
+    def __init__(
+        self,
+        tables: Dict[str, Mapping],
+        versions: Dict[str, Tuple[str, str]],
+        generation: Any = None,
+    ):
+        self._tables = MappingProxyType(dict(tables))
+        self.versions = MappingProxyType(dict(versions))
+        self.generation = generation
+
+    def get(self, namespace: str, default: Any = None) -> Any:
+        return self._tables.get(namespace, default)
+
+    def __getitem__(self, namespace: str) -> Mapping:
+        return self._tables[namespace]
+
+    def __contains__(self, namespace: str) -> bool:
+        return namespace in self._tables
+
+    def namespaces(self):
+        return list(self._tables.keys())
+
+
+def _freeze(data: Any) -> Mapping:
+    """Convert a table's JSON payload into a read-only mapping"""
+    if isinstance(data, list):
+        # Lists of records are indexed by their key/code field
+        data = {
+            str(row.get("key", row.get("code"))): row
+            for row in data
+            if isinstance(row, dict) and ("key" in row or "code" in row)
+        }
+    if not isinstance(data, dict):
+        return MappingProxyType({})
+
+    return PackedTable.build(data) or MappingProxyType(data)
+
+
+class ReferenceDataStore:
+    """
+    Per-process holder of the current ReferenceSnapshot.
+    """
+
+    def __init__(
+        self,
+        check_interval: float = CHECK_INTERVAL,
+        manifest_max_age: float = MANIFEST_MAX_AGE,
+        mmap_threshold: int = MMAP_THRESHOLD,
+        snapshot_dir: str = SNAPSHOT_DIR,
+    ):
+        self.check_interval = check_interval
+        self.manifest_max_age = manifest_max_age
+        self.mmap_threshold = mmap_threshold
+        self.snapshot_dir = snapshot_dir
+
+        self._snapshot: Optional[ReferenceSnapshot] = None
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._manifest_at = 0.0
+
+    def snapshot(self) -> ReferenceSnapshot:
+        """Return the current snapshot, reloading changed tables if needed"""
+        now = time.monotonic()
+        if self._snapshot is not None and now - self._checked_at < self.check_interval:
+            return self._snapshot
+
+        with self._lock:
+            if (
+                self._snapshot is not None
+                and time.monotonic() - self._checked_at < self.check_interval
+            ):
+                return self._snapshot
+
+            generation = self._generation()
+            if (
+                self._snapshot is None
+                or generation != self._snapshot.generation
+                or now - self._manifest_at >= self.manifest_max_age
+            ):
+                self._snapshot = self._load(self._snapshot, generation)
+                self._manifest_at = time.monotonic()
+
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Force the next snapshot() call to re-check the manifest"""
+        with self._lock:
+            self._checked_at = 0.0
+            self._manifest_at = 0.0
+
+    @staticmethod
+    def _generation() -> Any:
+        try:
+            return cache.get(GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"Reference generation unavailable: {e}")
+            return None
+
+    def _load(
+        self, previous: Optional[ReferenceSnapshot], generation: Any
+    ) -> ReferenceSnapshot:
+        from ..models_extended import ReferenceTable
+
+        today = timezone.localdate()
+        manifest: Dict[str, Tuple[int, str, str]] = {}
+
+        # Newest valid version of each namespace
+        rows = (
+            ReferenceTable.objects.filter(valid_from__lte=today)
+            .filter(Q(valid_until__gte=today) | Q(valid_until__isnull=True))
+            .order_by("namespace", "-valid_from", "-created_at")
+            .values_list("id", "namespace", "version", "checksum")
+        )
+        for table_id, namespace, version, checksum in rows:
+            manifest.setdefault(namespace, (table_id, version, checksum))
+
+        tables: Dict[str, Mapping] = {}
+        to_load = {}
+        for namespace, (table_id, version, checksum) in manifest.items():
+            if previous is not None and previous.versions.get(namespace) == (
+                version,
+                checksum,
+            ):
+                tables[namespace] = previous[namespace]
+            else:
+                to_load[table_id] = (namespace, version, checksum)
+
+        if to_load:
+            for table_id, data in ReferenceTable.objects.filter(
+                id__in=to_load
+            ).values_list("id", "data"):
+                namespace, version, checksum = to_load[table_id]
+                tables[namespace] = self._build_table(data, checksum)
+
+            logger.info(
+                f"Loaded reference tables: "
+                f"{', '.join(ns for ns, _, _ in to_load.values())}"
+            )
+
+        versions = {ns: (v, c) for ns, (_, v, c) in manifest.items()}
+        return ReferenceSnapshot(tables, versions, generation)
+
+    def _build_table(self, data: Any, checksum: str) -> Mapping:
+        table = _freeze(data)
+        if not isinstance(table, PackedTable) or len(table) < self.mmap_threshold:
+            return table
+
+        path = os.path.join(self.snapshot_dir, f"{checksum}.{table.typecode}")
+        try:
+            if not os.path.exists(path):
+                table.to_file(path)
+            return PackedTable.from_file(path, table.typecode, table.width, len(table))
+        except OSError as e:
+            logger.warning(f"Could not memory-map reference snapshot {path}: {e}")
+            return table
+
+
+def bump_generation() -> None:
+    """Signal every process that reference tables changed"""
+    try:
+        if not cache.add(GENERATION_KEY, 1, timeout=None):
+            cache.incr(GENERATION_KEY)
+    except Exception as e:
+        logger.warning(f"Could not bump reference generation: {e}")
+
+    reference_store.invalidate()
+
+
+# Shared by all evaluations in this process
+reference_store = ReferenceDataStore()
@@ -5,11 +5,13 @@ Supports JSONLogic format with extensible adapter pattern.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, date
 import json
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +39,10 @@ class EvaluationContext:
 
         Example: get('student.age') -> input_data['student']['age']
         """
-        parts = path.split(".")
+        return self.get_path(path.split("."), default)
+
+    def get_path(self, parts: Sequence[str], default: Any = None) -> Any:
+        """Get value from context using a pre-split path"""
         data = self.input_data
 
         for part in parts:
@@ -236,6 +241,289 @@ class JSONLogicEvaluator:
         return context.get_reference(namespace, key, default)
 
 
+# Compiled rule program: a closure over an EvaluationContext
+Program = Callable[[EvaluationContext], Any]
+
+# Sentinel marking a compiled node whose value is not known at compile time
+_DYNAMIC = object()
+
+
+def _parse_date(value: Any) -> Any:
+    """Parse ISO date strings, leaving other values untouched"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).date()
+    return value
+
+
+class RuleCompiler:
+    """
+    Compiles JSONLogic expressions into Python closures.
+
+    Produces the same results as JSONLogicEvaluator, but resolves operator
+    dispatch, splits ``var`` paths and folds constant sub-expressions once
+    at compile time instead of on every evaluation.
+    """
+
+    # Operators whose result depends on the evaluation context
+    CONTEXT_OPERATORS = {"var", "lookup", "reference"}
+
+    def __init__(self):
+        self.builders = {
+            "==": self._build_binary(lambda a, b: a == b),
+            "!=": self._build_binary(lambda a, b: not a == b),
+            ">": self._build_binary(lambda a, b: a > b),
+            ">=": self._build_binary(lambda a, b: a >= b),
+            "<": self._build_binary(lambda a, b: a < b),
+            "<=": self._build_binary(lambda a, b: a <= b),
+            "in": self._build_binary(lambda a, b: a in b),
+            "and": self._build_and,
+            "or": self._build_or,
+            "not": self._build_not,
+            "var": self._build_var,
+            "if": self._build_if,
+            "between": self._build_between,
+            "date_diff": self._build_date_diff,
+            "lookup": self._build_lookup,
+            "reference": self._build_reference,
+        }
+
+    def compile(self, logic: Any) -> Program:
+        """Compile a JSONLogic expression into a callable program"""
+        program, _ = self._compile(logic)
+        return program
+
+    def _compile(self, logic: Any) -> Tuple[Program, Any]:
+        """
+        Compile a node.
+
+        Returns a (program, constant) pair where constant is the folded
+        value of the node, or _DYNAMIC if it must be computed at runtime.
+        """
+        if not isinstance(logic, dict):
+            return self._constant(logic)
+
+        op = next(iter(logic)) if logic else None
+        if op is None:
+            raise ValueError("Empty JSONLogic expression")
+
+        builder = self.builders.get(op)
+        if builder is None:
+            logger.warning(f"Unknown operator: {op}")
+            return self._constant(False)
+
+        program, operands = builder(logic[op])
+
+        # Fold pure operators whose operands are all constants
+        if op not in self.CONTEXT_OPERATORS and all(
+            value is not _DYNAMIC for value in operands
+        ):
+            try:
+                return self._constant(program(None))
+            except Exception:
+                # Leave runtime errors to surface during evaluation
+                pass
+
+        return program, _DYNAMIC
+
+    @staticmethod
+    def _constant(value: Any) -> Tuple[Program, Any]:
+        return (lambda context: value), value
+
+    def _compile_args(self, args: Any) -> Tuple[List[Program], List[Any]]:
+        """Compile a list of operand expressions"""
+        compiled = [self._compile(arg) for arg in args]
+        return [c[0] for c in compiled], [c[1] for c in compiled]
+
+    def _build_binary(self, fn: Callable[[Any, Any], Any]):
+        def build(args: List) -> Tuple[Program, List[Any]]:
+            (left, right), operands = self._compile_args(args[:2])
+            return (lambda context: fn(left(context), right(context))), operands
+
+        return build
+
+    def _build_and(self, args: List) -> Tuple[Program, List[Any]]:
+        programs, operands = self._compile_args(args)
+        return (lambda context: all(p(context) for p in programs)), operands
+
+    def _build_or(self, args: List) -> Tuple[Program, List[Any]]:
+        programs, operands = self._compile_args(args)
+        return (lambda context: any(p(context) for p in programs)), operands
+
+    def _build_not(self, args: Any) -> Tuple[Program, List[Any]]:
+        program, operand = self._compile(args)
+        return (lambda context: not program(context)), [operand]
+
+    def _build_var(self, args: Any) -> Tuple[Program, List[Any]]:
+        if isinstance(args, list):
+            path = args[0]
+            default = args[1] if len(args) > 1 else None
+        else:
+            path = args
+            default = None
+
+        if isinstance(path, str):
+            parts = tuple(path.split("."))
+            return (lambda context: context.get_path(parts, default)), []
+
+        return (lambda context: context.get(path, default)), []
+
+    def _build_if(self, args: List) -> Tuple[Program, List[Any]]:
+        programs, operands = self._compile_args(args[:3])
+        condition, then_branch = programs[0], programs[1]
+        else_branch = programs[2] if len(programs) > 2 else None
+
+        def program(context):
+            if condition(context):
+                return then_branch(context)
+            return else_branch(context) if else_branch else None
+
+        return program, operands
+
+    def _build_between(self, args: List) -> Tuple[Program, List[Any]]:
+        (value, min_val, max_val), operands = self._compile_args(args[:3])
+
+        def program(context):
+            v = value(context)
+            return min_val(context) <= v <= max_val(context)
+
+        return program, operands
+
+    def _build_date_diff(self, args: List) -> Tuple[Program, List[Any]]:
+        (first, second), operands = self._compile_args(args[:2])
+
+        def program(context):
+            date1 = _parse_date(first(context))
+            date2 = _parse_date(second(context))
+            return (date2 - date1).days
+
+        return program, operands
+
+    def _build_table_access(self, args: List, accessor: str):
+        programs, operands = self._compile_args(args[:3])
+        source, key = programs[0], programs[1]
+        default = programs[2] if len(programs) > 2 else None
+
+        def program(context):
+            return getattr(context, accessor)(
+                source(context),
+                key(context),
+                default(context) if default else None,
+            )
+
+        return program, operands
+
+    def _build_lookup(self, args: List) -> Tuple[Program, List[Any]]:
+        return self._build_table_access(args, "get_lookup")
+
+    def _build_reference(self, args: List) -> Tuple[Program, List[Any]]:
+        return self._build_table_access(args, "get_reference")
+
+
+@dataclass
+class CompiledArtifact:
+    """A single ruleset artifact compiled for repeated evaluation"""
+
+    name: str
+    type: str
+    program: Optional[Program] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class CompiledRuleset:
+    """All artifacts of one ruleset version, compiled once"""
+
+    version: str
+    artifacts: List[CompiledArtifact] = field(default_factory=list)
+
+
+def compile_ruleset(
+    ruleset_artifacts: List[Dict[str, Any]], ruleset_version: str
+) -> CompiledRuleset:
+    """
+    Compile ruleset artifacts into reusable programs.
+
+    Artifacts that fail to parse or compile keep their error message so
+    evaluation reports them exactly as the interpreter would.
+    """
+    compiler = RuleCompiler()
+    compiled = CompiledRuleset(version=ruleset_version)
+
+    for artifact in ruleset_artifacts:
+        entry = CompiledArtifact(name=artifact["name"], type=artifact["type"])
+
+        if entry.type == "jsonlogic":
+            try:
+                entry.program = compiler.compile(json.loads(artifact["blob"]))
+            except Exception as e:
+                logger.error(f"Error compiling {entry.name}: {e}")
+                entry.error = str(e)
+
+        compiled.artifacts.append(entry)
+
+    return compiled
+
+
+class RulesetProgramCache:
+    """
+    Per-process LRU cache of compiled rulesets.
+
+    Only non-draft rulesets are cached, since rulesets are immutable once
+    activated. Entries are keyed by ruleset id, version and checksum.
+    """
+
+    def __init__(self, max_size: int = 64):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple, CompiledRuleset]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(ruleset) -> Tuple:
+        return (
+            ruleset.pk,
+            ruleset.jurisdiction_code,
+            ruleset.version,
+            ruleset.checksum,
+        )
+
+    def get(self, ruleset) -> CompiledRuleset:
+        """Return the compiled program for a Ruleset, compiling on first use"""
+        if ruleset.status == "draft":
+            return compile_ruleset(self._load_artifacts(ruleset), ruleset.version)
+
+        key = self.cache_key(ruleset)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                return compiled
+
+        compiled = compile_ruleset(self._load_artifacts(ruleset), ruleset.version)
+
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _load_artifacts(ruleset) -> List[Dict[str, Any]]:
+        return [
+            {"type": artifact.type, "name": artifact.name, "blob": artifact.blob}
+            for artifact in ruleset.artifacts.all()
+        ]
+
+
+# Shared by all evaluations in this process
+ruleset_programs = RulesetProgramCache()
+
+
 class RulesEngine:
     """
     Main rules engine for funding eligibility evaluation.
@@ -258,26 +546,46 @@ class RulesEngine:
             context: Evaluation context with input and lookup data
             ruleset_version: Version string for reproducibility
 
+        Returns:
+            EvaluationResult with outcome and reasons
+        """
+        return self.evaluate_compiled(
+            compile_ruleset(ruleset_artifacts, ruleset_version), context
+        )
+
+    def evaluate_compiled(
+        self, compiled: CompiledRuleset, context: EvaluationContext
+    ) -> EvaluationResult:
+        """
+        Evaluate eligibility using a precompiled ruleset.
+
+        Args:
+            compiled: Ruleset compiled with compile_ruleset or ruleset_programs
+            context: Evaluation context with input and lookup data
+
         Returns:
             EvaluationResult with outcome and reasons
         """
         reasons = []
         clause_refs = []
         details = {}
+        ruleset_version = compiled.version
 
         # Track all rule results
         rule_results = []
 
-        for artifact in ruleset_artifacts:
-            artifact_type = artifact["type"]
-            artifact_name = artifact["name"]
-            blob = artifact["blob"]
+        for artifact in compiled.artifacts:
+            artifact_name = artifact.name
+
+            if artifact.type == "jsonlogic":
+                if artifact.error is not None:
+                    rule_results.append(
+                        {"artifact": artifact_name, "error": artifact.error}
+                    )
+                    continue
 
-            if artifact_type == "jsonlogic":
-                # Parse and evaluate JSONLogic
                 try:
-                    logic = json.loads(blob)
-                    result = self.evaluator.evaluate(logic, context)
+                    result = artifact.program(context)
 
                     rule_results.append(
                         {
@@ -293,11 +601,11 @@ class RulesEngine:
                     logger.error(f"Error evaluating {artifact_name}: {e}")
                     rule_results.append({"artifact": artifact_name, "error": str(e)})
 
-            elif artifact_type == "rego":
+            elif artifact.type == "rego":
                 # TODO: Implement OPA/Rego evaluation
                 logger.warning(f"Rego not yet supported: {artifact_name}")
 
-            elif artifact_type == "python":
+            elif artifact.type == "python":
                 # TODO: Implement safe Python evaluation
                 logger.warning(f"Python not yet supported: {artifact_name}")
 
@@ -0,0 +1,17 @@
+"""
+Signal handlers for funding eligibility models.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models_extended import ReferenceTable
+from .services.reference_data import bump_generation
+
+
+@receiver(post_save, sender=ReferenceTable)
+@receiver(post_delete, sender=ReferenceTable)
+def reference_table_changed(sender, instance, **kwargs):
+    """Reload in-memory reference data in every process once committed"""
+    transaction.on_commit(bump_generation)
@@ -14,93 +14,196 @@ import requests
 
 logger = logging.getLogger(__name__)
 
+# ExternalLookup fields written from a lookup result
+LOOKUP_RESULT_FIELDS = [
+    "request_data",
+    "response_data",
+    "status",
+    "error_message",
+    "latency_ms",
+    "cached_until",
+]
+
+
+def _evaluate_request(request_obj, ruleset_id: int = None):
+    """
+    Evaluate a request against the active (or given) ruleset and store the
+    decision. Returns the existing decision if the request was already
+    evaluated, so task retries are idempotent.
+    """
+    from .models_extended import Ruleset, EligibilityDecision
+    from .services.reference_data import reference_store
+    from .services.rules_engine import (
+        RulesEngine,
+        EvaluationContext,
+        ruleset_programs,
+    )
+
+    existing = EligibilityDecision.objects.filter(request=request_obj).first()
+    if existing:
+        return existing
+
+    # Get ruleset
+    if ruleset_id:
+        ruleset = Ruleset.objects.get(id=ruleset_id, status="active")
+    else:
+        ruleset = Ruleset.objects.filter(
+            jurisdiction_code=request_obj.jurisdiction_code, status="active"
+        ).first()
+
+    if not ruleset:
+        raise ValueError(
+            f"No active ruleset for jurisdiction {request_obj.jurisdiction_code}"
+        )
+
+    # Collect lookup results
+    lookups = {}
+    for lookup in request_obj.external_lookups.filter(status="success"):
+        if lookup.provider not in lookups:
+            lookups[lookup.provider] = {}
+        lookups[lookup.provider].update(lookup.response_data)
+
+    # Build context
+    context = EvaluationContext(
+        input_data=request_obj.input,
+        lookups=lookups,
+        reference_data=reference_store.snapshot(),
+        jurisdiction_code=request_obj.jurisdiction_code,
+        evaluation_date=timezone.now(),
+    )
+
+    # Evaluate with the compiled program for this ruleset version
+    engine = RulesEngine()
+    result = engine.evaluate_compiled(ruleset_programs.get(ruleset), context)
+
+    # Create decision
+    with transaction.atomic():
+        decision = EligibilityDecision.objects.create(
+            request=request_obj,
+            ruleset=ruleset,
+            outcome=result.outcome,
+            reasons=result.reasons,
+            clause_refs=result.clause_refs,
+            decision_data=result.details,
+            explanation=result.explanation,
+            decided_by="system",
+        )
+
+        request_obj.status = "evaluated"
+        request_obj.evaluated_at = timezone.now()
+        request_obj.save()
+
+    logger.info(f"Evaluated request {request_obj.id}: {result.outcome}")
+
+    return decision
+
+
+def send_decision_webhook(decision) -> bool:
+    """
+    Queue the decision.finalized webhook unless it was already queued for
+    this decision (e.g. by an earlier attempt of a retried task).
+    """
+    from .models_extended import EligibilityDecision
+
+    claimed = EligibilityDecision.objects.filter(
+        pk=decision.pk, webhook_sent_at__isnull=True
+    ).update(webhook_sent_at=timezone.now())
+    if claimed:
+        deliver_webhook.delay(decision.request_id, "decision.finalized")
+    return bool(claimed)
+
+
+def _mark_request_error(request_id: int) -> None:
+    from .models_extended import EligibilityRequest
+
+    EligibilityRequest.objects.filter(id=request_id).update(status="error")
+
 
 @shared_task(bind=True, max_retries=3)
-def enqueue_external_lookups(self, request_id: int):
+def enqueue_external_lookups(self, request_id: int, ruleset_id: int = None):
     """
-    Enqueue external lookups for an eligibility request.
-    Determines which lookups are needed based on input data.
+    Run all external lookups for an eligibility request, then evaluate it.
+
+    Lookups run concurrently in one event loop with per-provider timeouts,
+    and evaluation follows directly once they complete.
     """
     from .models_extended import EligibilityRequest, ExternalLookup
-    from .services.connectors import ConnectorFactory
+    from .services.lookup_orchestrator import LookupOrchestrator, lookup_status
 
     try:
         request_obj = EligibilityRequest.objects.get(id=request_id)
         request_obj.status = "evaluating"
         request_obj.save()
 
-        input_data = request_obj.input
-
-        # Determine which lookups are needed
-        lookups_needed = []
-
-        # USI validation
-        if input_data.get("usi"):
-            lookups_needed.append(
-                {
-                    "provider": "usi",
-                    "data": {
-                        "usi": input_data["usi"],
-                        "first_name": input_data.get("first_name"),
-                        "family_name": input_data.get("family_name"),
-                        "date_of_birth": input_data.get("date_of_birth"),
-                    },
-                }
-            )
-
-        # Postcode lookup
-        if input_data.get("postcode"):
-            lookups_needed.append(
-                {"provider": "postcode", "data": {"postcode": input_data["postcode"]}}
-            )
-
-        # Concession card
-        if input_data.get("concession_card"):
-            lookups_needed.append(
-                {
-                    "provider": "concession",
-                    "data": {
-                        "card_number": input_data["concession_card"].get("number"),
-                        "card_type": input_data["concession_card"].get("type"),
-                        "holder_name": input_data.get("full_name"),
-                    },
-                }
-            )
-
-        # Visa check
-        if input_data.get("passport_number"):
-            lookups_needed.append(
-                {
-                    "provider": "visa",
-                    "data": {
-                        "passport_number": input_data["passport_number"],
-                        "country_of_passport": input_data.get("country_of_passport"),
-                        "date_of_birth": input_data.get("date_of_birth"),
-                    },
-                }
-            )
+        # Determine which lookups are needed, reusing fresh results already
+        # stored for this request (e.g. from a previous attempt)
+        orchestrator = LookupOrchestrator(tenant_id=request_obj.tenant_id)
+        cached_providers = set(
+            request_obj.external_lookups.filter(
+                status="success", cached_until__gt=timezone.now()
+            ).values_list("provider", flat=True)
+        )
+        lookups_needed = [
+            planned
+            for planned in orchestrator.plan(request_obj.input)
+            if planned.provider not in cached_providers
+        ]
+
+        # Execute lookups concurrently
+        results = orchestrator.run(lookups_needed) if lookups_needed else {}
+
+        # Update the rows of a previous attempt rather than adding new ones
+        existing = {}
+        for lookup in request_obj.external_lookups.filter(
+            provider__in=[planned.provider for planned in lookups_needed]
+        ).order_by("-created_at"):
+            existing.setdefault(lookup.provider, lookup)
+
+        updated, created = [], []
+        for planned in lookups_needed:
+            result = results[planned.cache_key]
+            lookup = existing.get(planned.provider)
+            if lookup is None:
+                lookup = ExternalLookup(request=request_obj, provider=planned.provider)
+                created.append(lookup)
+            else:
+                updated.append(lookup)
+            lookup.request_data = planned.data
+            lookup.response_data = result.data
+            lookup.status = lookup_status(result)
+            lookup.error_message = result.error or ""
+            lookup.latency_ms = result.latency_ms
+            lookup.cached_until = result.cache_until
+
+        ExternalLookup.objects.bulk_create(created)
+        ExternalLookup.objects.bulk_update(updated, LOOKUP_RESULT_FIELDS)
+
+        logger.info(f"Completed {len(lookups_needed)} lookups for request {request_id}")
+
+        decision = _evaluate_request(request_obj, ruleset_id)
 
-        # Execute lookups
-        for lookup_def in lookups_needed:
-            perform_external_lookup.delay(
-                request_id, lookup_def["provider"], lookup_def["data"]
-            )
+        # Trigger webhook
+        send_decision_webhook(decision)
 
-        logger.info(f"Enqueued {len(lookups_needed)} lookups for request {request_id}")
+        return decision.id
 
     except Exception as e:
-        logger.error(f"Error enqueuing lookups for request {request_id}: {e}")
+        logger.error(f"Error processing lookups for request {request_id}: {e}")
+        _mark_request_error(request_id)
         raise self.retry(exc=e, countdown=60)
 
 
 @shared_task(bind=True, max_retries=3)
 def perform_external_lookup(self, request_id: int, provider: str, lookup_data: dict):
     """
-    Perform a single external lookup.
+    Perform (or refresh) a single external lookup.
     """
     from .models_extended import EligibilityRequest, ExternalLookup
-    from .services.connectors import ConnectorFactory
-    import asyncio
+    from .services.lookup_orchestrator import (
+        LookupOrchestrator,
+        PlannedLookup,
+        lookup_status,
+    )
 
     try:
         request_obj = EligibilityRequest.objects.get(id=request_id)
@@ -125,19 +228,17 @@ def perform_external_lookup(self, request_id: int, provider: str, lookup_data: d
             status="pending",
         )
 
-        # Get connector
-        connector_config = {
-            "timeout": 30,
-            "cache_ttl": 3600,
-        }
-        connector = ConnectorFactory.create(provider, connector_config)
-
-        # Perform lookup (run async function in sync context)
-        result = asyncio.run(connector.lookup(**lookup_data))
+        orchestrator = LookupOrchestrator(tenant_id=request_obj.tenant_id)
+        planned = PlannedLookup(
+            provider=provider,
+            data=lookup_data,
+            cache_key=orchestrator.connector(provider).get_cache_key(**lookup_data),
+        )
+        result = orchestrator.refresh(planned)
 
         # Update lookup record
         lookup.response_data = result.data
-        lookup.status = "success" if result.success else "error"
+        lookup.status = lookup_status(result)
         lookup.error_message = result.error or ""
         lookup.latency_ms = result.latency_ms
         lookup.cached_until = result.cache_until
@@ -161,19 +262,43 @@ def perform_external_lookup(self, request_id: int, provider: str, lookup_data: d
         raise self.retry(exc=e, countdown=60)
 
 
+@shared_task
+def refresh_cached_lookup(provider: str, lookup_data: dict, tenant_id=None):
+    """
+    Refresh a stale entry in the shared lookup cache.
+    Scheduled by the lookup orchestrator when it serves a stale result.
+    """
+    from .services.lookup_cache import LookupCache, lookup_cache
+    from .services.lookup_orchestrator import LookupOrchestrator, PlannedLookup
+
+    orchestrator = LookupOrchestrator(tenant_id=tenant_id)
+    connector = orchestrator.connector(provider)
+    planned = PlannedLookup(
+        provider=provider,
+        data=lookup_data,
+        cache_key=connector.get_cache_key(**lookup_data),
+    )
+
+    try:
+        result = orchestrator.refresh(planned)
+        logger.info(f"Refreshed cached {provider} lookup: {result.success}")
+    finally:
+        lookup_cache.release_refresh(
+            LookupCache.make_key(connector, planned.cache_key, tenant_id)
+        )
+
+
 @shared_task(bind=True, max_retries=3)
 def evaluate_eligibility(self, request_id: int, ruleset_id: int = None):
     """
-    Evaluate eligibility for a request.
-    Called after all external lookups complete.
+    Evaluate eligibility for a request using its stored lookup results.
     """
-    from .models_extended import EligibilityRequest, Ruleset, EligibilityDecision
-    from .services.rules_engine import RulesEngine, EvaluationContext
+    from .models_extended import EligibilityRequest
 
     try:
         request_obj = EligibilityRequest.objects.get(id=request_id)
 
-        # Check if all lookups complete
+        # A single-provider refresh may still be in flight
         pending_lookups = request_obj.external_lookups.filter(status="pending").count()
         if pending_lookups > 0:
             logger.info(
@@ -181,84 +306,62 @@ def evaluate_eligibility(self, request_id: int, ruleset_id: int = None):
             )
             raise self.retry(countdown=30)
 
-        # Get ruleset
-        if ruleset_id:
-            ruleset = Ruleset.objects.get(id=ruleset_id, status="active")
-        else:
-            ruleset = Ruleset.objects.filter(
-                jurisdiction_code=request_obj.jurisdiction_code, status="active"
-            ).first()
+        decision = _evaluate_request(request_obj, ruleset_id)
 
-        if not ruleset:
-            raise ValueError(
-                f"No active ruleset for jurisdiction {request_obj.jurisdiction_code}"
-            )
+        # Trigger webhook
+        send_decision_webhook(decision)
 
-        # Collect lookup results
-        lookups = {}
-        for lookup in request_obj.external_lookups.filter(status="success"):
-            if lookup.provider not in lookups:
-                lookups[lookup.provider] = {}
-            lookups[lookup.provider].update(lookup.response_data)
-
-        # Build context
-        context = EvaluationContext(
-            input_data=request_obj.input,
-            lookups=lookups,
-            reference_data={},  # TODO: Load reference tables
-            jurisdiction_code=request_obj.jurisdiction_code,
-            evaluation_date=timezone.now(),
-        )
+        return decision.id
 
-        # Get artifacts
-        artifacts = []
-        for artifact in ruleset.artifacts.all():
-            artifacts.append(
-                {
-                    "type": artifact.type,
-                    "name": artifact.name,
-                    "blob": artifact.blob,
-                }
-            )
+    except Exception as e:
+        logger.error(f"Error evaluating request {request_id}: {e}")
 
-        # Evaluate
-        engine = RulesEngine()
-        result = engine.evaluate(artifacts, context, ruleset.version)
-
-        # Create decision
-        with transaction.atomic():
-            decision = EligibilityDecision.objects.create(
-                request=request_obj,
-                ruleset=ruleset,
-                outcome=result.outcome,
-                reasons=result.reasons,
-                clause_refs=result.clause_refs,
-                decision_data=result.details,
-                explanation=result.explanation,
-                decided_by="system",
-            )
+        # Mark request as error
+        _mark_request_error(request_id)
 
-            request_obj.status = "evaluated"
-            request_obj.evaluated_at = timezone.now()
-            request_obj.save()
+        raise self.retry(exc=e, countdown=60)
 
-        logger.info(f"Evaluated request {request_id}: {result.outcome}")
 
-        # Trigger webhook
-        deliver_webhook.delay(request_id, "decision.finalized")
+@shared_task(bind=True, max_retries=3)
+def evaluate_eligibility_batch(self, batch_id: int):
+    """
+    Evaluate every request of a bulk intake in a single task.
+    Replaces the per-student lookup/evaluate task chain for whole intakes.
+    """
+    from .models_extended import EligibilityBatch, WebhookEndpoint
+    from .services.batch import run_batch
 
-        return decision.id
+    try:
+        batch = run_batch(batch_id)
+
+        if batch.status == "completed":
+            webhooks = WebhookEndpoint.objects.filter(
+                tenant=batch.tenant, active=True, events__contains=["batch.completed"]
+            )
+            for webhook in webhooks:
+                deliver_webhook_to_endpoint.delay(
+                    webhook.id,
+                    {
+                        "event_type": "batch.completed",
+                        "batch_id": batch.id,
+                        "jurisdiction": batch.jurisdiction_code,
+                        "total_rows": batch.total_rows,
+                        "failed_rows": batch.failed_rows,
+                        "outcomes": batch.summary.get("outcomes", {}),
+                        "timestamp": timezone.now().isoformat(),
+                    },
+                )
+
+        return batch.id
 
     except Exception as e:
-        logger.error(f"Error evaluating request {request_id}: {e}")
+        logger.error(f"Error evaluating eligibility batch {batch_id}: {e}")
 
-        # Mark request as error
-        try:
-            request_obj = EligibilityRequest.objects.get(id=request_id)
-            request_obj.status = "error"
-            request_obj.save()
-        except:
-            pass
+        if self.request.retries >= self.max_retries:
+            EligibilityBatch.objects.filter(id=batch_id).update(
+                status="failed", completed_at=timezone.now()
+            )
+            raise
 
         raise self.retry(exc=e, countdown=60)
 
@@ -401,6 +504,7 @@ def compute_eligibility_metrics():
     Run hourly via Celery beat.
     """
     from .models_extended import EligibilityRequest, EligibilityDecision
+    from .services.lookup_cache import lookup_cache
     from django.db.models import Count, Q
     from datetime import timedelta
 
@@ -428,6 +532,7 @@ def compute_eligibility_metrics():
         metrics = {
             "outcomes": list(outcomes),
             "by_jurisdiction": list(by_jurisdiction),
+            "lookup_cache": lookup_cache.stats(),
             "computed_at": timezone.now().isoformat(),
         }
 
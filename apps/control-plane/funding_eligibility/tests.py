@@ -1,9 +1,42 @@
-from django.test import TestCase
+import json
+import time
+from unittest import mock
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
 from datetime import date, timedelta
-from tenants.models import Tenant
+from rest_framework.test import APIClient
+from tenants.models import Tenant, TenantUser
 from .models import JurisdictionRequirement, EligibilityRule, EligibilityCheck
+from . import tasks
+from .models_extended import (
+    EligibilityBatch,
+    EligibilityDecision,
+    EligibilityRequest,
+    ReferenceTable,
+    Ruleset,
+    RulesetArtifact,
+)
+from .services.connectors import LookupResult
+from .services.lookup_cache import LookupCache
+from .services.lookup_orchestrator import LookupOrchestrator, lookup_status
+from .services.reference_data import PackedTable, ReferenceDataStore
+from .serializers_extended import CreateEligibilityBatchSerializer
+from .services.batch import (
+    MAX_INTAKE_ROWS,
+    BatchEvaluator,
+    create_batch_requests,
+    normalise_row,
+    parse_intake,
+)
+from .services.rules_engine import (
+    EvaluationContext,
+    JSONLogicEvaluator,
+    RuleCompiler,
+    RulesEngine,
+    compile_ruleset,
+)
 
 
 class JurisdictionRequirementTests(TestCase):
@@ -129,3 +162,369 @@ class EligibilityCheckTests(TestCase):
         self.check.is_eligible = True
         summary = self.check.get_eligibility_summary()
         self.assertIn("Eligible", summary)
+
+
+class RuleCompilerTests(SimpleTestCase):
+    def setUp(self):
+        self.context = EvaluationContext(
+            input_data={
+                "student": {"age": 22, "residency": "VIC"},
+                "start_date": "2024-01-01",
+                "end_date": "2024-03-01",
+            },
+            lookups={"postcode": {"rai_band": 2}},
+            reference_data={"vic.concessions": {"HCC": True}},
+            jurisdiction_code="VIC",
+            evaluation_date=timezone.now(),
+        )
+        self.compiler = RuleCompiler()
+        self.interpreter = JSONLogicEvaluator()
+
+    def assertMatchesInterpreter(self, logic):
+        compiled = self.compiler.compile(logic)(self.context)
+        self.assertEqual(compiled, self.interpreter.evaluate(logic, self.context))
+        return compiled
+
+    def test_matches_interpreter(self):
+        expressions = [
+            {">=": [{"var": "student.age"}, 18]},
+            {"==": [{"var": ["student.missing", "none"]}, "none"]},
+            {"in": [{"var": "student.residency"}, ["VIC", "NSW"]]},
+            {"and": [{"<": [1, 2]}, {"not": {"var": "student.missing"}}]},
+            {"or": [False, {"between": [{"var": "student.age"}, 15, 64]}]},
+            {"if": [{"var": "student.missing"}, "yes", "no"]},
+            {"date_diff": [{"var": "start_date"}, {"var": "end_date"}]},
+            {"lookup": ["postcode", "rai_band"]},
+            {"reference": ["vic.concessions", "HCC", False]},
+            {"unknown_op": [1, 2]},
+        ]
+        for logic in expressions:
+            with self.subTest(logic=logic):
+                self.assertMatchesInterpreter(logic)
+
+    def test_constant_folding(self):
+        program, constant = self.compiler._compile({"and": [{"<": [1, 2]}, True]})
+        self.assertIs(constant, True)
+        self.assertTrue(program(None))
+
+    def test_var_is_not_folded(self):
+        _, constant = self.compiler._compile({"==": [{"var": "student.age"}, 22]})
+        self.assertIsNot(constant, True)
+
+    def test_compiled_ruleset_reports_errors(self):
+        artifacts = [
+            {
+                "type": "jsonlogic",
+                "name": "age_check",
+                "blob": json.dumps({">=": [{"var": "student.age"}, 18]}),
+            },
+            {"type": "jsonlogic", "name": "broken", "blob": "{not json"},
+        ]
+        compiled = compile_ruleset(artifacts, "1.0.0")
+        self.assertIsNotNone(compiled.artifacts[1].error)
+
+        result = RulesEngine().evaluate_compiled(compiled, self.context)
+        self.assertTrue(result.details["age_check"])
+        self.assertEqual(result.ruleset_version, "1.0.0")
+
+
+class IntakeParsingTests(SimpleTestCase):
+    def test_parse_csv_expands_dotted_columns(self):
+        content = (
+            "person_id,course_id,postcode,concession_card.number,concession_card.type\n"
+            "P1,BSB50120,3000,123456,HCC\n"
+        ).encode()
+        rows = parse_intake(content, "intake.csv")
+        self.assertEqual(
+            rows[0]["concession_card"], {"number": "123456", "type": "HCC"}
+        )
+        self.assertEqual(rows[0]["postcode"], "3000")
+
+    def test_parse_json_rows(self):
+        rows = parse_intake(json.dumps({"rows": [{"person_id": "P1"}]}), "x.json")
+        self.assertEqual(rows, [{"person_id": "P1"}])
+
+    def test_inline_rows_are_capped(self):
+        serializer = CreateEligibilityBatchSerializer(
+            data={
+                "jurisdiction_code": "VIC",
+                "rows": [{"person_id": "P1"}] * (MAX_INTAKE_ROWS + 1),
+            }
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("rows", serializer.errors)
+
+    def test_normalise_row_requires_person(self):
+        with self.assertRaises(ValueError):
+            normalise_row({"course_id": "BSB50120"})
+
+    def test_normalise_row_uses_default_course(self):
+        person_id, course_id, input_data = normalise_row(
+            {"person_id": "P1", "postcode": "3000"}, "BSB50120"
+        )
+        self.assertEqual((person_id, course_id), ("P1", "BSB50120"))
+        self.assertEqual(input_data, {"postcode": "3000"})
+
+
+class BatchEvaluatorTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(
+            name="Test Tenant",
+            slug="test-tenant",
+            contact_email="test@example.com",
+            contact_name="Test Contact",
+        )
+        self.ruleset = Ruleset.objects.create(
+            version="1.0.0",
+            jurisdiction_code="VIC",
+            status="active",
+            checksum="test",
+        )
+        RulesetArtifact.objects.create(
+            ruleset=self.ruleset,
+            type="jsonlogic",
+            name="vic_resident",
+            blob=json.dumps({"==": [{"lookup": ["postcode", "state"]}, "VIC"]}),
+        )
+        self.batch = EligibilityBatch.objects.create(
+            tenant=self.tenant, jurisdiction_code="VIC"
+        )
+
+    def test_batch_evaluation(self):
+        rows = [
+            {"person_id": "P1", "postcode": "3000"},
+            {"person_id": "P2", "postcode": "3000"},
+            {"person_id": "P3", "postcode": "2000"},
+            {"postcode": "3000"},
+        ]
+        created = create_batch_requests(self.batch, rows, "BSB50120")
+        self.assertEqual(created, 3)
+
+        batch = BatchEvaluator(self.batch, chunk_size=2).run()
+
+        self.assertEqual(batch.status, "completed")
+        self.assertEqual(batch.processed_rows, 4)
+        self.assertEqual(batch.failed_rows, 1)
+        self.assertEqual(batch.errors[0]["row"], 4)
+        self.assertEqual(batch.summary["outcomes"], {"eligible": 2, "ineligible": 1})
+        # Shared postcodes are looked up once
+        self.assertEqual(batch.summary["lookups"]["requested"], 3)
+        self.assertEqual(batch.summary["lookups"]["unique"], 2)
+        self.assertEqual(
+            batch.requests.filter(status="evaluated", decision__isnull=False).count(),
+            3,
+        )
+
+    def test_batch_api(self):
+        user = User.objects.create_user(username="officer", password="x")
+        TenantUser.objects.create(tenant=self.tenant, user=user)
+        client = APIClient()
+        client.force_authenticate(user)
+        url = "/api/tenants/test-tenant/funding-eligibility/batches/"
+        intake = SimpleUploadedFile(
+            "intake.csv", b"person_id,postcode\nP3,2000\nP4,3000\n", "text/csv"
+        )
+
+        with mock.patch.object(
+            tasks.evaluate_eligibility_batch,
+            "delay",
+            side_effect=tasks.evaluate_eligibility_batch,
+        ), self.captureOnCommitCallbacks(execute=True):
+            inline = client.post(
+                url,
+                {
+                    "jurisdiction_code": "VIC",
+                    "course_id": "BSB50120",
+                    "rows": [{"person_id": "P1", "postcode": "3000"}],
+                },
+                format="json",
+            )
+            upload = client.post(
+                url,
+                {"jurisdiction_code": "VIC", "course_id": "BSB50120", "file": intake},
+                format="multipart",
+            )
+
+        self.assertEqual(inline.status_code, 202)
+        self.assertEqual(upload.status_code, 202)
+        self.assertEqual(upload.data["source_filename"], "intake.csv")
+
+        batch = client.get(f"{url}{upload.data['id']}/").data
+        self.assertEqual(batch["status"], "completed")
+        self.assertEqual(batch["total_rows"], 2)
+        self.assertEqual(batch["summary"]["outcomes"], {"eligible": 1, "ineligible": 1})
+        self.assertEqual(
+            EligibilityBatch.objects.get(id=inline.data["id"]).tenant, self.tenant
+        )
+        # Plus the batch made in setUp
+        self.assertEqual(len(client.get(url).data["results"]), 3)
+
+        outsider = User.objects.create_user(username="outsider", password="x")
+        client.force_authenticate(outsider)
+        self.assertEqual(client.get(url).status_code, 403)
+
+    def test_retried_lookups_update_rows_and_notify_once(self):
+        request = EligibilityRequest.objects.create(
+            tenant=self.tenant,
+            person_id="P1",
+            course_id="BSB50120",
+            jurisdiction_code="VIC",
+            input={"postcode": "3000"},
+        )
+
+        with mock.patch.object(tasks.deliver_webhook, "delay") as delay:
+            tasks.enqueue_external_lookups.run(request.id)
+            # A retry after the lookup expired
+            request.external_lookups.update(cached_until=timezone.now())
+            tasks.enqueue_external_lookups.run(request.id)
+
+        self.assertEqual(request.external_lookups.count(), 1)
+        self.assertEqual(request.external_lookups.get().status, "success")
+        delay.assert_called_once_with(request.id, "decision.finalized")
+        self.assertIsNotNone(EligibilityDecision.objects.get().webhook_sent_at)
+
+
+class LookupOrchestratorTests(SimpleTestCase):
+    def test_plan_and_run_deduplicates(self):
+        orchestrator = LookupOrchestrator(cache=None)
+        planned = orchestrator.plan({"postcode": "3000"}) + orchestrator.plan(
+            {"postcode": "3000"}
+        )
+        results = orchestrator.run(planned)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[planned[0].cache_key].data["state"], "VIC")
+
+    def test_provider_timeout(self):
+        orchestrator = LookupOrchestrator(
+            provider_config={"usi": {"timeout": 0.01}}, cache=None
+        )
+        planned = orchestrator.plan(
+            {"usi": "ABCDE12345", "postcode": "3000", "date_of_birth": "2000-01-01"}
+        )
+        results = orchestrator.run(planned)
+        statuses = {p.provider: lookup_status(results[p.cache_key]) for p in planned}
+        self.assertEqual(statuses, {"usi": "timeout", "postcode": "success"})
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class LookupCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = LookupCache()
+
+    def test_shared_tier_serves_other_processes(self):
+        orchestrator = LookupOrchestrator(cache=self.cache)
+        planned = orchestrator.plan({"postcode": "3000"})
+        orchestrator.run(planned)
+
+        # A fresh process-local tier still hits the shared tier
+        other = LookupOrchestrator(cache=LookupCache())
+        results = other.run(planned)
+        self.assertTrue(results[planned[0].cache_key].cached)
+        self.assertEqual(other.stats["fetched"], 0)
+
+    def test_personal_lookups_are_tenant_scoped(self):
+        orchestrator = LookupOrchestrator(cache=self.cache)
+        usi = orchestrator.connector("usi")
+        postcode = orchestrator.connector("postcode")
+        self.assertNotEqual(
+            LookupCache.make_key(usi, "k", 1), LookupCache.make_key(usi, "k", 2)
+        )
+        self.assertEqual(
+            LookupCache.make_key(postcode, "k", 1),
+            LookupCache.make_key(postcode, "k", 2),
+        )
+
+    def test_keys_do_not_contain_lookup_inputs(self):
+        orchestrator = LookupOrchestrator(cache=self.cache)
+        usi = orchestrator.connector("usi")
+        cache_key = usi.get_cache_key(usi="ABCDE12345", date_of_birth="2000-01-01")
+        key = LookupCache.make_key(usi, cache_key, 1)
+        self.assertNotIn("ABCDE12345", key)
+        self.assertNotIn("2000-01-01", key)
+
+    def test_stale_results_have_no_cache_until(self):
+        result = LookupResult(
+            provider="postcode",
+            success=True,
+            data={"state": "VIC"},
+            cache_until=timezone.now(),
+        )
+        self.cache.set("key", result, ttl=3600)
+        self.assertIsNotNone(self.cache.get_many(["key"])[0]["key"].cache_until)
+
+        with mock.patch("time.time", return_value=time.time() + 3601):
+            results, stale, _ = self.cache.get_many(["key"])
+        self.assertEqual(stale, ["key"])
+        self.assertIsNone(results["key"].cache_until)
+
+    def test_negative_caching_and_hit_ratio(self):
+        failed = LookupResult(provider="usi", success=False, data={}, error="down")
+        self.cache.set("key", failed, ttl=3600)
+
+        results, stale, missing = self.cache.get_many(["key", "other"])
+        self.assertFalse(results["key"].success)
+        self.assertEqual((stale, missing), ([], ["other"]))
+        self.assertEqual(self.cache.stats()["hit_ratio"], 0.5)
+
+
+class PackedTableTests(SimpleTestCase):
+    def test_packs_fixed_width_numeric_tables(self):
+        data = {str(postcode).zfill(4): postcode % 5 for postcode in range(800, 900)}
+        table = PackedTable.build(data)
+        self.assertIsNotNone(table)
+        self.assertEqual(table["0801"], 1)
+        self.assertEqual(table.get("801"), None)
+        self.assertEqual(table.get("0900", "n/a"), "n/a")
+        self.assertEqual(dict(table), data)
+
+    def test_non_numeric_tables_are_not_packed(self):
+        self.assertIsNone(PackedTable.build({"HCC": True}))
+        self.assertIsNone(PackedTable.build({"3000": "Major Cities"}))
+
+    def test_memory_mapped_snapshot(self):
+        import tempfile
+
+        table = PackedTable.build({"0": 0.5, "1": 2.0})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/table.d"
+            table.to_file(path)
+            mapped = PackedTable.from_file(path, "d", 1, len(table))
+            self.assertEqual(dict(mapped), {"0": 0.5, "1": 2.0})
+
+
+class ReferenceDataStoreTests(TestCase):
+    def setUp(self):
+        self.store = ReferenceDataStore(check_interval=0)
+        ReferenceTable.objects.create(
+            namespace="vic.rai_bands",
+            version="1",
+            data={"3000": 1, "3550": 3},
+            source="test",
+        )
+
+    def test_snapshot_loads_valid_tables(self):
+        snapshot = self.store.snapshot()
+        context = EvaluationContext(
+            input_data={},
+            lookups={},
+            reference_data=snapshot,
+            jurisdiction_code="VIC",
+            evaluation_date=timezone.now(),
+        )
+        self.assertEqual(context.get_reference("vic.rai_bands", "3550"), 3)
+        self.assertIsNone(context.get_reference("missing", "3550"))
+
+    def test_reload_on_version_change(self):
+        first = self.store.snapshot()
+        ReferenceTable.objects.create(
+            namespace="vic.rai_bands",
+            version="2",
+            data={"3000": 2},
+            source="test",
+        )
+        self.store.invalidate()
+        second = self.store.snapshot()
+        self.assertEqual(first["vic.rai_bands"]["3000"], 1)
+        self.assertEqual(second["vic.rai_bands"]["3000"], 2)
@@ -9,6 +9,7 @@ from .views_extended import (
     RulesetViewSet,
     ReferenceTableViewSet,
     EligibilityRequestViewSet,
+    EligibilityBatchViewSet,
     DecisionOverrideViewSet,
     EvidenceAttachmentViewSet,
     WebhookEndpointViewSet,
@@ -30,6 +31,7 @@ router.register(r"jurisdictions", JurisdictionViewSet, basename="jurisdiction")
 router.register(r"rulesets", RulesetViewSet, basename="ruleset")
 router.register(r"reference-tables", ReferenceTableViewSet, basename="reference-table")
 router.register(r"requests", EligibilityRequestViewSet, basename="request")
+router.register(r"batches", EligibilityBatchViewSet, basename="batch")
 router.register(r"overrides", DecisionOverrideViewSet, basename="override")
 router.register(r"attachments", EvidenceAttachmentViewSet, basename="attachment")
 router.register(r"webhooks", WebhookEndpointViewSet, basename="webhook")
@@ -1,9 +1,12 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Count, Q
+from django.db.models import Q
 from django.utils import timezone
-from datetime import timedelta
+
+from control_plane.response_cache import cached_response
+from dashboards.rollups import dashboard_response, get_rollup
+from tenants.resolver import request_tenant
 
 from .models import (
     JurisdictionRequirement,
@@ -31,7 +34,16 @@ class JurisdictionRequirementViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(tenant=self.request.tenant, created_by=self.request.user)
 
+    @cached_response(
+        "funding_eligibility.jurisdictions", models=[JurisdictionRequirement]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @action(detail=False, methods=["get"])
+    @cached_response(
+        "funding_eligibility.active_jurisdictions", models=[JurisdictionRequirement]
+    )
     def active(self, request):
         """Get currently active jurisdiction requirements"""
         tenant = request.tenant
@@ -724,58 +736,7 @@ class EligibilityCheckViewSet(viewsets.ModelViewSet):
         """
         Get dashboard statistics
         """
-        tenant = request.tenant
-
-        # Date range
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-
-        checks = EligibilityCheck.objects.filter(tenant=tenant)
-        recent_checks = checks.filter(checked_at__gte=thirty_days_ago)
-
-        stats = {
-            "total_checks": checks.count(),
-            "eligible_count": checks.filter(is_eligible=True).count(),
-            "ineligible_count": checks.filter(is_eligible=False).count(),
-            "pending_count": checks.filter(status="pending").count(),
-            "override_count": checks.filter(status="override").count(),
-            "eligibility_rate": 0.0,
-            "by_jurisdiction": {},
-            "by_status": {},
-            "recent_checks": recent_checks.count(),
-            "prevented_enrollments": checks.filter(prevents_enrollment=True).count(),
-            "top_failure_reasons": [],
-        }
+        rollup = get_rollup("funding_eligibility", request_tenant(request))
 
-        # Eligibility rate
-        if stats["total_checks"] > 0:
-            stats["eligibility_rate"] = round(
-                (stats["eligible_count"] / stats["total_checks"]) * 100, 2
-            )
-
-        # By jurisdiction
-        by_jurisdiction = checks.values("jurisdiction").annotate(count=Count("id"))
-        stats["by_jurisdiction"] = {
-            item["jurisdiction"]: item["count"] for item in by_jurisdiction
-        }
-
-        # By status
-        by_status = checks.values("status").annotate(count=Count("id"))
-        stats["by_status"] = {item["status"]: item["count"] for item in by_status}
-
-        # Top failure reasons
-        ineligible_checks = checks.filter(is_eligible=False)
-        failure_reasons = {}
-        for check in ineligible_checks:
-            for failed_rule in check.failed_rules:
-                rule_name = failed_rule.get("rule_name", "Unknown")
-                failure_reasons[rule_name] = failure_reasons.get(rule_name, 0) + 1
-
-        stats["top_failure_reasons"] = [
-            {"reason": reason, "count": count}
-            for reason, count in sorted(
-                failure_reasons.items(), key=lambda x: x[1], reverse=True
-            )[:5]
-        ]
-
-        serializer = DashboardStatsSerializer(stats)
-        return Response(serializer.data)
+        serializer = DashboardStatsSerializer(rollup.data)
+        return dashboard_response(serializer.data, rollup)
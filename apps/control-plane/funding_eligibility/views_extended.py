@@ -7,16 +7,21 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.db import transaction
 
+from tenants.permissions import IsTenantMember
+from tenants.resolver import request_tenant
+
 from .models_extended import (
     Jurisdiction,
     Ruleset,
     RulesetArtifact,
     ReferenceTable,
     EligibilityRequest,
+    EligibilityBatch,
     ExternalLookup,
     EligibilityDecision,
     DecisionOverride,
@@ -31,19 +36,23 @@ from .serializers_extended import (
     ReferenceTableSerializer,
     EligibilityRequestSerializer,
     EligibilityRequestListSerializer,
+    EligibilityBatchSerializer,
     EligibilityDecisionSerializer,
     DecisionOverrideSerializer,
     EvidenceAttachmentSerializer,
     WebhookEndpointSerializer,
     WebhookDeliverySerializer,
     CreateEligibilityRequestSerializer,
+    CreateEligibilityBatchSerializer,
     EvaluateRequestSerializer,
     CreateOverrideSerializer,
     UploadEvidenceSerializer,
     ActivateRulesetSerializer,
 )
-from .services.rules_engine import RulesEngine, EvaluationContext
+from .services.rules_engine import RulesEngine, EvaluationContext, ruleset_programs
 from .services.connectors import ConnectorFactory
+from .services.reference_data import reference_store
+from .services.batch import IntakeError, create_batch_requests, parse_intake
 
 import logging
 
@@ -59,6 +68,10 @@ class TenantScopedMixin:
             return queryset.filter(tenant=self.request.user.tenant)
         return queryset.none()
 
+    def get_tenant(self):
+        """Tenant of the ``tenant_slug`` URL kwarg"""
+        return request_tenant(self.request, self.kwargs.get("tenant_slug"))
+
 
 class JurisdictionViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -176,6 +189,7 @@ class EligibilityRequestViewSet(TenantScopedMixin, viewsets.ModelViewSet):
         status_filter = self.request.query_params.get("status")
         person_id = self.request.query_params.get("person_id")
         jurisdiction = self.request.query_params.get("jurisdiction")
+        batch_id = self.request.query_params.get("batch")
 
         if status_filter:
             queryset = queryset.filter(status=status_filter)
@@ -183,6 +197,8 @@ class EligibilityRequestViewSet(TenantScopedMixin, viewsets.ModelViewSet):
             queryset = queryset.filter(person_id=person_id)
         if jurisdiction:
             queryset = queryset.filter(jurisdiction_code=jurisdiction)
+        if batch_id:
+            queryset = queryset.filter(batch_id=batch_id)
 
         return queryset.order_by("-requested_at")
 
@@ -258,8 +274,8 @@ class EligibilityRequestViewSet(TenantScopedMixin, viewsets.ModelViewSet):
                 lookups[lookup.provider] = {}
             lookups[lookup.provider].update(lookup.response_data)
 
-        # TODO: Collect reference data
-        reference_data = {}
+        # Shared in-memory reference tables
+        reference_data = reference_store.snapshot()
 
         # Build evaluation context
         context = EvaluationContext(
@@ -270,20 +286,9 @@ class EligibilityRequestViewSet(TenantScopedMixin, viewsets.ModelViewSet):
             evaluation_date=timezone.now(),
         )
 
-        # Get ruleset artifacts
-        artifacts = []
-        for artifact in ruleset.artifacts.all():
-            artifacts.append(
-                {
-                    "type": artifact.type,
-                    "name": artifact.name,
-                    "blob": artifact.blob,
-                }
-            )
-
-        # Evaluate
+        # Evaluate with the compiled program for this ruleset version
         engine = RulesEngine()
-        result = engine.evaluate(artifacts, context, ruleset.version)
+        result = engine.evaluate_compiled(ruleset_programs.get(ruleset), context)
 
         # Create or update decision
         if hasattr(eligibility_request, "decision") and force:
@@ -307,9 +312,9 @@ class EligibilityRequestViewSet(TenantScopedMixin, viewsets.ModelViewSet):
         eligibility_request.save()
 
         # Trigger webhooks for decision
-        from .tasks import deliver_webhook
+        from .tasks import send_decision_webhook
 
-        deliver_webhook.delay(eligibility_request.id, "decision.finalized")
+        send_decision_webhook(decision)
 
         return Response(
             EligibilityDecisionSerializer(decision).data, status=status.HTTP_200_OK
@@ -394,6 +399,71 @@ class EligibilityRequestViewSet(TenantScopedMixin, viewsets.ModelViewSet):
             )
 
 
+class EligibilityBatchViewSet(TenantScopedMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Bulk eligibility evaluation for whole intakes.
+
+    POST an intake file (CSV or JSON) or inline rows; every row becomes an
+    EligibilityRequest and the whole batch is evaluated by a single task.
+    Poll the batch for progress and per-row errors.
+    """
+
+    queryset = EligibilityBatch.objects.select_related("ruleset")
+    serializer_class = EligibilityBatchSerializer
+    permission_classes = [IsAuthenticated, IsTenantMember]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
+
+    def get_queryset(self):
+        return self.queryset.filter(tenant=self.get_tenant())
+
+    def create(self, request, tenant_slug=None):
+        """Ingest an intake and enqueue batch evaluation"""
+        serializer = CreateEligibilityBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        ruleset = None
+        if data.get("ruleset_id"):
+            ruleset = get_object_or_404(
+                Ruleset,
+                id=data["ruleset_id"],
+                jurisdiction_code=data["jurisdiction_code"],
+                status="active",
+            )
+
+        upload = data.get("file")
+        if upload:
+            try:
+                rows = parse_intake(upload.read(), upload.name)
+            except IntakeError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            rows = data["rows"]
+
+        with transaction.atomic():
+            batch = EligibilityBatch.objects.create(
+                tenant=self.get_tenant(),
+                jurisdiction_code=data["jurisdiction_code"],
+                ruleset=ruleset,
+                source_filename=upload.name if upload else "",
+                requested_by=request.user,
+            )
+            create_batch_requests(
+                batch,
+                rows,
+                default_course_id=data.get("course_id", ""),
+                requested_by=request.user,
+            )
+
+        from .tasks import evaluate_eligibility_batch
+
+        transaction.on_commit(lambda: evaluate_eligibility_batch.delay(batch.id))
+
+        return Response(
+            EligibilityBatchSerializer(batch).data, status=status.HTTP_202_ACCEPTED
+        )
+
+
 class DecisionOverrideViewSet(TenantScopedMixin, viewsets.ModelViewSet):
     """
     Decision override viewset.
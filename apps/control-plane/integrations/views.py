@@ -2,10 +2,9 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
-from tenants.models import Tenant
+from tenants.resolver import TenantScopedMixin
 from .models import Integration, IntegrationLog, IntegrationMapping
 from .serializers import (
     IntegrationSerializer,
@@ -16,7 +15,7 @@ from .serializers import (
 from .connectors import get_connector
 
 
-class IntegrationViewSet(viewsets.ModelViewSet):
+class IntegrationViewSet(TenantScopedMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing integrations
     """
@@ -25,14 +24,12 @@ class IntegrationViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        tenant = get_object_or_404(Tenant, slug=tenant_slug)
+        tenant = self.get_tenant()
         return Integration.objects.filter(tenant=tenant)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        tenant_slug = self.kwargs.get("tenant_slug")
-        context["tenant"] = get_object_or_404(Tenant, slug=tenant_slug)
+        context["tenant"] = self.get_tenant()
         return context
 
     @action(detail=True, methods=["post"])
@@ -214,7 +211,7 @@ class IntegrationViewSet(viewsets.ModelViewSet):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class IntegrationLogViewSet(viewsets.ReadOnlyModelViewSet):
+class IntegrationLogViewSet(TenantScopedMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for viewing integration logs
     """
@@ -223,6 +220,5 @@ class IntegrationLogViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        tenant = get_object_or_404(Tenant, slug=tenant_slug)
+        tenant = self.get_tenant()
         return IntegrationLog.objects.filter(integration__tenant=tenant)
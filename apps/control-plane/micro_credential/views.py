@@ -15,11 +15,11 @@ from .serializers import (
     MicroCredentialVersionSerializer,
     MicroCredentialEnrollmentSerializer,
 )
-from tenants.models import Tenant
+from tenants.resolver import TenantScopedMixin
 
 
 @method_decorator(csrf_exempt, name="dispatch")
-class MicroCredentialViewSet(viewsets.ModelViewSet):
+class MicroCredentialViewSet(TenantScopedMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing micro-credentials (short courses).
     """
@@ -28,13 +28,11 @@ class MicroCredentialViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]  # TODO: Change to IsAuthenticated in production
 
     def get_queryset(self):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        tenant = get_object_or_404(Tenant, slug=tenant_slug)
+        tenant = self.get_tenant()
         return MicroCredential.objects.filter(tenant=tenant)
 
     def perform_create(self, serializer):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        tenant = get_object_or_404(Tenant, slug=tenant_slug)
+        tenant = self.get_tenant()
         # Use request.user if authenticated, otherwise use None
         created_by = self.request.user if self.request.user.is_authenticated else None
         serializer.save(tenant=tenant, created_by=created_by)
@@ -44,7 +42,7 @@ class MicroCredentialViewSet(viewsets.ModelViewSet):
         """
         Generate a micro-credential using AI from selected units.
         """
-        tenant = get_object_or_404(Tenant, slug=tenant_slug)
+        tenant = self.get_tenant()
 
         # Extract request data
         unit_codes = request.data.get("unit_codes", [])
@@ -257,7 +255,7 @@ class MicroCredentialViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class MicroCredentialVersionViewSet(viewsets.ReadOnlyModelViewSet):
+class MicroCredentialVersionViewSet(TenantScopedMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing micro-credential version history.
     """
@@ -266,10 +264,8 @@ class MicroCredentialVersionViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [AllowAny]  # TODO: Change to IsAuthenticated in production
 
     def get_queryset(self):
-        tenant_slug = self.kwargs.get("tenant_slug")
         micro_credential_id = self.kwargs.get("micro_credential_id")
-
-        tenant = get_object_or_404(Tenant, slug=tenant_slug)
+        tenant = self.get_tenant()
         micro_credential = get_object_or_404(
             MicroCredential, id=micro_credential_id, tenant=tenant
         )
@@ -277,7 +273,7 @@ class MicroCredentialVersionViewSet(viewsets.ReadOnlyModelViewSet):
         return MicroCredentialVersion.objects.filter(micro_credential=micro_credential)
 
 
-class MicroCredentialEnrollmentViewSet(viewsets.ModelViewSet):
+class MicroCredentialEnrollmentViewSet(TenantScopedMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing micro-credential enrollments.
     """
@@ -286,8 +282,7 @@ class MicroCredentialEnrollmentViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]  # TODO: Change to IsAuthenticated in production
 
     def get_queryset(self):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        tenant = get_object_or_404(Tenant, slug=tenant_slug)
+        tenant = self.get_tenant()
 
         # Filter by micro_credential if provided in query params
         micro_credential_id = self.request.query_params.get("micro_credential")
@@ -5,3 +5,6 @@ class PdTrackerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "pd_tracker"
     verbose_name = "PD Tracker"
+
+    def ready(self):
+        from . import rollups  # noqa: F401
@@ -0,0 +1,112 @@
+"""
+Dashboard rollup for the PD tracker.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from dashboards.rollups import register
+
+from .models import PDActivity, PDSuggestion, TrainerProfile
+
+# Months of completed hours shown in the trend chart
+TREND_MONTHS = 6
+
+
+@register(
+    "pd_tracker",
+    sources={
+        PDActivity: lambda activity: activity.tenant,
+        TrainerProfile: lambda profile: profile.tenant,
+        PDSuggestion: lambda suggestion: suggestion.trainer_profile.tenant,
+    },
+    all_tenants=True,
+)
+def compute_dashboard(tenant):
+    """Dashboard statistics with conditional aggregates (all tenants if blank)"""
+    activities = PDActivity.objects.all()
+    profiles = TrainerProfile.objects.all()
+    suggestions = PDSuggestion.objects.all()
+
+    if tenant:
+        activities = activities.filter(tenant=tenant)
+        profiles = profiles.filter(tenant=tenant)
+        suggestions = suggestions.filter(trainer_profile__tenant=tenant)
+
+    today = timezone.now().date()
+    thirty_days_ago = today - timedelta(days=30)
+
+    months = []
+    for i in range(TREND_MONTHS):
+        month_start = today.replace(day=1) - timedelta(days=i * 30)
+        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(
+            days=1
+        )
+        months.append((month_start, month_end))
+
+    completed = Q(status="completed")
+    recent = completed & Q(start_date__gte=thirty_days_ago)
+    totals = activities.aggregate(
+        completed=Count("id", filter=completed),
+        hours=Sum("hours_completed", filter=completed),
+        recent=Count("id", filter=recent),
+        recent_hours=Sum("hours_completed", filter=recent),
+        pending_verifications=Count("id", filter=Q(verification_status="pending")),
+        **{
+            f"month_{i}": Sum(
+                "hours_completed",
+                filter=completed
+                & Q(start_date__gte=month_start, start_date__lte=month_end),
+            )
+            for i, (month_start, month_end) in enumerate(months)
+        },
+    )
+
+    def either_currency(value):
+        return Q(vocational_currency_status=value) | Q(industry_currency_status=value)
+
+    currency = profiles.aggregate(
+        current=Count("id", filter=either_currency("current")),
+        expiring=Count("id", filter=either_currency("expiring_soon")),
+        expired=Count("id", filter=either_currency("expired")),
+    )
+
+    activities_by_type = dict(
+        activities.filter(completed)
+        .values("activity_type")
+        .annotate(count=Count("id"))
+        .values_list("activity_type", "count")
+    )
+
+    top_trainers = list(
+        profiles.order_by("-current_year_hours")[:5].values(
+            "trainer_name", "current_year_hours", "annual_pd_goal_hours"
+        )
+    )
+
+    monthly_hours = [
+        {
+            "month": month_start.strftime("%b %Y"),
+            "hours": float(totals[f"month_{i}"] or 0),
+        }
+        for i, (month_start, _) in enumerate(months)
+    ]
+    monthly_hours.reverse()
+
+    return {
+        "total_activities": totals["completed"],
+        "total_hours": float(totals["hours"] or 0),
+        "activities_last_30_days": totals["recent"],
+        "hours_last_30_days": float(totals["recent_hours"] or 0),
+        "trainers_current": currency["current"],
+        "trainers_expiring_soon": currency["expiring"],
+        "trainers_expired": currency["expired"],
+        "activities_by_type": activities_by_type,
+        "compliance_checks_needed": currency["expired"],
+        "pending_suggestions": suggestions.filter(status="pending_review").count(),
+        "pending_verifications": totals["pending_verifications"],
+        "top_trainers": top_trainers,
+        "monthly_hours": monthly_hours,
+    }
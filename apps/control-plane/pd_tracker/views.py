@@ -2,10 +2,12 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db.models import Sum, Count, Q
+from django.db.models import Sum
 from datetime import timedelta, date
 import json
 
+from dashboards.rollups import dashboard_response, get_rollup
+
 from .models import (
     PDActivity,
     TrainerProfile,
@@ -514,127 +516,8 @@ class ComplianceCheckViewSet(viewsets.ModelViewSet):
         """Get dashboard statistics"""
         tenant = request.query_params.get("tenant")
 
-        # Base querysets
-        activities = PDActivity.objects.all()
-        profiles = TrainerProfile.objects.all()
-
-        if tenant:
-            activities = activities.filter(tenant=tenant)
-            profiles = profiles.filter(tenant=tenant)
-
-        # Date ranges
-        today = timezone.now().date()
-        thirty_days_ago = today - timedelta(days=30)
-
-        # Activity stats
-        total_activities = activities.filter(status="completed").count()
-        total_hours = (
-            activities.filter(status="completed").aggregate(
-                total=Sum("hours_completed")
-            )["total"]
-            or 0
-        )
-
-        activities_last_30 = activities.filter(
-            status="completed", start_date__gte=thirty_days_ago
-        ).count()
-
-        hours_last_30 = (
-            activities.filter(
-                status="completed", start_date__gte=thirty_days_ago
-            ).aggregate(total=Sum("hours_completed"))["total"]
-            or 0
-        )
-
-        # Currency status
-        trainers_current = (
-            profiles.filter(
-                Q(vocational_currency_status="current")
-                | Q(industry_currency_status="current")
-            )
-            .distinct()
-            .count()
-        )
-
-        trainers_expiring = (
-            profiles.filter(
-                Q(vocational_currency_status="expiring_soon")
-                | Q(industry_currency_status="expiring_soon")
-            )
-            .distinct()
-            .count()
-        )
-
-        trainers_expired = (
-            profiles.filter(
-                Q(vocational_currency_status="expired")
-                | Q(industry_currency_status="expired")
-            )
-            .distinct()
-            .count()
-        )
-
-        # Activities by type
-        activities_by_type = dict(
-            activities.filter(status="completed")
-            .values("activity_type")
-            .annotate(count=Count("id"))
-            .values_list("activity_type", "count")
-        )
-
-        # Pending items
-        pending_suggestions = PDSuggestion.objects.filter(
-            status="pending_review"
-        ).count()
-        pending_verifications = activities.filter(verification_status="pending").count()
-
-        # Top trainers
-        top_trainers = list(
-            profiles.order_by("-current_year_hours")[:5].values(
-                "trainer_name", "current_year_hours", "annual_pd_goal_hours"
-            )
-        )
-
-        # Monthly hours (last 6 months)
-        monthly_hours = []
-        for i in range(6):
-            month_start = today.replace(day=1) - timedelta(days=i * 30)
-            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(
-                days=1
-            )
-
-            month_total = (
-                activities.filter(
-                    status="completed",
-                    start_date__gte=month_start,
-                    start_date__lte=month_end,
-                ).aggregate(total=Sum("hours_completed"))["total"]
-                or 0
-            )
-
-            monthly_hours.append(
-                {"month": month_start.strftime("%b %Y"), "hours": float(month_total)}
-            )
-
-        monthly_hours.reverse()
-
-        response_data = {
-            "total_activities": total_activities,
-            "total_hours": float(total_hours),
-            "activities_last_30_days": activities_last_30,
-            "hours_last_30_days": float(hours_last_30),
-            "trainers_current": trainers_current,
-            "trainers_expiring_soon": trainers_expiring,
-            "trainers_expired": trainers_expired,
-            "activities_by_type": activities_by_type,
-            "compliance_checks_needed": trainers_expired,
-            "pending_suggestions": pending_suggestions,
-            "pending_verifications": pending_verifications,
-            "top_trainers": top_trainers,
-            "monthly_hours": monthly_hours,
-        }
-
-        return Response(response_data)
+        rollup = get_rollup("pd_tracker", tenant)
+        return dashboard_response(rollup.data, rollup)
 
     @action(detail=False, methods=["post"])
     def compliance_report(self, request):
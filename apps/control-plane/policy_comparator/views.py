@@ -24,6 +24,8 @@ from .serializers import (
     CompareRequestSerializer,
     GapAnalysisSerializer,
 )
+from control_plane.response_cache import cached_response
+from tenants.resolver import TenantScopedMixin
 
 
 class ASQAStandardViewSet(viewsets.ModelViewSet):
@@ -38,6 +40,14 @@ class ASQAStandardViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return ASQAStandard.objects.filter(is_active=True).prefetch_related("clauses")
 
+    @cached_response(
+        "policy_comparator.standards",
+        models=[ASQAStandard, ASQAClause],
+        per_tenant=False,
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 class ASQAClauseViewSet(viewsets.ModelViewSet):
     """ViewSet for ASQA clauses"""
@@ -51,8 +61,16 @@ class ASQAClauseViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return ASQAClause.objects.filter(is_active=True).select_related("standard")
 
+    @cached_response(
+        "policy_comparator.clauses",
+        models=[ASQAStandard, ASQAClause],
+        per_tenant=False,
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
-class PolicyViewSet(viewsets.ModelViewSet):
+class PolicyViewSet(TenantScopedMixin, viewsets.ModelViewSet):
     """ViewSet for policies with comparison capabilities"""
 
     serializer_class = PolicySerializer
@@ -62,17 +80,11 @@ class PolicyViewSet(viewsets.ModelViewSet):
     ordering_fields = ["created_at", "updated_at", "compliance_score"]
 
     def get_queryset(self):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        from tenants.models import Tenant
-
-        tenant = Tenant.objects.get(slug=tenant_slug)
+        tenant = self.get_tenant()
         return Policy.objects.filter(tenant=tenant)
 
     def perform_create(self, serializer):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        from tenants.models import Tenant
-
-        tenant = Tenant.objects.get(slug=tenant_slug)
+        tenant = self.get_tenant()
         serializer.save(tenant=tenant, created_by=self.request.user)
 
     @action(detail=True, methods=["post"])
@@ -89,10 +101,7 @@ class PolicyViewSet(viewsets.ModelViewSet):
 
         data = serializer.validated_data
 
-        # Get tenant
-        from tenants.models import Tenant
-
-        tenant = Tenant.objects.get(slug=tenant_slug)
+        tenant = self.get_tenant()
 
         start_time = time.time()
 
@@ -445,7 +454,7 @@ class PolicyViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ComparisonSessionViewSet(viewsets.ReadOnlyModelViewSet):
+class ComparisonSessionViewSet(TenantScopedMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for comparison sessions (read-only)"""
 
     serializer_class = ComparisonSessionSerializer
@@ -454,10 +463,7 @@ class ComparisonSessionViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ["created_at", "overall_compliance_score"]
 
     def get_queryset(self):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        from tenants.models import Tenant
-
-        tenant = Tenant.objects.get(slug=tenant_slug)
+        tenant = self.get_tenant()
         return ComparisonSession.objects.filter(tenant=tenant).select_related(
             "policy", "created_by"
         )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RiskEngineConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "risk_engine"
+
+    def ready(self):
+        from . import rollups  # noqa: F401
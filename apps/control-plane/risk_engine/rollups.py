@@ -0,0 +1,45 @@
+"""
+Dashboard rollup for risk alerts.
+"""
+
+from django.db.models import Avg, Count, Q
+
+from dashboards.rollups import register
+
+from .models import RiskAssessment
+from .serializers import RiskAssessmentListSerializer
+
+
+@register(
+    "risk_engine",
+    sources={RiskAssessment: lambda assessment: None},
+    all_tenants=True,
+)
+def compute_dashboard(tenant):
+    """Alert dashboard across all risk assessments (not tenant scoped)"""
+    assessments = RiskAssessment.objects.all()
+    totals = assessments.aggregate(
+        total=Count("id"),
+        active_alerts=Count(
+            "id", filter=Q(alert_triggered=True, alert_acknowledged=False)
+        ),
+        avg_dropout=Avg("dropout_probability"),
+    )
+
+    risk_breakdown = (
+        assessments.values("risk_level")
+        .annotate(count=Count("id"))
+        .order_by("risk_level")
+    )
+
+    high_risk = assessments.filter(risk_level__in=["high", "critical"]).order_by(
+        "-assessment_date"
+    )[:10]
+
+    return {
+        "active_alerts": totals["active_alerts"],
+        "risk_breakdown": list(risk_breakdown),
+        "high_risk_students": RiskAssessmentListSerializer(high_risk, many=True).data,
+        "average_dropout_probability": round(totals["avg_dropout"] or 0.0, 4),
+        "total_assessments": totals["total"],
+    }
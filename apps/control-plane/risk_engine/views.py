@@ -1,11 +1,13 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Count, Avg, Q
+from django.db.models import Q
 from django.utils import timezone
 import random
 import math
 
+from dashboards.rollups import dashboard_response, get_rollup
+
 from .models import (
     RiskAssessment,
     RiskFactor,
@@ -394,40 +396,8 @@ class RiskAssessmentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def alerts_dashboard(self, request):
         """Get dashboard data for risk alerts"""
-        # Active alerts
-        active_alerts = RiskAssessment.objects.filter(
-            alert_triggered=True, alert_acknowledged=False
-        ).count()
-
-        # Risk level breakdown
-        risk_breakdown = (
-            RiskAssessment.objects.values("risk_level")
-            .annotate(count=Count("id"))
-            .order_by("risk_level")
-        )
-
-        # Recent high-risk assessments
-        high_risk = RiskAssessment.objects.filter(
-            risk_level__in=["high", "critical"]
-        ).order_by("-assessment_date")[:10]
-
-        # Average dropout probability
-        avg_dropout_prob = (
-            RiskAssessment.objects.aggregate(avg=Avg("dropout_probability"))["avg"]
-            or 0.0
-        )
-
-        return Response(
-            {
-                "active_alerts": active_alerts,
-                "risk_breakdown": list(risk_breakdown),
-                "high_risk_students": RiskAssessmentListSerializer(
-                    high_risk, many=True
-                ).data,
-                "average_dropout_probability": round(avg_dropout_prob, 4),
-                "total_assessments": RiskAssessment.objects.count(),
-            }
-        )
+        rollup = get_rollup("risk_engine", None)
+        return dashboard_response(rollup.data, rollup)
 
     @action(detail=True, methods=["post"])
     def acknowledge_alert(self, request, pk=None):
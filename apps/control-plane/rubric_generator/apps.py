@@ -5,3 +5,6 @@ class RubricGeneratorConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "rubric_generator"
     verbose_name = "Rubric Generator"
+
+    def ready(self):
+        from . import rollups  # noqa: F401
@@ -0,0 +1,73 @@
+"""
+Dashboard rollup for the rubric generator.
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from dashboards.rollups import register
+
+from .models import Rubric, RubricCriterion
+
+
+@register(
+    "rubric_generator",
+    sources={
+        Rubric: lambda rubric: rubric.tenant_id,
+        RubricCriterion: lambda criterion: criterion.rubric.tenant_id,
+    },
+)
+def compute_dashboard(tenant):
+    """Dashboard statistics for a tenant (keyed by Tenant pk)"""
+    thirty_days_ago = timezone.now() - timedelta(days=30)
+
+    rubrics = Rubric.objects.filter(tenant_id=tenant)
+    counts = rubrics.aggregate(
+        total=Count("id"),
+        ai_generated=Count("id", filter=Q(ai_generated=True)),
+        recent=Count("id", filter=Q(created_at__gte=thirty_days_ago)),
+    )
+
+    # Calculate taxonomy distribution
+    tag_counts = Counter()
+    for tags in rubrics.values_list("taxonomy_tags", flat=True).iterator():
+        tag_counts.update(tags or [])
+    total_tags = sum(tag_counts.values())
+    taxonomy_distribution = (
+        {tag: round((count / total_tags) * 100, 1) for tag, count in tag_counts.items()}
+        if total_tags > 0
+        else {}
+    )
+
+    stats = {
+        "total_rubrics": counts["total"],
+        "by_status": dict(
+            rubrics.values("status")
+            .annotate(count=Count("id"))
+            .values_list("status", "count")
+        ),
+        "by_type": dict(
+            rubrics.values("rubric_type")
+            .annotate(count=Count("id"))
+            .values_list("rubric_type", "count")
+        ),
+        "ai_generated_count": counts["ai_generated"],
+        "ai_generation_rate": 0.0,
+        "avg_criteria_per_rubric": 0.0,
+        "taxonomy_distribution": taxonomy_distribution,
+        "recent_rubrics": counts["recent"],
+    }
+
+    if counts["total"] > 0:
+        stats["ai_generation_rate"] = round(
+            (counts["ai_generated"] / counts["total"]) * 100, 1
+        )
+        total_criteria = RubricCriterion.objects.filter(
+            rubric__tenant_id=tenant
+        ).count()
+        stats["avg_criteria_per_rubric"] = round(total_criteria / counts["total"], 1)
+
+    return stats
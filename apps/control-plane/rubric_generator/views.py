@@ -1,12 +1,14 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Count, Avg
+from django.db.models import Avg
 from django.utils import timezone
-from datetime import timedelta
 import time
 import re
 
+from dashboards.rollups import dashboard_response, get_rollup
+from tenants.resolver import request_tenant
+
 from .models import Rubric, RubricCriterion, RubricLevel, RubricGenerationLog
 from .serializers import (
     RubricSerializer,
@@ -587,62 +589,10 @@ achievement of learning outcomes through observable indicators.
     @action(detail=False, methods=["get"])
     def dashboard_stats(self, request):
         """Get dashboard statistics"""
-        tenant = request.tenant
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-
-        rubrics = Rubric.objects.filter(tenant=tenant)
-        recent = rubrics.filter(created_at__gte=thirty_days_ago)
-
-        # Calculate taxonomy distribution
-        all_tags = []
-        for rubric in rubrics:
-            all_tags.extend(rubric.taxonomy_tags or [])
-
-        from collections import Counter
-
-        tag_counts = Counter(all_tags)
-        total_tags = sum(tag_counts.values())
-        taxonomy_distribution = (
-            {
-                tag: round((count / total_tags) * 100, 1)
-                for tag, count in tag_counts.items()
-            }
-            if total_tags > 0
-            else {}
-        )
+        rollup = get_rollup("rubric_generator", request_tenant(request))
 
-        stats = {
-            "total_rubrics": rubrics.count(),
-            "by_status": dict(
-                rubrics.values("status")
-                .annotate(count=Count("id"))
-                .values_list("status", "count")
-            ),
-            "by_type": dict(
-                rubrics.values("rubric_type")
-                .annotate(count=Count("id"))
-                .values_list("rubric_type", "count")
-            ),
-            "ai_generated_count": rubrics.filter(ai_generated=True).count(),
-            "ai_generation_rate": 0.0,
-            "avg_criteria_per_rubric": 0.0,
-            "taxonomy_distribution": taxonomy_distribution,
-            "recent_rubrics": recent.count(),
-        }
-
-        if stats["total_rubrics"] > 0:
-            stats["ai_generation_rate"] = round(
-                (stats["ai_generated_count"] / stats["total_rubrics"]) * 100, 1
-            )
-
-            # Calculate average criteria
-            total_criteria = sum(r.get_criterion_count() for r in rubrics)
-            stats["avg_criteria_per_rubric"] = round(
-                total_criteria / stats["total_rubrics"], 1
-            )
-
-        serializer = DashboardStatsSerializer(stats)
-        return Response(serializer.data)
+        serializer = DashboardStatsSerializer(rollup.data)
+        return dashboard_response(serializer.data, rollup)
 
 
 class RubricCriterionViewSet(viewsets.ModelViewSet):
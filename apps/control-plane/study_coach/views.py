@@ -6,6 +6,8 @@ from django.db.models import Count, Avg, Q
 from datetime import datetime, timedelta
 import random
 
+from embeddings.service import cosine_similarity, get_embedding_service
+
 from .models import (
     ChatSession,
     ChatMessage,
@@ -24,6 +26,9 @@ from .serializers import (
     GenerateInsightsRequestSerializer,
 )
 
+# Documents scored against the query per retrieval
+MAX_CONTEXT_CANDIDATES = 200
+
 
 class ChatSessionViewSet(viewsets.ModelViewSet):
     queryset = ChatSession.objects.all()
@@ -244,10 +249,7 @@ class ChatSessionViewSet(viewsets.ModelViewSet):
         return "statement"
 
     def _retrieve_context(self, tenant, query, subject, topic):
-        """Retrieve relevant context from vector DB (simulated)"""
-        # In production, this would use actual vector similarity search
-        # For now, return relevant documents based on subject/topic
-
+        """Retrieve the knowledge documents most similar to the query"""
         documents = KnowledgeDocument.objects.filter(tenant=tenant)
 
         if subject:
@@ -258,8 +260,22 @@ class ChatSessionViewSet(viewsets.ModelViewSet):
                 Q(topic__icontains=topic) | Q(content__icontains=topic)
             )
 
-        # Simulate vector search with top K results
-        top_docs = documents[:5]
+        # Rank candidates by embedding similarity; document embeddings are
+        # cached by content hash so each document is embedded once
+        candidates = list(documents[:MAX_CONTEXT_CANDIDATES])
+        embeddings = get_embedding_service().embed_many(
+            [query] + [doc.content for doc in candidates]
+        )
+        query_embedding = embeddings[0]
+        ranked = sorted(
+            (
+                (cosine_similarity(query_embedding, embedding), doc)
+                for embedding, doc in zip(embeddings[1:], candidates)
+            ),
+            key=lambda pair: pair[0],
+            reverse=True,
+        )[:5]
+        top_docs = [doc for _, doc in ranked]
 
         # Update retrieval stats
         for doc in top_docs:
@@ -269,7 +285,7 @@ class ChatSessionViewSet(viewsets.ModelViewSet):
 
         return {
             "context_summary": {
-                "documents_found": top_docs.count(),
+                "documents_found": len(top_docs),
                 "subjects": list(set(d.subject for d in top_docs)),
                 "types": list(set(d.document_type for d in top_docs)),
             },
@@ -282,7 +298,7 @@ class ChatSessionViewSet(viewsets.ModelViewSet):
                 }
                 for doc in top_docs
             ],
-            "scores": [round(0.9 - i * 0.1, 2) for i in range(len(top_docs))],
+            "scores": [round(score, 2) for score, _ in ranked],
         }
 
     def _generate_coach_response(self, tenant, session, message, context):
@@ -377,7 +393,14 @@ class KnowledgeDocumentViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         tenant = self.kwargs.get("tenant_slug")
-        serializer.save(tenant=tenant)
+        document = serializer.save(tenant=tenant)
+
+        # Embed up front so the first retrieval does not pay for it
+        embedding_service = get_embedding_service()
+        embedding_service.embed(document.content)
+        if document.embedding_model != embedding_service.model_name:
+            document.embedding_model = embedding_service.model_name
+            document.save(update_fields=["embedding_model"])
 
 
 class CoachingInsightViewSet(viewsets.ModelViewSet):
@@ -5,7 +5,8 @@ from .models import (
     TASTemplateSection, 
     TASTemplateSectionAssignment,
     TASVersion, 
-    TASGenerationLog
+    TASGenerationLog,
+    TASContentBlob,
 )
 
 
@@ -277,7 +278,13 @@ class TASVersionAdmin(admin.ModelAdmin):
     ]
     list_filter = ["was_regenerated", "created_at"]
     search_fields = ["tas__code", "tas__title", "change_summary"]
-    readonly_fields = ["created_by", "created_at"]
+    readonly_fields = [
+        "created_by",
+        "created_at",
+        "manifest_digest",
+        "delta",
+        "base_manifest",
+    ]
     date_hierarchy = "created_at"
 
     fieldsets = (
@@ -292,6 +299,13 @@ class TASVersionAdmin(admin.ModelAdmin):
                 "classes": ("collapse",),
             },
         ),
+        (
+            "Delta Storage",
+            {
+                "fields": ("manifest_digest", "delta", "base_manifest"),
+                "classes": ("collapse",),
+            },
+        ),
         ("Regeneration", {"fields": ("was_regenerated", "regeneration_reason")}),
         (
             "Metadata",
@@ -300,6 +314,13 @@ class TASVersionAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(TASContentBlob)
+class TASContentBlobAdmin(admin.ModelAdmin):
+    list_display = ["digest", "size", "created_at"]
+    search_fields = ["digest"]
+    readonly_fields = ["digest", "body", "size", "created_at"]
+
+
 @admin.register(TASGenerationLog)
 class TASGenerationLogAdmin(admin.ModelAdmin):
     list_display = [
@@ -5,3 +5,6 @@ class TasConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tas"
     verbose_name = "Training and Assessment Strategies"
+
+    def ready(self):
+        from . import signals  # noqa: F401
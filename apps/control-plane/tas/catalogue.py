@@ -0,0 +1,431 @@
+"""
+Qualification catalogue (code, title, AQF level and training package).
+
+Seeded into QualificationCache, which the qualification search endpoint
+reads. Curated units and groupings are loaded separately by the
+load_qualifications command.
+"""
+
+QUALIFICATIONS = [
+    # Business Services Training Package (BSB)
+    {
+        "code": "BSB10120",
+        "title": "Certificate I in Workplace Skills",
+        "aqf_level": "certificate_i",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB20120",
+        "title": "Certificate II in Workplace Skills",
+        "aqf_level": "certificate_ii",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB30120",
+        "title": "Certificate III in Business",
+        "aqf_level": "certificate_iii",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB30420",
+        "title": "Certificate III in Library and Information Services",
+        "aqf_level": "certificate_iii",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB40120",
+        "title": "Certificate IV in Business",
+        "aqf_level": "certificate_iv",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB40320",
+        "title": "Certificate IV in Entrepreneurship and New Business",
+        "aqf_level": "certificate_iv",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB40520",
+        "title": "Certificate IV in Leadership and Management",
+        "aqf_level": "certificate_iv",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB40920",
+        "title": "Certificate IV in Project Management Practice",
+        "aqf_level": "certificate_iv",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB50120",
+        "title": "Diploma of Business",
+        "aqf_level": "diploma",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB50320",
+        "title": "Diploma of Human Resource Management",
+        "aqf_level": "diploma",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB50420",
+        "title": "Diploma of Leadership and Management",
+        "aqf_level": "diploma",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB50820",
+        "title": "Diploma of Project Management",
+        "aqf_level": "diploma",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB60120",
+        "title": "Advanced Diploma of Business",
+        "aqf_level": "advanced_diploma",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB60420",
+        "title": "Advanced Diploma of Leadership and Management",
+        "aqf_level": "advanced_diploma",
+        "training_package": "BSB",
+    },
+    # Information and Communications Technology (ICT)
+    {
+        "code": "ICT30120",
+        "title": "Certificate III in Information Technology",
+        "aqf_level": "certificate_iii",
+        "training_package": "ICT",
+    },
+    {
+        "code": "ICT40120",
+        "title": "Certificate IV in Information Technology",
+        "aqf_level": "certificate_iv",
+        "training_package": "ICT",
+    },
+    {
+        "code": "ICT40520",
+        "title": "Certificate IV in Web Based Technologies",
+        "aqf_level": "certificate_iv",
+        "training_package": "ICT",
+    },
+    {
+        "code": "ICT50120",
+        "title": "Diploma of Information Technology",
+        "aqf_level": "diploma",
+        "training_package": "ICT",
+    },
+    {
+        "code": "ICT50220",
+        "title": "Diploma of Information Technology (Advanced Networking)",
+        "aqf_level": "diploma",
+        "training_package": "ICT",
+    },
+    {
+        "code": "ICT50420",
+        "title": "Diploma of Information Technology (Back End Development)",
+        "aqf_level": "diploma",
+        "training_package": "ICT",
+    },
+    {
+        "code": "ICT50620",
+        "title": "Diploma of Information Technology (Cyber Security)",
+        "aqf_level": "diploma",
+        "training_package": "ICT",
+    },
+    {
+        "code": "ICT50720",
+        "title": "Diploma of Information Technology (Front End Web Development)",
+        "aqf_level": "diploma",
+        "training_package": "ICT",
+    },
+    {
+        "code": "ICT60120",
+        "title": "Advanced Diploma of Information Technology",
+        "aqf_level": "advanced_diploma",
+        "training_package": "ICT",
+    },
+    {
+        "code": "ICT60220",
+        "title": "Advanced Diploma of Information Technology (Network Security)",
+        "aqf_level": "advanced_diploma",
+        "training_package": "ICT",
+    },
+    # Community Services (CHC)
+    {
+        "code": "CHC22015",
+        "title": "Certificate II in Community Services",
+        "aqf_level": "certificate_ii",
+        "training_package": "CHC",
+    },
+    {
+        "code": "CHC32015",
+        "title": "Certificate III in Community Services",
+        "aqf_level": "certificate_iii",
+        "training_package": "CHC",
+    },
+    {
+        "code": "CHC33015",
+        "title": "Certificate III in Individual Support",
+        "aqf_level": "certificate_iii",
+        "training_package": "CHC",
+    },
+    {
+        "code": "CHC42015",
+        "title": "Certificate IV in Community Services",
+        "aqf_level": "certificate_iv",
+        "training_package": "CHC",
+    },
+    {
+        "code": "CHC43015",
+        "title": "Certificate IV in Ageing Support",
+        "aqf_level": "certificate_iv",
+        "training_package": "CHC",
+    },
+    {
+        "code": "CHC43115",
+        "title": "Certificate IV in Disability",
+        "aqf_level": "certificate_iv",
+        "training_package": "CHC",
+    },
+    {
+        "code": "CHC43315",
+        "title": "Certificate IV in Mental Health",
+        "aqf_level": "certificate_iv",
+        "training_package": "CHC",
+    },
+    {
+        "code": "CHC50113",
+        "title": "Diploma of Early Childhood Education and Care",
+        "aqf_level": "diploma",
+        "training_package": "CHC",
+    },
+    {
+        "code": "CHC52015",
+        "title": "Diploma of Community Services",
+        "aqf_level": "diploma",
+        "training_package": "CHC",
+    },
+    {
+        "code": "CHC52021",
+        "title": "Diploma of Community Services (Case Management)",
+        "aqf_level": "diploma",
+        "training_package": "CHC",
+    },
+    {
+        "code": "CHC62015",
+        "title": "Advanced Diploma of Community Sector Management",
+        "aqf_level": "advanced_diploma",
+        "training_package": "CHC",
+    },
+    # Hospitality (SIT)
+    {
+        "code": "SIT20316",
+        "title": "Certificate II in Hospitality",
+        "aqf_level": "certificate_ii",
+        "training_package": "SIT",
+    },
+    {
+        "code": "SIT30616",
+        "title": "Certificate III in Hospitality",
+        "aqf_level": "certificate_iii",
+        "training_package": "SIT",
+    },
+    {
+        "code": "SIT30816",
+        "title": "Certificate III in Commercial Cookery",
+        "aqf_level": "certificate_iii",
+        "training_package": "SIT",
+    },
+    {
+        "code": "SIT31016",
+        "title": "Certificate III in Patisserie",
+        "aqf_level": "certificate_iii",
+        "training_package": "SIT",
+    },
+    {
+        "code": "SIT40416",
+        "title": "Certificate IV in Hospitality",
+        "aqf_level": "certificate_iv",
+        "training_package": "SIT",
+    },
+    {
+        "code": "SIT40516",
+        "title": "Certificate IV in Commercial Cookery",
+        "aqf_level": "certificate_iv",
+        "training_package": "SIT",
+    },
+    {
+        "code": "SIT50416",
+        "title": "Diploma of Hospitality Management",
+        "aqf_level": "diploma",
+        "training_package": "SIT",
+    },
+    {
+        "code": "SIT60316",
+        "title": "Advanced Diploma of Hospitality Management",
+        "aqf_level": "advanced_diploma",
+        "training_package": "SIT",
+    },
+    # Retail Services (SIR)
+    {
+        "code": "SIR20216",
+        "title": "Certificate II in Retail Services",
+        "aqf_level": "certificate_ii",
+        "training_package": "SIR",
+    },
+    {
+        "code": "SIR30216",
+        "title": "Certificate III in Retail",
+        "aqf_level": "certificate_iii",
+        "training_package": "SIR",
+    },
+    {
+        "code": "SIR40216",
+        "title": "Certificate IV in Retail Management",
+        "aqf_level": "certificate_iv",
+        "training_package": "SIR",
+    },
+    {
+        "code": "SIR50217",
+        "title": "Diploma of Retail Management",
+        "aqf_level": "diploma",
+        "training_package": "SIR",
+    },
+    # Education and Training (TAE)
+    {
+        "code": "TAE40116",
+        "title": "Certificate IV in Training and Assessment",
+        "aqf_level": "certificate_iv",
+        "training_package": "TAE",
+    },
+    {
+        "code": "TAE50216",
+        "title": "Diploma of Training Design and Development",
+        "aqf_level": "diploma",
+        "training_package": "TAE",
+    },
+    {
+        "code": "TAE50116",
+        "title": "Diploma of Vocational Education and Training",
+        "aqf_level": "diploma",
+        "training_package": "TAE",
+    },
+    # Health (HLT)
+    {
+        "code": "HLT33015",
+        "title": "Certificate III in Health Services Assistance",
+        "aqf_level": "certificate_iii",
+        "training_package": "HLT",
+    },
+    {
+        "code": "HLT37315",
+        "title": "Certificate III in Sterilisation Services",
+        "aqf_level": "certificate_iii",
+        "training_package": "HLT",
+    },
+    {
+        "code": "HLT43015",
+        "title": "Certificate IV in Allied Health Assistance",
+        "aqf_level": "certificate_iv",
+        "training_package": "HLT",
+    },
+    {
+        "code": "HLT47315",
+        "title": "Certificate IV in Health Administration",
+        "aqf_level": "certificate_iv",
+        "training_package": "HLT",
+    },
+    {
+        "code": "HLT54121",
+        "title": "Diploma of Nursing",
+        "aqf_level": "diploma",
+        "training_package": "HLT",
+    },
+    # Financial Services (FNS)
+    {
+        "code": "FNS30120",
+        "title": "Certificate III in Financial Services",
+        "aqf_level": "certificate_iii",
+        "training_package": "FNS",
+    },
+    {
+        "code": "FNS40120",
+        "title": "Certificate IV in Accounting and Bookkeeping",
+        "aqf_level": "certificate_iv",
+        "training_package": "FNS",
+    },
+    {
+        "code": "FNS40217",
+        "title": "Certificate IV in Bookkeeping",
+        "aqf_level": "certificate_iv",
+        "training_package": "FNS",
+    },
+    {
+        "code": "FNS50217",
+        "title": "Diploma of Accounting",
+        "aqf_level": "diploma",
+        "training_package": "FNS",
+    },
+    {
+        "code": "FNS50615",
+        "title": "Diploma of Financial Planning",
+        "aqf_level": "diploma",
+        "training_package": "FNS",
+    },
+    # Marketing and Communication (BSB subset)
+    {
+        "code": "BSB40820",
+        "title": "Certificate IV in Marketing and Communication",
+        "aqf_level": "certificate_iv",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB50620",
+        "title": "Diploma of Marketing and Communication",
+        "aqf_level": "diploma",
+        "training_package": "BSB",
+    },
+    {
+        "code": "BSB60520",
+        "title": "Advanced Diploma of Marketing and Communication",
+        "aqf_level": "advanced_diploma",
+        "training_package": "BSB",
+    },
+]
+
+
+def load_catalogue(model, entries=QUALIFICATIONS, source="curated"):
+    """
+    Upsert catalogue entries into QualificationCache (or its historical model).
+
+    Only the catalogue columns are written, so units and groupings loaded
+    for a qualification are kept.
+    """
+    rows = [
+        model(
+            qualification_code=entry["code"],
+            qualification_title=entry["title"],
+            training_package=entry["training_package"],
+            aqf_level=entry["aqf_level"],
+            source=source,
+            is_active=True,
+        )
+        for entry in entries
+    ]
+    model.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["qualification_code"],
+        update_fields=[
+            "qualification_title",
+            "training_package",
+            "aqf_level",
+            "is_active",
+            "last_updated",
+        ],
+    )
+    return len(rows)
@@ -4,6 +4,8 @@ Usage: python manage.py load_qualifications
 """
 
 from django.core.management.base import BaseCommand
+from control_plane.response_cache import invalidate
+from tas.catalogue import load_catalogue
 from tas.models import QualificationCache
 import logging
 
@@ -35,47 +37,71 @@ class Command(BaseCommand):
                 self.style.WARNING(f"Deleted {count} cached qualifications")
             )
 
+        self.stdout.write("📚 Loading qualification catalogue...")
+        catalogue_count = load_catalogue(QualificationCache, source=options["source"])
+        self.stdout.write(f"  Loaded {catalogue_count} catalogue entries")
+
         self.stdout.write("📚 Loading qualification data...")
 
         # Load curated qualification data
         qualifications_data = self.get_qualifications_data()
 
+        codes = [qual_data["qualification_code"] for qual_data in qualifications_data]
+        existing = set(
+            QualificationCache.objects.filter(qualification_code__in=codes).values_list(
+                "qualification_code", flat=True
+            )
+        )
+
+        # Create or update in one statement
+        QualificationCache.objects.bulk_create(
+            [
+                QualificationCache(
+                    qualification_code=qual_data["qualification_code"],
+                    qualification_title=qual_data["qualification_title"],
+                    training_package=qual_data.get("training_package", ""),
+                    aqf_level=qual_data.get("aqf_level", ""),
+                    packaging_rules=qual_data.get("packaging_rules", ""),
+                    has_groupings=qual_data.get("has_groupings", False),
+                    groupings=qual_data.get("groupings", []),
+                    source=options["source"],
+                    is_active=True,
+                )
+                for qual_data in qualifications_data
+            ],
+            update_conflicts=True,
+            unique_fields=["qualification_code"],
+            update_fields=[
+                "qualification_title",
+                "training_package",
+                "aqf_level",
+                "packaging_rules",
+                "has_groupings",
+                "groupings",
+                "source",
+                "is_active",
+                "last_updated",
+            ],
+        )
+
+        # Bulk upserts send no save signals
+        invalidate("tas.qualifications")
+        invalidate("tas.units")
+
         created_count = 0
         updated_count = 0
 
         for qual_data in qualifications_data:
             qual_code = qual_data["qualification_code"]
-
-            try:
-                # Create or update
-                obj, created = QualificationCache.objects.update_or_create(
-                    qualification_code=qual_code,
-                    defaults={
-                        "qualification_title": qual_data["qualification_title"],
-                        "training_package": qual_data.get("training_package", ""),
-                        "aqf_level": qual_data.get("aqf_level", ""),
-                        "packaging_rules": qual_data.get("packaging_rules", ""),
-                        "has_groupings": qual_data.get("has_groupings", False),
-                        "groupings": qual_data.get("groupings", []),
-                        "source": options["source"],
-                        "is_active": True,
-                    },
+            if qual_code in existing:
+                updated_count += 1
+                self.stdout.write(
+                    f'  🔄 Updated: {qual_code} - {qual_data["qualification_title"]}'
                 )
-
-                if created:
-                    created_count += 1
-                    self.stdout.write(
-                        f'  ✅ Created: {qual_code} - {qual_data["qualification_title"]}'
-                    )
-                else:
-                    updated_count += 1
-                    self.stdout.write(
-                        f'  🔄 Updated: {qual_code} - {qual_data["qualification_title"]}'
-                    )
-
-            except Exception as e:
+            else:
+                created_count += 1
                 self.stdout.write(
-                    self.style.ERROR(f"  ❌ Error loading {qual_code}: {str(e)}")
+                    f'  ✅ Created: {qual_code} - {qual_data["qualification_title"]}'
                 )
 
         self.stdout.write(
@@ -0,0 +1,67 @@
+"""
+Management command to sync qualification pages from training.gov.au
+Usage: python manage.py sync_tga_catalogue [--codes ICT40120 BSB50120]
+"""
+
+from django.core.management.base import BaseCommand
+
+from tas.tga_sync import (
+    MIN_REQUEST_INTERVAL,
+    PARSE_WORKERS,
+    PER_HOST_CONCURRENCY,
+    SYNC_WORKERS,
+    TGASync,
+)
+from tas.tga_scraper import TrainingGovAuScraper
+
+
+class Command(BaseCommand):
+    help = "Fetch changed qualification pages from training.gov.au into the cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--codes",
+            nargs="+",
+            help="Qualification codes to sync (default: all active cached codes)",
+        )
+        parser.add_argument(
+            "--base-url",
+            default=TrainingGovAuScraper.BASE_URL,
+            help="Site to fetch from (e.g. a local fixture server)",
+        )
+        parser.add_argument("--workers", type=int, default=SYNC_WORKERS)
+        parser.add_argument("--per-host", type=int, default=PER_HOST_CONCURRENCY)
+        parser.add_argument(
+            "--min-interval",
+            type=float,
+            default=MIN_REQUEST_INTERVAL,
+            help="Seconds between requests to the same host",
+        )
+        parser.add_argument(
+            "--parse-workers",
+            type=int,
+            default=PARSE_WORKERS,
+            help="Parser processes (0 parses in this process)",
+        )
+
+    def handle(self, *args, **options):
+        sync = TGASync(
+            base_url=options["base_url"],
+            workers=options["workers"],
+            per_host_concurrency=options["per_host"],
+            min_request_interval=options["min_interval"],
+            parse_workers=options["parse_workers"],
+        )
+        stats = sync.sync(options["codes"])
+
+        for code, error in sorted(stats.errors.items()):
+            self.stdout.write(self.style.ERROR(f"  ❌ {code}: {error}"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✨ Synced {stats.requested} qualifications in {stats.seconds}s: "
+                f"{stats.upserted} updated, {stats.not_modified} unchanged, "
+                f"{stats.missing} missing, {stats.unparsable} unparsable, "
+                f"{stats.failed} failed"
+            )
+        )
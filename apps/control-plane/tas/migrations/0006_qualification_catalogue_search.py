@@ -0,0 +1,55 @@
+# Generated by Django 5.1.13 on 2026-10-18 23:32
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def seed_catalogue(apps, schema_editor):
+    """Load the qualification catalogue the search endpoint now reads"""
+    from tas.catalogue import load_catalogue
+
+    load_catalogue(apps.get_model("tas", "QualificationCache"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tas", "0005_tastemplatesectionassignment_and_more"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="qualificationcache",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("qualification_code"),
+                    name="gin_trgm_ops",
+                ),
+                name="tas_qual_code_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="qualificationcache",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("qualification_title"),
+                    name="gin_trgm_ops",
+                ),
+                name="tas_qual_title_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="qualificationcache",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("qualification_code"),
+                    name="text_pattern_ops",
+                ),
+                name="tas_qual_code_prefix",
+            ),
+        ),
+        migrations.RunPython(seed_catalogue, migrations.RunPython.noop),
+    ]
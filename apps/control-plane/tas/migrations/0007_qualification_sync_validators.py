@@ -0,0 +1,23 @@
+# Generated by Django 5.1.13 on 2026-10-18 23:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tas", "0006_qualification_catalogue_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="qualificationcache",
+            name="source_etag",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="qualificationcache",
+            name="source_last_modified",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
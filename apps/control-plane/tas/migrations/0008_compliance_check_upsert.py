@@ -0,0 +1,35 @@
+# Generated by Django 5.1.13 on 2026-10-18 23:45
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def drop_duplicate_checks(apps, schema_editor):
+    """Keep only the latest check per entity and rule"""
+    ComplianceCheck = apps.get_model("tas", "ComplianceCheck")
+    latest = (
+        ComplianceCheck.objects.values("entity_type", "entity_id", "rule")
+        .annotate(latest=Max("id"))
+        .values_list("latest", flat=True)
+    )
+    ComplianceCheck.objects.exclude(id__in=latest).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tas", "0007_qualification_sync_validators"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_checks, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="compliancecheck",
+            constraint=models.UniqueConstraint(
+                fields=("entity_type", "entity_id", "rule"),
+                name="tas_compliance_check_entity_rule",
+            ),
+        ),
+    ]
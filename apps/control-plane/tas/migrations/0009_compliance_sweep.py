@@ -0,0 +1,112 @@
+# Generated by Django 5.1.13 on 2026-10-18 23:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tas", "0008_compliance_check_upsert"),
+        ("tenants", "0003_tenantapikey_description"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="compliancecheck",
+            name="fingerprint",
+            field=models.CharField(
+                blank=True,
+                help_text="Hash of the entity content and rule version this result was computed from",
+                max_length=64,
+            ),
+        ),
+        migrations.CreateModel(
+            name="ComplianceSweep",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="running",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "trigger",
+                    models.CharField(
+                        choices=[("manual", "Manual"), ("rule_change", "Rule Change")],
+                        default="manual",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "rule_types",
+                    models.JSONField(
+                        default=list, help_text="Rule types to re-check (empty for all)"
+                    ),
+                ),
+                ("total_courses", models.IntegerField(default=0)),
+                ("total_shards", models.IntegerField(default=0)),
+                ("completed_shards", models.IntegerField(default=0)),
+                ("failed_shards", models.IntegerField(default=0)),
+                ("checks_run", models.IntegerField(default=0)),
+                (
+                    "checks_skipped",
+                    models.IntegerField(
+                        default=0, help_text="Unchanged since their last check"
+                    ),
+                ),
+                ("red_count", models.IntegerField(default=0)),
+                ("amber_count", models.IntegerField(default=0)),
+                ("green_count", models.IntegerField(default=0)),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "started_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="compliance_sweeps",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="compliance_sweeps",
+                        to="tenants.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Compliance Sweep",
+                "verbose_name_plural": "Compliance Sweeps",
+                "db_table": "tas_compliance_sweeps",
+                "ordering": ["-started_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["tenant", "status"],
+                        name="tas_complia_tenant__703bbf_idx",
+                    )
+                ],
+            },
+        ),
+    ]
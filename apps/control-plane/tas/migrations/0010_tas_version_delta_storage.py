@@ -0,0 +1,65 @@
+# Generated by Django 5.1.13 on 2026-10-18 23:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tas", "0009_compliance_sweep"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TASContentBlob",
+            fields=[
+                (
+                    "digest",
+                    models.CharField(
+                        help_text="SHA-256 of the canonical JSON body",
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("body", models.JSONField()),
+                (
+                    "size",
+                    models.IntegerField(default=0, help_text="Bytes of canonical JSON"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "TAS Content Blob",
+                "verbose_name_plural": "TAS Content Blobs",
+                "db_table": "tas_content_blobs",
+            },
+        ),
+        migrations.AddField(
+            model_name="tasversion",
+            name="base_manifest",
+            field=models.JSONField(
+                blank=True,
+                help_text="All section blob digests of the previous version (keyframes only)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="tasversion",
+            name="delta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Section blob digests changed since the previous version",
+            ),
+        ),
+        migrations.AddField(
+            model_name="tasversion",
+            name="manifest_digest",
+            field=models.CharField(
+                blank=True,
+                help_text="SHA-256 of this version's manifest",
+                max_length=64,
+            ),
+        ),
+    ]
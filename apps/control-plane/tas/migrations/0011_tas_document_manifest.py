@@ -0,0 +1,23 @@
+# Generated by Django 5.1.13 on 2026-10-19 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tas", "0010_tas_version_delta_storage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tas",
+            name="document_manifest",
+            field=models.JSONField(
+                blank=True,
+                editable=False,
+                help_text="Section digests of a superseded version whose sections and content are kept in the version store",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.13 on 2026-10-19 00:45
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tas", "0011_tas_document_manifest"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="tas",
+            name="document_manifest",
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from tenants.context import TenantManager
 from tenants.models import Tenant
 from django.utils import timezone
 import hashlib
@@ -421,6 +424,22 @@ class TASVersion(models.Model):
         default=dict, help_text="Snapshot of new version content"
     )
 
+    # Delta storage (see services/version_store.py); rows created before it
+    # keep their content in previous_content/new_content instead
+    delta = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Section blob digests changed since the previous version",
+    )
+    base_manifest = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="All section blob digests of the previous version (keyframes only)",
+    )
+    manifest_digest = models.CharField(
+        max_length=64, blank=True, help_text="SHA-256 of this version's manifest"
+    )
+
     # Metadata
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -440,6 +459,30 @@ class TASVersion(models.Model):
         return f"{self.tas.code} - Version {self.version_number}"
 
 
+class TASContentBlob(models.Model):
+    """
+    Content-addressed body of one TAS document section, shared by every
+    version (of any document) that contains it
+    """
+
+    digest = models.CharField(
+        max_length=64,
+        primary_key=True,
+        help_text="SHA-256 of the canonical JSON body",
+    )
+    body = models.JSONField()
+    size = models.IntegerField(default=0, help_text="Bytes of canonical JSON")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "tas_content_blobs"
+        verbose_name = "TAS Content Blob"
+        verbose_name_plural = "TAS Content Blobs"
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.size} bytes)"
+
+
 class TASGenerationLog(models.Model):
     """
     Log of GPT-4 generation attempts and results
@@ -768,6 +811,10 @@ class CourseTAS(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = models.Manager()
+    # Rows of the current tenant only (see tenants.context)
+    tenant_objects = TenantManager()
+
     class Meta:
         db_table = "tas_course_tas"
         ordering = ["-created_at"]
@@ -965,6 +1012,11 @@ class ComplianceCheck(models.Model):
     status = models.CharField(max_length=20, choices=STATUS)
     message = models.TextField(help_text="Compliance check message")
     details = models.JSONField(default=dict, help_text="Detailed check results")
+    fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of the entity content and rule version this result was computed from",
+    )
 
     # Resolution
     resolved = models.BooleanField(default=False)
@@ -987,6 +1039,13 @@ class ComplianceCheck(models.Model):
         indexes = [
             models.Index(fields=["entity_type", "entity_id", "status"]),
         ]
+        constraints = [
+            # One current result per entity and rule (compliance runs upsert)
+            models.UniqueConstraint(
+                fields=["entity_type", "entity_id", "rule"],
+                name="tas_compliance_check_entity_rule",
+            ),
+        ]
         verbose_name = "Compliance Check"
         verbose_name_plural = "Compliance Checks"
 
@@ -994,6 +1053,77 @@ class ComplianceCheck(models.Model):
         return f"{self.rule.name} - {self.status}"
 
 
+class ComplianceSweep(models.Model):
+    """
+    Tenant-wide compliance run across every Course TAS and Unit TAS
+    Shards update the running totals as they finish
+    """
+
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    TRIGGERS = [
+        ("manual", "Manual"),
+        ("rule_change", "Rule Change"),
+    ]
+
+    tenant = models.ForeignKey(
+        Tenant, on_delete=models.CASCADE, related_name="compliance_sweeps"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running")
+    trigger = models.CharField(max_length=20, choices=TRIGGERS, default="manual")
+    rule_types = models.JSONField(
+        default=list, help_text="Rule types to re-check (empty for all)"
+    )
+
+    # Progress
+    total_courses = models.IntegerField(default=0)
+    total_shards = models.IntegerField(default=0)
+    completed_shards = models.IntegerField(default=0)
+    failed_shards = models.IntegerField(default=0)
+
+    # Running totals over the checks of completed shards
+    checks_run = models.IntegerField(default=0)
+    checks_skipped = models.IntegerField(
+        default=0, help_text="Unchanged since their last check"
+    )
+    red_count = models.IntegerField(default=0)
+    amber_count = models.IntegerField(default=0)
+    green_count = models.IntegerField(default=0)
+
+    started_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="compliance_sweeps",
+    )
+    started_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "tas_compliance_sweeps"
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["tenant", "status"]),
+        ]
+        verbose_name = "Compliance Sweep"
+        verbose_name_plural = "Compliance Sweeps"
+
+    def __str__(self):
+        return f"Compliance sweep {self.id} ({self.status})"
+
+    @property
+    def progress_percent(self) -> float:
+        if not self.total_shards:
+            return 100.0
+        done = self.completed_shards + self.failed_shards
+        return round(done / self.total_shards * 100, 1)
+
+
 class AssessmentTask(models.Model):
     """
     Assessment tasks linked to Unit TAS
@@ -1207,6 +1337,10 @@ class QualificationCache(models.Model):
     is_active = models.BooleanField(default=True)
     release_date = models.DateField(null=True, blank=True)
 
+    # Validators from the last sync, sent back as conditional request headers
+    source_etag = models.CharField(max_length=255, blank=True)
+    source_last_modified = models.CharField(max_length=64, blank=True)
+
     class Meta:
         db_table = "tas_qualification_cache"
         ordering = ["qualification_code"]
@@ -1215,6 +1349,20 @@ class QualificationCache(models.Model):
         indexes = [
             models.Index(fields=["qualification_code", "is_active"]),
             models.Index(fields=["training_package"]),
+            # Catalogue search: icontains on code/title (trigram), typeahead
+            # istartswith on code (pattern ops)
+            GinIndex(
+                OpClass(Upper("qualification_code"), name="gin_trgm_ops"),
+                name="tas_qual_code_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("qualification_title"), name="gin_trgm_ops"),
+                name="tas_qual_title_trgm",
+            ),
+            models.Index(
+                OpClass(Upper("qualification_code"), name="text_pattern_ops"),
+                name="tas_qual_code_prefix",
+            ),
         ]
 
     def __str__(self):
@@ -0,0 +1,10 @@
+from rest_framework.pagination import CursorPagination
+
+
+class QualificationCursorPagination(CursorPagination):
+    """Cursor pages over the qualification catalogue, in code order"""
+
+    ordering = "qualification_code"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
@@ -5,10 +5,14 @@ from .models import (
     TASTemplateSection, 
     TASTemplateSectionAssignment,
     TASVersion, 
-    TASGenerationLog
+    TASGenerationLog,
+    ComplianceRule,
+    ComplianceSweep,
 )
 from django.contrib.auth.models import User
 
+from .services import version_store
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -117,6 +121,8 @@ class TASTemplateSerializer(serializers.ModelSerializer):
 
 class TASVersionSerializer(serializers.ModelSerializer):
     created_by_details = UserSerializer(source="created_by", read_only=True)
+    previous_content = serializers.SerializerMethodField()
+    new_content = serializers.SerializerMethodField()
 
     class Meta:
         model = TASVersion
@@ -137,6 +143,16 @@ class TASVersionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_at"]
 
+    def get_previous_content(self, obj):
+        if obj.manifest_digest:
+            return version_store.version_document(obj, before=True)["content"]
+        return obj.previous_content
+
+    def get_new_content(self, obj):
+        if obj.manifest_digest:
+            return version_store.version_document(obj)["content"]
+        return obj.new_content
+
 
 class TASGenerationLogSerializer(serializers.ModelSerializer):
     created_by_details = UserSerializer(source="created_by", read_only=True)
@@ -242,6 +258,9 @@ class TASSerializer(serializers.ModelSerializer):
         return obj.get_time_saved()
 
     def get_version_count(self, obj):
+        # Annotated by the list views (see views.with_serializer_relations)
+        if getattr(obj, "version_count", None) is not None:
+            return obj.version_count
         return TAS.objects.filter(tenant=obj.tenant, code=obj.code).count()
 
 
@@ -340,3 +359,36 @@ class TASUpdateSerializer(serializers.Serializer):
                 }
             )
         return data
+
+
+class ComplianceSweepSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source="get_status_display", read_only=True)
+    progress_percent = serializers.FloatField(read_only=True)
+    rule_types = serializers.ListField(
+        child=serializers.ChoiceField(choices=ComplianceRule.RULE_TYPES),
+        required=False,
+    )
+
+    class Meta:
+        model = ComplianceSweep
+        fields = [
+            "id",
+            "status",
+            "status_display",
+            "trigger",
+            "rule_types",
+            "total_courses",
+            "total_shards",
+            "completed_shards",
+            "failed_shards",
+            "progress_percent",
+            "checks_run",
+            "checks_skipped",
+            "red_count",
+            "amber_count",
+            "green_count",
+            "started_by",
+            "started_at",
+            "completed_at",
+        ]
+        read_only_fields = [f for f in fields if f != "rule_types"]
@@ -9,6 +9,7 @@ from .compliance import ComplianceRAGEngine
 from .assessment_mapper import AssessmentMapper
 from .evidence import EvidenceSnapshotService
 from .exporter import ExporterSyncService
+from .course_graph import CourseGraph, load_course_graph
 
 __all__ = [
     "TASOrchestrator",
@@ -17,4 +18,6 @@ __all__ = [
     "AssessmentMapper",
     "EvidenceSnapshotService",
     "ExporterSyncService",
+    "CourseGraph",
+    "load_course_graph",
 ]
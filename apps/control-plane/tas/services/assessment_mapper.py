@@ -2,10 +2,70 @@
 Assessment Mapper Service
 Maps unit elements/PC/KE/FS to assessment tasks and instruments
 Generates mapping matrices
+
+Coverage is computed from inverted indexes (criterion code -> tasks), so
+a matrix costs one pass over the tasks and one over the criteria.
 """
 
-from typing import Dict, List
-from ..models import UnitTAS, AssessmentTask
+from collections import defaultdict
+from collections.abc import Hashable
+from typing import Any, Dict, Iterable, List, Optional
+from ..models import CourseTAS, UnitTAS, AssessmentTask
+
+# (matrix key, criterion id field, task field, criterion fields, task fields, summary prefix)
+MATRIX_SECTIONS = [
+    (
+        "elements",
+        "code",
+        "elements_covered",
+        ("code", "title"),
+        ("task_number", "task_name", "task_type"),
+        "elements",
+    ),
+    (
+        "performance_criteria",
+        "code",
+        "performance_criteria_covered",
+        ("code", "description"),
+        ("task_number", "task_name"),
+        "pc",
+    ),
+    (
+        "knowledge_evidence",
+        "id",
+        "knowledge_evidence_covered",
+        ("description",),
+        ("task_number", "task_name"),
+        "ke",
+    ),
+    (
+        "foundation_skills",
+        "id",
+        "foundation_skills_covered",
+        ("skill", "description"),
+        ("task_number", "task_name"),
+        "fs",
+    ),
+]
+
+
+def build_coverage_index(
+    tasks: Iterable[AssessmentTask], field: str, task_fields: Iterable[str]
+) -> Dict[Any, List[Dict]]:
+    """
+    Map each criterion code listed in a task field to the tasks covering it
+
+    Tasks keep their order; a task listing a code twice appears once.
+    """
+    index = defaultdict(list)
+    for task in tasks:
+        summary = {name: getattr(task, name) for name in task_fields}
+        codes = [
+            code for code in getattr(task, field) or [] if isinstance(code, Hashable)
+        ]
+        for code in dict.fromkeys(codes):
+            index[code].append(summary)
+    return index
 
 
 class AssessmentMapper:
@@ -14,156 +74,101 @@ class AssessmentMapper:
     """
 
     @classmethod
-    def create_mapping_matrix(cls, unit_tas: UnitTAS) -> Dict:
+    def create_mapping_matrix(
+        cls, unit_tas: UnitTAS, tasks: Optional[List[AssessmentTask]] = None
+    ) -> Dict:
         """
         Generate assessment mapping matrix for a unit
 
         Args:
             unit_tas: UnitTAS instance
+            tasks: Optional assessment tasks (default: the unit's, using
+                prefetched tasks when present)
 
         Returns:
             Dict with complete mapping matrix
         """
         # Get TGA snapshot data
         tga_snapshot = unit_tas.tga_unit_snapshot or {}
-        elements = tga_snapshot.get("elements", [])
-        performance_criteria = tga_snapshot.get("performance_criteria", [])
-        knowledge_evidence = tga_snapshot.get("knowledge_evidence", [])
-        foundation_skills = tga_snapshot.get("foundation_skills", [])
 
         # Get assessment tasks
-        assessment_tasks = unit_tas.assessment_tasks.all()
+        if tasks is None:
+            tasks = list(unit_tas.assessment_tasks.all())
 
         # Build matrix
         matrix = {
             "unit_code": unit_tas.unit_code,
             "unit_title": unit_tas.unit_title,
-            "elements": [],
-            "performance_criteria": [],
-            "knowledge_evidence": [],
-            "foundation_skills": [],
-            "coverage_summary": {
-                "elements_covered": 0,
-                "elements_total": len(elements),
-                "pc_covered": 0,
-                "pc_total": len(performance_criteria),
-                "ke_covered": 0,
-                "ke_total": len(knowledge_evidence),
-                "fs_covered": 0,
-                "fs_total": len(foundation_skills),
-            },
+        }
+        summary = {}
+
+        for key, id_field, task_field, fields, task_fields, prefix in MATRIX_SECTIONS:
+            criteria = tga_snapshot.get(key, [])
+            index = build_coverage_index(tasks, task_field, task_fields)
+
+            mappings = []
+            covered = 0
+            for criterion in criteria:
+                criterion_id = criterion.get(id_field)
+                covering = (
+                    index.get(criterion_id, ())
+                    if isinstance(criterion_id, Hashable)
+                    else ()
+                )
+                mapping = {name: criterion.get(name) for name in fields}
+                mapping["covered_by_tasks"] = [dict(task) for task in covering]
+                if covering:
+                    covered += 1
+                mappings.append(mapping)
+
+            matrix[key] = mappings
+            summary[f"{prefix}_covered"] = covered
+            summary[f"{prefix}_total"] = len(criteria)
+
+        matrix["coverage_summary"] = {
+            f"{prefix}_{count}": summary[f"{prefix}_{count}"]
+            for *_, prefix in MATRIX_SECTIONS
+            for count in ("covered", "total")
         }
 
-        # Map elements
-        for element in elements:
-            element_mapping = {
-                "code": element.get("code"),
-                "title": element.get("title"),
-                "covered_by_tasks": [],
-            }
-
-            for task in assessment_tasks:
-                if element.get("code") in task.elements_covered:
-                    element_mapping["covered_by_tasks"].append(
-                        {
-                            "task_number": task.task_number,
-                            "task_name": task.task_name,
-                            "task_type": task.task_type,
-                        }
-                    )
-
-            if element_mapping["covered_by_tasks"]:
-                matrix["coverage_summary"]["elements_covered"] += 1
-
-            matrix["elements"].append(element_mapping)
-
-        # Map performance criteria
-        for pc in performance_criteria:
-            pc_mapping = {
-                "code": pc.get("code"),
-                "description": pc.get("description"),
-                "covered_by_tasks": [],
-            }
-
-            for task in assessment_tasks:
-                if pc.get("code") in task.performance_criteria_covered:
-                    pc_mapping["covered_by_tasks"].append(
-                        {
-                            "task_number": task.task_number,
-                            "task_name": task.task_name,
-                        }
-                    )
-
-            if pc_mapping["covered_by_tasks"]:
-                matrix["coverage_summary"]["pc_covered"] += 1
-
-            matrix["performance_criteria"].append(pc_mapping)
-
-        # Map knowledge evidence
-        for ke in knowledge_evidence:
-            ke_mapping = {
-                "description": ke.get("description"),
-                "covered_by_tasks": [],
-            }
+        # Calculate coverage percentages
+        for prefix in ("elements", "pc"):
+            if summary[f"{prefix}_total"] > 0:
+                matrix["coverage_summary"][f"{prefix}_coverage_percent"] = round(
+                    (summary[f"{prefix}_covered"] / summary[f"{prefix}_total"]) * 100,
+                    1,
+                )
 
-            for task in assessment_tasks:
-                if ke.get("id") in task.knowledge_evidence_covered:
-                    ke_mapping["covered_by_tasks"].append(
-                        {
-                            "task_number": task.task_number,
-                            "task_name": task.task_name,
-                        }
-                    )
-
-            if ke_mapping["covered_by_tasks"]:
-                matrix["coverage_summary"]["ke_covered"] += 1
-
-            matrix["knowledge_evidence"].append(ke_mapping)
-
-        # Map foundation skills
-        for fs in foundation_skills:
-            fs_mapping = {
-                "skill": fs.get("skill"),
-                "description": fs.get("description"),
-                "covered_by_tasks": [],
-            }
+        return matrix
 
-            for task in assessment_tasks:
-                if fs.get("id") in task.foundation_skills_covered:
-                    fs_mapping["covered_by_tasks"].append(
-                        {
-                            "task_number": task.task_number,
-                            "task_name": task.task_name,
-                        }
-                    )
+    @classmethod
+    def create_mapping_matrices(
+        cls, course_tas: CourseTAS, save: bool = False
+    ) -> List[Dict]:
+        """
+        Generate mapping matrices for every unit of a Course TAS
 
-            if fs_mapping["covered_by_tasks"]:
-                matrix["coverage_summary"]["fs_covered"] += 1
+        Loads the units and all their assessment tasks in two queries.
 
-            matrix["foundation_skills"].append(fs_mapping)
+        Args:
+            course_tas: CourseTAS instance
+            save: Also store each matrix on its UnitTAS (one bulk update)
 
-        # Calculate coverage percentages
-        if matrix["coverage_summary"]["elements_total"] > 0:
-            matrix["coverage_summary"]["elements_coverage_percent"] = round(
-                (
-                    matrix["coverage_summary"]["elements_covered"]
-                    / matrix["coverage_summary"]["elements_total"]
-                )
-                * 100,
-                1,
-            )
+        Returns:
+            List of mapping matrices in unit order
+        """
+        units = list(course_tas.unit_tas_set.prefetch_related("assessment_tasks"))
+        matrices = []
+        for unit in units:
+            matrix = cls.create_mapping_matrix(unit)
+            if save:
+                unit.mapping_matrix = matrix
+            matrices.append(matrix)
 
-        if matrix["coverage_summary"]["pc_total"] > 0:
-            matrix["coverage_summary"]["pc_coverage_percent"] = round(
-                (
-                    matrix["coverage_summary"]["pc_covered"]
-                    / matrix["coverage_summary"]["pc_total"]
-                )
-                * 100,
-                1,
-            )
+        if save and units:
+            UnitTAS.objects.bulk_update(units, ["mapping_matrix"], batch_size=200)
 
-        return matrix
+        return matrices
 
     @classmethod
     def validate_coverage(cls, unit_tas: UnitTAS) -> Dict:
@@ -305,8 +310,9 @@ class AssessmentMapper:
         foundation_skills = tga_snapshot.get("foundation_skills", [])
 
         # Create assessment tasks
+        tasks = []
         for suggestion in suggestions:
-            task = AssessmentTask.objects.create(
+            task = AssessmentTask(
                 unit_tas=unit_tas,
                 task_number=suggestion["task_number"],
                 task_name=suggestion["task_name"],
@@ -324,6 +330,8 @@ class AssessmentMapper:
                 ],
                 instruments=suggestion.get("suggested_instruments", []),
             )
+            tasks.append(task)
+        AssessmentTask.objects.bulk_create(tasks)
 
         # Update unit TAS mapping matrix
         matrix = cls.create_mapping_matrix(unit_tas)
@@ -1,14 +1,125 @@
 """
 Compliance RAG (Red/Amber/Green) Engine
 Implements compliance checks and guardrails for ASQA standards
+
+Checks run in batches: the courses being checked, their units, trainers
+and facilities are loaded once into a CourseContext, every rule is
+evaluated in memory against it, and all results are written with one
+bulk upsert.
+
+Each stored check carries a fingerprint of the entity content and rule
+version it was computed from, so sweeps can skip checks whose inputs
+have not changed.
 """
 
-from typing import Dict, List, Tuple
+import datetime
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import transaction
+from django.db.models import Prefetch, Q
 from django.utils import timezone
-from django.db import models as models_module
+
 from ..models import CourseTAS, UnitTAS, ComplianceRule, ComplianceCheck, Trainer
 
+# Rule types that also apply to individual units
+UNIT_RULE_TYPES = ["trainer_scope", "facility_adequacy", "assessment_coverage"]
+
+# Rule types whose result changes with the date (trainer currency)
+DATED_RULE_TYPES = ["trainer_scope"]
+
+UPSERT_BATCH_SIZE = 500
+
+
+@dataclass
+class CourseContext:
+    """A Course TAS with everything the course and unit checks read"""
+
+    course: CourseTAS
+    # Trainers (with users) and facilities prefetched
+    units: List[UnitTAS]
+    facilities: list
+
+
+# (entity_type, entity_id, rule, check result, fingerprint)
+Outcome = Tuple[str, int, ComplianceRule, Dict, str]
+
+
+def _units_queryset():
+    return UnitTAS.objects.prefetch_related(
+        Prefetch("trainers", queryset=Trainer.objects.select_related("user")),
+        "facilities",
+    )
+
+
+def load_contexts(courses: Iterable[Union[CourseTAS, int]]) -> Dict[int, CourseContext]:
+    """
+    Load evaluation contexts for many Course TAS at once
+
+    Five queries however many courses and units: courses, course
+    facilities, units, unit trainers (with users) and unit facilities.
+    """
+    ids = [c.pk if isinstance(c, CourseTAS) else c for c in courses]
+    queryset = CourseTAS.objects.filter(pk__in=ids).prefetch_related(
+        "facilities", Prefetch("unit_tas_set", queryset=_units_queryset())
+    )
+    return {
+        course.pk: CourseContext(
+            course=course,
+            units=list(course.unit_tas_set.all()),
+            facilities=list(course.facilities.all()),
+        )
+        for course in queryset
+    }
+
+
+def _unit_content(unit: UnitTAS) -> Dict:
+    """Everything the unit checks read from a Unit TAS"""
+    return {
+        "id": unit.pk,
+        "unit_code": unit.unit_code,
+        "nominal_hours": unit.nominal_hours,
+        "trainers": [
+            [t.pk, t.user.username, t.scope_units, t.last_currency_date]
+            for t in unit.trainers.all()
+        ],
+        "facilities": [f.pk for f in unit.facilities.all()],
+    }
+
+
+def entity_fingerprint(entity_type: str, entity: Union[CourseContext, UnitTAS]) -> str:
+    """Hash of the content the checks of a course or unit depend on"""
+    if entity_type == "unit":
+        content = _unit_content(entity)
+    else:
+        course = entity.course
+        content = {
+            "core_units": course.core_units,
+            "elective_units": course.elective_units,
+            "total_units": course.total_units,
+            "packaging_rules": course.tga_qualification_snapshot.get(
+                "packaging_rules", {}
+            ),
+            "total_hours": course.total_hours,
+            "clusters": course.clusters,
+            "policy_links": course.policy_links,
+            "facilities": [f.pk for f in entity.facilities],
+            "units": [_unit_content(unit) for unit in entity.units],
+        }
+    payload = json.dumps(content, cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def check_fingerprint(entity_hash: str, rule: ComplianceRule) -> str:
+    """Hash of the inputs of one check: entity content and rule version"""
+    parts = [entity_hash, str(rule.pk), rule.updated_at.isoformat()]
+    if rule.rule_type in DATED_RULE_TYPES:
+        parts.append(datetime.date.today().isoformat())
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
 
 class ComplianceRAGEngine:
     """
@@ -28,74 +139,265 @@ class ComplianceRAGEngine:
         Returns:
             Dict with check results categorized by status (red/amber/green)
         """
-        results = {
-            "red": [],
-            "amber": [],
-            "green": [],
-            "summary": {
-                "total_checks": 0,
-                "red_count": 0,
-                "amber_count": 0,
-                "green_count": 0,
-                "can_approve": True,
-            },
-        }
+        return cls.run_batch([course_tas], user=user)[course_tas.pk]
 
-        # Get active rules for the tenant
-        rules = ComplianceRule.objects.filter(
-            models_module.Q(tenant=course_tas.tenant)
-            | models_module.Q(is_system_rule=True),
-            is_active=True,
-        )
+    @classmethod
+    def run_unit_checks(cls, unit_tas: UnitTAS, user=None) -> Dict:
+        """
+        Run compliance checks for a Unit TAS
 
-        with transaction.atomic():
-            for rule in rules:
-                check_result = cls._execute_rule(rule, course_tas)
-
-                # Create or update compliance check record
-                check, created = ComplianceCheck.objects.update_or_create(
-                    entity_type="course",
-                    entity_id=course_tas.id,
-                    rule=rule,
-                    defaults={
-                        "status": check_result["status"],
-                        "message": check_result["message"],
-                        "details": check_result.get("details", {}),
-                    },
-                )
-
-                results[check_result["status"]].append(
-                    {
-                        "rule_name": rule.name,
-                        "rule_type": rule.rule_type,
-                        "asqa_clause": rule.asqa_clause,
-                        "message": check_result["message"],
-                        "details": check_result.get("details", {}),
-                        "check_id": check.id,
-                    }
-                )
-                results["summary"]["total_checks"] += 1
-                results["summary"][f"{check_result['status']}_count"] += 1
+        Args:
+            unit_tas: UnitTAS instance
+            user: Optional user running the check
+
+        Returns:
+            Dict with check results
+        """
+        unit = _units_queryset().select_related("course_tas").get(pk=unit_tas.pk)
+        rules = cls._active_rules([unit.course_tas.tenant_id])
+        unit_hash = entity_fingerprint("unit", unit)
+
+        outcomes = [
+            cls._outcome("unit", unit.pk, unit, unit_hash, rule)
+            for rule in cls._rules_for(rules, unit.course_tas.tenant_id)
+            if rule.rule_type in UNIT_RULE_TYPES
+        ]
+        checks = cls._save_checks(outcomes)
+
+        results = cls._empty_results("can_proceed")
+        for (_, _, rule, check_result, _), check in zip(outcomes, checks):
+            results[check_result["status"]].append(
+                {
+                    "rule_name": rule.name,
+                    "rule_type": rule.rule_type,
+                    "message": check_result["message"],
+                    "check_id": check.id,
+                }
+            )
+            cls._count(results, check_result["status"])
 
-        # Cannot approve if there are red issues
         if results["summary"]["red_count"] > 0:
-            results["summary"]["can_approve"] = False
+            results["summary"]["can_proceed"] = False
 
         return results
 
     @classmethod
-    def run_unit_checks(cls, unit_tas: UnitTAS, user=None) -> Dict:
+    def run_batch(
+        cls,
+        courses: Iterable[Union[CourseTAS, int]],
+        user=None,
+        include_units: bool = False,
+    ) -> Dict[int, Dict]:
         """
-        Run compliance checks for a Unit TAS
+        Run all compliance checks for many Course TAS documents
+
+        Loads every course into a CourseContext in a fixed number of
+        queries, evaluates the active rules of each course's tenant
+        against it and upserts all results at once. With include_units,
+        the unit rules are also run against every unit of each course.
 
         Args:
-            unit_tas: UnitTAS instance
+            courses: CourseTAS instances or ids
             user: Optional user running the check
+            include_units: Also check each course's units
 
         Returns:
-            Dict with check results
+            Dict of course id -> results as returned by run_all_checks
         """
+        contexts = load_contexts(courses)
+        rules = cls._active_rules(
+            {context.course.tenant_id for context in contexts.values()}
+        )
+
+        outcomes = [
+            cls._outcome(*planned)
+            for planned in cls._plan(contexts, rules, include_units)
+        ]
+        checks = cls._save_checks(outcomes)
+
         results = {
+            course_id: cls._empty_results("can_approve") for course_id in contexts
+        }
+        for (entity_type, entity_id, rule, check_result, _), check in zip(
+            outcomes, checks
+        ):
+            if entity_type != "course":
+                continue
+            course_results = results[entity_id]
+            course_results[check_result["status"]].append(
+                {
+                    "rule_name": rule.name,
+                    "rule_type": rule.rule_type,
+                    "asqa_clause": rule.asqa_clause,
+                    "message": check_result["message"],
+                    "details": check_result.get("details", {}),
+                    "check_id": check.id,
+                }
+            )
+            cls._count(course_results, check_result["status"])
+
+        # Cannot approve if there are red issues
+        for course_results in results.values():
+            if course_results["summary"]["red_count"] > 0:
+                course_results["summary"]["can_approve"] = False
+
+        return results
+
+    @classmethod
+    def sweep_batch(
+        cls,
+        courses: Iterable[Union[CourseTAS, int]],
+        rule_types: Optional[List[str]] = None,
+    ) -> Dict[str, int]:
+        """
+        Incrementally check courses and all their units
+
+        Checks whose stored fingerprint matches the current entity
+        content and rule version are skipped and keep their status.
+
+        Args:
+            courses: CourseTAS instances or ids
+            rule_types: Only run rules of these types (default: all)
+
+        Returns:
+            Dict with checks run and skipped, and red/amber/green totals
+            over all checks of the batch
+        """
+        contexts = load_contexts(courses)
+        rules = cls._active_rules(
+            {context.course.tenant_id for context in contexts.values()}
+        )
+        planned = list(cls._plan(contexts, rules, True, rule_types))
+        previous = cls._stored_checks(planned)
+
+        totals = {"run": 0, "skipped": 0, "red": 0, "amber": 0, "green": 0}
+        outcomes: List[Outcome] = []
+        for entity_type, entity_id, entity, entity_hash, rule in planned:
+            stored = previous.get((entity_type, entity_id, rule.pk))
+            if stored and stored[0] == check_fingerprint(entity_hash, rule):
+                totals["skipped"] += 1
+                totals[stored[1]] += 1
+                continue
+
+            outcome = cls._outcome(entity_type, entity_id, entity, entity_hash, rule)
+            outcomes.append(outcome)
+            totals["run"] += 1
+            totals[outcome[3]["status"]] += 1
+
+        cls._save_checks(outcomes)
+        return totals
+
+    @classmethod
+    def _plan(
+        cls,
+        contexts: Dict[int, CourseContext],
+        rules: List[ComplianceRule],
+        include_units: bool,
+        rule_types: Optional[List[str]] = None,
+    ) -> Iterator[Tuple[str, int, object, str, ComplianceRule]]:
+        """(entity_type, entity_id, entity, entity hash, rule) of every check"""
+        unit_hashes: Dict[int, str] = {}
+        for course_id, context in contexts.items():
+            course_hash = entity_fingerprint("course", context)
+            for rule in cls._rules_for(rules, context.course.tenant_id):
+                if rule_types and rule.rule_type not in rule_types:
+                    continue
+                yield "course", course_id, context, course_hash, rule
+                if include_units and rule.rule_type in UNIT_RULE_TYPES:
+                    for unit in context.units:
+                        if unit.pk not in unit_hashes:
+                            unit_hashes[unit.pk] = entity_fingerprint("unit", unit)
+                        yield "unit", unit.pk, unit, unit_hashes[unit.pk], rule
+
+    @classmethod
+    def _outcome(
+        cls, entity_type: str, entity_id: int, entity, entity_hash: str, rule
+    ) -> Outcome:
+        if entity_type == "unit":
+            check_result = cls._execute_unit_rule(rule, entity)
+        else:
+            check_result = cls._execute_rule(rule, entity)
+        return (
+            entity_type,
+            entity_id,
+            rule,
+            check_result,
+            check_fingerprint(entity_hash, rule),
+        )
+
+    @staticmethod
+    def _stored_checks(planned) -> Dict[Tuple[str, int, int], Tuple[str, str]]:
+        """(entity_type, entity_id, rule id) -> (fingerprint, status), one query"""
+        ids = {"course": set(), "unit": set()}
+        rule_ids = set()
+        for entity_type, entity_id, _, _, rule in planned:
+            ids[entity_type].add(entity_id)
+            rule_ids.add(rule.pk)
+        if not rule_ids:
+            return {}
+
+        rows = ComplianceCheck.objects.filter(
+            Q(entity_type="course", entity_id__in=ids["course"])
+            | Q(entity_type="unit", entity_id__in=ids["unit"]),
+            rule_id__in=rule_ids,
+        ).values_list("entity_type", "entity_id", "rule_id", "fingerprint", "status")
+        return {
+            (entity_type, entity_id, rule_id): (fingerprint, status)
+            for entity_type, entity_id, rule_id, fingerprint, status in rows
+        }
+
+    @staticmethod
+    def _active_rules(tenant_ids: Iterable) -> List[ComplianceRule]:
+        """Active rules of the given tenants plus system rules, in one query"""
+        return list(
+            ComplianceRule.objects.filter(
+                Q(tenant_id__in=list(tenant_ids)) | Q(is_system_rule=True),
+                is_active=True,
+            )
+        )
+
+    @staticmethod
+    def _rules_for(rules: List[ComplianceRule], tenant_id) -> List[ComplianceRule]:
+        return [
+            rule for rule in rules if rule.tenant_id == tenant_id or rule.is_system_rule
+        ]
+
+    @staticmethod
+    def _save_checks(outcomes: List[Outcome]) -> List[ComplianceCheck]:
+        """Create or update one ComplianceCheck per outcome in a bulk upsert"""
+        checks = [
+            ComplianceCheck(
+                entity_type=entity_type,
+                entity_id=entity_id,
+                rule=rule,
+                status=check_result["status"],
+                message=check_result["message"],
+                details=check_result.get("details", {}),
+                fingerprint=fingerprint,
+            )
+            for entity_type, entity_id, rule, check_result, fingerprint in outcomes
+        ]
+        if not checks:
+            return checks
+
+        with transaction.atomic():
+            return ComplianceCheck.objects.bulk_create(
+                checks,
+                batch_size=UPSERT_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["entity_type", "entity_id", "rule"],
+                update_fields=[
+                    "status",
+                    "message",
+                    "details",
+                    "fingerprint",
+                    "checked_at",
+                ],
+            )
+
+    @staticmethod
+    def _empty_results(flag: str) -> Dict:
+        return {
             "red": [],
             "amber": [],
             "green": [],
@@ -104,53 +406,19 @@ class ComplianceRAGEngine:
                 "red_count": 0,
                 "amber_count": 0,
                 "green_count": 0,
-                "can_proceed": True,
+                flag: True,
             },
         }
 
-        # Unit-specific checks
-        unit_rules = ComplianceRule.objects.filter(
-            models_module.Q(tenant=unit_tas.course_tas.tenant)
-            | models_module.Q(is_system_rule=True),
-            is_active=True,
-            rule_type__in=["trainer_scope", "facility_adequacy", "assessment_coverage"],
-        )
-
-        with transaction.atomic():
-            for rule in unit_rules:
-                check_result = cls._execute_unit_rule(rule, unit_tas)
-
-                check, created = ComplianceCheck.objects.update_or_create(
-                    entity_type="unit",
-                    entity_id=unit_tas.id,
-                    rule=rule,
-                    defaults={
-                        "status": check_result["status"],
-                        "message": check_result["message"],
-                        "details": check_result.get("details", {}),
-                    },
-                )
-
-                results[check_result["status"]].append(
-                    {
-                        "rule_name": rule.name,
-                        "rule_type": rule.rule_type,
-                        "message": check_result["message"],
-                        "check_id": check.id,
-                    }
-                )
-                results["summary"]["total_checks"] += 1
-                results["summary"][f"{check_result['status']}_count"] += 1
-
-        if results["summary"]["red_count"] > 0:
-            results["summary"]["can_proceed"] = False
-
-        return results
+    @staticmethod
+    def _count(results: Dict, status: str):
+        results["summary"]["total_checks"] += 1
+        results["summary"][f"{status}_count"] += 1
 
     @classmethod
-    def _execute_rule(cls, rule: ComplianceRule, course_tas: CourseTAS) -> Dict:
+    def _execute_rule(cls, rule: ComplianceRule, context: CourseContext) -> Dict:
         """
-        Execute a compliance rule against a Course TAS
+        Execute a compliance rule against a loaded Course TAS
 
         Returns:
             Dict with status, message, and details
@@ -159,17 +427,17 @@ class ComplianceRAGEngine:
 
         # Route to appropriate check method
         if rule_type == "packaging":
-            return cls._check_packaging_rules(rule, course_tas)
+            return cls._check_packaging_rules(rule, context.course)
         elif rule_type == "trainer_scope":
-            return cls._check_course_trainer_scope(rule, course_tas)
+            return cls._check_course_trainer_scope(rule, context)
         elif rule_type == "facility_adequacy":
-            return cls._check_facility_adequacy(rule, course_tas)
+            return cls._check_facility_adequacy(rule, context)
         elif rule_type == "hours_validation":
-            return cls._check_hours_validation(rule, course_tas)
+            return cls._check_hours_validation(rule, context)
         elif rule_type == "clustering":
-            return cls._check_clustering_sanity(rule, course_tas)
+            return cls._check_clustering_sanity(rule, context.course)
         elif rule_type == "policy":
-            return cls._check_policy_compliance(rule, course_tas)
+            return cls._check_policy_compliance(rule, context.course)
         else:
             return {
                 "status": "amber",
@@ -247,18 +515,16 @@ class ComplianceRAGEngine:
 
     @classmethod
     def _check_course_trainer_scope(
-        cls, rule: ComplianceRule, course_tas: CourseTAS
+        cls, rule: ComplianceRule, context: CourseContext
     ) -> Dict:
         """
         Check if trainers are assigned and qualified for all units (ASQA 1.13-1.16)
         """
         issues = []
         warnings = []
+        today = datetime.date.today()
 
-        # Get all unit TAS
-        unit_tas_set = course_tas.unit_tas_set.all()
-
-        for unit_tas in unit_tas_set:
+        for unit_tas in context.units:
             trainers = unit_tas.trainers.all()
 
             if not trainers:
@@ -274,11 +540,7 @@ class ComplianceRAGEngine:
 
                     # Check currency
                     if trainer.last_currency_date:
-                        import datetime
-
-                        days_since_currency = (
-                            datetime.date.today() - trainer.last_currency_date
-                        ).days
+                        days_since_currency = (today - trainer.last_currency_date).days
                         if days_since_currency > 730:  # 2 years
                             warnings.append(
                                 f"{unit_tas.unit_code}: Trainer {trainer.user.username} "
@@ -333,10 +595,10 @@ class ComplianceRAGEngine:
 
     @classmethod
     def _check_facility_adequacy(
-        cls, rule: ComplianceRule, course_tas: CourseTAS
+        cls, rule: ComplianceRule, context: CourseContext
     ) -> Dict:
         """Check if facilities are adequate for delivery (ASQA 1.13)"""
-        if not course_tas.facilities.exists():
+        if not context.facilities:
             return {
                 "status": "amber",
                 "message": "No facilities assigned to course",
@@ -352,7 +614,7 @@ class ComplianceRAGEngine:
         cls, rule: ComplianceRule, unit_tas: UnitTAS
     ) -> Dict:
         """Check facility adequacy for a specific unit"""
-        if not unit_tas.facilities.exists():
+        if not unit_tas.facilities.all():
             return {
                 "status": "amber",
                 "message": f"No facilities assigned to {unit_tas.unit_code}",
@@ -365,14 +627,13 @@ class ComplianceRAGEngine:
 
     @classmethod
     def _check_hours_validation(
-        cls, rule: ComplianceRule, course_tas: CourseTAS
+        cls, rule: ComplianceRule, context: CourseContext
     ) -> Dict:
         """Validate total hours against units and delivery model"""
-        total_hours = course_tas.total_hours
+        total_hours = context.course.total_hours
 
         # Calculate expected hours from units
-        unit_tas_set = course_tas.unit_tas_set.all()
-        expected_hours = sum(unit.nominal_hours for unit in unit_tas_set)
+        expected_hours = sum(unit.nominal_hours for unit in context.units)
 
         if total_hours == 0:
             return {
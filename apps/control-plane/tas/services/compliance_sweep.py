@@ -0,0 +1,123 @@
+"""
+Tenant-wide Compliance Sweep
+Runs compliance across every Course TAS and Unit TAS of a tenant
+
+A sweep splits the tenant's courses into shards of SWEEP_SHARD_SIZE and
+queues one Celery task per shard. Each shard runs
+ComplianceRAGEngine.sweep_batch, which skips checks whose entity content
+and rule are unchanged, then adds its red/amber/green totals to the
+ComplianceSweep row. The last shard to finish completes the sweep.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from ..models import ComplianceSweep, CourseTAS
+from .compliance import ComplianceRAGEngine
+
+logger = logging.getLogger(__name__)
+
+# Courses per shard task
+SWEEP_SHARD_SIZE = getattr(settings, "TAS_COMPLIANCE_SWEEP_SHARD_SIZE", 50)
+
+
+def start_sweep(
+    tenant,
+    rule_types: Optional[List[str]] = None,
+    trigger: str = "manual",
+    user=None,
+) -> ComplianceSweep:
+    """
+    Start a compliance sweep of a tenant
+
+    Args:
+        tenant: Tenant instance
+        rule_types: Only re-check rules of these types (default: all)
+        trigger: 'manual' or 'rule_change'
+        user: Optional user starting the sweep
+
+    Returns:
+        The ComplianceSweep; its shards are queued once it is committed
+    """
+    from ..tasks import run_compliance_sweep_shard
+
+    course_ids = list(
+        CourseTAS.objects.filter(tenant=tenant)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    shards = [
+        course_ids[i : i + SWEEP_SHARD_SIZE]
+        for i in range(0, len(course_ids), SWEEP_SHARD_SIZE)
+    ]
+
+    with transaction.atomic():
+        sweep = ComplianceSweep.objects.create(
+            tenant=tenant,
+            trigger=trigger,
+            rule_types=rule_types or [],
+            total_courses=len(course_ids),
+            total_shards=len(shards),
+            started_by=user,
+            status="running" if shards else "completed",
+            completed_at=None if shards else timezone.now(),
+        )
+        for shard in shards:
+            transaction.on_commit(
+                lambda shard=shard: run_compliance_sweep_shard.delay(sweep.pk, shard)
+            )
+
+    logger.info(
+        f"Compliance sweep {sweep.pk} started for {tenant}: "
+        f"{len(course_ids)} courses in {len(shards)} shards"
+    )
+    return sweep
+
+
+def run_shard(sweep_id: int, course_ids: List[int]) -> Dict[str, int]:
+    """Check one shard of a sweep and add its totals to the sweep"""
+    sweep = ComplianceSweep.objects.get(pk=sweep_id)
+    totals = ComplianceRAGEngine.sweep_batch(course_ids, sweep.rule_types or None)
+    record_shard(sweep_id, totals)
+    return totals
+
+
+def record_shard(sweep_id: int, totals: Optional[Dict[str, int]] = None):
+    """
+    Add a finished shard to the sweep's running totals
+
+    Without totals the shard is counted as failed. Uses F() updates so
+    shards finishing concurrently do not overwrite each other.
+    """
+    if totals is None:
+        updates = {"failed_shards": F("failed_shards") + 1}
+    else:
+        updates = {
+            "completed_shards": F("completed_shards") + 1,
+            "checks_run": F("checks_run") + totals["run"],
+            "checks_skipped": F("checks_skipped") + totals["skipped"],
+            "red_count": F("red_count") + totals["red"],
+            "amber_count": F("amber_count") + totals["amber"],
+            "green_count": F("green_count") + totals["green"],
+        }
+    ComplianceSweep.objects.filter(pk=sweep_id).update(**updates)
+
+    # Only the update that sees every shard done changes the status
+    finished = ComplianceSweep.objects.filter(
+        pk=sweep_id,
+        status="running",
+        total_shards__lte=F("completed_shards") + F("failed_shards"),
+    ).update(
+        status=Case(
+            When(failed_shards__gt=0, then=Value("failed")),
+            default=Value("completed"),
+        ),
+        completed_at=timezone.now(),
+    )
+    if finished:
+        logger.info(f"Compliance sweep {sweep_id} finished")
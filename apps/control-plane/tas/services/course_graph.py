@@ -0,0 +1,165 @@
+"""
+Course TAS Graph Loader
+Loads a Course TAS with its units, trainers, facilities, engagements and
+assessment tasks in a fixed number of queries
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Optional, Tuple, Union
+
+from django.db.models import Prefetch
+
+from ..models import AssessmentTask, CourseTAS, Trainer, UnitTAS
+
+TASK_FIELDS = tuple(field.attname for field in AssessmentTask._meta.concrete_fields)
+
+
+@dataclass(frozen=True)
+class TrainerRecord:
+    name: str
+    email: str
+    qualifications: Any
+    tae_qualification: str
+    industry_experience_years: int
+    last_currency_date: Optional[date]
+
+
+@dataclass(frozen=True)
+class FacilityRecord:
+    name: str
+    facility_type: str
+    location: str
+    capacity: int
+    equipment: Any
+    software: Any
+
+
+@dataclass(frozen=True)
+class EngagementRecord:
+    id: int
+    employer_name: str
+    engagement_date: date
+    engagement_type: str
+    outcomes: Any
+    notes: str
+
+
+@dataclass(frozen=True)
+class UnitRecord:
+    unit_code: str
+    unit_title: str
+    unit_type: str
+    nominal_hours: int
+    tga_unit_snapshot: Any
+    cluster_assignment: str
+    delivery_sequence: Any
+    mapping_matrix: Any
+    resources: Any
+    cohort_context: str
+    industry_relevance: str
+    trainers: Tuple[TrainerRecord, ...]
+    facilities: Tuple[FacilityRecord, ...]
+    # Field values of each task, as AssessmentTask.objects.values() returns them
+    assessment_tasks: Tuple[Dict[str, Any], ...]
+
+
+@dataclass(frozen=True)
+class CourseGraph:
+    """Read-only view of a Course TAS shared by snapshot and export builders"""
+
+    course: CourseTAS
+    units: Tuple[UnitRecord, ...]
+    facilities: Tuple[FacilityRecord, ...]
+    industry_engagements: Tuple[EngagementRecord, ...]
+
+
+def load_course_graph(course_tas: Union[CourseTAS, int]) -> CourseGraph:
+    """
+    Load a Course TAS and everything the builders read from it
+
+    Seven queries regardless of the number of units, trainers or tasks:
+    course (with approver), course facilities, engagements, units, unit
+    trainers (with users), unit facilities and assessment tasks.
+    """
+    pk = course_tas.pk if isinstance(course_tas, CourseTAS) else course_tas
+
+    # Scoped to the current tenant when there is one (e.g. in export tasks)
+    course = (
+        CourseTAS.tenant_objects.select_related("approved_by")
+        .prefetch_related(
+            "facilities",
+            "industry_engagements",
+            Prefetch(
+                "unit_tas_set",
+                queryset=UnitTAS.objects.prefetch_related(
+                    Prefetch(
+                        "trainers", queryset=Trainer.objects.select_related("user")
+                    ),
+                    "facilities",
+                    "assessment_tasks",
+                ),
+            ),
+        )
+        .get(pk=pk)
+    )
+
+    return CourseGraph(
+        course=course,
+        units=tuple(_unit_record(unit) for unit in course.unit_tas_set.all()),
+        facilities=tuple(_facility_record(f) for f in course.facilities.all()),
+        industry_engagements=tuple(
+            EngagementRecord(
+                id=e.id,
+                employer_name=e.employer_name,
+                engagement_date=e.engagement_date,
+                engagement_type=e.engagement_type,
+                outcomes=e.outcomes,
+                notes=e.notes,
+            )
+            for e in course.industry_engagements.all()
+        ),
+    )
+
+
+def _unit_record(unit: UnitTAS) -> UnitRecord:
+    return UnitRecord(
+        unit_code=unit.unit_code,
+        unit_title=unit.unit_title,
+        unit_type=unit.unit_type,
+        nominal_hours=unit.nominal_hours,
+        tga_unit_snapshot=unit.tga_unit_snapshot,
+        cluster_assignment=unit.cluster_assignment,
+        delivery_sequence=unit.delivery_sequence,
+        mapping_matrix=unit.mapping_matrix,
+        resources=unit.resources,
+        cohort_context=unit.cohort_context,
+        industry_relevance=unit.industry_relevance,
+        trainers=tuple(
+            TrainerRecord(
+                name=t.user.get_full_name() or t.user.username,
+                email=t.user.email,
+                qualifications=t.qualifications,
+                tae_qualification=t.tae_qualification,
+                industry_experience_years=t.industry_experience_years,
+                last_currency_date=t.last_currency_date,
+            )
+            for t in unit.trainers.all()
+        ),
+        facilities=tuple(_facility_record(f) for f in unit.facilities.all()),
+        assessment_tasks=tuple(
+            {name: getattr(task, name) for name in TASK_FIELDS}
+            for task in unit.assessment_tasks.all()
+        ),
+    )
+
+
+def _facility_record(facility) -> FacilityRecord:
+    return FacilityRecord(
+        name=facility.name,
+        facility_type=facility.facility_type,
+        location=facility.location,
+        capacity=facility.capacity,
+        equipment=facility.equipment,
+        software=facility.software,
+    )
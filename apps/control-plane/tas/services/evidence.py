@@ -4,8 +4,10 @@ Assembles evidence packs and creates immutable snapshots for audit trail
 """
 
 from typing import Dict, List
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import transaction
 from django.utils import timezone
+import json
 import secrets
 from datetime import timedelta
 from ..models import (
@@ -15,6 +17,7 @@ from ..models import (
     EvidencePack,
     IndustryEngagement,
 )
+from .course_graph import load_course_graph
 
 
 class EvidenceSnapshotService:
@@ -65,6 +68,9 @@ class EvidenceSnapshotService:
         Returns:
             Dict with frozen state
         """
+        graph = load_course_graph(course_tas)
+        course_tas = graph.course
+
         # Course TAS data
         course_data = {
             "qualification_code": course_tas.qualification_code,
@@ -102,7 +108,7 @@ class EvidenceSnapshotService:
                 "type": f.facility_type,
                 "location": f.location,
             }
-            for f in course_tas.facilities.all()
+            for f in graph.facilities
         ]
 
         # Industry engagements
@@ -113,12 +119,12 @@ class EvidenceSnapshotService:
                 "type": e.engagement_type,
                 "outcomes": e.outcomes,
             }
-            for e in course_tas.industry_engagements.all()
+            for e in graph.industry_engagements
         ]
 
         # Unit TAS data
         unit_tas_data = []
-        for unit_tas in course_tas.unit_tas_set.all():
+        for unit_tas in graph.units:
             unit_data = {
                 "unit_code": unit_tas.unit_code,
                 "unit_title": unit_tas.unit_title,
@@ -127,23 +133,25 @@ class EvidenceSnapshotService:
                 "tga_unit_snapshot": unit_tas.tga_unit_snapshot,
                 "cluster_assignment": unit_tas.cluster_assignment,
                 "delivery_sequence": unit_tas.delivery_sequence,
-                "assessment_tasks": unit_tas.assessment_tasks,
+                "assessment_tasks": json.loads(
+                    json.dumps(unit_tas.assessment_tasks, cls=DjangoJSONEncoder)
+                ),
                 "mapping_matrix": unit_tas.mapping_matrix,
                 "resources": unit_tas.resources,
                 "cohort_context": unit_tas.cohort_context,
                 "industry_relevance": unit_tas.industry_relevance,
                 "trainers": [
                     {
-                        "name": t.user.get_full_name() or t.user.username,
+                        "name": t.name,
                         "qualifications": t.qualifications,
                         "tae_qualification": t.tae_qualification,
                         "industry_experience_years": t.industry_experience_years,
                     }
-                    for t in unit_tas.trainers.all()
+                    for t in unit_tas.trainers
                 ],
                 "facilities": [
                     {"name": f.name, "type": f.facility_type}
-                    for f in unit_tas.facilities.all()
+                    for f in unit_tas.facilities
                 ],
             }
             unit_tas_data.append(unit_data)
@@ -196,10 +204,12 @@ class EvidenceSnapshotService:
         Returns:
             EvidencePack instance
         """
+        graph = load_course_graph(course_tas)
+
         with transaction.atomic():
             # Gather evidence links
             industry_engagement_links = []
-            for engagement in course_tas.industry_engagements.all():
+            for engagement in graph.industry_engagements:
                 industry_engagement_links.append(
                     {
                         "id": engagement.id,
@@ -212,13 +222,12 @@ class EvidenceSnapshotService:
 
             # Gather trainer credentials
             trainer_credentials = []
-            for unit_tas in course_tas.unit_tas_set.all():
-                for trainer in unit_tas.trainers.all():
+            for unit_tas in graph.units:
+                for trainer in unit_tas.trainers:
                     trainer_credentials.append(
                         {
                             "unit_code": unit_tas.unit_code,
-                            "trainer": trainer.user.get_full_name()
-                            or trainer.user.username,
+                            "trainer": trainer.name,
                             "qualifications": trainer.qualifications,
                             "tae_qualification": trainer.tae_qualification,
                             "currency_date": (
@@ -231,7 +240,7 @@ class EvidenceSnapshotService:
 
             # Gather facility documentation
             facility_documentation = []
-            for facility in course_tas.facilities.all():
+            for facility in graph.facilities:
                 facility_documentation.append(
                     {
                         "facility": facility.name,
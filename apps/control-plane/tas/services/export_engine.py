@@ -0,0 +1,647 @@
+"""
+Course TAS Export Engine
+Renders a Course TAS to CSV, DOCX or PDF incrementally
+
+Every format is written block by block to a file object, so memory use
+does not grow with the number of units. DOCX is an Office Open XML
+package written with zipfile; PDF is a plain text layout using the
+standard Helvetica fonts. Neither needs a document library.
+
+Rendered DOCX/PDF files are kept in default storage under the Course TAS
+id and version, and discarded when the course, a unit or an assessment
+task changes. Formats in BACKGROUND_FORMATS are rendered by a Celery task.
+
+Usage:
+    for chunk in iter_csv(load_course_graph(course)):  # StreamingHttpResponse
+        ...
+    name = stored_export(course, "docx") or store_export(course, "docx")
+"""
+
+import csv
+import logging
+import re
+import textwrap
+import zipfile
+import zlib
+from dataclasses import dataclass
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Union
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from ..models import CourseTAS
+from .course_graph import CourseGraph, UnitRecord, load_course_graph
+
+logger = logging.getLogger(__name__)
+
+# Bytes a render keeps in memory before spilling to a temporary file
+SPOOL_MAX_SIZE = getattr(settings, "TAS_EXPORT_SPOOL_MAX_SIZE", 5 * 1024 * 1024)
+
+# Storage directory for rendered exports
+STORAGE_PREFIX = getattr(settings, "TAS_EXPORT_STORAGE_PREFIX", "tas_exports")
+
+# Formats rendered by a Celery task instead of in the request
+BACKGROUND_FORMATS = getattr(settings, "TAS_EXPORT_BACKGROUND_FORMATS", ("pdf",))
+
+# Seconds a queued render holds its lock
+RENDER_LOCK_TIMEOUT = getattr(settings, "TAS_EXPORT_RENDER_LOCK_TIMEOUT", 15 * 60)
+
+RENDER_LOCK_KEY = "tas:export:rendering:{pk}:{version}:{export_format}"
+
+# Format -> (content type, file extension)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "docx": (
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "docx",
+    ),
+    "pdf": ("application/pdf", "pdf"),
+}
+
+# Formats stored as files (CSV is cheap enough to stream on every request)
+STORED_FORMATS = ("docx", "pdf")
+
+CSV_HEADER = [
+    "Unit Code",
+    "Unit Title",
+    "Type",
+    "Nominal Hours",
+    "Cluster",
+    "Trainers",
+    "Facilities",
+]
+
+
+@dataclass(frozen=True)
+class Heading:
+    level: int
+    text: str
+
+
+@dataclass(frozen=True)
+class Paragraph:
+    text: str
+
+
+@dataclass(frozen=True)
+class Table:
+    header: Sequence[str]
+    rows: Iterable[Sequence[str]]
+
+
+Block = Union[Heading, Paragraph, Table]
+
+
+def unit_row(unit: UnitRecord) -> List:
+    """One unit mapping row (CSV and the document's unit table)"""
+    return [
+        unit.unit_code,
+        unit.unit_title,
+        unit.unit_type,
+        unit.nominal_hours,
+        unit.cluster_assignment,
+        ", ".join(t.name for t in unit.trainers),
+        ", ".join(f.name for f in unit.facilities),
+    ]
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(graph: CourseGraph) -> Iterator[str]:
+    """Yield the unit mapping CSV one line at a time"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for unit in graph.units:
+        yield writer.writerow(unit_row(unit))
+
+
+def document_blocks(graph: CourseGraph) -> Iterator[Block]:
+    """Yield the blocks of the DOCX/PDF document in reading order"""
+    course = graph.course
+
+    yield Heading(1, f"{course.qualification_code} {course.qualification_name}")
+    yield Paragraph(
+        f"Training and Assessment Strategy, version {course.version} "
+        f"({course.get_status_display()})"
+    )
+
+    yield Heading(2, "Course Overview")
+    yield Table(
+        ["Item", "Detail"],
+        [
+            ["AQF level", course.get_aqf_level_display()],
+            ["Training package", course.training_package],
+            ["Delivery model", course.delivery_model],
+            ["Total nominal hours", course.total_hours],
+            ["Duration (weeks)", course.duration_weeks],
+            ["Facilities", ", ".join(f.name for f in graph.facilities)],
+        ],
+    )
+    if course.cohort_profile:
+        yield Heading(3, "Cohort Profile")
+        yield Paragraph(course.cohort_profile)
+    if course.assessment_overview:
+        yield Heading(3, "Assessment Overview")
+        yield Paragraph(course.assessment_overview)
+
+    yield Heading(2, "Unit Mapping")
+    yield Table(CSV_HEADER, (unit_row(unit) for unit in graph.units))
+
+    for unit in graph.units:
+        yield Heading(2, f"{unit.unit_code} {unit.unit_title}")
+        yield Paragraph(
+            f"{unit.unit_type.title()} unit, {unit.nominal_hours} nominal hours"
+            + (
+                f", cluster {unit.cluster_assignment}"
+                if unit.cluster_assignment
+                else ""
+            )
+        )
+        if unit.cohort_context:
+            yield Paragraph(unit.cohort_context)
+        if unit.assessment_tasks:
+            yield Heading(3, "Assessment Tasks")
+            yield Table(
+                ["Task", "Name", "Type", "Description"],
+                (
+                    [
+                        task["task_number"],
+                        task["task_name"],
+                        task["task_type"],
+                        task["description"],
+                    ]
+                    for task in unit.assessment_tasks
+                ),
+            )
+        if unit.trainers:
+            yield Heading(3, "Trainers and Assessors")
+            yield Table(
+                ["Name", "TAE Qualification", "Industry Experience (years)"],
+                (
+                    [t.name, t.tae_qualification, t.industry_experience_years]
+                    for t in unit.trainers
+                ),
+            )
+
+    if graph.industry_engagements:
+        yield Heading(2, "Industry Engagement")
+        yield Table(
+            ["Date", "Employer", "Type", "Notes"],
+            (
+                [e.engagement_date, e.employer_name, e.engagement_type, e.notes]
+                for e in graph.industry_engagements
+            ),
+        )
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value)
+
+
+# Characters XML 1.0 does not allow
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+DOCX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+        "</Relationships>"
+    ),
+    "word/_rels/document.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        "</Relationships>"
+    ),
+    "word/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal">'
+        '<w:name w:val="Normal"/><w:rPr><w:sz w:val="20"/></w:rPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/>'
+        '<w:basedOn w:val="Normal"/><w:next w:val="Normal"/>'
+        '<w:pPr><w:spacing w:before="240" w:after="120"/><w:outlineLvl w:val="0"/></w:pPr>'
+        '<w:rPr><w:b/><w:sz w:val="36"/></w:rPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/>'
+        '<w:basedOn w:val="Normal"/><w:next w:val="Normal"/>'
+        '<w:pPr><w:spacing w:before="240" w:after="80"/><w:outlineLvl w:val="1"/></w:pPr>'
+        '<w:rPr><w:b/><w:sz w:val="28"/></w:rPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="Heading3"><w:name w:val="heading 3"/>'
+        '<w:basedOn w:val="Normal"/><w:next w:val="Normal"/>'
+        '<w:pPr><w:spacing w:before="160" w:after="60"/><w:outlineLvl w:val="2"/></w:pPr>'
+        '<w:rPr><w:b/><w:sz w:val="22"/></w:rPr></w:style>'
+        '<w:style w:type="table" w:styleId="TableGrid"><w:name w:val="Table Grid"/>'
+        "<w:tblPr><w:tblBorders>"
+        '<w:top w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+        '<w:left w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+        '<w:bottom w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+        '<w:right w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+        '<w:insideH w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+        '<w:insideV w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+        "</w:tblBorders></w:tblPr></w:style>"
+        "</w:styles>"
+    ),
+}
+
+
+class DocxWriter:
+    """Writes a WordprocessingML package, streaming the document body"""
+
+    # A4 with 2cm margins, in twentieths of a point
+    PAGE_WIDTH = 11906
+    PAGE_HEIGHT = 16838
+    MARGIN = 1134
+
+    def __init__(self, fileobj: BinaryIO):
+        self.package = zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED)
+        for name, content in DOCX_PARTS.items():
+            self.package.writestr(name, content)
+        self.body = self.package.open("word/document.xml", "w")
+        self._write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            "<w:body>"
+        )
+
+    def heading(self, level: int, text: str):
+        self._write(self._paragraph(text, style=f"Heading{level}"))
+
+    def paragraph(self, text: str):
+        self._write(self._paragraph(text))
+
+    def table(self, header: Sequence[str], rows: Iterable[Sequence]):
+        width = (self.PAGE_WIDTH - 2 * self.MARGIN) // len(header)
+        self._write(
+            '<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/>'
+            '<w:tblW w:w="0" w:type="auto"/></w:tblPr><w:tblGrid>'
+            + f'<w:gridCol w:w="{width}"/>' * len(header)
+            + "</w:tblGrid>"
+        )
+        self._write(self._row(header, width, bold=True))
+        for row in rows:
+            self._write(self._row(row, width))
+        # Keeps consecutive tables apart
+        self._write("</w:tbl><w:p/>")
+
+    def close(self):
+        self._write(
+            f'<w:sectPr><w:pgSz w:w="{self.PAGE_WIDTH}" w:h="{self.PAGE_HEIGHT}"/>'
+            f'<w:pgMar w:top="{self.MARGIN}" w:right="{self.MARGIN}" '
+            f'w:bottom="{self.MARGIN}" w:left="{self.MARGIN}" w:header="708" '
+            f'w:footer="708" w:gutter="0"/></w:sectPr></w:body></w:document>'
+        )
+        self.body.close()
+        self.package.close()
+
+    def _write(self, xml: str):
+        self.body.write(xml.encode("utf-8"))
+
+    def _row(self, cells: Sequence, width: int, bold: bool = False) -> str:
+        header = "<w:trPr><w:tblHeader/></w:trPr>" if bold else ""
+        return (
+            f"<w:tr>{header}"
+            + "".join(
+                f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/></w:tcPr>'
+                f"{self._paragraph(cell, bold=bold)}</w:tc>"
+                for cell in cells
+            )
+            + "</w:tr>"
+        )
+
+    @staticmethod
+    def _paragraph(text, style: Optional[str] = None, bold: bool = False) -> str:
+        properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+        run_properties = "<w:rPr><w:b/></w:rPr>" if bold else ""
+        lines = _XML_INVALID.sub("", _text(text)).split("\n")
+        runs = "<w:br/>".join(
+            f'<w:t xml:space="preserve">{escape(line)}</w:t>' for line in lines
+        )
+        return f"<w:p>{properties}<w:r>{run_properties}{runs}</w:r></w:p>"
+
+
+class PdfWriter:
+    """
+    Writes a text-only PDF one page at a time
+
+    Each page's content stream is written as soon as the page is full;
+    only object offsets are kept until the cross-reference table at the
+    end.
+    """
+
+    # A4 in points
+    PAGE_WIDTH = 595
+    PAGE_HEIGHT = 842
+    MARGIN = 50
+
+    FONT_SIZE = 9
+    HEADING_SIZES = {1: 16, 2: 13, 3: 11}
+    # Average Helvetica glyph width as a fraction of the font size
+    CHAR_WIDTH = 0.5
+    LEADING = 1.35
+
+    CATALOG_ID, PAGES_ID, REGULAR_FONT_ID, BOLD_FONT_ID = 1, 2, 3, 4
+
+    def __init__(self, fileobj: BinaryIO):
+        self.out = fileobj
+        self.position = 0
+        self.offsets = {}
+        self.page_ids: List[int] = []
+        self.next_id = self.BOLD_FONT_ID + 1
+        self.operations: List[str] = []
+        self.y = self.PAGE_HEIGHT - self.MARGIN
+        self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def text_width(self) -> int:
+        return self.PAGE_WIDTH - 2 * self.MARGIN
+
+    def heading(self, level: int, text: str):
+        size = self.HEADING_SIZES.get(level, self.FONT_SIZE)
+        lines = self._wrap(text, self.text_width, size)
+        # Keep a heading on the same page as the first line after it
+        self._space(size * 0.8 + size * self.LEADING * len(lines) + self._line_height())
+        self.y -= size * 0.8
+        for line in lines:
+            self._line(line, self.MARGIN, size, bold=True)
+
+    def paragraph(self, text: str):
+        for line in self._wrap(text, self.text_width, self.FONT_SIZE):
+            self._line(line, self.MARGIN, self.FONT_SIZE)
+        self.y -= self.FONT_SIZE * 0.5
+
+    def table(self, header: Sequence[str], rows: Iterable[Sequence]):
+        column_width = self.text_width / len(header)
+        self._row(header, column_width, bold=True)
+        for row in rows:
+            self._row(row, column_width)
+        self.y -= self.FONT_SIZE * 0.5
+
+    def close(self):
+        self._finish_page()
+
+        self._object(
+            self.REGULAR_FONT_ID,
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+            b"/Encoding /WinAnsiEncoding >>",
+        )
+        self._object(
+            self.BOLD_FONT_ID,
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold "
+            b"/Encoding /WinAnsiEncoding >>",
+        )
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+        self._object(
+            self.PAGES_ID,
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode(),
+        )
+        self._object(
+            self.CATALOG_ID, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>".encode()
+        )
+
+        xref_offset = self.position
+        size = self.next_id
+        entries = ["xref", f"0 {size}", "0000000000 65535 f "]
+        entries += [
+            f"{self.offsets[obj_id]:010d} 00000 n " for obj_id in range(1, size)
+        ]
+        self._emit(("\n".join(entries) + "\n").encode())
+        self._emit(
+            f"trailer\n<< /Size {size} /Root {self.CATALOG_ID} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n".encode()
+        )
+
+    def _row(self, cells: Sequence, column_width: float, bold: bool = False):
+        wrapped = [self._wrap(cell, column_width - 4, self.FONT_SIZE) for cell in cells]
+        height = max(len(lines) for lines in wrapped) * self._line_height()
+        self._space(height + 2)
+
+        top = self.y
+        for column, lines in enumerate(wrapped):
+            self.y = top
+            for line in lines:
+                self._line(
+                    line, self.MARGIN + column * column_width, self.FONT_SIZE, bold
+                )
+        self.y = top - height - 2
+
+        if bold:
+            rule = self.y + self.FONT_SIZE * 0.4
+            self.operations.append(
+                f"0.5 w {self.MARGIN} {rule:.1f} m "
+                f"{self.PAGE_WIDTH - self.MARGIN} {rule:.1f} l S"
+            )
+
+    def _line(self, text: str, x: float, size: int, bold: bool = False):
+        self._space(size * self.LEADING)
+        self.y -= size * self.LEADING
+        font = "F2" if bold else "F1"
+        self.operations.append(
+            f"BT /{font} {size} Tf {x:.1f} {self.y:.1f} Td ({self._escape(text)}) Tj ET"
+        )
+
+    def _line_height(self) -> float:
+        return self.FONT_SIZE * self.LEADING
+
+    def _space(self, height: float):
+        """Start a new page unless height fits above the bottom margin"""
+        if self.y - height < self.MARGIN and self.operations:
+            self._finish_page()
+
+    def _finish_page(self):
+        number = len(self.page_ids) + 1
+        self.operations.append(
+            f"BT /F1 8 Tf {self.PAGE_WIDTH / 2 - 12:.1f} {self.MARGIN / 2:.1f} Td "
+            f"(Page {number}) Tj ET"
+        )
+        stream = zlib.compress("\n".join(self.operations).encode("latin-1"))
+
+        content_id = self._object_id()
+        self._object(
+            content_id,
+            f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode()
+            + stream
+            + b"\nendstream",
+        )
+        page_id = self._object_id()
+        self._object(
+            page_id,
+            (
+                f"<< /Type /Page /Parent {self.PAGES_ID} 0 R "
+                f"/MediaBox [0 0 {self.PAGE_WIDTH} {self.PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 {self.REGULAR_FONT_ID} 0 R "
+                f"/F2 {self.BOLD_FONT_ID} 0 R >> >> /Contents {content_id} 0 R >>"
+            ).encode(),
+        )
+        self.page_ids.append(page_id)
+        self.operations = []
+        self.y = self.PAGE_HEIGHT - self.MARGIN
+
+    def _wrap(self, text, width: float, size: int) -> List[str]:
+        columns = max(int(width / (size * self.CHAR_WIDTH)), 1)
+        lines = []
+        for line in _text(text).splitlines() or [""]:
+            lines.extend(textwrap.wrap(line, columns) or [""])
+        return lines
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        # Helvetica's WinAnsiEncoding covers cp1252; other characters become "?"
+        text = text.encode("cp1252", "replace").decode("latin-1")
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    def _object_id(self) -> int:
+        self.next_id += 1
+        return self.next_id - 1
+
+    def _object(self, obj_id: int, body: bytes):
+        self.offsets[obj_id] = self.position
+        self._emit(f"{obj_id} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def _emit(self, data: bytes):
+        self.out.write(data)
+        self.position += len(data)
+
+
+WRITERS = {"docx": DocxWriter, "pdf": PdfWriter}
+
+
+def write_export(graph: CourseGraph, export_format: str, fileobj: BinaryIO):
+    """Render a loaded Course TAS graph to fileobj"""
+    if export_format == "csv":
+        for line in iter_csv(graph):
+            fileobj.write(line.encode("utf-8"))
+        return
+
+    writer = WRITERS[export_format](fileobj)
+    for block in document_blocks(graph):
+        if isinstance(block, Heading):
+            writer.heading(block.level, block.text)
+        elif isinstance(block, Paragraph):
+            writer.paragraph(block.text)
+        else:
+            writer.table(block.header, block.rows)
+    writer.close()
+
+
+def render_to_spool(
+    course_tas: Union[CourseGraph, CourseTAS, int], export_format: str
+) -> SpooledTemporaryFile:
+    """Render to a temporary file (in memory up to SPOOL_MAX_SIZE), rewound"""
+    if export_format not in FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    graph = (
+        course_tas
+        if isinstance(course_tas, CourseGraph)
+        else load_course_graph(course_tas)
+    )
+
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        write_export(graph, export_format, spool)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def export_name(pk: int, version: int, export_format: str) -> str:
+    """Storage name of a rendered export"""
+    extension = FORMATS[export_format][1]
+    return f"{STORAGE_PREFIX}/{pk}/v{version}/course_tas.{extension}"
+
+
+def export_filename(course_tas: CourseTAS, export_format: str) -> str:
+    """Download filename of an export"""
+    extension = FORMATS[export_format][1]
+    return f"{course_tas.qualification_code}-v{course_tas.version}.{extension}"
+
+
+def stored_export(course_tas: CourseTAS, export_format: str) -> Optional[str]:
+    """Storage name of the current rendered export, if there is one"""
+    name = export_name(course_tas.pk, course_tas.version, export_format)
+    return name if default_storage.exists(name) else None
+
+
+def store_export(
+    course_tas: Union[CourseTAS, int], export_format: str, locked: bool = False
+) -> Optional[str]:
+    """
+    Render a Course TAS and save the result to default storage
+
+    Writes go through the render lock of the version, so two renders never
+    replace the same file at once. Returns None if another render holds
+    the lock; pass locked=True when the caller already holds it.
+    """
+    graph = load_course_graph(course_tas)
+    course = graph.course
+    name = export_name(course.pk, course.version, export_format)
+    key = RENDER_LOCK_KEY.format(
+        pk=course.pk, version=course.version, export_format=export_format
+    )
+    if not locked and not cache.add(key, 1, RENDER_LOCK_TIMEOUT):
+        return None
+
+    try:
+        with render_to_spool(graph, export_format) as spool:
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            saved = default_storage.save(name, File(spool))
+    finally:
+        if not locked:
+            cache.delete(key)
+
+    logger.info(f"Rendered {export_format} export of Course TAS {course.pk}: {saved}")
+    return saved
+
+
+def discard_exports(pk: int, version: int):
+    """Delete the rendered exports of one Course TAS version"""
+    for export_format in STORED_FORMATS:
+        try:
+            default_storage.delete(export_name(pk, version, export_format))
+        except Exception as e:
+            logger.warning(f"Could not discard {export_format} export of {pk}: {e}")
+
+
+def queue_export(course_tas: CourseTAS, export_format: str) -> bool:
+    """
+    Queue a background render of a Course TAS export
+
+    Returns False if a render of the same version and format is already
+    queued or running.
+    """
+    from ..tasks import render_course_tas_export
+
+    key = RENDER_LOCK_KEY.format(
+        pk=course_tas.pk, version=course_tas.version, export_format=export_format
+    )
+    if not cache.add(key, 1, RENDER_LOCK_TIMEOUT):
+        return False
+    render_course_tas_export.delay(course_tas.pk, export_format, course_tas.version)
+    return True
+
+
+def release_render_lock(pk: int, version: int, export_format: str):
+    cache.delete(
+        RENDER_LOCK_KEY.format(pk=pk, version=version, export_format=export_format)
+    )
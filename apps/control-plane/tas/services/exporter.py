@@ -7,6 +7,8 @@ from typing import Dict, List, Optional
 from django.conf import settings
 import json
 from ..models import CourseTAS, UnitTAS
+from .course_graph import load_course_graph
+from .export_engine import iter_csv, render_to_spool
 
 
 class ExporterSyncService:
@@ -25,6 +27,9 @@ class ExporterSyncService:
         Returns:
             Dict with complete TAS data
         """
+        graph = load_course_graph(course_tas)
+        course_tas = graph.course
+
         export_data = {
             "course_tas": {
                 "qualification_code": course_tas.qualification_code,
@@ -48,7 +53,7 @@ class ExporterSyncService:
         }
 
         # Add Unit TAS
-        for unit_tas in course_tas.unit_tas_set.all():
+        for unit_tas in graph.units:
             unit_data = {
                 "unit_code": unit_tas.unit_code,
                 "unit_title": unit_tas.unit_title,
@@ -56,14 +61,10 @@ class ExporterSyncService:
                 "nominal_hours": unit_tas.nominal_hours,
                 "cluster_assignment": unit_tas.cluster_assignment,
                 "delivery_sequence": unit_tas.delivery_sequence,
-                "assessment_tasks": list(unit_tas.assessment_tasks.values()),
+                "assessment_tasks": [dict(task) for task in unit_tas.assessment_tasks],
                 "mapping_matrix": unit_tas.mapping_matrix,
                 "trainers": [
-                    {
-                        "name": t.user.get_full_name() or t.user.username,
-                        "email": t.user.email,
-                    }
-                    for t in unit_tas.trainers.all()
+                    {"name": t.name, "email": t.email} for t in unit_tas.trainers
                 ],
             }
             export_data["unit_tas"].append(unit_data)
@@ -79,50 +80,9 @@ class ExporterSyncService:
             course_tas: CourseTAS instance
 
         Returns:
-            CSV string
+            CSV string (use export_engine.iter_csv to stream it instead)
         """
-        import csv
-        from io import StringIO
-
-        output = StringIO()
-        writer = csv.writer(output)
-
-        # Header
-        writer.writerow(
-            [
-                "Unit Code",
-                "Unit Title",
-                "Type",
-                "Nominal Hours",
-                "Cluster",
-                "Trainers",
-                "Facilities",
-            ]
-        )
-
-        # Unit rows
-        for unit_tas in course_tas.unit_tas_set.all():
-            trainers = ", ".join(
-                [
-                    t.user.get_full_name() or t.user.username
-                    for t in unit_tas.trainers.all()
-                ]
-            )
-            facilities = ", ".join([f.name for f in unit_tas.facilities.all()])
-
-            writer.writerow(
-                [
-                    unit_tas.unit_code,
-                    unit_tas.unit_title,
-                    unit_tas.unit_type,
-                    unit_tas.nominal_hours,
-                    unit_tas.cluster_assignment,
-                    trainers,
-                    facilities,
-                ]
-            )
-
-        return output.getvalue()
+        return "".join(iter_csv(load_course_graph(course_tas)))
 
     @classmethod
     def export_to_docx(
@@ -136,16 +96,10 @@ class ExporterSyncService:
             template_path: Optional path to DOCX template
 
         Returns:
-            DOCX file bytes
+            DOCX file bytes (use export_engine.store_export for large documents)
         """
-        # TODO: Implement DOCX generation using python-docx or similar
-        # This is a placeholder implementation
-        from io import BytesIO
-
-        # Mock DOCX generation
-        output = BytesIO()
-        output.write(b"TAS Document - " + course_tas.qualification_code.encode())
-        return output.getvalue()
+        with render_to_spool(course_tas, "docx") as spool:
+            return spool.read()
 
     @classmethod
     def export_to_pdf(cls, course_tas: CourseTAS) -> bytes:
@@ -156,16 +110,10 @@ class ExporterSyncService:
             course_tas: CourseTAS instance
 
         Returns:
-            PDF file bytes
+            PDF file bytes (use export_engine.store_export for large documents)
         """
-        # TODO: Implement PDF generation using ReportLab or WeasyPrint
-        # This is a placeholder implementation
-        from io import BytesIO
-
-        output = BytesIO()
-        output.write(b"%PDF-1.4\n")
-        output.write(b"TAS Document\n")
-        return output.getvalue()
+        with render_to_spool(course_tas, "pdf") as spool:
+            return spool.read()
 
     @classmethod
     def sync_to_lms(cls, course_tas: CourseTAS, lms_type: str = "canvas") -> Dict:
@@ -182,26 +130,29 @@ class ExporterSyncService:
         # TODO: Implement LMS integration
         # This is a placeholder for the integration point
 
+        graph = load_course_graph(course_tas)
+        course_tas = graph.course
+
         payload = {
             "course_code": course_tas.qualification_code,
             "course_name": course_tas.qualification_name,
             "units": [],
         }
 
-        for unit_tas in course_tas.unit_tas_set.all():
+        for unit_tas in graph.units:
             unit_payload = {
                 "unit_code": unit_tas.unit_code,
                 "unit_name": unit_tas.unit_title,
                 "assessment_tasks": [],
             }
 
-            for task in unit_tas.assessment_tasks.all():
+            for task in unit_tas.assessment_tasks:
                 unit_payload["assessment_tasks"].append(
                     {
-                        "name": task.task_name,
-                        "type": task.task_type,
-                        "description": task.description,
-                        "instructions": task.instructions,
+                        "name": task["task_name"],
+                        "type": task["task_type"],
+                        "description": task["description"],
+                        "instructions": task["instructions"],
                     }
                 )
 
@@ -7,6 +7,10 @@ from django.db import transaction
 from django.utils import timezone
 from typing import Dict, List, Optional
 from ..models import CourseTAS, UnitTAS, ComplianceCheck
+from .export_engine import discard_exports
+
+# Unit TAS rows per INSERT when generating a course's units
+UNIT_BATCH_SIZE = 500
 
 
 class TASOrchestrator:
@@ -65,38 +69,31 @@ class TASOrchestrator:
         Returns:
             List of UnitTAS instances
         """
-        unit_tas_list = []
+        unit_tas_list = [
+            UnitTAS(
+                course_tas=course_tas,
+                unit_code=unit["code"],
+                unit_title=unit["title"],
+                unit_type=unit_type,
+                nominal_hours=unit.get("nominal_hours", 0),
+                tga_unit_snapshot=unit.get("tga_snapshot", {}),
+                status="draft",
+                version=1,
+                created_by=user,
+            )
+            for unit_type, units in (
+                ("core", course_tas.core_units),
+                ("elective", course_tas.elective_units),
+            )
+            for unit in units
+        ]
 
         with transaction.atomic():
-            # Generate for core units
-            for unit in course_tas.core_units:
-                unit_tas = UnitTAS.objects.create(
-                    course_tas=course_tas,
-                    unit_code=unit["code"],
-                    unit_title=unit["title"],
-                    unit_type="core",
-                    nominal_hours=unit.get("nominal_hours", 0),
-                    tga_unit_snapshot=unit.get("tga_snapshot", {}),
-                    status="draft",
-                    version=1,
-                    created_by=user,
-                )
-                unit_tas_list.append(unit_tas)
-
-            # Generate for elective units
-            for unit in course_tas.elective_units:
-                unit_tas = UnitTAS.objects.create(
-                    course_tas=course_tas,
-                    unit_code=unit["code"],
-                    unit_title=unit["title"],
-                    unit_type="elective",
-                    nominal_hours=unit.get("nominal_hours", 0),
-                    tga_unit_snapshot=unit.get("tga_snapshot", {}),
-                    status="draft",
-                    version=1,
-                    created_by=user,
-                )
-                unit_tas_list.append(unit_tas)
+            UnitTAS.objects.bulk_create(unit_tas_list, batch_size=UNIT_BATCH_SIZE)
+            # bulk_create sends no post_save, so drop rendered exports here
+            transaction.on_commit(
+                lambda: discard_exports(course_tas.pk, course_tas.version)
+            )
 
         return unit_tas_list
 
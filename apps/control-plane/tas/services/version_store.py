@@ -0,0 +1,378 @@
+"""
+Content-addressed, delta-compressed storage of TAS document versions
+
+Each section of a TAS document (every entry of ``sections`` and every
+top-level key of ``content``) is stored once in TASContentBlob, keyed by
+the SHA-256 of its canonical JSON. A TASVersion row keeps only the blob
+digests that changed since the previous stored version of the same
+document (same tenant and code). Every TAS_VERSION_KEYFRAME_INTERVAL
+versions, or when the previous row does not match, a row also keeps the
+full manifest of the previous version, so rebuilding a version reads at
+most that many rows.
+
+Documents are rebuilt on demand. Manifests and blob bodies never change
+once written, so both are kept in per-process LRU caches.
+
+Usage:
+    record_version(new_tas, previous_document, change_summary="...")
+    version_document(tas_version)            # {"sections": [...], "content": {...}}
+    compare_versions(tas, from_version=2, to_version=5)
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ..models import TAS, TASContentBlob, TASVersion
+
+# Versions between two full manifests
+KEYFRAME_INTERVAL = getattr(settings, "TAS_VERSION_KEYFRAME_INTERVAL", 20)
+
+# Version manifests and blob bodies kept in memory per process
+MANIFEST_CACHE_SIZE = getattr(settings, "TAS_VERSION_MANIFEST_CACHE_SIZE", 1024)
+BLOB_CACHE_SIZE = getattr(settings, "TAS_VERSION_BLOB_CACHE_SIZE", 4096)
+
+BLOB_BATCH_SIZE = 500
+
+# {"sections": [digest, ...], "content": {key: digest}}
+Manifest = Dict[str, Any]
+
+
+class LRUCache:
+    """Thread-safe mapping that drops its least recently used entries"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# TASVersion pk -> (previous manifest, manifest)
+_manifests = LRUCache(MANIFEST_CACHE_SIZE)
+
+# Blob digest -> canonical JSON
+_blobs = LRUCache(BLOB_CACHE_SIZE)
+
+
+def clear_caches():
+    _manifests.clear()
+    _blobs.clear()
+
+
+def canonical_json(body) -> str:
+    return json.dumps(
+        body, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":")
+    )
+
+
+def document_of(tas: TAS) -> Dict:
+    """The versioned parts of a TAS document"""
+    return {"sections": list(tas.sections or []), "content": dict(tas.content or {})}
+
+
+def build_manifest(document: Dict) -> Tuple[Manifest, Dict[str, str]]:
+    """Digest manifest of a document, and the canonical JSON of each digest"""
+    bodies: Dict[str, str] = {}
+
+    def add(body) -> str:
+        text = canonical_json(body)
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        bodies[digest] = text
+        return digest
+
+    manifest = {
+        "sections": [add(section) for section in document.get("sections") or []],
+        "content": {
+            key: add(value) for key, value in (document.get("content") or {}).items()
+        },
+    }
+    return manifest, bodies
+
+
+def manifest_digest(manifest: Manifest) -> str:
+    return hashlib.sha256(canonical_json(manifest).encode()).hexdigest()
+
+
+def make_delta(previous: Manifest, current: Manifest) -> Dict:
+    """Digests of ``current`` that differ from ``previous``"""
+    old_sections = previous["sections"]
+    delta = {
+        "sections": {
+            "length": len(current["sections"]),
+            "changed": {
+                str(i): digest
+                for i, digest in enumerate(current["sections"])
+                if i >= len(old_sections) or old_sections[i] != digest
+            },
+        },
+        "content": {
+            "changed": {
+                key: digest
+                for key, digest in current["content"].items()
+                if previous["content"].get(key) != digest
+            },
+            "removed": [
+                key for key in previous["content"] if key not in current["content"]
+            ],
+        },
+    }
+    # Key order only needs recording when applying the changes would not keep it
+    if list(apply_delta(previous, delta)["content"]) != list(current["content"]):
+        delta["content"]["order"] = list(current["content"])
+    return delta
+
+
+def apply_delta(previous: Manifest, delta: Dict) -> Manifest:
+    length = delta["sections"]["length"]
+    sections = previous["sections"][:length]
+    sections += [None] * (length - len(sections))
+    for i, digest in delta["sections"]["changed"].items():
+        sections[int(i)] = digest
+
+    removed = set(delta["content"]["removed"])
+    content = {k: d for k, d in previous["content"].items() if k not in removed}
+    content.update(delta["content"]["changed"])
+    if "order" in delta["content"]:
+        content = {key: content[key] for key in delta["content"]["order"]}
+
+    return {"sections": sections, "content": content}
+
+
+def store_blobs(bodies: Dict[str, str]):
+    """Save the blobs that are not stored yet"""
+    existing = set(
+        TASContentBlob.objects.filter(digest__in=list(bodies)).values_list(
+            "digest", flat=True
+        )
+    )
+    TASContentBlob.objects.bulk_create(
+        [
+            TASContentBlob(
+                digest=digest, body=json.loads(text), size=len(text.encode())
+            )
+            for digest, text in bodies.items()
+            if digest not in existing
+        ],
+        batch_size=BLOB_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    for digest, text in bodies.items():
+        _blobs.set(digest, text)
+
+
+def load_blobs(digests: Iterable[str]) -> Dict[str, str]:
+    """Canonical JSON of each digest, reading uncached ones in one query"""
+    texts = {}
+    missing = []
+    for digest in set(digests):
+        text = _blobs.get(digest)
+        if text is None:
+            missing.append(digest)
+        else:
+            texts[digest] = text
+
+    if missing:
+        for digest, body in TASContentBlob.objects.filter(
+            digest__in=missing
+        ).values_list("digest", "body"):
+            texts[digest] = canonical_json(body)
+            _blobs.set(digest, texts[digest])
+
+    lost = set(missing) - set(texts)
+    if lost:
+        raise ValueError(f"TAS content blobs missing: {sorted(lost)}")
+    return texts
+
+
+def assemble(manifest: Manifest) -> Dict:
+    """Rebuild a document from its manifest"""
+    texts = load_blobs([*manifest["sections"], *manifest["content"].values()])
+    return {
+        "sections": [json.loads(texts[digest]) for digest in manifest["sections"]],
+        "content": {
+            key: json.loads(texts[digest])
+            for key, digest in manifest["content"].items()
+        },
+    }
+
+
+def _chain(tas: TAS):
+    """Stored version rows of a document (every version of its tenant and code)"""
+    return TASVersion.objects.filter(
+        tas__tenant_id=tas.tenant_id, tas__code=tas.code
+    ).exclude(manifest_digest="")
+
+
+def record_version(tas: TAS, previous_document: Dict, **fields) -> TASVersion:
+    """
+    Create the TASVersion row of ``tas``, the new version of a document
+
+    previous_document is the document it was made from, as document_of()
+    returns it; fields are the other TASVersion fields (change_summary,
+    changed_sections, created_by, ...).
+    """
+    previous, previous_bodies = build_manifest(previous_document)
+    current, bodies = build_manifest(document_of(tas))
+    store_blobs({**previous_bodies, **bodies})
+
+    last = (
+        _chain(tas)
+        .filter(version_number__lt=tas.version)
+        .order_by("-version_number")
+        .only("delta", "manifest_digest")
+        .first()
+    )
+    keyframe = (
+        last is None
+        or last.manifest_digest != manifest_digest(previous)
+        or last.delta.get("depth", 0) + 1 >= KEYFRAME_INTERVAL
+    )
+
+    version = TASVersion.objects.create(
+        tas=tas,
+        version_number=tas.version,
+        delta={
+            **make_delta(previous, current),
+            "depth": 0 if keyframe else last.delta["depth"] + 1,
+        },
+        base_manifest=previous if keyframe else None,
+        manifest_digest=manifest_digest(current),
+        **fields,
+    )
+    _manifests.set(version.pk, (previous, current))
+    return version
+
+
+def version_manifests(version: TASVersion) -> Tuple[Manifest, Manifest]:
+    """Manifests of the document before and after a stored version"""
+    cached = _manifests.get(version.pk)
+    if cached is not None:
+        return cached
+    if not version.manifest_digest:
+        raise ValueError(f"TAS version {version.pk} predates delta storage")
+
+    # Walk back to the nearest keyframe (or cached version), then replay forwards
+    rows = (
+        _chain(version.tas)
+        .filter(version_number__lte=version.version_number)
+        .order_by("-version_number")
+        .values_list("pk", "base_manifest", "delta")
+    )
+    replay: List[Tuple[int, Dict]] = []
+    current = None
+    for pk, base_manifest, delta in rows.iterator(chunk_size=KEYFRAME_INTERVAL):
+        manifests = _manifests.get(pk)
+        if manifests is not None:
+            current = manifests[1]
+            break
+        replay.append((pk, delta))
+        if base_manifest is not None:
+            current = base_manifest
+            break
+    if current is None:
+        raise ValueError(f"TAS version {version.pk} has no keyframe")
+
+    for pk, delta in reversed(replay):
+        manifests = (current, apply_delta(current, delta))
+        _manifests.set(pk, manifests)
+        current = manifests[1]
+
+    if manifest_digest(current) != version.manifest_digest:
+        raise ValueError(f"TAS version {version.pk} failed its manifest check")
+    return manifests
+
+
+def version_document(version: TASVersion, before: bool = False) -> Dict:
+    """The document after (or before) a stored version"""
+    previous, current = version_manifests(version)
+    return assemble(previous if before else current)
+
+
+def manifest_at(tas: TAS, version_number: int) -> Manifest:
+    """Manifest of one version of a document"""
+    rows = {
+        row.version_number: row
+        for row in _chain(tas)
+        .select_related("tas")
+        .filter(version_number__in=[version_number, version_number + 1])
+    }
+    if version_number in rows:
+        return version_manifests(rows[version_number])[1]
+    if version_number + 1 in rows:
+        # A first version has no row of its own; its successor keeps it
+        return version_manifests(rows[version_number + 1])[0]
+    raise TASVersion.DoesNotExist(
+        f"Version {version_number} of {tas.code} is not in the version store"
+    )
+
+
+def compare_versions(tas: TAS, from_version: int, to_version: int) -> Dict:
+    """
+    What changed between two versions of a document
+
+    Worked out from the stored manifests; only the bodies of changed
+    sections are read, for their names.
+    """
+    old = manifest_at(tas, from_version)
+    new = manifest_at(tas, to_version)
+
+    changes = []
+    for i in range(max(len(old["sections"]), len(new["sections"]))):
+        if i >= len(old["sections"]):
+            changes.append((i, "added", new["sections"][i]))
+        elif i >= len(new["sections"]):
+            changes.append((i, "removed", old["sections"][i]))
+        elif old["sections"][i] != new["sections"][i]:
+            changes.append((i, "changed", new["sections"][i]))
+
+    texts = load_blobs(digest for _, _, digest in changes)
+    sections = []
+    for i, change, digest in changes:
+        body = json.loads(texts[digest])
+        sections.append(
+            {
+                "index": i,
+                "name": body.get("name") if isinstance(body, dict) else None,
+                "change": change,
+            }
+        )
+
+    return {
+        "from_version": from_version,
+        "to_version": to_version,
+        "sections": sections,
+        "unchanged_sections": min(len(old["sections"]), len(new["sections"]))
+        - sum(1 for _, change, _ in changes if change == "changed"),
+        "content": {
+            "added": [key for key in new["content"] if key not in old["content"]],
+            "removed": [key for key in old["content"] if key not in new["content"]],
+            "changed": [
+                key
+                for key, digest in new["content"].items()
+                if key in old["content"] and old["content"][key] != digest
+            ],
+        },
+    }
@@ -0,0 +1,82 @@
+"""
+Signal handlers for TAS models.
+"""
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import AssessmentTask, ComplianceRule, CourseTAS, UnitTAS
+from .services.export_engine import discard_exports
+
+
+@receiver(post_save, sender=CourseTAS)
+@receiver(post_delete, sender=CourseTAS)
+def course_tas_changed(sender, instance, **kwargs):
+    _on_commit_discard(instance.pk, instance.version)
+
+
+@receiver(post_save, sender=UnitTAS)
+@receiver(post_delete, sender=UnitTAS)
+def unit_tas_changed(sender, instance, **kwargs):
+    _discard_for_course(instance.course_tas_id)
+
+
+@receiver(post_save, sender=AssessmentTask)
+@receiver(post_delete, sender=AssessmentTask)
+def assessment_task_changed(sender, instance, **kwargs):
+    course_tas_id = (
+        UnitTAS.objects.filter(pk=instance.unit_tas_id)
+        .values_list("course_tas_id", flat=True)
+        .first()
+    )
+    _discard_for_course(course_tas_id)
+
+
+@receiver(m2m_changed, sender=CourseTAS.facilities.through)
+@receiver(m2m_changed, sender=CourseTAS.industry_engagements.through)
+def course_tas_links_changed(sender, instance, action, reverse, **kwargs):
+    if action.startswith("post_") and not reverse:
+        _on_commit_discard(instance.pk, instance.version)
+
+
+@receiver(m2m_changed, sender=UnitTAS.trainers.through)
+@receiver(m2m_changed, sender=UnitTAS.facilities.through)
+def unit_tas_links_changed(sender, instance, action, reverse, **kwargs):
+    if action.startswith("post_") and not reverse:
+        _discard_for_course(instance.course_tas_id)
+
+
+def _discard_for_course(course_tas_id):
+    version = (
+        CourseTAS.objects.filter(pk=course_tas_id)
+        .values_list("version", flat=True)
+        .first()
+    )
+    if version is not None:
+        _on_commit_discard(course_tas_id, version)
+
+
+def _on_commit_discard(pk, version):
+    """Drop rendered exports once the change is committed"""
+    transaction.on_commit(lambda: discard_exports(pk, version))
+
+
+@receiver(post_save, sender=ComplianceRule)
+def compliance_rule_saved(sender, instance, **kwargs):
+    """Re-check the rule's type across the tenants it applies to"""
+    from .tasks import start_compliance_sweep
+
+    rule_type = instance.rule_type
+    if instance.is_system_rule or instance.tenant_id is None:
+        tenant_ids = (
+            CourseTAS.objects.order_by().values_list("tenant_id", flat=True).distinct()
+        )
+    else:
+        tenant_ids = [instance.tenant_id]
+
+    def queue():
+        for tenant_id in tenant_ids:
+            start_compliance_sweep.delay(str(tenant_id), [rule_type], "rule_change")
+
+    transaction.on_commit(queue)
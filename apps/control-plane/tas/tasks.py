@@ -0,0 +1,69 @@
+from celery import shared_task
+import logging
+
+from .models import CourseTAS
+from .services.compliance_sweep import record_shard, run_shard, start_sweep
+from .services.export_engine import release_render_lock, store_export
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=2)
+def render_course_tas_export(self, course_tas_id, export_format, version):
+    """
+    Render a Course TAS export into storage.
+
+    Queued by export_engine.queue_export, which holds a lock per
+    (course_tas_id, version, export_format) until this task succeeds or
+    runs out of retries.
+    """
+    try:
+        name = store_export(course_tas_id, export_format, locked=True)
+    except CourseTAS.DoesNotExist:
+        logger.warning(f"Course TAS {course_tas_id} no longer exists")
+        release_render_lock(course_tas_id, version, export_format)
+        return None
+    except Exception as e:
+        logger.error(f"Error rendering {export_format} export of {course_tas_id}: {e}")
+        if self.request.retries < self.max_retries:
+            # Keep the lock so polls don't queue a second render meanwhile
+            raise self.retry(exc=e, countdown=30)
+        release_render_lock(course_tas_id, version, export_format)
+        raise
+    release_render_lock(course_tas_id, version, export_format)
+    return name
+
+
+@shared_task
+def start_compliance_sweep(tenant_id, rule_types=None, trigger="manual"):
+    """
+    Start a compliance sweep of one tenant.
+
+    Queued when a compliance rule changes, with that rule's type.
+    """
+    from tenants.models import Tenant
+
+    try:
+        tenant = Tenant.objects.get(pk=tenant_id)
+    except Tenant.DoesNotExist:
+        logger.warning(f"Tenant {tenant_id} no longer exists")
+        return None
+    return start_sweep(tenant, rule_types, trigger).pk
+
+
+@shared_task(bind=True, max_retries=2)
+def run_compliance_sweep_shard(self, sweep_id, course_ids):
+    """
+    Check one shard of a compliance sweep.
+
+    A shard that still fails after its retries is counted as failed so
+    the sweep can finish.
+    """
+    try:
+        return run_shard(sweep_id, course_ids)
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=30)
+        logger.error(f"Compliance sweep {sweep_id} shard failed: {e}")
+        record_shard(sweep_id)
+        return None
@@ -1,8 +1,62 @@
-from django.test import TestCase
+import hashlib
+import re
+import threading
+import time
+import zipfile
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+from xml.etree import ElementTree
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
-from django.db import IntegrityError
-from tenants.models import Tenant
-from .models import TAS, TASTemplate, TASVersion, TASGenerationLog
+from django.core.cache import cache
+from django.utils import timezone
+from django.db import IntegrityError, connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+from tenants.context import tenant_context
+from tenants.models import Tenant, TenantUser
+from control_plane.response_cache import data_version
+from .catalogue import load_catalogue
+from .models import (
+    TAS,
+    TASTemplate,
+    TASVersion,
+    TASContentBlob,
+    TASGenerationLog,
+    QualificationCache,
+    AssessmentTask,
+    ComplianceCheck,
+    ComplianceRule,
+    CourseTAS,
+    Facility,
+    IndustryEngagement,
+    Trainer,
+    UnitTAS,
+)
+from .services import (
+    AssessmentMapper,
+    ComplianceRAGEngine,
+    EvidenceSnapshotService,
+    ExporterSyncService,
+    TASOrchestrator,
+    load_course_graph,
+)
+from .services import compliance_sweep, version_store
+from .services.export_engine import (
+    RENDER_LOCK_KEY,
+    discard_exports,
+    iter_csv,
+    store_export,
+    stored_export,
+)
+from .tasks import render_course_tas_export
+from .tga_sync import TGASync
+from .views import ComplianceSweepView, CourseTASExportView, TASViewSet
 
 
 class TASTemplateModelTest(TestCase):
@@ -124,6 +178,173 @@ class TASVersionModelTest(TestCase):
         self.assertEqual(str(self.version), "BSB50120 - Version 1")
 
 
+class VersionStoreTest(TestCase):
+    def setUp(self):
+        version_store.clear_caches()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.tenant = Tenant.objects.create(
+            name="Test College",
+            slug="test-college",
+            domain="test.example.com",
+            contact_email="test@example.com",
+            contact_name="Test Contact",
+        )
+        self.tas = TAS.objects.create(
+            tenant=self.tenant,
+            title="BSB50120 - Diploma of Business",
+            code="BSB50120",
+            qualification_name="Diploma of Business",
+            aqf_level="diploma",
+            sections=[{"name": f"Section {i}", "body": "x" * 200} for i in range(6)],
+            content={"overview": "Overview", "assessment": {"methods": ["written"]}},
+            created_by=self.user,
+        )
+
+    def edit(self, tas, section=None, **content):
+        """Create the next version of ``tas`` with one section and some keys changed"""
+        previous = version_store.document_of(tas)
+        new_tas = tas.create_new_version(self.user)
+        if section is not None:
+            new_tas.sections = [dict(s) for s in new_tas.sections]
+            new_tas.sections[section]["body"] = f"v{new_tas.version}"
+        new_tas.content = {**new_tas.content, **content}
+        new_tas.save()
+        version_store.record_version(
+            new_tas, previous, change_summary="Edit", created_by=self.user
+        )
+        return new_tas
+
+    def test_versions_store_changed_sections_once(self):
+        documents = {1: version_store.document_of(self.tas)}
+        tas = self.tas
+        for i in range(4):
+            tas = self.edit(tas, section=i % 2, overview=f"Overview {tas.version + 1}")
+            documents[tas.version] = version_store.document_of(tas)
+
+        # Six sections and two keys at first, then one section and one key a version
+        self.assertEqual(TASContentBlob.objects.count(), 8 + 4 * 2)
+        rows = {row.version_number: row for row in TASVersion.objects.all()}
+        self.assertIsNotNone(rows[2].base_manifest)
+        self.assertIsNone(rows[3].base_manifest)
+        self.assertEqual(list(rows[4].delta["sections"]["changed"]), ["0"])
+        self.assertEqual(list(rows[4].delta["content"]["changed"]), ["overview"])
+
+        version_store.clear_caches()
+        for number, row in rows.items():
+            self.assertEqual(version_store.version_document(row), documents[number])
+            self.assertEqual(
+                version_store.version_document(row, before=True), documents[number - 1]
+            )
+
+    def test_rebuild_reads_back_to_keyframe_only(self):
+        tas = self.tas
+        with mock.patch.object(version_store, "KEYFRAME_INTERVAL", 3):
+            for i in range(7):
+                tas = self.edit(tas, section=i % 6)
+        keyframes = TASVersion.objects.exclude(base_manifest=None)
+        self.assertEqual(
+            sorted(keyframes.values_list("version_number", flat=True)), [2, 5, 8]
+        )
+
+        version_store.clear_caches()
+        latest = TASVersion.objects.select_related("tas").get(version_number=7)
+        with CaptureQueriesContext(connection) as queries:
+            document = version_store.version_document(latest)
+        # Version rows, then the blobs
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(document["sections"][5]["body"], "v7")
+
+        # Cached once rebuilt
+        with self.assertNumQueries(0):
+            version_store.version_document(latest)
+
+    def test_edit_outside_the_store_starts_a_keyframe(self):
+        tas = self.edit(self.tas, section=0)
+        tas.content = {"overview": "Edited in place"}
+        tas.save()
+        tas = self.edit(tas, section=1)
+
+        row = TASVersion.objects.select_related("tas").get(version_number=3)
+        self.assertIsNotNone(row.base_manifest)
+        version_store.clear_caches()
+        self.assertEqual(
+            version_store.version_document(row, before=True)["content"],
+            {"overview": "Edited in place"},
+        )
+
+    def test_compare_versions(self):
+        tas = self.edit(self.tas, section=2, overview="New overview")
+        tas = self.edit(tas, pathways="None")
+        version_store.clear_caches()
+
+        request = APIRequestFactory().get("/compare/", {"from": 1})
+        view = TASViewSet.as_view({"get": "compare_versions"})
+        response = view(request, tenant_slug="test-college", pk=tas.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["to_version"], 3)
+        self.assertEqual(
+            response.data["sections"],
+            [{"index": 2, "name": "Section 2", "change": "changed"}],
+        )
+        self.assertEqual(response.data["unchanged_sections"], 5)
+        self.assertEqual(
+            response.data["content"],
+            {"added": ["pathways"], "removed": [], "changed": ["overview"]},
+        )
+
+        response = view(
+            APIRequestFactory().get("/compare/", {"from": 9}),
+            tenant_slug="test-college",
+            pk=tas.pk,
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_versions_are_listed_in_fixed_number_of_queries(self):
+        view = TASViewSet.as_view({"get": "versions"})
+
+        def list_versions(tas):
+            request = APIRequestFactory().get("/versions/")
+            with CaptureQueriesContext(connection) as queries:
+                response = view(request, tenant_slug="test-college", pk=tas.pk)
+            self.assertEqual(response.status_code, 200)
+            return response.data, len(queries)
+
+        tas = self.edit(self.tas, section=0)
+        list_versions(tas)  # Caches the tenant
+        data, count = list_versions(tas)
+        self.assertEqual([row["version_count"] for row in data], [2, 2])
+
+        for i in range(4):
+            tas = self.edit(tas, section=i % 6)
+        tas.approved_by = self.user
+        tas.save()
+        data, more = list_versions(tas)
+
+        self.assertEqual(more, count)
+        self.assertEqual(len(data), 6)
+        self.assertEqual(data[0]["approved_by_details"]["username"], "testuser")
+        self.assertEqual(data[-1]["sections"], self.tas.sections)
+
+    def test_history_serializes_stored_and_legacy_versions(self):
+        TASVersion.objects.create(
+            tas=self.tas,
+            version_number=1,
+            change_summary="Initial version",
+            new_content={"overview": "Legacy"},
+        )
+        self.edit(self.tas, overview="Stored")
+
+        request = APIRequestFactory().get("/version_history/")
+        view = TASViewSet.as_view({"get": "version_history"})
+        response = view(request, tenant_slug="test-college", pk=self.tas.pk)
+
+        contents = {v["version_number"]: v for v in response.data}
+        self.assertEqual(contents[1]["new_content"], {"overview": "Legacy"})
+        self.assertEqual(contents[2]["previous_content"]["overview"], "Overview")
+        self.assertEqual(contents[2]["new_content"]["overview"], "Stored")
+
+
 class TASGenerationLogModelTest(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username="testuser", password="testpass")
@@ -154,3 +375,842 @@ class TASGenerationLogModelTest(TestCase):
     def test_log_creation(self):
         self.assertEqual(self.log.status, "completed")
         self.assertEqual(self.log.tokens_total, 5000)
+
+
+class QualificationSearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        QualificationCache.objects.all().delete()
+        load_catalogue(QualificationCache)
+        self.factory = APIRequestFactory()
+        self.view = TASViewSet.as_view({"get": "qualifications"})
+
+    def get(self, params=None, **headers):
+        request = self.factory.get("/qualifications/", params or {}, **headers)
+        return self.view(request, tenant_slug="test-college")
+
+    def codes(self, response):
+        return [qual["code"] for qual in response.data["results"]]
+
+    def test_search_matches_code_or_title(self):
+        self.assertIn("BSB50120", self.codes(self.get({"search": "bsb501"})))
+        self.assertIn("BSB50120", self.codes(self.get({"search": "diploma of bus"})))
+
+    def test_prefix_and_filters(self):
+        codes = self.codes(self.get({"prefix": "tae", "aqf_level": "certificate_iv"}))
+
+        self.assertTrue(codes)
+        self.assertTrue(all(code.startswith("TAE") for code in codes))
+
+    def test_results_are_cursor_paginated_in_code_order(self):
+        first = self.get({"page_size": 10})
+        self.assertEqual(len(first.data["results"]), 10)
+        self.assertEqual(self.codes(first), sorted(self.codes(first)))
+
+        cursor = parse_qs(urlparse(first.data["next"]).query)["cursor"][0]
+        second = self.get({"page_size": 10, "cursor": cursor})
+        self.assertGreater(self.codes(second)[0], self.codes(first)[-1])
+
+    def test_repeat_requests_are_served_from_cache(self):
+        first = self.get({"package": "BSB"})
+        with self.assertNumQueries(0):
+            second = self.get({"package": "BSB"})
+
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.get()["ETag"]
+
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIsNone(response.data)
+
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_catalogue_changes_invalidate_cached_pages(self):
+        self.get({"search": "BSB10120"})
+        version = data_version("tas.qualifications")
+
+        qualification = QualificationCache.objects.get(qualification_code="BSB10120")
+        qualification.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            qualification.save()
+
+        self.assertEqual(data_version("tas.qualifications"), version + 1)
+        self.assertEqual(self.codes(self.get({"search": "BSB10120"})), [])
+
+    @override_settings(ALLOWED_HOSTS=["first.example.com", "second.example.com"])
+    def test_cached_pages_link_to_the_requesting_route(self):
+        def get(slug, host):
+            request = self.factory.get(
+                f"/api/tenants/{slug}/tas/qualifications/",
+                {"page_size": 10},
+                HTTP_HOST=host,
+            )
+            return self.view(request, tenant_slug=slug)
+
+        first = get("first-college", "first.example.com")
+        with self.assertNumQueries(0):
+            second = get("second-college", "second.example.com")
+
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(second.data["results"], first.data["results"])
+        self.assertTrue(
+            second.data["next"].startswith(
+                "http://second.example.com/api/tenants/second-college/tas/qualifications/?"
+            )
+        )
+        self.assertEqual(
+            urlparse(second.data["next"]).query, urlparse(first.data["next"]).query
+        )
+
+
+def qualification_page(code, title, units):
+    rows = "".join(f"<tr><td>{unit}</td><td>Unit {unit}</td></tr>" for unit in units)
+    return (
+        f"<html><body><h1>{code} {title}</h1>"
+        f"<h2>Core Units</h2><table><tr><th>Code</th><th>Title</th></tr>{rows}</table>"
+        f"</body></html>"
+    ).encode()
+
+
+class FixtureTGAServer:
+    """Local stand-in for training.gov.au that honours If-None-Match"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with fixture.lock:
+                    fixture.requests += 1
+                    fixture.in_flight += 1
+                    fixture.max_in_flight = max(
+                        fixture.max_in_flight, fixture.in_flight
+                    )
+                try:
+                    time.sleep(0.01)
+                    code = self.path.rstrip("/").rsplit("/", 1)[-1]
+                    content = fixture.pages.get(code)
+                    if content is None:
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+                    etag = f'"{hashlib.md5(content).hexdigest()}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    self.send_response(200)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+                finally:
+                    with fixture.lock:
+                        fixture.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TGASyncTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.codes = [f"ICT4{n:04d}" for n in range(12)]
+        self.server = FixtureTGAServer(
+            {
+                code: qualification_page(code, "Certificate IV in IT", ["ICTICT418"])
+                for code in self.codes
+            }
+        )
+        self.addCleanup(self.server.close)
+
+    def sync(self, codes, **options):
+        options.setdefault("parse_workers", 0)
+        options.setdefault("min_request_interval", 0)
+        return TGASync(base_url=self.server.url, **options).sync(codes)
+
+    def test_first_sync_fetches_and_upserts(self):
+        stats = self.sync(self.codes)
+
+        self.assertEqual(stats.fetched, 12)
+        self.assertEqual(stats.upserted, 12)
+        qual = QualificationCache.objects.get(qualification_code="ICT40003")
+        self.assertEqual(qual.qualification_title, "Certificate IV in IT")
+        self.assertEqual(qual.training_package, "ICT")
+        self.assertEqual(qual.groupings[0]["units"][0]["code"], "ICTICT418")
+        self.assertTrue(qual.source_etag)
+
+    def test_unchanged_pages_are_skipped(self):
+        self.sync(self.codes)
+        self.server.pages["ICT40005"] = qualification_page(
+            "ICT40005", "Certificate IV in IT", ["ICTICT418", "ICTPRG430"]
+        )
+
+        stats = self.sync(self.codes)
+
+        self.assertEqual(stats.not_modified, 11)
+        self.assertEqual(stats.upserted, 1)
+        qual = QualificationCache.objects.get(qualification_code="ICT40005")
+        self.assertEqual(len(qual.groupings[0]["units"]), 2)
+
+    def test_missing_pages_are_counted(self):
+        stats = self.sync(["ICT40001", "XXX99999"])
+
+        self.assertEqual(stats.fetched, 1)
+        self.assertEqual(stats.missing, 1)
+        self.assertFalse(
+            QualificationCache.objects.filter(qualification_code="XXX99999").exists()
+        )
+
+    def test_per_host_concurrency_is_bounded(self):
+        self.sync(self.codes, workers=8, per_host_concurrency=2)
+
+        self.assertEqual(self.server.requests, 12)
+        self.assertLessEqual(self.server.max_in_flight, 2)
+
+    def test_pages_parse_in_process_pool(self):
+        stats = self.sync(self.codes[:3], parse_workers=2)
+
+        self.assertEqual(stats.upserted, 3)
+        self.assertEqual(QualificationCache.objects.count(), 3)
+
+
+class CourseGraphTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="approver", password="x")
+        self.tenant = Tenant.objects.create(
+            name="Graph College",
+            slug="graph-college",
+            domain="graph.example.com",
+            contact_email="graph@example.com",
+            contact_name="Graph Contact",
+        )
+        self.course = CourseTAS.objects.create(
+            tenant=self.tenant,
+            qualification_code="BSB50120",
+            qualification_name="Diploma of Business",
+            aqf_level="diploma",
+            approved_by=self.user,
+        )
+        room = Facility.objects.create(
+            tenant=self.tenant, name="Room 1", facility_type="classroom"
+        )
+        self.course.facilities.add(room)
+        self.course.industry_engagements.add(
+            IndustryEngagement.objects.create(
+                tenant=self.tenant,
+                engagement_type="consultation",
+                employer_name="Acme",
+                engagement_date=timezone.now().date(),
+                notes="Reviewed units",
+            )
+        )
+        self.add_units(3)
+
+    def add_units(self, count):
+        start = self.course.unit_tas_set.count()
+        for n in range(start, start + count):
+            unit = UnitTAS.objects.create(
+                course_tas=self.course,
+                unit_code=f"BSBOPS{500 + n}",
+                unit_title=f"Unit {n}",
+                unit_type="core",
+            )
+            trainer_user = User.objects.create_user(
+                username=f"trainer{n}", first_name="Trainer", last_name=str(n)
+            )
+            unit.trainers.add(
+                Trainer.objects.create(tenant=self.tenant, user=trainer_user)
+            )
+            unit.facilities.add(*self.course.facilities.all())
+            AssessmentTask.objects.create(
+                unit_tas=unit,
+                task_number=1,
+                task_name="Written questions",
+                task_type="knowledge",
+                description="Answer the questions",
+            )
+
+    def test_loads_graph_in_fixed_number_of_queries(self):
+        with self.assertNumQueries(7):
+            graph = load_course_graph(self.course)
+
+        self.assertEqual(len(graph.units), 3)
+        self.assertEqual(graph.units[0].trainers[0].name, "Trainer 0")
+        self.assertEqual(graph.units[0].facilities[0].name, "Room 1")
+        self.assertEqual(
+            graph.units[0].assessment_tasks[0]["task_name"], "Written questions"
+        )
+        self.assertEqual(graph.industry_engagements[0].employer_name, "Acme")
+
+        self.add_units(5)
+        with self.assertNumQueries(7):
+            self.assertEqual(len(load_course_graph(self.course.pk).units), 8)
+
+    def test_graph_is_scoped_to_current_tenant(self):
+        other = Tenant.objects.create(
+            name="Other College",
+            slug="other-college",
+            domain="other.example.com",
+            contact_email="other@example.com",
+            contact_name="Other Contact",
+        )
+        with tenant_context(self.tenant.pk):
+            self.assertEqual(len(load_course_graph(self.course.pk).units), 3)
+        with tenant_context(other.pk), self.assertRaises(CourseTAS.DoesNotExist):
+            load_course_graph(self.course.pk)
+
+    def test_exports_use_loaded_graph(self):
+        with self.assertNumQueries(7):
+            export = ExporterSyncService.export_to_json(self.course)
+        self.assertEqual(export["unit_tas"][0]["trainers"][0]["name"], "Trainer 0")
+        self.assertEqual(
+            export["unit_tas"][0]["assessment_tasks"][0]["task_type"], "knowledge"
+        )
+
+        with self.assertNumQueries(7):
+            csv = ExporterSyncService.export_to_csv(self.course)
+        self.assertIn("BSBOPS500,Unit 0,core,0,,Trainer 0,Room 1", csv)
+
+        with self.assertNumQueries(7):
+            result = ExporterSyncService.sync_to_lms(self.course)
+        self.assertEqual(len(result["payload"]["units"]), 3)
+
+    def test_snapshot_and_evidence_pack(self):
+        snapshot = EvidenceSnapshotService.create_snapshot(
+            self.course, "Initial Approval", self.user
+        )
+
+        self.assertTrue(snapshot.verify_integrity())
+        units = snapshot.snapshot_data["unit_tas"]
+        self.assertEqual(units[2]["trainers"][0]["name"], "Trainer 2")
+        self.assertEqual(units[0]["assessment_tasks"][0]["task_number"], 1)
+        self.assertEqual(
+            snapshot.snapshot_data["course_tas"]["approved_by"], "approver"
+        )
+
+        pack = EvidenceSnapshotService.create_evidence_pack(
+            self.course, snapshot, self.user
+        )
+        self.assertEqual(len(pack.trainer_credentials), 3)
+        self.assertEqual(pack.facility_documentation[0]["facility"], "Room 1")
+
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+)
+class CourseExportTest(TestCase):
+    add_units = CourseGraphTest.add_units
+
+    def setUp(self):
+        CourseGraphTest.setUp(self)
+        TenantUser.objects.create(tenant=self.tenant, user=self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def lock_key(self, export_format):
+        return RENDER_LOCK_KEY.format(
+            pk=self.course.pk, version=1, export_format=export_format
+        )
+
+    def get(self, export_format, user=True):
+        request = APIRequestFactory().get(f"/export/{export_format}/")
+        if user:
+            force_authenticate(request, user=self.user if user is True else user)
+        return CourseTASExportView.as_view()(
+            request,
+            tenant_slug="graph-college",
+            pk=self.course.pk,
+            export_format=export_format,
+        )
+
+    def test_csv_is_streamed_line_by_line(self):
+        lines = list(iter_csv(load_course_graph(self.course)))
+
+        self.assertEqual(len(lines), 4)
+        self.assertEqual("".join(lines), ExporterSyncService.export_to_csv(self.course))
+
+        response = self.get("csv")
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertIn('filename="BSB50120-v1.csv"', response["Content-Disposition"])
+        self.assertIn(b"BSBOPS502,Unit 2", b"".join(response.streaming_content))
+
+    def test_docx_is_a_word_package(self):
+        package = zipfile.ZipFile(
+            BytesIO(ExporterSyncService.export_to_docx(self.course))
+        )
+
+        self.assertIn("word/styles.xml", package.namelist())
+        document = ElementTree.fromstring(package.read("word/document.xml"))
+        text = [node.text for node in document.iter(f"{WORD_NS}t")]
+        self.assertIn("BSB50120 Diploma of Business", text)
+        self.assertIn("BSBOPS502 Unit 2", text)
+        self.assertIn("Written questions", text)
+        self.assertEqual(len(list(document.iter(f"{WORD_NS}tbl"))), 9)
+
+    def test_pdf_pages_and_cross_references(self):
+        self.add_units(40)
+        pdf = ExporterSyncService.export_to_pdf(self.course)
+
+        self.assertTrue(pdf.startswith(b"%PDF-1.4"))
+        self.assertTrue(pdf.endswith(b"%%EOF\n"))
+
+        xref = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+        self.assertTrue(pdf[xref:].startswith(b"xref"))
+        entries = re.findall(rb"(\d{10}) 00000 n ", pdf[xref:])
+        for obj_id, offset in enumerate(entries, start=1):
+            self.assertTrue(pdf[int(offset) :].startswith(b"%d 0 obj" % obj_id))
+
+        pages = int(re.search(rb"/Count (\d+)", pdf).group(1))
+        self.assertGreater(pages, 1)
+        text = b"".join(
+            zlib.decompress(stream)
+            for stream in re.findall(rb"stream\n(.*?)\nendstream", pdf, re.S)
+        )
+        self.assertIn(b"(BSBOPS542 Unit 42)", text)
+        self.assertIn(b"(Page %d)" % pages, text)
+
+    def test_docx_is_rendered_once_per_version(self):
+        response = self.get("docx")
+
+        self.assertIsInstance(response, FileResponse)
+        self.assertIn('filename="BSB50120-v1.docx"', response["Content-Disposition"])
+        self.assertEqual(
+            stored_export(self.course, "docx"),
+            f"tas_exports/{self.course.pk}/v1/course_tas.docx",
+        )
+        # The tenant membership check and the Course TAS
+        with self.assertNumQueries(2):
+            self.assertEqual(self.get("docx").status_code, 200)
+
+    def test_pdf_is_rendered_in_the_background(self):
+        with mock.patch("tas.tasks.render_course_tas_export.delay") as delay:
+            first = self.get("pdf")
+            second = self.get("pdf")
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(first["Retry-After"], "5")
+        self.assertEqual(second.status_code, 202)
+        delay.assert_called_once_with(self.course.pk, "pdf", 1)
+
+        render_course_tas_export(self.course.pk, "pdf", 1)
+        self.assertIsNone(cache.get(self.lock_key("pdf")))
+        response = self.get("pdf")
+        self.assertIsInstance(response, FileResponse)
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+
+    def test_render_keeps_its_lock_while_retrying(self):
+        key = self.lock_key("pdf")
+        cache.add(key, 1)
+        locked = []
+
+        def fail_once(*args, **kwargs):
+            locked.append(cache.get(key))
+            if len(locked) == 1:
+                raise OSError("storage unavailable")
+            return store_export(*args, **kwargs)
+
+        with mock.patch("tas.tasks.store_export", side_effect=fail_once):
+            render_course_tas_export.apply(args=(self.course.pk, "pdf", 1))
+
+        self.assertEqual(locked, [1, 1])
+        self.assertIsNone(cache.get(key))
+        self.assertIsNotNone(stored_export(self.course, "pdf"))
+
+    def test_render_releases_its_lock_after_the_last_retry(self):
+        cache.add(self.lock_key("pdf"), 1)
+
+        with mock.patch("tas.tasks.store_export", side_effect=OSError) as render:
+            result = render_course_tas_export.apply(args=(self.course.pk, "pdf", 1))
+
+        self.assertIsInstance(result.result, OSError)
+        self.assertEqual(render.call_count, 3)
+        self.assertIsNone(cache.get(self.lock_key("pdf")))
+
+    def test_docx_renders_do_not_overwrite_each_other(self):
+        discard_exports(self.course.pk, 1)
+        cache.add(self.lock_key("docx"), 1)
+
+        self.assertIsNone(store_export(self.course, "docx"))
+        response = self.get("docx")
+        self.assertIsInstance(response, FileResponse)
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"PK"))
+        self.assertIsNone(stored_export(self.course, "docx"))
+
+        cache.clear()
+        self.assertEqual(
+            store_export(self.course, "docx"),
+            f"tas_exports/{self.course.pk}/v1/course_tas.docx",
+        )
+        self.assertIsNone(cache.get(self.lock_key("docx")))
+
+    def test_changes_discard_rendered_exports(self):
+        store_export(self.course, "docx")
+        store_export(self.course, "pdf")
+
+        unit = self.course.unit_tas_set.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            AssessmentTask.objects.create(
+                unit_tas=unit, task_number=2, task_name="Project", task_type="project"
+            )
+        self.assertIsNone(stored_export(self.course, "docx"))
+        self.assertIsNone(stored_export(self.course, "pdf"))
+
+        store_export(self.course, "pdf")
+        with self.captureOnCommitCallbacks(execute=True):
+            unit.trainers.clear()
+        self.assertIsNone(stored_export(self.course, "pdf"))
+
+    def test_export_needs_a_tenant_member(self):
+        self.assertEqual(self.get("csv", user=None).status_code, 401)
+
+        outsider = User.objects.create_user(username="outsider", password="x")
+        self.assertEqual(self.get("csv", user=outsider).status_code, 403)
+
+    def test_unknown_format_is_rejected(self):
+        response = self.get("xlsx")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["formats"], ["csv", "docx", "pdf"])
+
+
+class ComplianceRunnerTest(TestCase):
+    setUp_course = CourseGraphTest.setUp
+    add_units = CourseGraphTest.add_units
+
+    def setUp(self):
+        self.setUp_course()
+        for rule_type, _ in ComplianceRule.RULE_TYPES:
+            ComplianceRule.objects.create(
+                rule_type=rule_type,
+                name=f"System {rule_type}",
+                description=rule_type,
+                severity="red",
+                is_system_rule=True,
+            )
+        ComplianceRule.objects.create(
+            tenant=self.tenant,
+            rule_type="policy",
+            name="College policies",
+            description="policy",
+            severity="amber",
+        )
+
+    def add_course(self, code):
+        course = CourseTAS.objects.create(
+            tenant=self.tenant,
+            qualification_code=code,
+            qualification_name=code,
+            aqf_level="diploma",
+        )
+        UnitTAS.objects.create(
+            course_tas=course, unit_code=f"{code}U", unit_title="Unit", unit_type="core"
+        )
+        return course
+
+    def test_results_are_upserted(self):
+        results = ComplianceRAGEngine.run_all_checks(self.course)
+
+        self.assertEqual(results["summary"]["total_checks"], 7)
+        # No trainer has the units in scope
+        trainer_check = next(
+            r for r in results["amber"] if r["rule_type"] == "trainer_scope"
+        )
+        self.assertEqual(len(trainer_check["details"]["warnings"]), 3)
+        self.assertEqual(ComplianceCheck.objects.count(), 7)
+
+        self.course.unit_tas_set.first().trainers.clear()
+        again = ComplianceRAGEngine.run_all_checks(self.course)
+
+        self.assertEqual(ComplianceCheck.objects.count(), 7)
+        self.assertFalse(again["summary"]["can_approve"])
+        red = next(r for r in again["red"] if r["rule_type"] == "trainer_scope")
+        self.assertEqual(red["check_id"], trainer_check["check_id"])
+        self.assertEqual(ComplianceCheck.objects.get(id=red["check_id"]).status, "red")
+
+    def test_batch_runs_in_fixed_number_of_queries(self):
+        courses = [self.course, self.add_course("BSB40120")]
+        with CaptureQueriesContext(connection) as small:
+            ComplianceRAGEngine.run_batch(courses, include_units=True)
+
+        courses += [self.add_course(f"BSB3{n}120") for n in range(5)]
+        with CaptureQueriesContext(connection) as large:
+            results = ComplianceRAGEngine.run_batch(courses, include_units=True)
+
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(len(results), 7)
+        # 7 course checks per course, 2 unit rule types per unit
+        self.assertEqual(
+            ComplianceCheck.objects.filter(entity_type="course").count(), 49
+        )
+        self.assertEqual(
+            ComplianceCheck.objects.filter(entity_type="unit").count(), 2 * (3 + 6)
+        )
+
+    def test_unit_checks(self):
+        unit = self.course.unit_tas_set.first()
+        results = ComplianceRAGEngine.run_unit_checks(unit)
+
+        self.assertEqual(results["summary"]["total_checks"], 2)
+        self.assertEqual(results["summary"]["amber_count"], 1)
+        self.assertTrue(results["summary"]["can_proceed"])
+        self.assertEqual(
+            ComplianceCheck.objects.filter(
+                entity_type="unit", entity_id=unit.pk
+            ).count(),
+            2,
+        )
+
+
+class ComplianceSweepTest(TestCase):
+    setUp_course = CourseGraphTest.setUp
+    add_units = CourseGraphTest.add_units
+    setUp = ComplianceRunnerTest.setUp
+    add_course = ComplianceRunnerTest.add_course
+
+    def test_unchanged_checks_are_skipped(self):
+        first = ComplianceRAGEngine.sweep_batch([self.course])
+        # 7 course checks, 2 unit rule types for each of 3 units
+        self.assertEqual(first["run"], 13)
+        self.assertEqual(first["skipped"], 0)
+
+        second = ComplianceRAGEngine.sweep_batch([self.course])
+        self.assertEqual(second["run"], 0)
+        self.assertEqual(second["skipped"], 13)
+        for status in ("red", "amber", "green"):
+            self.assertEqual(second[status], first[status])
+
+        # A unit change re-checks that unit and the course, not the other units
+        self.course.unit_tas_set.first().trainers.clear()
+        third = ComplianceRAGEngine.sweep_batch([self.course])
+        self.assertEqual(third["run"], 9)
+        self.assertEqual(third["red"], first["red"] + 2)
+
+    def test_rule_change_rechecks_only_that_rule(self):
+        ComplianceRAGEngine.sweep_batch([self.course])
+        rule = ComplianceRule.objects.get(tenant=self.tenant)
+        rule.description = "Updated"
+        rule.save()
+
+        totals = ComplianceRAGEngine.sweep_batch([self.course], ["policy"])
+        self.assertEqual(totals["run"], 1)
+        self.assertEqual(totals["skipped"], 1)
+
+    def test_sweep_shards_and_totals(self):
+        for n in range(4):
+            self.add_course(f"BSB3{n}120")
+
+        with mock.patch.object(compliance_sweep, "SWEEP_SHARD_SIZE", 2), mock.patch(
+            "tas.tasks.run_compliance_sweep_shard.delay",
+            side_effect=compliance_sweep.run_shard,
+        ) as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                sweep = compliance_sweep.start_sweep(self.tenant)
+
+        self.assertEqual(delay.call_count, 3)
+        sweep.refresh_from_db()
+        self.assertEqual(sweep.status, "completed")
+        self.assertEqual(sweep.total_courses, 5)
+        self.assertEqual(sweep.completed_shards, 3)
+        # 7 course checks per course, 2 unit rule types per unit
+        self.assertEqual(sweep.checks_run, 5 * 7 + 2 * (3 + 4))
+        self.assertEqual(
+            sweep.red_count + sweep.amber_count + sweep.green_count,
+            ComplianceCheck.objects.count(),
+        )
+
+    def test_rule_change_starts_sweep_of_its_type(self):
+        with mock.patch("tas.tasks.start_compliance_sweep.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                ComplianceRule.objects.create(
+                    tenant=self.tenant,
+                    rule_type="hours_validation",
+                    name="Hours",
+                    description="hours",
+                    severity="amber",
+                )
+
+        delay.assert_called_once_with(
+            str(self.tenant.pk), ["hours_validation"], "rule_change"
+        )
+
+    def test_start_and_poll_sweep(self):
+        TenantUser.objects.create(tenant=self.tenant, user=self.user)
+        view = ComplianceSweepView.as_view()
+        request = APIRequestFactory().post(
+            "/compliance-sweeps/", {"rule_types": ["policy"]}, format="json"
+        )
+        force_authenticate(request, user=self.user)
+        with mock.patch("tas.tasks.run_compliance_sweep_shard.delay"):
+            response = view(request, tenant_slug="graph-college")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["rule_types"], ["policy"])
+        self.assertEqual(response.data["total_shards"], 1)
+
+        request = APIRequestFactory().get("/compliance-sweeps/")
+        force_authenticate(request, user=self.user)
+        response = view(request, tenant_slug="graph-college", pk=response.data["id"])
+        self.assertEqual(response.data["status"], "running")
+        self.assertEqual(response.data["progress_percent"], 0.0)
+
+    def test_sweeps_need_a_tenant_member(self):
+        view = ComplianceSweepView.as_view()
+        request = APIRequestFactory().post("/compliance-sweeps/", {}, format="json")
+        with mock.patch("tas.tasks.run_compliance_sweep_shard.delay") as delay:
+            self.assertEqual(
+                view(request, tenant_slug="graph-college").status_code, 401
+            )
+
+            force_authenticate(request, user=self.user)
+            self.assertEqual(
+                view(request, tenant_slug="graph-college").status_code, 403
+            )
+        delay.assert_not_called()
+
+
+class AssessmentMappingTest(TestCase):
+    setUp_course = CourseGraphTest.setUp
+    add_units = CourseGraphTest.add_units
+
+    SNAPSHOT = {
+        "elements": [
+            {"code": "1", "title": "Plan"},
+            {"code": "2", "title": "Do"},
+            {"code": "3", "title": "Review"},
+        ],
+        "performance_criteria": [
+            {"code": "1.1", "description": "Plan work"},
+            {"code": "1.2", "description": "Confirm plan"},
+            {"code": "2.1", "description": "Do work"},
+            {"code": "3.1", "description": "Review work"},
+        ],
+        "knowledge_evidence": [
+            {"id": 1, "description": "Legislation"},
+            {"id": 2, "description": "Procedures"},
+        ],
+        "foundation_skills": [{"id": 1, "skill": "Reading", "description": "Text"}],
+    }
+
+    def setUp(self):
+        self.setUp_course()
+        self.unit = self.course.unit_tas_set.get(unit_code="BSBOPS500")
+        self.unit.tga_unit_snapshot = self.SNAPSHOT
+        self.unit.save()
+        AssessmentTask.objects.filter(unit_tas=self.unit).update(
+            elements_covered=["1", "2", "2"],
+            performance_criteria_covered=["1.1", "2.1"],
+            knowledge_evidence_covered=[1],
+        )
+        AssessmentTask.objects.create(
+            unit_tas=self.unit,
+            task_number=2,
+            task_name="Project",
+            task_type="project",
+            elements_covered=["2"],
+            performance_criteria_covered=["1.2", "2.1"],
+            foundation_skills_covered=[1],
+        )
+
+    def test_matrix_maps_criteria_to_tasks(self):
+        matrix = AssessmentMapper.create_mapping_matrix(self.unit)
+
+        self.assertEqual(
+            [len(e["covered_by_tasks"]) for e in matrix["elements"]], [1, 2, 0]
+        )
+        self.assertEqual(
+            matrix["elements"][1]["covered_by_tasks"][1],
+            {"task_number": 2, "task_name": "Project", "task_type": "project"},
+        )
+        self.assertEqual(
+            [
+                [t["task_number"] for t in pc["covered_by_tasks"]]
+                for pc in matrix["performance_criteria"]
+            ],
+            [[1], [2], [1, 2], []],
+        )
+        self.assertEqual(
+            matrix["knowledge_evidence"][0],
+            {
+                "description": "Legislation",
+                "covered_by_tasks": [
+                    {"task_number": 1, "task_name": "Written questions"}
+                ],
+            },
+        )
+        self.assertEqual(
+            matrix["coverage_summary"],
+            {
+                "elements_covered": 2,
+                "elements_total": 3,
+                "pc_covered": 3,
+                "pc_total": 4,
+                "ke_covered": 1,
+                "ke_total": 2,
+                "fs_covered": 1,
+                "fs_total": 1,
+                "elements_coverage_percent": 66.7,
+                "pc_coverage_percent": 75.0,
+            },
+        )
+
+    def test_matrices_for_every_unit_in_two_queries(self):
+        self.add_units(5)
+        with self.assertNumQueries(2):
+            matrices = AssessmentMapper.create_mapping_matrices(self.course)
+
+        self.assertEqual(len(matrices), 8)
+        by_code = {m["unit_code"]: m for m in matrices}
+        self.assertEqual(by_code["BSBOPS500"]["coverage_summary"]["pc_covered"], 3)
+
+        AssessmentMapper.create_mapping_matrices(self.course, save=True)
+        self.unit.refresh_from_db()
+        self.assertEqual(self.unit.mapping_matrix, by_code["BSBOPS500"])
+
+    def test_unit_tas_set_is_bulk_created(self):
+        course = CourseTAS.objects.create(
+            tenant=self.tenant,
+            qualification_code="BSB40120",
+            qualification_name="Certificate IV in Business",
+            aqf_level="certificate_iv",
+            core_units=[
+                {"code": f"BSBCORE{n}", "title": f"Core {n}", "nominal_hours": 40}
+                for n in range(3)
+            ],
+            elective_units=[{"code": "BSBELEC1", "title": "Elective"}],
+        )
+
+        units = TASOrchestrator.generate_unit_tas_set(course, self.user)
+
+        self.assertEqual([u.unit_type for u in units], ["core"] * 3 + ["elective"])
+        self.assertTrue(all(u.pk for u in units))
+        self.assertEqual(course.unit_tas_set.count(), 4)
+        self.assertEqual(
+            course.unit_tas_set.get(unit_code="BSBCORE0").nominal_hours, 40
+        )
@@ -16,14 +16,13 @@ class TrainingGovAuScraper:
     """Scraper for training.gov.au to fetch qualification and unit data"""
 
     BASE_URL = "https://training.gov.au"
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    }
 
     def __init__(self):
         self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            }
-        )
+        self.session.headers.update(self.HEADERS)
 
     def fetch_qualification_units(self, qualification_code: str) -> Optional[Dict]:
         """
@@ -37,13 +36,34 @@ class TrainingGovAuScraper:
         """
         try:
             # Construct the URL for the qualification page
-            url = f"{self.BASE_URL}/Training/Details/{qualification_code}"
+            url = self.qualification_url(qualification_code)
             logger.info(f"🔍 Fetching qualification data from: {url}")
 
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.content, "lxml")
+        except requests.RequestException as e:
+            logger.error(f"❌ Network error fetching {qualification_code}: {str(e)}")
+            return None
+
+        return self.parse_qualification_page(qualification_code, response.content)
+
+    def qualification_url(self, qualification_code: str) -> str:
+        """URL of a qualification's details page"""
+        return f"{self.BASE_URL}/Training/Details/{qualification_code}"
+
+    def parse_qualification_page(
+        self, qualification_code: str, content: bytes
+    ) -> Optional[Dict]:
+        """
+        Parse a qualification details page
+
+        Returns:
+            Dictionary with qualification details and units, or None if the
+            page has no title or units
+        """
+        try:
+            soup = BeautifulSoup(content, "lxml")
 
             # Extract qualification title
             title_elem = soup.find("h1")
@@ -88,9 +108,6 @@ class TrainingGovAuScraper:
             )
             return result
 
-        except requests.RequestException as e:
-            logger.error(f"❌ Network error fetching {qualification_code}: {str(e)}")
-            return None
         except Exception as e:
             logger.error(f"❌ Error parsing {qualification_code}: {str(e)}")
             import traceback
@@ -300,3 +317,15 @@ class TrainingGovAuScraper:
             logger.warning(f"Error finding unit codes: {e}")
 
         return units
+
+
+# Parser reused by each worker process of a parse pool
+_page_parser = None
+
+
+def parse_qualification_page(qualification_code: str, content: bytes) -> Optional[Dict]:
+    """Parse a qualification page (module-level so process pools can call it)"""
+    global _page_parser
+    if _page_parser is None:
+        _page_parser = TrainingGovAuScraper()
+    return _page_parser.parse_qualification_page(qualification_code, content)
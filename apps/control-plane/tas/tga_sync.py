@@ -0,0 +1,320 @@
+"""
+Concurrent, incremental sync of qualification pages from training.gov.au
+
+Pages are fetched by a bounded thread pool (one requests.Session per
+thread) with a per-host cap on concurrent requests and a minimum gap
+between requests to the same host. Each request carries the ETag and
+Last-Modified validators saved by the previous sync, so unchanged pages
+come back as 304 and are skipped. Changed pages are parsed in a process
+pool and bulk-upserted into QualificationCache.
+
+Usage:
+    stats = TGASync().sync()              # every active cached qualification
+    stats = TGASync().sync(["ICT40120"])  # specific codes
+"""
+
+import logging
+import re
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+
+from control_plane.response_cache import invalidate
+from tenants.context import ContextThreadPoolExecutor
+
+from .models import QualificationCache
+from .tga_scraper import TrainingGovAuScraper, parse_qualification_page
+
+logger = logging.getLogger(__name__)
+
+# Concurrent page fetches
+SYNC_WORKERS = getattr(settings, "TGA_SYNC_WORKERS", 16)
+
+# Concurrent requests to any one host
+PER_HOST_CONCURRENCY = getattr(settings, "TGA_SYNC_PER_HOST_CONCURRENCY", 8)
+
+# Seconds between the starts of two requests to the same host
+MIN_REQUEST_INTERVAL = getattr(settings, "TGA_SYNC_MIN_REQUEST_INTERVAL", 0.05)
+
+# Parser processes (None: one per CPU, 0: parse in this process)
+PARSE_WORKERS = getattr(settings, "TGA_SYNC_PARSE_WORKERS", None)
+
+REQUEST_TIMEOUT = 10
+MAX_RETRIES = 2
+UPSERT_BATCH_SIZE = 200
+
+SYNCED_FIELDS = [
+    "qualification_title",
+    "training_package",
+    "packaging_rules",
+    "has_groupings",
+    "groupings",
+    "source",
+    "source_etag",
+    "source_last_modified",
+    "is_active",
+    "last_updated",
+]
+
+
+@dataclass
+class FetchResult:
+    code: str
+    status: str  # fetched, not_modified, missing or failed
+    content: bytes = b""
+    etag: str = ""
+    last_modified: str = ""
+    error: str = ""
+
+
+@dataclass
+class SyncStats:
+    requested: int = 0
+    fetched: int = 0
+    not_modified: int = 0
+    missing: int = 0
+    failed: int = 0
+    unparsable: int = 0
+    upserted: int = 0
+    seconds: float = 0.0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+class HostThrottle:
+    """Caps concurrent requests and request rate per host"""
+
+    def __init__(self, concurrency: int, min_interval: float):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def acquire(self, host: str):
+        with self._lock:
+            slots = self._slots.setdefault(
+                host, threading.BoundedSemaphore(self.concurrency)
+            )
+        slots.acquire()
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host: str):
+        self._slots[host].release()
+
+
+class TGASync:
+    """Fetches, parses and stores qualification pages"""
+
+    def __init__(
+        self,
+        base_url: str = TrainingGovAuScraper.BASE_URL,
+        workers: int = SYNC_WORKERS,
+        per_host_concurrency: int = PER_HOST_CONCURRENCY,
+        min_request_interval: float = MIN_REQUEST_INTERVAL,
+        parse_workers: Optional[int] = PARSE_WORKERS,
+        source: str = "training.gov.au",
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.workers = workers
+        self.parse_workers = parse_workers
+        self.source = source
+        self.throttle = HostThrottle(per_host_concurrency, min_request_interval)
+        self._local = threading.local()
+
+    def sync(self, codes: Optional[Iterable[str]] = None) -> SyncStats:
+        """Sync the given qualification codes (default: all active cached ones)"""
+        started = time.perf_counter()
+
+        if codes is None:
+            codes = QualificationCache.objects.filter(is_active=True).values_list(
+                "qualification_code", flat=True
+            )
+        codes = list(dict.fromkeys(codes))
+
+        validators = {
+            code: (etag, last_modified)
+            for code, etag, last_modified in QualificationCache.objects.filter(
+                qualification_code__in=codes
+            ).values_list("qualification_code", "source_etag", "source_last_modified")
+        }
+
+        stats = SyncStats(requested=len(codes))
+        rows: List[QualificationCache] = []
+
+        parse_pool = (
+            ProcessPoolExecutor(self.parse_workers) if self.parse_workers != 0 else None
+        )
+        try:
+            with ContextThreadPoolExecutor(self.workers) as fetch_pool:
+                pending = {
+                    fetch_pool.submit(self.fetch, code, *validators.get(code, ("", "")))
+                    for code in codes
+                }
+                parsing: Dict[Future, FetchResult] = {}
+
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        if result.status != "fetched":
+                            self._count(stats, result)
+                        elif parse_pool is None:
+                            parsed = parse_qualification_page(
+                                result.code, result.content
+                            )
+                            self._collect(stats, rows, result, parsed)
+                        else:
+                            parse_future = parse_pool.submit(
+                                parse_qualification_page, result.code, result.content
+                            )
+                            parsing[parse_future] = result
+
+                    # Store parsed pages while fetches are still running
+                    for parse_future in [f for f in parsing if f.done()]:
+                        result = parsing.pop(parse_future)
+                        self._collect(stats, rows, result, parse_future.result())
+
+                    if len(rows) >= UPSERT_BATCH_SIZE:
+                        stats.upserted += self._upsert(rows)
+                        rows = []
+
+                for parse_future, result in parsing.items():
+                    self._collect(stats, rows, result, parse_future.result())
+        finally:
+            if parse_pool is not None:
+                parse_pool.shutdown()
+
+        stats.upserted += self._upsert(rows)
+        if stats.upserted:
+            # Bulk upserts send no save signals
+            invalidate("tas.qualifications")
+            invalidate("tas.units")
+        stats.seconds = round(time.perf_counter() - started, 2)
+
+        logger.info(
+            f"TGA sync: {stats.fetched} fetched, {stats.not_modified} unchanged, "
+            f"{stats.missing} missing, {stats.failed} failed in {stats.seconds}s"
+        )
+        return stats
+
+    def fetch(self, code: str, etag: str = "", last_modified: str = "") -> FetchResult:
+        """Conditionally GET one qualification page"""
+        url = f"{self.base_url}/Training/Details/{code}"
+        host = urlparse(url).netloc
+
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        for attempt in range(MAX_RETRIES + 1):
+            self.throttle.acquire(host)
+            try:
+                response = self._session().get(
+                    url, headers=headers, timeout=REQUEST_TIMEOUT
+                )
+            except requests.RequestException as e:
+                error = str(e)
+                response = None
+            finally:
+                self.throttle.release(host)
+
+            if response is not None:
+                if response.status_code == 304:
+                    return FetchResult(code, "not_modified")
+                if response.status_code == 404:
+                    return FetchResult(code, "missing")
+                if response.status_code == 200:
+                    return FetchResult(
+                        code,
+                        "fetched",
+                        content=response.content,
+                        etag=response.headers.get("ETag", ""),
+                        last_modified=response.headers.get("Last-Modified", ""),
+                    )
+                error = f"HTTP {response.status_code}"
+                if response.status_code != 429 and response.status_code < 500:
+                    break
+
+            if attempt < MAX_RETRIES:
+                time.sleep(2**attempt)
+
+        logger.warning(f"Could not fetch {code}: {error}")
+        return FetchResult(code, "failed", error=error)
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(TrainingGovAuScraper.HEADERS)
+            self._local.session = session
+        return session
+
+    @staticmethod
+    def _count(stats: SyncStats, result: FetchResult):
+        if result.status == "not_modified":
+            stats.not_modified += 1
+        elif result.status == "missing":
+            stats.missing += 1
+        else:
+            stats.failed += 1
+            stats.errors[result.code] = result.error
+
+    def _collect(
+        self,
+        stats: SyncStats,
+        rows: List[QualificationCache],
+        result: FetchResult,
+        parsed: Optional[Dict],
+    ):
+        stats.fetched += 1
+        if parsed is None:
+            stats.unparsable += 1
+            return
+
+        package = re.match(r"[A-Z]*", result.code).group(0)
+        rows.append(
+            QualificationCache(
+                qualification_code=result.code,
+                qualification_title=parsed["qualification_title"],
+                training_package=package,
+                packaging_rules=parsed["packaging_rules"],
+                has_groupings=parsed["has_groupings"],
+                groupings=parsed["groupings"],
+                source=self.source,
+                source_etag=result.etag,
+                source_last_modified=result.last_modified,
+                is_active=True,
+            )
+        )
+
+    @staticmethod
+    def _upsert(rows: List[QualificationCache]) -> int:
+        if not rows:
+            return 0
+        QualificationCache.objects.bulk_create(
+            rows,
+            batch_size=UPSERT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["qualification_code"],
+            update_fields=SYNCED_FIELDS,
+        )
+        return len(rows)
@@ -4,7 +4,9 @@ from .views import (
     TASViewSet, 
     TASTemplateViewSet, 
     TASTemplateSectionViewSet,
-    TASTemplateSectionAssignmentViewSet
+    TASTemplateSectionAssignmentViewSet,
+    CourseTASExportView,
+    ComplianceSweepView,
 )
 
 router = DefaultRouter()
@@ -13,4 +15,20 @@ router.register(r"template-sections", TASTemplateSectionViewSet, basename="tas-t
 router.register(r"template-section-assignments", TASTemplateSectionAssignmentViewSet, basename="tas-section-assignment")
 router.register(r"", TASViewSet, basename="tas")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path(
+        "course-tas/<int:pk>/export/<str:export_format>/",
+        CourseTASExportView.as_view(),
+        name="course-tas-export",
+    ),
+    path(
+        "compliance-sweeps/",
+        ComplianceSweepView.as_view(),
+        name="compliance-sweep-list",
+    ),
+    path(
+        "compliance-sweeps/<int:pk>/",
+        ComplianceSweepView.as_view(),
+        name="compliance-sweep-detail",
+    ),
+] + router.urls
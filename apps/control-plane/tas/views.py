@@ -2,8 +2,14 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.views import APIView
+from django.core.files.storage import default_storage
+from django.http import FileResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.http import content_disposition_header
 from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery
 import time
 import json
 
@@ -14,7 +20,9 @@ from .models import (
     TASTemplateSectionAssignment,
     TASVersion, 
     TASGenerationLog, 
-    QualificationCache
+    QualificationCache,
+    CourseTAS,
+    ComplianceSweep,
 )
 from .serializers import (
     TASSerializer,
@@ -25,8 +33,15 @@ from .serializers import (
     TASGenerationLogSerializer,
     TASGenerateRequestSerializer,
     TASVersionCreateSerializer,
+    ComplianceSweepSerializer,
 )
 from .ai_services import AIServiceFactory
+from .pagination import QualificationCursorPagination
+from .services import export_engine, load_course_graph, version_store
+from .services.compliance_sweep import start_sweep
+from control_plane.response_cache import cached_response
+from tenants.permissions import IsTenantMember
+from tenants.resolver import TenantScopedMixin, request_tenant
 import logging
 
 logger = logging.getLogger(__name__)
@@ -45,6 +60,14 @@ class TASTemplateViewSet(viewsets.ModelViewSet):
         # Show all active templates (system + user-created)
         return TASTemplate.objects.filter(is_active=True)
 
+    @cached_response(
+        "tas.templates",
+        models=[TASTemplate, TASTemplateSection, TASTemplateSectionAssignment],
+        per_tenant=False,
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         # Use request.user if authenticated, otherwise use None or a default user
         user = self.request.user if self.request.user.is_authenticated else None
@@ -258,7 +281,28 @@ class TASTemplateSectionAssignmentViewSet(viewsets.ModelViewSet):
             )
 
 
-class TASViewSet(viewsets.ModelViewSet):
+def with_serializer_relations(queryset):
+    """
+    Load what TASSerializer reads for every row: the related users and
+    template, and the document's version count.
+    """
+    version_count = (
+        TAS.objects.filter(tenant=OuterRef("tenant"), code=OuterRef("code"))
+        .order_by()
+        .values("tenant", "code")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return queryset.select_related(
+        "created_by",
+        "submitted_by",
+        "reviewed_by",
+        "approved_by",
+        "template__created_by",
+    ).annotate(version_count=Subquery(version_count))
+
+
+class TASViewSet(TenantScopedMixin, viewsets.ModelViewSet):
     """ViewSet for TAS documents with GPT-4 generation"""
 
     serializer_class = TASSerializer
@@ -268,17 +312,11 @@ class TASViewSet(viewsets.ModelViewSet):
     ordering_fields = ["created_at", "updated_at", "code", "version"]
 
     def get_queryset(self):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        from tenants.models import Tenant
-
-        tenant = Tenant.objects.get(slug=tenant_slug)
-        return TAS.objects.filter(tenant=tenant)
+        tenant = self.get_tenant()
+        return with_serializer_relations(TAS.objects.filter(tenant=tenant))
 
     def perform_create(self, serializer):
-        tenant_slug = self.kwargs.get("tenant_slug")
-        from tenants.models import Tenant
-
-        tenant = Tenant.objects.get(slug=tenant_slug)
+        tenant = self.get_tenant()
         serializer.save(tenant=tenant, created_by=self.request.user)
 
     @action(detail=False, methods=["post"])
@@ -293,10 +331,7 @@ class TASViewSet(viewsets.ModelViewSet):
 
         data = serializer.validated_data
 
-        # Get tenant
-        from tenants.models import Tenant
-
-        tenant = Tenant.objects.get(slug=tenant_slug)
+        tenant = self.get_tenant()
 
         # Start timing
         start_time = time.time()
@@ -681,13 +716,11 @@ class TASViewSet(viewsets.ModelViewSet):
         new_tas = tas.create_new_version(request.user)
 
         # Create version history record
-        TASVersion.objects.create(
-            tas=new_tas,
-            version_number=new_tas.version,
+        version_store.record_version(
+            new_tas,
+            version_store.document_of(tas),
             change_summary=data["change_summary"],
             changed_sections=data["changed_sections"],
-            previous_content=tas.content,
-            new_content=new_tas.content,
             created_by=request.user,
         )
 
@@ -750,13 +783,11 @@ class TASViewSet(viewsets.ModelViewSet):
                 changed_sections = list(new_section_names.union(old_section_names))
 
             # Create version history record
-            TASVersion.objects.create(
-                tas=new_tas,
-                version_number=new_tas.version,
+            version_store.record_version(
+                new_tas,
+                {"sections": old_sections, "content": old_content},
                 change_summary=change_summary or "Content updated",
                 changed_sections=changed_sections,
-                previous_content=old_content,
-                new_content=new_tas.content,
                 created_by=request.user if request.user.is_authenticated else None,
                 was_regenerated=False,
             )
@@ -789,9 +820,9 @@ class TASViewSet(viewsets.ModelViewSet):
     def versions(self, request, tenant_slug=None, pk=None):
         """Get all versions of a TAS document"""
         tas = self.get_object()
-        versions = TAS.objects.filter(tenant=tas.tenant, code=tas.code).order_by(
-            "-version"
-        )
+        versions = with_serializer_relations(
+            TAS.objects.filter(tenant=tas.tenant, code=tas.code)
+        ).order_by("-version")
         serializer = TASSerializer(versions, many=True)
         return Response(serializer.data)
 
@@ -799,10 +830,37 @@ class TASViewSet(viewsets.ModelViewSet):
     def version_history(self, request, tenant_slug=None, pk=None):
         """Get version history for a TAS document"""
         tas = self.get_object()
-        history = TASVersion.objects.filter(tas__tenant=tas.tenant, tas__code=tas.code)
+        history = TASVersion.objects.filter(
+            tas__tenant=tas.tenant, tas__code=tas.code
+        ).select_related("tas", "created_by")
         serializer = TASVersionSerializer(history, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def compare_versions(self, request, tenant_slug=None, pk=None):
+        """
+        Compare two versions of a TAS document
+
+        GET /api/tenants/{slug}/tas/{id}/compare_versions/?from=1&to=3
+
+        Defaults to this version against the one before it.
+        """
+        tas = self.get_object()
+        try:
+            to_version = int(request.query_params.get("to", tas.version))
+            from_version = int(request.query_params.get("from", to_version - 1))
+        except ValueError:
+            return Response(
+                {"error": "from and to must be version numbers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            comparison = version_store.compare_versions(tas, from_version, to_version)
+        except TASVersion.DoesNotExist as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        return Response(comparison)
+
     @action(detail=True, methods=["get"])
     def generation_logs(self, request, tenant_slug=None, pk=None):
         """Get GPT-4 generation logs for a TAS document"""
@@ -964,46 +1022,59 @@ class TASViewSet(viewsets.ModelViewSet):
         return Response(TASSerializer(tas).data)
 
     @action(detail=False, methods=["get"], url_path="qualifications")
+    @cached_response(
+        "tas.qualifications", models=[QualificationCache], per_tenant=False
+    )
     def qualifications(self, request, tenant_slug=None):
         """
-        Fetch qualifications from training.gov.au
-        Returns a list of qualifications with code, title, AQF level, and training package
+        Search the qualification catalogue
+        Returns cursor-paginated qualifications with code, title, AQF level and training package
         """
         try:
-            # In production, this would fetch from training.gov.au API
-            # For now, return a comprehensive mock dataset
-            qualifications_data = self._get_qualifications_data()
+            queryset = QualificationCache.objects.filter(is_active=True).only(
+                "qualification_code",
+                "qualification_title",
+                "aqf_level",
+                "training_package",
+            )
 
-            # Optional: Filter by search query
-            search = request.query_params.get("search", "").lower()
+            # Optional: Substring search on code or title (trigram indexed).
+            # Codes start with their training package, so this also matches packages
+            search = request.query_params.get("search", "").strip()
             if search:
-                qualifications_data = [
-                    qual
-                    for qual in qualifications_data
-                    if search in qual["code"].lower()
-                    or search in qual["title"].lower()
-                    or search in qual["training_package"].lower()
-                ]
+                queryset = queryset.filter(
+                    Q(qualification_code__icontains=search)
+                    | Q(qualification_title__icontains=search)
+                )
+
+            # Optional: Code prefix for typeahead
+            prefix = request.query_params.get("prefix", "").strip()
+            if prefix:
+                queryset = queryset.filter(qualification_code__istartswith=prefix)
 
             # Optional: Filter by training package
             package = request.query_params.get("package", "").upper()
             if package:
-                qualifications_data = [
-                    qual
-                    for qual in qualifications_data
-                    if qual["training_package"] == package
-                ]
+                queryset = queryset.filter(training_package=package)
 
             # Optional: Filter by AQF level
             aqf_level = request.query_params.get("aqf_level", "")
             if aqf_level:
-                qualifications_data = [
-                    qual
-                    for qual in qualifications_data
-                    if qual["aqf_level"] == aqf_level
-                ]
+                queryset = queryset.filter(aqf_level=aqf_level)
 
-            return Response(qualifications_data, status=status.HTTP_200_OK)
+            paginator = QualificationCursorPagination()
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            return paginator.get_paginated_response(
+                [
+                    {
+                        "code": qual.qualification_code,
+                        "title": qual.qualification_title,
+                        "aqf_level": qual.aqf_level,
+                        "training_package": qual.training_package,
+                    }
+                    for qual in page
+                ]
+            )
 
         except Exception as e:
             import traceback
@@ -1014,403 +1085,8 @@ class TASViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def _get_qualifications_data(self):
-        """
-        Get qualifications data from training.gov.au
-        In production, this would integrate with the TGA API
-        For now, returns a comprehensive mock dataset
-        """
-        return [
-            # Business Services Training Package (BSB)
-            {
-                "code": "BSB10120",
-                "title": "Certificate I in Workplace Skills",
-                "aqf_level": "certificate_i",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB20120",
-                "title": "Certificate II in Workplace Skills",
-                "aqf_level": "certificate_ii",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB30120",
-                "title": "Certificate III in Business",
-                "aqf_level": "certificate_iii",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB30420",
-                "title": "Certificate III in Library and Information Services",
-                "aqf_level": "certificate_iii",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB40120",
-                "title": "Certificate IV in Business",
-                "aqf_level": "certificate_iv",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB40320",
-                "title": "Certificate IV in Entrepreneurship and New Business",
-                "aqf_level": "certificate_iv",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB40520",
-                "title": "Certificate IV in Leadership and Management",
-                "aqf_level": "certificate_iv",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB40920",
-                "title": "Certificate IV in Project Management Practice",
-                "aqf_level": "certificate_iv",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB50120",
-                "title": "Diploma of Business",
-                "aqf_level": "diploma",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB50320",
-                "title": "Diploma of Human Resource Management",
-                "aqf_level": "diploma",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB50420",
-                "title": "Diploma of Leadership and Management",
-                "aqf_level": "diploma",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB50820",
-                "title": "Diploma of Project Management",
-                "aqf_level": "diploma",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB60120",
-                "title": "Advanced Diploma of Business",
-                "aqf_level": "advanced_diploma",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB60420",
-                "title": "Advanced Diploma of Leadership and Management",
-                "aqf_level": "advanced_diploma",
-                "training_package": "BSB",
-            },
-            # Information and Communications Technology (ICT)
-            {
-                "code": "ICT30120",
-                "title": "Certificate III in Information Technology",
-                "aqf_level": "certificate_iii",
-                "training_package": "ICT",
-            },
-            {
-                "code": "ICT40120",
-                "title": "Certificate IV in Information Technology",
-                "aqf_level": "certificate_iv",
-                "training_package": "ICT",
-            },
-            {
-                "code": "ICT40520",
-                "title": "Certificate IV in Web Based Technologies",
-                "aqf_level": "certificate_iv",
-                "training_package": "ICT",
-            },
-            {
-                "code": "ICT50120",
-                "title": "Diploma of Information Technology",
-                "aqf_level": "diploma",
-                "training_package": "ICT",
-            },
-            {
-                "code": "ICT50220",
-                "title": "Diploma of Information Technology (Advanced Networking)",
-                "aqf_level": "diploma",
-                "training_package": "ICT",
-            },
-            {
-                "code": "ICT50420",
-                "title": "Diploma of Information Technology (Back End Development)",
-                "aqf_level": "diploma",
-                "training_package": "ICT",
-            },
-            {
-                "code": "ICT50620",
-                "title": "Diploma of Information Technology (Cyber Security)",
-                "aqf_level": "diploma",
-                "training_package": "ICT",
-            },
-            {
-                "code": "ICT50720",
-                "title": "Diploma of Information Technology (Front End Web Development)",
-                "aqf_level": "diploma",
-                "training_package": "ICT",
-            },
-            {
-                "code": "ICT60120",
-                "title": "Advanced Diploma of Information Technology",
-                "aqf_level": "advanced_diploma",
-                "training_package": "ICT",
-            },
-            {
-                "code": "ICT60220",
-                "title": "Advanced Diploma of Information Technology (Network Security)",
-                "aqf_level": "advanced_diploma",
-                "training_package": "ICT",
-            },
-            # Community Services (CHC)
-            {
-                "code": "CHC22015",
-                "title": "Certificate II in Community Services",
-                "aqf_level": "certificate_ii",
-                "training_package": "CHC",
-            },
-            {
-                "code": "CHC32015",
-                "title": "Certificate III in Community Services",
-                "aqf_level": "certificate_iii",
-                "training_package": "CHC",
-            },
-            {
-                "code": "CHC33015",
-                "title": "Certificate III in Individual Support",
-                "aqf_level": "certificate_iii",
-                "training_package": "CHC",
-            },
-            {
-                "code": "CHC42015",
-                "title": "Certificate IV in Community Services",
-                "aqf_level": "certificate_iv",
-                "training_package": "CHC",
-            },
-            {
-                "code": "CHC43015",
-                "title": "Certificate IV in Ageing Support",
-                "aqf_level": "certificate_iv",
-                "training_package": "CHC",
-            },
-            {
-                "code": "CHC43115",
-                "title": "Certificate IV in Disability",
-                "aqf_level": "certificate_iv",
-                "training_package": "CHC",
-            },
-            {
-                "code": "CHC43315",
-                "title": "Certificate IV in Mental Health",
-                "aqf_level": "certificate_iv",
-                "training_package": "CHC",
-            },
-            {
-                "code": "CHC50113",
-                "title": "Diploma of Early Childhood Education and Care",
-                "aqf_level": "diploma",
-                "training_package": "CHC",
-            },
-            {
-                "code": "CHC52015",
-                "title": "Diploma of Community Services",
-                "aqf_level": "diploma",
-                "training_package": "CHC",
-            },
-            {
-                "code": "CHC52021",
-                "title": "Diploma of Community Services (Case Management)",
-                "aqf_level": "diploma",
-                "training_package": "CHC",
-            },
-            {
-                "code": "CHC62015",
-                "title": "Advanced Diploma of Community Sector Management",
-                "aqf_level": "advanced_diploma",
-                "training_package": "CHC",
-            },
-            # Hospitality (SIT)
-            {
-                "code": "SIT20316",
-                "title": "Certificate II in Hospitality",
-                "aqf_level": "certificate_ii",
-                "training_package": "SIT",
-            },
-            {
-                "code": "SIT30616",
-                "title": "Certificate III in Hospitality",
-                "aqf_level": "certificate_iii",
-                "training_package": "SIT",
-            },
-            {
-                "code": "SIT30816",
-                "title": "Certificate III in Commercial Cookery",
-                "aqf_level": "certificate_iii",
-                "training_package": "SIT",
-            },
-            {
-                "code": "SIT31016",
-                "title": "Certificate III in Patisserie",
-                "aqf_level": "certificate_iii",
-                "training_package": "SIT",
-            },
-            {
-                "code": "SIT40416",
-                "title": "Certificate IV in Hospitality",
-                "aqf_level": "certificate_iv",
-                "training_package": "SIT",
-            },
-            {
-                "code": "SIT40516",
-                "title": "Certificate IV in Commercial Cookery",
-                "aqf_level": "certificate_iv",
-                "training_package": "SIT",
-            },
-            {
-                "code": "SIT50416",
-                "title": "Diploma of Hospitality Management",
-                "aqf_level": "diploma",
-                "training_package": "SIT",
-            },
-            {
-                "code": "SIT60316",
-                "title": "Advanced Diploma of Hospitality Management",
-                "aqf_level": "advanced_diploma",
-                "training_package": "SIT",
-            },
-            # Retail Services (SIR)
-            {
-                "code": "SIR20216",
-                "title": "Certificate II in Retail Services",
-                "aqf_level": "certificate_ii",
-                "training_package": "SIR",
-            },
-            {
-                "code": "SIR30216",
-                "title": "Certificate III in Retail",
-                "aqf_level": "certificate_iii",
-                "training_package": "SIR",
-            },
-            {
-                "code": "SIR40216",
-                "title": "Certificate IV in Retail Management",
-                "aqf_level": "certificate_iv",
-                "training_package": "SIR",
-            },
-            {
-                "code": "SIR50217",
-                "title": "Diploma of Retail Management",
-                "aqf_level": "diploma",
-                "training_package": "SIR",
-            },
-            # Education and Training (TAE)
-            {
-                "code": "TAE40116",
-                "title": "Certificate IV in Training and Assessment",
-                "aqf_level": "certificate_iv",
-                "training_package": "TAE",
-            },
-            {
-                "code": "TAE50216",
-                "title": "Diploma of Training Design and Development",
-                "aqf_level": "diploma",
-                "training_package": "TAE",
-            },
-            {
-                "code": "TAE50116",
-                "title": "Diploma of Vocational Education and Training",
-                "aqf_level": "diploma",
-                "training_package": "TAE",
-            },
-            # Health (HLT)
-            {
-                "code": "HLT33015",
-                "title": "Certificate III in Health Services Assistance",
-                "aqf_level": "certificate_iii",
-                "training_package": "HLT",
-            },
-            {
-                "code": "HLT37315",
-                "title": "Certificate III in Sterilisation Services",
-                "aqf_level": "certificate_iii",
-                "training_package": "HLT",
-            },
-            {
-                "code": "HLT43015",
-                "title": "Certificate IV in Allied Health Assistance",
-                "aqf_level": "certificate_iv",
-                "training_package": "HLT",
-            },
-            {
-                "code": "HLT47315",
-                "title": "Certificate IV in Health Administration",
-                "aqf_level": "certificate_iv",
-                "training_package": "HLT",
-            },
-            {
-                "code": "HLT54121",
-                "title": "Diploma of Nursing",
-                "aqf_level": "diploma",
-                "training_package": "HLT",
-            },
-            # Financial Services (FNS)
-            {
-                "code": "FNS30120",
-                "title": "Certificate III in Financial Services",
-                "aqf_level": "certificate_iii",
-                "training_package": "FNS",
-            },
-            {
-                "code": "FNS40120",
-                "title": "Certificate IV in Accounting and Bookkeeping",
-                "aqf_level": "certificate_iv",
-                "training_package": "FNS",
-            },
-            {
-                "code": "FNS40217",
-                "title": "Certificate IV in Bookkeeping",
-                "aqf_level": "certificate_iv",
-                "training_package": "FNS",
-            },
-            {
-                "code": "FNS50217",
-                "title": "Diploma of Accounting",
-                "aqf_level": "diploma",
-                "training_package": "FNS",
-            },
-            {
-                "code": "FNS50615",
-                "title": "Diploma of Financial Planning",
-                "aqf_level": "diploma",
-                "training_package": "FNS",
-            },
-            # Marketing and Communication (BSB subset)
-            {
-                "code": "BSB40820",
-                "title": "Certificate IV in Marketing and Communication",
-                "aqf_level": "certificate_iv",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB50620",
-                "title": "Diploma of Marketing and Communication",
-                "aqf_level": "diploma",
-                "training_package": "BSB",
-            },
-            {
-                "code": "BSB60520",
-                "title": "Advanced Diploma of Marketing and Communication",
-                "aqf_level": "advanced_diploma",
-                "training_package": "BSB",
-            },
-        ]
-
     @action(detail=False, methods=["get"], url_path="units")
+    @cached_response("tas.units", models=[QualificationCache], per_tenant=False)
     def units_of_competency(self, request, tenant_slug=None):
         """
         Fetch units of competency for a specific qualification
@@ -3109,3 +2785,119 @@ class TASViewSet(viewsets.ModelViewSet):
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class CourseTASExportView(APIView):
+    """
+    Download a Course TAS as CSV, DOCX or PDF
+
+    GET /api/tenants/{tenant_slug}/tas/course-tas/{id}/export/{csv|docx|pdf}/
+
+    CSV is streamed as it is written. DOCX and PDF are rendered once per
+    Course TAS version and served from storage; formats rendered in the
+    background return 202 with Retry-After until the file is ready.
+    """
+
+    permission_classes = [IsAuthenticated, IsTenantMember]
+
+    # Seconds a client should wait before polling a background render
+    RETRY_AFTER = 5
+
+    def get(self, request, tenant_slug=None, pk=None, export_format=None):
+        if export_format not in export_engine.FORMATS:
+            return Response(
+                {
+                    "error": f"Unsupported export format: {export_format}",
+                    "formats": list(export_engine.FORMATS),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        course_tas = get_object_or_404(CourseTAS, pk=pk, tenant__slug=tenant_slug)
+        content_type = export_engine.FORMATS[export_format][0]
+        filename = export_engine.export_filename(course_tas, export_format)
+
+        if export_format == "csv":
+            response = StreamingHttpResponse(
+                export_engine.iter_csv(load_course_graph(course_tas)),
+                content_type=content_type,
+            )
+            response["Content-Disposition"] = content_disposition_header(
+                True, filename
+            )
+            return response
+
+        name = export_engine.stored_export(course_tas, export_format)
+        if name is None:
+            if export_format in export_engine.BACKGROUND_FORMATS:
+                export_engine.queue_export(course_tas, export_format)
+                response = Response(
+                    {
+                        "status": "rendering",
+                        "course_tas": course_tas.pk,
+                        "version": course_tas.version,
+                        "format": export_format,
+                    },
+                    status=status.HTTP_202_ACCEPTED,
+                )
+                response["Retry-After"] = str(self.RETRY_AFTER)
+                return response
+            name = export_engine.store_export(course_tas, export_format)
+            if name is None:
+                # Another request is storing this version; send our own render
+                return FileResponse(
+                    export_engine.render_to_spool(course_tas, export_format),
+                    as_attachment=True,
+                    filename=filename,
+                    content_type=content_type,
+                )
+
+        return FileResponse(
+            default_storage.open(name, "rb"),
+            as_attachment=True,
+            filename=filename,
+            content_type=content_type,
+        )
+
+
+class ComplianceSweepView(APIView):
+    """
+    Tenant-wide compliance sweeps
+
+    POST /api/tenants/{tenant_slug}/tas/compliance-sweeps/
+    Body: {"rule_types": ["trainer_scope"]}  // Optional, defaults to all
+
+    GET /api/tenants/{tenant_slug}/tas/compliance-sweeps/
+    GET /api/tenants/{tenant_slug}/tas/compliance-sweeps/{id}/
+
+    Totals grow as shards finish; unchanged checks are counted as skipped.
+    """
+
+    permission_classes = [IsAuthenticated, IsTenantMember]
+
+    # Sweeps listed without an id
+    RECENT = 20
+
+    def get(self, request, tenant_slug=None, pk=None):
+        sweeps = ComplianceSweep.objects.filter(tenant__slug=tenant_slug)
+        if pk is not None:
+            sweep = get_object_or_404(sweeps, pk=pk)
+            return Response(ComplianceSweepSerializer(sweep).data)
+        return Response(
+            ComplianceSweepSerializer(sweeps[: self.RECENT], many=True).data
+        )
+
+    def post(self, request, tenant_slug=None):
+        tenant = request_tenant(request, tenant_slug)
+        serializer = ComplianceSweepSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        sweep = start_sweep(
+            tenant,
+            rule_types=serializer.validated_data.get("rule_types"),
+            # API key users are not database users
+            user=request.user,
+        )
+        return Response(
+            ComplianceSweepSerializer(sweep).data, status=status.HTTP_202_ACCEPTED
+        )
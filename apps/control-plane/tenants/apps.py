@@ -9,3 +9,6 @@ class TenantsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tenants"
     verbose_name = "Tenant Management"
+
+    def ready(self):
+        from . import context, signals  # noqa: F401
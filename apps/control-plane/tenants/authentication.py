@@ -0,0 +1,263 @@
+"""
+API key authentication for machine-to-machine integrations.
+
+Clients send ``Authorization: Api-Key nc_...`` or ``X-API-Key: nc_...``.
+Keys are looked up by prefix (indexed) and their SHA-256 compared in
+constant time. Key records are cached per process for
+API_KEY_LOCAL_CACHE_TTL seconds and in the shared cache for
+API_KEY_CACHE_TIMEOUT seconds; saving or deleting a key (e.g. revoking
+it) or its tenant drops them. last_used_at is buffered per process and
+written in one query at most every API_KEY_USAGE_FLUSH_INTERVAL seconds.
+
+request.user is the tenant's API service user (a real User, created on
+first use and shared by all of its keys), so code that stores
+request.user (created_by etc.) works for API clients too; request.auth is
+the key record.
+"""
+
+import hmac
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from .models import TenantAPIKey, TenantStatus
+
+logger = logging.getLogger(__name__)
+
+# Seconds key records are kept in the shared cache
+API_KEY_CACHE_TIMEOUT = getattr(settings, "API_KEY_CACHE_TIMEOUT", 60)
+
+# Seconds key records are kept in each process
+API_KEY_LOCAL_CACHE_TTL = getattr(settings, "API_KEY_LOCAL_CACHE_TTL", 5)
+
+# Seconds between last_used_at writes per process
+API_KEY_USAGE_FLUSH_INTERVAL = getattr(settings, "API_KEY_USAGE_FLUSH_INTERVAL", 60)
+
+CACHE_KEY = "tenants:api_keys:v2:{prefix}"
+
+SERVICE_USERNAME = "api-key:{tenant_id}"
+
+
+@dataclass(frozen=True)
+class APIKeyRecord:
+    """What authentication needs to know about one API key"""
+
+    id: str
+    tenant_id: str
+    name: str
+    key_hash: str
+    scopes: Tuple[str, ...]
+    is_active: bool
+    expires_at: Optional[datetime]
+    tenant_active: bool
+    service_user_id: int
+
+    def is_valid(self) -> bool:
+        return (
+            self.is_active
+            and self.tenant_active
+            and (self.expires_at is None or timezone.now() <= self.expires_at)
+        )
+
+
+def api_key_user(api_key: APIKeyRecord):
+    """request.user of a request authenticated with ``api_key``"""
+    user = get_user_model()(
+        pk=api_key.service_user_id,
+        username=SERVICE_USERNAME.format(tenant_id=api_key.tenant_id),
+        is_active=True,
+    )
+    user._state.adding = False
+    user.api_key = api_key
+    return user
+
+
+def service_user_id(tenant_id) -> int:
+    """Id of the tenant's API service user, creating it on first use"""
+    user, _ = get_user_model().objects.get_or_create(
+        username=SERVICE_USERNAME.format(tenant_id=tenant_id),
+        defaults={"password": make_password(None)},
+    )
+    return user.pk
+
+
+class TenantAPIKeyAuthentication(BaseAuthentication):
+    """Authenticates requests carrying a tenant API key"""
+
+    keyword = "Api-Key"
+
+    def authenticate(self, request):
+        key = self.get_key(request)
+        if key is None:
+            return None
+
+        api_key = verify_key(key)
+        if api_key is None:
+            raise exceptions.AuthenticationFailed("Invalid or expired API key.")
+
+        # A key only opens its own tenant's routes
+        route_tenant = getattr(request._request, "tenant", None)
+        if route_tenant is not None and str(route_tenant.pk) != api_key.tenant_id:
+            raise exceptions.AuthenticationFailed(
+                "API key is not valid for this tenant."
+            )
+        if not getattr(request._request, "tenant_id", None):
+            request._request.tenant_id = api_key.tenant_id
+
+        record_usage(api_key.id)
+        return api_key_user(api_key), api_key
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+    def get_key(self, request) -> Optional[str]:
+        auth = get_authorization_header(request).split()
+        if auth and auth[0].lower() == self.keyword.lower().encode():
+            if len(auth) != 2:
+                raise exceptions.AuthenticationFailed("Invalid API key header.")
+            try:
+                return auth[1].decode()
+            except UnicodeError:
+                raise exceptions.AuthenticationFailed("Invalid API key header.")
+        return request.META.get("HTTP_X_API_KEY") or None
+
+
+# Key prefix -> (expiry on the monotonic clock, records with that prefix)
+_local: Dict[str, Tuple[float, List[APIKeyRecord]]] = {}
+_local_lock = threading.Lock()
+
+
+def verify_key(key: str) -> Optional[APIKeyRecord]:
+    """The valid API key matching ``key``, or None"""
+    key_hash = TenantAPIKey.hash_key(key)
+    match = None
+    # Compare against every candidate so timing does not depend on which matched
+    for record in key_records(TenantAPIKey.get_prefix(key)):
+        if hmac.compare_digest(record.key_hash, key_hash):
+            match = record
+    if match is None or not match.is_valid():
+        return None
+    return match
+
+
+def key_records(prefix: str) -> List[APIKeyRecord]:
+    """Records of the keys with this prefix (usually one, or none)"""
+    now = time.monotonic()
+    with _local_lock:
+        entry = _local.get(prefix)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    records = _cache_get(CACHE_KEY.format(prefix=prefix))
+    if records is None:
+        records = [
+            APIKeyRecord(
+                id=str(row["id"]),
+                tenant_id=str(row["tenant_id"]),
+                name=row["name"],
+                key_hash=row["key_hash"],
+                scopes=tuple(row["scopes"] or ()),
+                is_active=row["is_active"],
+                expires_at=row["expires_at"],
+                tenant_active=row["tenant__status"] == TenantStatus.ACTIVE,
+                service_user_id=service_user_id(row["tenant_id"]),
+            )
+            for row in TenantAPIKey.objects.filter(key_prefix=prefix).values(
+                "id",
+                "tenant_id",
+                "name",
+                "key_hash",
+                "scopes",
+                "is_active",
+                "expires_at",
+                "tenant__status",
+            )
+        ]
+        # Unknown prefixes are cached too, so bad keys do not reach the database
+        _cache_set(CACHE_KEY.format(prefix=prefix), records)
+
+    with _local_lock:
+        _local[prefix] = (now + API_KEY_LOCAL_CACHE_TTL, records)
+    return records
+
+
+def invalidate_keys(*prefixes: str):
+    """Drop cached key records (called when a key or its tenant changes)"""
+    with _local_lock:
+        for prefix in prefixes:
+            _local.pop(prefix, None)
+    try:
+        cache.delete_many([CACHE_KEY.format(prefix=prefix) for prefix in prefixes])
+    except Exception as e:
+        logger.warning(f"Could not invalidate cached API keys: {e}")
+
+
+def clear_local_cache():
+    with _local_lock:
+        _local.clear()
+
+
+# Key id -> when it was last used, not yet written
+_usage: Dict[str, datetime] = {}
+_usage_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def record_usage(key_id: str):
+    """Note that a key was used; written by the next flush that is due"""
+    with _usage_lock:
+        _usage[key_id] = timezone.now()
+        due = time.monotonic() - _last_flush >= API_KEY_USAGE_FLUSH_INTERVAL
+    if due:
+        flush_usage()
+
+
+def flush_usage() -> int:
+    """Write buffered last_used_at values in one query"""
+    global _last_flush
+
+    with _usage_lock:
+        used = dict(_usage)
+        _usage.clear()
+        _last_flush = time.monotonic()
+    if not used:
+        return 0
+
+    try:
+        TenantAPIKey.objects.bulk_update(
+            [
+                TenantAPIKey(pk=key_id, last_used_at=used_at)
+                for key_id, used_at in used.items()
+            ],
+            ["last_used_at"],
+        )
+    except Exception as e:
+        logger.warning(f"Could not record API key usage: {e}")
+        return 0
+    return len(used)
+
+
+def _cache_get(key: str):
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"API key cache read failed: {e}")
+        return None
+
+
+def _cache_set(key: str, records: List[APIKeyRecord]):
+    try:
+        cache.set(key, records, API_KEY_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"API key cache write failed: {e}")
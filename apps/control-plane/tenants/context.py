@@ -0,0 +1,124 @@
+"""
+Tenant context of the running request or task.
+
+The current tenant id is held in a ContextVar rather than a thread-local,
+so it follows the code that runs on behalf of a request:
+
+- async views and asyncio tasks each see their own request's tenant
+  (asyncio copies the context into every task it creates);
+- sync_to_async/async_to_sync and asyncio.to_thread carry it across;
+- ContextThreadPoolExecutor carries it into pool threads (a plain
+  ThreadPoolExecutor, or loop.run_in_executor, does not), e.g. the TGA
+  sync fetch pool;
+- Celery tasks published while it is set get a ``tenant_id`` header, and
+  the worker sets it for the duration of the task.
+
+TenantManager filters querysets by the current tenant when one is set
+(CourseTAS.tenant_objects, used to load Course TAS graphs, so an export
+task queued for one tenant cannot render another's course).
+"""
+
+import contextvars
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from celery.signals import before_task_publish, task_postrun, task_prerun
+from django.db import models
+
+logger = logging.getLogger(__name__)
+
+TASK_HEADER = "tenant_id"
+
+_tenant_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "tenant_id", default=None
+)
+
+
+def get_current_tenant_id() -> Optional[str]:
+    """The tenant id of the current context, or None"""
+    return _tenant_id.get()
+
+
+def set_current_tenant_id(tenant_id) -> contextvars.Token:
+    """Set the tenant id of the current context; returns a token to reset it"""
+    return _tenant_id.set(str(tenant_id) if tenant_id is not None else None)
+
+
+def reset_current_tenant_id(token: contextvars.Token):
+    _tenant_id.reset(token)
+
+
+def parse_tenant_id(value) -> Optional[str]:
+    """Canonical form of a tenant id, or None if ``value`` is not one"""
+    try:
+        return str(uuid.UUID(str(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+@contextmanager
+def tenant_context(tenant_id):
+    """Run a block with ``tenant_id`` as the current tenant"""
+    token = set_current_tenant_id(tenant_id)
+    try:
+        yield
+    finally:
+        reset_current_tenant_id(token)
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that runs each call in a copy of the submitter's context"""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class TenantManager(models.Manager):
+    """
+    Manager limited to the current tenant's rows when a tenant is set.
+
+    Without a tenant (management commands, Beat tasks, the admin) it
+    returns every row, like the default manager.
+    """
+
+    tenant_field = "tenant"
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        tenant_id = get_current_tenant_id()
+        if tenant_id is None:
+            return queryset
+        return queryset.filter(**{f"{self.tenant_field}_id": tenant_id})
+
+
+# Celery task id -> token of the tenant set for it
+_task_tokens: Dict[str, contextvars.Token] = {}
+
+
+@before_task_publish.connect(dispatch_uid="tenants.context.publish")
+def add_tenant_header(sender=None, headers=None, **kwargs):
+    tenant_id = get_current_tenant_id()
+    if headers is not None and tenant_id is not None:
+        headers.setdefault(TASK_HEADER, tenant_id)
+
+
+@task_prerun.connect(dispatch_uid="tenants.context.prerun")
+def enter_task_tenant(sender=None, task_id=None, task=None, **kwargs):
+    tenant_id = getattr(task.request, TASK_HEADER, None) if task else None
+    if tenant_id is not None:
+        _task_tokens[task_id] = set_current_tenant_id(tenant_id)
+
+
+@task_postrun.connect(dispatch_uid="tenants.context.postrun")
+def exit_task_tenant(sender=None, task_id=None, **kwargs):
+    token = _task_tokens.pop(task_id, None)
+    if token is None:
+        return
+    try:
+        reset_current_tenant_id(token)
+    except ValueError:
+        # Set in another context (the task ran on another thread)
+        set_current_tenant_id(None)
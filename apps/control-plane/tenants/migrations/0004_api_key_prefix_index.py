@@ -0,0 +1,18 @@
+# Generated by Django 5.1.13 on 2026-10-19 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tenants", "0003_tenantapikey_description"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="tenantapikey",
+            name="key_prefix",
+            field=models.CharField(db_index=True, editable=False, max_length=16),
+        ),
+    ]
@@ -182,11 +182,14 @@ class TenantQuota(models.Model):
 
     def reset_monthly_quotas(self):
         """Reset monthly usage counters."""
+        from .quotas import reset_counters
+
         self.api_calls_used = 0
         self.ai_tokens_used = 0
         self.last_reset_at = timezone.now()
         self.quota_reset_at = timezone.now() + timezone.timedelta(days=30)
         self.save()
+        reset_counters(self.tenant_id)
 
     def check_api_quota(self) -> bool:
         """Check if tenant has available API quota."""
@@ -198,13 +201,18 @@ class TenantQuota(models.Model):
 
     def increment_api_calls(self, count: int = 1):
         """Increment API call usage."""
-        self.api_calls_used += count
-        self.save(update_fields=["api_calls_used", "updated_at"])
+        self._increment("api_calls_used", count)
 
     def increment_ai_tokens(self, count: int):
         """Increment AI token usage."""
-        self.ai_tokens_used += count
-        self.save(update_fields=["ai_tokens_used", "updated_at"])
+        self._increment("ai_tokens_used", count)
+
+    def _increment(self, field: str, count: int):
+        """Add to a usage counter in the database, safe under concurrency."""
+        TenantQuota.objects.filter(pk=self.pk).update(
+            **{field: models.F(field) + count}, updated_at=timezone.now()
+        )
+        self.refresh_from_db(fields=[field, "updated_at"])
 
 
 class TenantAPIKey(models.Model):
@@ -220,7 +228,7 @@ class TenantAPIKey(models.Model):
     description = models.TextField(
         blank=True, help_text="Optional description of key usage"
     )
-    key_prefix = models.CharField(max_length=16, editable=False)
+    key_prefix = models.CharField(max_length=16, editable=False, db_index=True)
     key_hash = models.CharField(max_length=128, editable=False)
 
     is_active = models.BooleanField(default=True)
@@ -255,6 +263,11 @@ class TenantAPIKey(models.Model):
 
         return f"nc_{secrets.token_urlsafe(32)}"
 
+    @staticmethod
+    def get_prefix(key: str) -> str:
+        """Get the stored prefix of an API key ("nc_" + first 8 chars)."""
+        return key[:11]
+
     @staticmethod
     def hash_key(key: str) -> str:
         """Hash an API key for storage."""
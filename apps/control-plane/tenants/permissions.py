@@ -0,0 +1,32 @@
+"""
+Permissions for slug-scoped tenant routes.
+"""
+
+from rest_framework.permissions import BasePermission
+
+from .authentication import APIKeyRecord
+from .models import TenantUser
+from .resolver import request_tenant
+
+
+class IsTenantMember(BasePermission):
+    """
+    Allows members of the tenant named by the ``tenant_slug`` URL kwarg.
+
+    That tenant's API keys and superusers are allowed too. Use it after
+    IsAuthenticated; an unknown slug raises Http404.
+    """
+
+    message = "You don't have access to this tenant."
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not (user and user.is_authenticated):
+            return False
+
+        tenant = request_tenant(request, view.kwargs.get("tenant_slug"))
+        if isinstance(request.auth, APIKeyRecord):
+            return request.auth.tenant_id == str(tenant.pk)
+        if user.is_superuser:
+            return True
+        return TenantUser.objects.filter(tenant=tenant, user=user).exists()
@@ -0,0 +1,274 @@
+"""
+Quota enforcement with Redis counters.
+
+TenantQuotaThrottle (control_plane.throttling) charges every authenticated
+slug-scoped API request to its tenant with one Lua script. The script
+seeds the tenant's usage counter (from TenantQuota) if it has expired and
+refuses the charge if it would pass the limit. Otherwise it adds the charge to the usage counter and
+to a pending counter. The flush_quota_counters task moves pending counts
+into TenantQuota with F() updates, so the database is written once per
+tenant per flush instead of once per request.
+
+Limits come from the tenant's TenantQuota, or from TENANT_TIER_QUOTAS for
+its subscription tier when it has none. Requests are let through when
+Redis is unavailable.
+
+Only API calls are counted here. AI token usage is known after each call
+and is added with TenantQuota.increment_ai_tokens.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from .models import SubscriptionTier, Tenant, TenantQuota
+
+logger = logging.getLogger(__name__)
+
+API_CALLS = "api_calls"
+AI_TOKENS = "ai_tokens"
+
+# Resources counted in Redis
+RESOURCES = (API_CALLS,)
+
+# Monthly limits of tenants without a TenantQuota row (and of new tenants)
+TENANT_TIER_QUOTAS = getattr(
+    settings,
+    "TENANT_TIER_QUOTAS",
+    {
+        SubscriptionTier.FREE: {API_CALLS: 10_000, AI_TOKENS: 100_000},
+        SubscriptionTier.BASIC: {API_CALLS: 50_000, AI_TOKENS: 500_000},
+        SubscriptionTier.PROFESSIONAL: {API_CALLS: 250_000, AI_TOKENS: 2_500_000},
+        SubscriptionTier.ENTERPRISE: {API_CALLS: 1_000_000, AI_TOKENS: 10_000_000},
+    },
+)
+
+# Seconds a usage counter lives in Redis before it is reseeded from the database
+QUOTA_COUNTER_TTL = getattr(settings, "QUOTA_COUNTER_TTL", 24 * 60 * 60)
+
+# Seconds quota limits are kept in each process
+QUOTA_LIMITS_CACHE_TTL = getattr(settings, "QUOTA_LIMITS_CACHE_TTL", 60)
+
+USED_KEY = "quota:{tenant}:{resource}:used"
+PENDING_KEY = "quota:{tenant}:{resource}:pending"
+DIRTY_KEY = "quota:dirty"
+
+# KEYS: used counter, pending counter, dirty set
+# ARGV: amount, limit, used in the database, counter TTL, dirty set member
+CHARGE_SCRIPT = """
+local used = redis.call('GET', KEYS[1])
+if used then
+    used = tonumber(used)
+else
+    used = tonumber(ARGV[3]) + tonumber(redis.call('GET', KEYS[2]) or '0')
+    redis.call('SET', KEYS[1], used, 'EX', ARGV[4])
+end
+local amount = tonumber(ARGV[1])
+if used + amount > tonumber(ARGV[2]) then
+    return {0, used}
+end
+redis.call('INCRBY', KEYS[2], amount)
+redis.call('SADD', KEYS[3], ARGV[5])
+return {1, redis.call('INCRBY', KEYS[1], amount)}
+"""
+
+# KEYS: pending counter
+DRAIN_SCRIPT = """
+local pending = redis.call('GET', KEYS[1])
+redis.call('DEL', KEYS[1])
+return tonumber(pending or '0')
+"""
+
+# Resource -> (limit, used in the database) per tenant id
+Limits = Dict[str, Tuple[int, int]]
+
+_limits: Dict[str, Tuple[float, Limits]] = {}
+_limits_lock = threading.Lock()
+
+_scripts = {}
+
+
+def charge(tenant: Tenant, resource: str = API_CALLS, amount: int = 1):
+    """
+    Charge usage to a tenant.
+
+    Returns (allowed, used, limit); ``used`` includes this charge when it
+    is allowed. Fails open (allowed, 0, limit) when Redis is unavailable.
+    """
+    limit, used_in_db = quota_limits(tenant)[resource]
+    client = _redis()
+    if client is None:
+        return True, 0, limit
+
+    tenant_id = str(tenant.pk)
+    try:
+        allowed, used = _script(client, CHARGE_SCRIPT)(
+            keys=[
+                USED_KEY.format(tenant=tenant_id, resource=resource),
+                PENDING_KEY.format(tenant=tenant_id, resource=resource),
+                DIRTY_KEY,
+            ],
+            args=[
+                amount,
+                limit,
+                used_in_db,
+                QUOTA_COUNTER_TTL,
+                f"{tenant_id}:{resource}",
+            ],
+        )
+    except Exception as e:
+        logger.warning(f"Quota check failed for tenant {tenant_id}: {e}")
+        return True, 0, limit
+    return bool(allowed), int(used), limit
+
+
+def quota_limits(tenant: Tenant) -> Limits:
+    """Limits and database usage of a tenant, cached for QUOTA_LIMITS_CACHE_TTL"""
+    tenant_id = str(tenant.pk)
+    now = time.monotonic()
+    with _limits_lock:
+        entry = _limits.get(tenant_id)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    quota = (
+        TenantQuota.objects.filter(tenant_id=tenant.pk)
+        .values(
+            *[
+                f"{resource}_{field}"
+                for resource in RESOURCES
+                for field in ("limit", "used")
+            ]
+        )
+        .first()
+    )
+    if quota is None:
+        tier = TENANT_TIER_QUOTAS.get(
+            tenant.subscription_tier, TENANT_TIER_QUOTAS[SubscriptionTier.FREE]
+        )
+        limits = {resource: (tier[resource], 0) for resource in RESOURCES}
+    else:
+        limits = {
+            resource: (quota[f"{resource}_limit"], quota[f"{resource}_used"])
+            for resource in RESOURCES
+        }
+
+    with _limits_lock:
+        _limits[tenant_id] = (now + QUOTA_LIMITS_CACHE_TTL, limits)
+    return limits
+
+
+def tier_limits(tier: str) -> Dict[str, int]:
+    """TenantQuota limit fields for a subscription tier"""
+    limits = TENANT_TIER_QUOTAS.get(tier, TENANT_TIER_QUOTAS[SubscriptionTier.FREE])
+    return {f"{resource}_limit": limit for resource, limit in limits.items()}
+
+
+def invalidate_limits(*tenant_ids):
+    with _limits_lock:
+        for tenant_id in tenant_ids:
+            _limits.pop(str(tenant_id), None)
+
+
+def clear_local_cache():
+    with _limits_lock:
+        _limits.clear()
+
+
+def flush_counters() -> int:
+    """Move pending Redis usage into TenantQuota; returns tenants updated"""
+    client = _redis()
+    if client is None:
+        return 0
+
+    usage: Dict[str, Dict[str, int]] = {}
+    drain = _script(client, DRAIN_SCRIPT)
+    for member in client.smembers(DIRTY_KEY):
+        member = member.decode() if isinstance(member, bytes) else member
+        tenant_id, resource = member.rsplit(":", 1)
+        # Leave the set first: charges made from here on mark it dirty again
+        client.srem(DIRTY_KEY, member)
+        pending = int(
+            drain(keys=[PENDING_KEY.format(tenant=tenant_id, resource=resource)])
+        )
+        if pending:
+            usage.setdefault(tenant_id, {})[resource] = pending
+
+    try:
+        return apply_usage(usage)
+    except Exception:
+        # Put the counts back for the next flush
+        for tenant_id, counts in usage.items():
+            for resource, pending in counts.items():
+                client.incrby(
+                    PENDING_KEY.format(tenant=tenant_id, resource=resource), pending
+                )
+                client.sadd(DIRTY_KEY, f"{tenant_id}:{resource}")
+        raise
+
+
+@transaction.atomic
+def apply_usage(usage: Dict[str, Dict[str, int]]) -> int:
+    """
+    Add usage counts to TenantQuota rows (one UPDATE per tenant)
+
+    All or nothing, so a failed flush can put every count back into Redis
+    without counting any tenant twice.
+    """
+    for tenant_id, counts in usage.items():
+        updates = {
+            f"{resource}_used": F(f"{resource}_used") + amount
+            for resource, amount in counts.items()
+        }
+        if not TenantQuota.objects.filter(tenant_id=tenant_id).update(
+            **updates, updated_at=timezone.now()
+        ):
+            tenant = Tenant.objects.filter(pk=tenant_id).first()
+            if tenant is None:
+                continue
+            TenantQuota.objects.create(
+                tenant=tenant,
+                **tier_limits(tenant.subscription_tier),
+                **{f"{resource}_used": amount for resource, amount in counts.items()},
+            )
+    transaction.on_commit(lambda: invalidate_limits(*usage))
+    return len(usage)
+
+
+def reset_counters(tenant_id):
+    """Drop a tenant's Redis counters (when its monthly usage is reset)"""
+    invalidate_limits(tenant_id)
+    client = _redis()
+    if client is None:
+        return
+    try:
+        client.delete(
+            *[
+                key.format(tenant=tenant_id, resource=resource)
+                for key in (USED_KEY, PENDING_KEY)
+                for resource in RESOURCES
+            ]
+        )
+    except Exception as e:
+        logger.warning(f"Could not reset quota counters of tenant {tenant_id}: {e}")
+
+
+def _redis() -> Optional[object]:
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        # The default cache is not Redis (e.g. in tests)
+        return None
+
+
+def _script(client, source: str):
+    if source not in _scripts:
+        _scripts[source] = client.register_script(source)
+    return _scripts[source]
@@ -0,0 +1,110 @@
+"""
+Tenant resolution for slug-scoped API routes.
+
+TenantResolverMiddleware resolves the ``tenant_slug`` URL kwarg once per
+request and attaches the Tenant as ``request.tenant`` (None for an unknown
+slug). Lookups go through a process-local TTL cache, then the shared
+cache, then the database. Saving or deleting a tenant drops its entries
+from the shared cache and from this process; other processes pick up the
+change within TENANT_LOCAL_CACHE_TTL seconds.
+"""
+
+import copy
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from .models import Tenant
+
+logger = logging.getLogger(__name__)
+
+# Seconds a tenant is kept in the shared cache
+TENANT_CACHE_TIMEOUT = getattr(settings, "TENANT_CACHE_TIMEOUT", 300)
+
+# Seconds a tenant is kept in each process
+TENANT_LOCAL_CACHE_TTL = getattr(settings, "TENANT_LOCAL_CACHE_TTL", 10)
+
+CACHE_KEY = "tenants:slug:{slug}"
+
+# Slug -> (expiry on the monotonic clock, tenant)
+_local: Dict[str, Tuple[float, Tenant]] = {}
+_lock = threading.Lock()
+
+
+def resolve_tenant(slug: str) -> Optional[Tenant]:
+    """The tenant with this slug, or None"""
+    now = time.monotonic()
+    with _lock:
+        entry = _local.get(slug)
+    if entry is not None and entry[0] > now:
+        return copy.deepcopy(entry[1])
+
+    tenant = _cache_get(CACHE_KEY.format(slug=slug))
+    if tenant is None:
+        tenant = Tenant.objects.filter(slug=slug).first()
+        if tenant is None:
+            return None
+        _cache_set(CACHE_KEY.format(slug=slug), tenant)
+
+    with _lock:
+        _local[slug] = (now + TENANT_LOCAL_CACHE_TTL, tenant)
+    # Callers get their own copy, so changes to it never leak between requests
+    return copy.deepcopy(tenant)
+
+
+def invalidate_tenant(*slugs: str):
+    """Drop cached tenants (called when a tenant is saved or deleted)"""
+    with _lock:
+        for slug in slugs:
+            _local.pop(slug, None)
+    try:
+        cache.delete_many([CACHE_KEY.format(slug=slug) for slug in slugs])
+    except Exception as e:
+        logger.warning(f"Could not invalidate cached tenants {slugs}: {e}")
+
+
+def clear_local_cache():
+    with _lock:
+        _local.clear()
+
+
+def request_tenant(request, tenant_slug: Optional[str] = None) -> Tenant:
+    """
+    Tenant of a slug-scoped request, raising Http404 if there is none.
+
+    Uses request.tenant when the middleware has resolved it, so views
+    called without the middleware (e.g. in tests) still work.
+    """
+    tenant = getattr(request, "tenant", None)
+    if tenant_slug and (tenant is None or tenant.slug != tenant_slug):
+        tenant = resolve_tenant(tenant_slug)
+    if tenant is None:
+        raise Http404("Tenant not found")
+    return tenant
+
+
+class TenantScopedMixin:
+    """Viewset mixin exposing the tenant of the ``tenant_slug`` URL kwarg"""
+
+    def get_tenant(self) -> Tenant:
+        return request_tenant(self.request, self.kwargs.get("tenant_slug"))
+
+
+def _cache_get(key: str):
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"Tenant cache read failed: {e}")
+        return None
+
+
+def _cache_set(key: str, tenant: Tenant):
+    try:
+        cache.set(key, tenant, TENANT_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Tenant cache write failed: {e}")
@@ -5,6 +5,7 @@ Serializers for tenant management.
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Tenant, TenantUser, TenantQuota, TenantAPIKey
+from .quotas import tier_limits
 
 User = get_user_model()
 
@@ -117,8 +118,10 @@ class TenantCreateSerializer(serializers.ModelSerializer):
         # Create tenant
         tenant = Tenant.objects.create(**validated_data)
 
-        # Create default quota
-        TenantQuota.objects.create(tenant=tenant)
+        # Create default quota for the tenant's subscription tier
+        TenantQuota.objects.create(
+            tenant=tenant, **tier_limits(tenant.subscription_tier)
+        )
 
         return tenant
 
@@ -185,7 +188,7 @@ class TenantAPIKeySerializer(serializers.ModelSerializer):
         api_key = TenantAPIKey.generate_key()
 
         # Extract the prefix (first 8 characters after "nc_")
-        key_prefix = api_key[:11]  # "nc_" + first 8 chars
+        key_prefix = TenantAPIKey.get_prefix(api_key)
 
         # Hash the key for storage
         key_hash = TenantAPIKey.hash_key(api_key)
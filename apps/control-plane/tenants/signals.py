@@ -0,0 +1,56 @@
+"""
+Signal handlers for tenant models.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_keys
+from .models import Tenant, TenantAPIKey, TenantQuota
+from .quotas import invalidate_limits
+from .resolver import invalidate_tenant
+
+
+@receiver(pre_save, sender=Tenant)
+def remember_tenant_slug(sender, instance, **kwargs):
+    if not instance._state.adding:
+        instance._saved_slug = (
+            Tenant.objects.filter(pk=instance.pk).values_list("slug", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+def tenant_changed(sender, instance, **kwargs):
+    slugs = {instance.slug, getattr(instance, "_saved_slug", None)} - {None}
+    # Now for this process, and again once readers elsewhere can see the change
+    invalidate_tenant(*slugs)
+    transaction.on_commit(lambda: invalidate_tenant(*slugs))
+    invalidate_limits(instance.pk)
+
+    # Keys of suspended or deactivated tenants stop working
+    prefixes = list(
+        TenantAPIKey.objects.filter(tenant_id=instance.pk).values_list(
+            "key_prefix", flat=True
+        )
+    )
+    if prefixes:
+        _invalidate_keys(prefixes)
+
+
+@receiver(post_save, sender=TenantQuota)
+@receiver(post_delete, sender=TenantQuota)
+def quota_changed(sender, instance, **kwargs):
+    invalidate_limits(instance.tenant_id)
+
+
+@receiver(post_save, sender=TenantAPIKey)
+@receiver(post_delete, sender=TenantAPIKey)
+def api_key_changed(sender, instance, **kwargs):
+    _invalidate_keys([instance.key_prefix])
+
+
+def _invalidate_keys(prefixes):
+    invalidate_keys(*prefixes)
+    transaction.on_commit(lambda: invalidate_keys(*prefixes))
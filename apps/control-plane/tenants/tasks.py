@@ -0,0 +1,19 @@
+from celery import shared_task
+import logging
+
+from .quotas import flush_counters
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_quota_counters():
+    """
+    Write pending Redis quota usage to TenantQuota.
+
+    Scheduled every minute via Celery Beat.
+    """
+    flushed = flush_counters()
+    if flushed:
+        logger.info(f"Flushed quota usage of {flushed} tenants")
+    return flushed
@@ -2,12 +2,46 @@
 Tests for tenant management functionality.
 """
 
-from django.test import TestCase
-from rest_framework.test import APITestCase
+import asyncio
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
 
-from .models import Tenant, TenantUser, TenantQuota, TenantStatus
+from control_plane import throttling
+from control_plane.middleware import (
+    TenantContextMiddleware,
+    TenantResolverMiddleware,
+)
+from . import authentication as auth_module
+from . import context
+from . import quotas
+from .authentication import TenantAPIKeyAuthentication, flush_usage
+from .authentication import clear_local_cache as clear_api_key_cache
+from .context import (
+    ContextThreadPoolExecutor,
+    TenantManager,
+    get_current_tenant_id,
+    set_current_tenant_id,
+    tenant_context,
+)
+from .models import (
+    SubscriptionTier,
+    Tenant,
+    TenantAPIKey,
+    TenantUser,
+    TenantQuota,
+    TenantStatus,
+)
+from .resolver import clear_local_cache, request_tenant, resolve_tenant
 
 User = get_user_model()
 
@@ -152,6 +186,436 @@ class TenantQuotaTestCase(TestCase):
         self.assertIsNotNone(quota.last_reset_at)
 
 
+class TenantResolverTestCase(TestCase):
+    """Test cases for cached tenant resolution."""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+        self.tenant = Tenant.objects.create(
+            name="Test Org",
+            slug="test-org",
+            contact_email="test@example.com",
+            contact_name="Test User",
+        )
+
+    def test_resolve_is_cached(self):
+        """Test that a resolved tenant is served from cache."""
+        self.assertEqual(resolve_tenant("test-org"), self.tenant)
+
+        with self.assertNumQueries(0):
+            tenant = resolve_tenant("test-org")
+        self.assertEqual(tenant.pk, self.tenant.pk)
+
+        # Each caller gets its own copy
+        tenant.name = "Changed"
+        self.assertEqual(resolve_tenant("test-org").name, "Test Org")
+
+        # Other processes read the shared cache
+        clear_local_cache()
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_tenant("test-org"), self.tenant)
+
+    def test_save_invalidates(self):
+        """Test that saving a tenant drops its cached entries."""
+        resolve_tenant("test-org")
+
+        self.tenant.slug = "renamed-org"
+        self.tenant.save()
+
+        self.assertIsNone(resolve_tenant("test-org"))
+        self.assertEqual(resolve_tenant("renamed-org").pk, self.tenant.pk)
+
+        self.tenant.delete()
+        self.assertIsNone(resolve_tenant("renamed-org"))
+
+    def test_middleware_attaches_tenant(self):
+        """Test that slug-scoped requests get request.tenant."""
+        middleware = TenantResolverMiddleware(lambda request: None)
+        factory = RequestFactory()
+
+        request = factory.get("/api/tenants/test-org/tas/")
+        middleware.process_view(request, None, (), {"tenant_slug": "test-org"})
+        self.assertEqual(request.tenant, self.tenant)
+        with self.assertNumQueries(0):
+            self.assertEqual(request_tenant(request, "test-org"), self.tenant)
+
+        request = factory.get("/api/tenants/missing/tas/")
+        middleware.process_view(request, None, (), {"tenant_slug": "missing"})
+        self.assertIsNone(request.tenant)
+        with self.assertRaises(Http404):
+            request_tenant(request, "missing")
+
+
+class TenantAPIKeyAuthenticationTestCase(TestCase):
+    """Test cases for API key authentication."""
+
+    def setUp(self):
+        cache.clear()
+        clear_api_key_cache()
+        flush_usage()
+        self.tenant = Tenant.objects.create(
+            name="Test Org",
+            slug="test-org",
+            contact_email="test@example.com",
+            contact_name="Test User",
+            status=TenantStatus.ACTIVE,
+        )
+        self.key = TenantAPIKey.generate_key()
+        self.api_key = TenantAPIKey.objects.create(
+            tenant=self.tenant,
+            name="LMS sync",
+            key_prefix=TenantAPIKey.get_prefix(self.key),
+            key_hash=TenantAPIKey.hash_key(self.key),
+            scopes=["sync"],
+        )
+        self.auth = TenantAPIKeyAuthentication()
+        self.factory = RequestFactory()
+        patcher = mock.patch.object(auth_module, "API_KEY_USAGE_FLUSH_INTERVAL", 3600)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def authenticate(self, key=None, **headers):
+        if key is not None:
+            headers["HTTP_AUTHORIZATION"] = f"Api-Key {key}"
+        return self.auth.authenticate(Request(self.factory.get("/", **headers)))
+
+    def test_authenticates_valid_key(self):
+        """Test that a valid key authenticates as its tenant."""
+        user, api_key = self.authenticate(self.key)
+
+        self.assertTrue(user.is_authenticated)
+        self.assertEqual(api_key.tenant_id, str(self.tenant.pk))
+        self.assertEqual(api_key.scopes, ("sync",))
+
+        user, _ = self.authenticate(HTTP_X_API_KEY=self.key)
+        self.assertEqual(user.api_key.id, str(self.api_key.pk))
+
+    def test_other_credentials_are_ignored(self):
+        """Test that requests without an API key fall through."""
+        self.assertIsNone(self.authenticate())
+        self.assertIsNone(self.authenticate(HTTP_AUTHORIZATION="Token abc"))
+
+    def test_lookups_are_cached(self):
+        """Test that repeat requests do not query the database."""
+        self.authenticate(self.key)
+        with self.assertNumQueries(0):
+            self.authenticate(self.key)
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(self.key + "x")
+
+        # Unknown prefixes are cached as well
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate("nc_unknown-key")
+        with self.assertNumQueries(0):
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate("nc_unknown-key")
+
+    def test_revoked_and_expired_keys_fail(self):
+        """Test that revoking or expiring a key takes effect at once."""
+        self.authenticate(self.key)
+
+        self.api_key.is_active = False
+        self.api_key.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.key)
+
+        self.api_key.is_active = True
+        self.api_key.expires_at = timezone.now() - timedelta(minutes=1)
+        self.api_key.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.key)
+
+    def test_suspended_tenant_keys_fail(self):
+        """Test that keys stop working when their tenant is suspended."""
+        self.authenticate(self.key)
+        self.tenant.suspend("Unpaid")
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.key)
+
+    def test_key_only_opens_its_tenant(self):
+        """Test that a key is rejected on another tenant's routes."""
+        other = Tenant.objects.create(
+            name="Other Org",
+            slug="other-org",
+            contact_email="other@example.com",
+            contact_name="Other User",
+        )
+        request = self.factory.get("/", HTTP_AUTHORIZATION=f"Api-Key {self.key}")
+        request.tenant = other
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate(Request(request))
+
+    def test_api_key_clients_can_write(self):
+        """Test that writes store the tenant's service user as their author."""
+        client = APIClient(HTTP_X_API_KEY=self.key)
+        response = client.post(
+            "/api/tenants/test-org/tas/",
+            {
+                "tenant": str(self.tenant.pk),
+                "title": "Diploma of Business TAS",
+                "code": "BSB50120",
+                "qualification_name": "Diploma of Business",
+                "aqf_level": "diploma",
+                "training_package": "BSB",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = client.post(
+            f"/api/tenants/test-org/tas/{response.data['id']}/create_version/",
+            {"change_summary": "Update", "changed_sections": []},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        service_user = User.objects.get(username=f"api-key:{self.tenant.pk}")
+        self.assertEqual(response.data["created_by"], service_user.pk)
+        self.assertFalse(service_user.has_usable_password())
+
+    def test_usage_is_written_in_batches(self):
+        """Test that last_used_at is buffered and flushed in one query."""
+        auth_module.service_user_id(self.tenant.pk)
+        # Loading the key record and its tenant's service user
+        with self.assertNumQueries(2):
+            for _ in range(3):
+                self.authenticate(self.key)
+        self.api_key.refresh_from_db()
+        self.assertIsNone(self.api_key.last_used_at)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(flush_usage(), 1)
+        self.api_key.refresh_from_db()
+        self.assertIsNotNone(self.api_key.last_used_at)
+
+
+class QuotaEnforcementTestCase(TestCase):
+    """Test cases for quota enforcement."""
+
+    def setUp(self):
+        quotas.clear_local_cache()
+        self.tenant = Tenant.objects.create(
+            name="Test Org",
+            slug="test-org",
+            contact_email="test@example.com",
+            contact_name="Test User",
+            subscription_tier=SubscriptionTier.BASIC,
+        )
+
+    def test_limits_fall_back_to_tier(self):
+        """Test that tenants without a quota row get their tier's limits."""
+        limits = quotas.quota_limits(self.tenant)
+        self.assertEqual(
+            limits[quotas.API_CALLS],
+            (quotas.TENANT_TIER_QUOTAS[SubscriptionTier.BASIC]["api_calls"], 0),
+        )
+
+        quota = TenantQuota.objects.create(
+            tenant=self.tenant, api_calls_limit=100, api_calls_used=40
+        )
+        self.assertEqual(quotas.quota_limits(self.tenant)[quotas.API_CALLS], (100, 40))
+        with self.assertNumQueries(0):
+            quotas.quota_limits(self.tenant)
+
+        quota.api_calls_limit = 200
+        quota.save()
+        self.assertEqual(quotas.quota_limits(self.tenant)[quotas.API_CALLS], (200, 40))
+
+    def test_charge_without_redis_is_allowed(self):
+        """Test that quotas fail open when the cache is not Redis."""
+        self.assertEqual(
+            quotas.charge(self.tenant),
+            (True, 0, quotas.TENANT_TIER_QUOTAS[SubscriptionTier.BASIC]["api_calls"]),
+        )
+        self.assertEqual(quotas.flush_counters(), 0)
+
+    def test_apply_usage_adds_to_database(self):
+        """Test that flushed usage is added, not written over."""
+        quota = TenantQuota.objects.create(tenant=self.tenant, api_calls_used=10)
+        TenantQuota.objects.filter(pk=quota.pk).update(ai_tokens_used=500)
+
+        quotas.apply_usage({str(self.tenant.pk): {"api_calls": 5}})
+
+        quota.refresh_from_db()
+        self.assertEqual(quota.api_calls_used, 15)
+        self.assertEqual(quota.ai_tokens_used, 500)
+
+    def test_failed_apply_usage_writes_nothing(self):
+        """Test that a flush failing partway leaves every tenant unchanged."""
+        quota = TenantQuota.objects.create(tenant=self.tenant, api_calls_used=10)
+        other = Tenant.objects.create(
+            name="Other Org",
+            slug="other-org",
+            contact_email="other@example.com",
+            contact_name="Other User",
+        )
+
+        with mock.patch.object(quotas, "tier_limits", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                quotas.apply_usage(
+                    {
+                        str(self.tenant.pk): {"api_calls": 5},
+                        str(other.pk): {"api_calls": 1},
+                    }
+                )
+
+        quota.refresh_from_db()
+        self.assertEqual(quota.api_calls_used, 10)
+        self.assertFalse(TenantQuota.objects.filter(tenant=other).exists())
+
+    def test_apply_usage_creates_missing_quota(self):
+        """Test that usage of a tenant without a quota row creates one."""
+        quotas.apply_usage({str(self.tenant.pk): {"api_calls": 3}})
+
+        quota = TenantQuota.objects.get(tenant=self.tenant)
+        self.assertEqual(quota.api_calls_used, 3)
+        self.assertEqual(
+            quota.api_calls_limit,
+            quotas.TENANT_TIER_QUOTAS[SubscriptionTier.BASIC]["api_calls"],
+        )
+
+    def test_throttle_rejects_over_quota(self):
+        """Test that authenticated requests are charged and get a 429 over quota."""
+        user = User.objects.create_user(username="member", password="x")
+        TenantUser.objects.create(tenant=self.tenant, user=user)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with mock.patch.object(
+            throttling, "charge", return_value=(True, 9, 10)
+        ) as charge:
+            response = client.get("/api/tenants/test-org/tas/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        charge.assert_called_once_with(self.tenant)
+
+        with mock.patch.object(throttling, "charge", return_value=(False, 10, 10)):
+            response = client.get("/api/tenants/test-org/tas/")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_unauthenticated_requests_are_not_charged(self):
+        """Test that anonymous requests and bad API keys use none of the quota."""
+        with mock.patch.object(throttling, "charge") as charge:
+            anonymous = APIClient().get("/api/tenants/test-org/tas/")
+            bad_key = APIClient().get(
+                "/api/tenants/test-org/tas/", HTTP_X_API_KEY="nc_not-a-real-key"
+            )
+
+        # The TAS list is open to anonymous callers, but they are not charged
+        self.assertEqual(anonymous.status_code, status.HTTP_200_OK)
+        self.assertEqual(bad_key.status_code, status.HTTP_401_UNAUTHORIZED)
+        charge.assert_not_called()
+
+
+class TenantContextTestCase(TestCase):
+    """Test cases for the tenant context."""
+
+    def setUp(self):
+        set_current_tenant_id(None)
+        self.addCleanup(set_current_tenant_id, None)
+        self.tenant = Tenant.objects.create(
+            name="Test Org",
+            slug="test-org",
+            contact_email="test@example.com",
+            contact_name="Test User",
+        )
+        self.other = Tenant.objects.create(
+            name="Other Org",
+            slug="other-org",
+            contact_email="other@example.com",
+            contact_name="Other User",
+        )
+
+    def test_middleware_sets_and_clears_tenant(self):
+        """Test that the tenant header is the current tenant for one request."""
+        middleware = TenantContextMiddleware(lambda request: None)
+        request = RequestFactory().get("/", HTTP_X_TENANT_ID=str(self.tenant.pk))
+
+        middleware.process_request(request)
+        self.assertEqual(get_current_tenant_id(), str(self.tenant.pk))
+
+        middleware.process_response(request, HttpResponse())
+        self.assertIsNone(get_current_tenant_id())
+
+    def test_middleware_resolves_tenant_header(self):
+        """Test that a slug header becomes the tenant id and junk is ignored."""
+        middleware = TenantContextMiddleware(lambda request: None)
+
+        middleware.process_request(
+            RequestFactory().get("/", HTTP_X_TENANT_ID="other-org")
+        )
+        self.assertEqual(get_current_tenant_id(), str(self.other.pk))
+
+        middleware.process_request(
+            RequestFactory().get("/", HTTP_X_TENANT_ID="no-such-org")
+        )
+        self.assertIsNone(get_current_tenant_id())
+
+        middleware.process_request(
+            RequestFactory().get("/", HTTP_X_TENANT_ID=str(self.tenant.pk).upper())
+        )
+        self.assertEqual(get_current_tenant_id(), str(self.tenant.pk))
+
+    def test_resolved_tenant_is_current(self):
+        """Test that the tenant of a slug-scoped route becomes the current tenant."""
+        middleware = TenantResolverMiddleware(lambda request: None)
+        middleware.process_view(
+            RequestFactory().get("/"), None, (), {"tenant_slug": "other-org"}
+        )
+        self.assertEqual(get_current_tenant_id(), str(self.other.pk))
+
+    def test_async_tasks_keep_their_own_tenant(self):
+        """Test that concurrent asyncio tasks do not see each other's tenant."""
+
+        async def run(tenant_id):
+            set_current_tenant_id(tenant_id)
+            await asyncio.sleep(0)
+            return get_current_tenant_id()
+
+        async def main():
+            return await asyncio.gather(run("a"), run("b"))
+
+        with tenant_context("outer"):
+            self.assertEqual(asyncio.run(main()), ["a", "b"])
+            self.assertEqual(get_current_tenant_id(), "outer")
+
+    def test_executor_threads_get_tenant(self):
+        """Test that pool threads run with the submitter's tenant."""
+        with ContextThreadPoolExecutor(max_workers=2) as executor:
+            with tenant_context(self.tenant.pk):
+                future = executor.submit(get_current_tenant_id)
+            self.assertEqual(future.result(), str(self.tenant.pk))
+            self.assertIsNone(executor.submit(get_current_tenant_id).result())
+
+    def test_celery_tasks_carry_tenant(self):
+        """Test that tasks are published with the tenant and run under it."""
+        headers = {}
+        context.add_tenant_header(headers=headers)
+        self.assertNotIn(context.TASK_HEADER, headers)
+
+        with tenant_context(self.tenant.pk):
+            context.add_tenant_header(headers=headers)
+        self.assertEqual(headers[context.TASK_HEADER], str(self.tenant.pk))
+
+        task = mock.Mock()
+        task.request.tenant_id = headers[context.TASK_HEADER]
+        context.enter_task_tenant(task_id="t1", task=task)
+        self.assertEqual(get_current_tenant_id(), str(self.tenant.pk))
+        context.exit_task_tenant(task_id="t1")
+        self.assertIsNone(get_current_tenant_id())
+
+    def test_tenant_manager_filters_by_current_tenant(self):
+        """Test that TenantManager only returns the current tenant's rows."""
+        TenantQuota.objects.create(tenant=self.tenant)
+        TenantQuota.objects.create(tenant=self.other)
+        manager = TenantManager()
+        manager.model = TenantQuota
+
+        self.assertEqual(manager.count(), 2)
+        with tenant_context(self.other.pk):
+            self.assertEqual([q.tenant_id for q in manager.all()], [self.other.pk])
+
+
 class TenantAPITestCase(APITestCase):
     """Test cases for Tenant API endpoints."""
 